@@ -0,0 +1,377 @@
+"""Tests for acme.async_client."""
+import asyncio
+import datetime
+import http.client as http_client
+import sys
+import unittest
+from unittest import mock
+
+from cryptography import x509
+import josepy as jose
+import pytest
+
+from acme import challenges
+from acme import errors
+from acme import messages
+from acme._internal.tests import test_util
+from acme._internal.tests.client_test import make_cert_for_renewal
+from acme.async_client import AsyncClientNetwork
+from acme.async_client import AsyncClientV2
+from acme.client import ClientNetwork
+
+CERT_SAN_PEM = test_util.load_vector('cert-san.pem')
+CSR_MIXED_PEM = test_util.load_vector('csr-mixed.pem')
+KEY = jose.JWKRSA.load(test_util.load_vector('rsa512_key.pem'))
+
+DIRECTORY_V2 = messages.Directory({
+    'newAccount': 'https://www.letsencrypt-demo.org/acme/new-account',
+    'newNonce': 'https://www.letsencrypt-demo.org/acme/new-nonce',
+    'newOrder': 'https://www.letsencrypt-demo.org/acme/new-order',
+    'revokeCert': 'https://www.letsencrypt-demo.org/acme/revoke-cert',
+    'renewalInfo': 'https://www.letsencrypt-demo.org/acme/renewal-info',
+    'meta': messages.Directory.Meta(),
+})
+
+
+class AsyncClientNetworkTest(unittest.TestCase):
+    """Tests for acme.async_client.AsyncClientNetwork."""
+
+    def setUp(self):
+        self.net = ClientNetwork(key=KEY, alg=jose.RS256)
+        self.async_net = AsyncClientNetwork(self.net, max_workers=2)
+        self.addCleanup(self.async_net.close)
+
+        self.nonces = [jose.b64encode(b'Nonce2').decode(), jose.b64encode(b'Nonce').decode()]
+        self.sent = []
+
+        def send_request(method, url, *args, **kwargs):
+            # pylint: disable=unused-argument
+            self.sent.append((method, url))
+            response = mock.MagicMock(ok=True, status_code=http_client.OK, links={})
+            response.headers = {ClientNetwork.REPLAY_NONCE_HEADER: self.nonces.pop()}
+            return response
+
+        # pylint: disable=protected-access
+        patcher = mock.patch.object(self.net, '_send_request', side_effect=send_request)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(self.net, '_check_response',
+                                    side_effect=lambda response, content_type: response)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_get(self):
+        asyncio.run(self.async_net.get('https://example.com/dir'))
+        assert self.sent == [('GET', 'https://example.com/dir')]
+
+    def test_post_fetches_and_reuses_nonces(self):
+        self.nonces.insert(0, jose.b64encode(b'Nonce3').decode())
+        asyncio.run(self.async_net.post('https://example.com/a', None,
+                                        new_nonce_url='https://example.com/nonce'))
+        asyncio.run(self.async_net.post('https://example.com/b', None,
+                                        new_nonce_url='https://example.com/nonce'))
+        assert self.sent == [('HEAD', 'https://example.com/nonce'),
+                             ('POST', 'https://example.com/a'),
+                             ('POST', 'https://example.com/b')]
+
+    def test_post_without_key(self):
+        self.net.key = None
+        with pytest.raises(errors.Error):
+            asyncio.run(self.async_net.post('https://example.com/a', None))
+
+    def test_post_retries_bad_nonce(self):
+        with mock.patch.object(AsyncClientNetwork, '_post_once') as mock_post_once:
+            mock_post_once.side_effect = [messages.Error.with_code('badNonce'),
+                                          mock.sentinel.response]
+            assert asyncio.run(self.async_net.post('url', None)) == mock.sentinel.response
+        assert mock_post_once.call_count == 2
+
+    def test_post_other_error(self):
+        with mock.patch.object(AsyncClientNetwork, '_post_once') as mock_post_once:
+            mock_post_once.side_effect = messages.Error.with_code('malformed')
+            with pytest.raises(messages.Error):
+                asyncio.run(self.async_net.post('url', None))
+        assert mock_post_once.call_count == 1
+
+    def test_account(self):
+        self.async_net.account = mock.sentinel.account
+        assert self.net.account == mock.sentinel.account
+        assert self.async_net.account == mock.sentinel.account
+
+
+class AsyncClientV2Test(unittest.TestCase):
+    """Tests for acme.async_client.AsyncClientV2."""
+
+    def setUp(self):
+        self.response = mock.MagicMock(
+            ok=True, status_code=http_client.OK, headers={}, links={})
+        self.net = mock.MagicMock()
+        self.net.post = mock.AsyncMock(return_value=self.response)
+        self.net.get = mock.AsyncMock(return_value=self.response)
+        self.client = AsyncClientV2(DIRECTORY_V2, self.net)
+
+        authzr_uri = 'https://www.letsencrypt-demo.org/acme/authz/1'
+        challb = messages.ChallengeBody(
+            uri=(authzr_uri + '/1'), status=messages.STATUS_VALID,
+            chall=challenges.DNS(token=jose.b64decode(
+                'evaGxfADs6pSRb2LAv9IZf17Dt3juxGJ-PCt92wr-oA')))
+        self.challr = messages.ChallengeResource(body=challb, authzr_uri=authzr_uri)
+        self.authz = messages.Authorization(
+            identifier=messages.Identifier(typ=messages.IDENTIFIER_FQDN, value='example.com'),
+            challenges=(challb,), status=messages.STATUS_VALID)
+        self.authzr = messages.AuthorizationResource(body=self.authz, uri=authzr_uri)
+        self.authzr_uri2 = 'https://www.letsencrypt-demo.org/acme/authz/2'
+        self.authz2 = self.authz.update(identifier=messages.Identifier(
+            typ=messages.IDENTIFIER_FQDN, value='www.example.com'),
+            status=messages.STATUS_PENDING)
+        self.authzr2 = messages.AuthorizationResource(body=self.authz2, uri=self.authzr_uri2)
+
+        self.order = messages.Order(
+            identifiers=(self.authz.identifier, self.authz2.identifier),
+            status=messages.STATUS_PENDING,
+            authorizations=(self.authzr.uri, self.authzr_uri2),
+            finalize='https://www.letsencrypt-demo.org/acme/acct/1/order/1/finalize')
+        self.orderr = messages.OrderResource(
+            body=self.order,
+            uri='https://www.letsencrypt-demo.org/acme/acct/1/order/1',
+            authorizations=[self.authzr, self.authzr2], csr_pem=CSR_MIXED_PEM)
+
+        patcher = mock.patch('acme.async_client.asyncio.sleep', new=mock.AsyncMock())
+        self.mock_sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _json_by_uri(self, bodies):
+        """Answer POST-as-GET requests with the JSON of the body for their URL."""
+        responses = {}
+        for uri, body in bodies.items():
+            response = mock.MagicMock(ok=True, status_code=http_client.OK, headers={},
+                                      links={})
+            if isinstance(body, list):
+                response.json.side_effect = [b.to_json() for b in body]
+            else:
+                response.json.return_value = body.to_json()
+            responses[uri] = response
+
+        async def post(url, obj, **kwargs):
+            # pylint: disable=unused-argument
+            return responses[url]
+        self.net.post.side_effect = post
+
+    def test_get_directory(self):
+        self.response.json.return_value = DIRECTORY_V2.to_json()
+        directory = asyncio.run(AsyncClientV2.get_directory('https://example.com/dir', self.net))
+        assert directory.to_partial_json() == DIRECTORY_V2.to_partial_json()
+
+    def test_new_account(self):
+        regr = messages.RegistrationResource(
+            body=messages.Registration(key=KEY.public_key()),
+            uri='https://www.letsencrypt-demo.org/acme/reg/1')
+        self.response.status_code = http_client.CREATED
+        self.response.json.return_value = regr.body.to_json()
+        self.response.headers['Location'] = regr.uri
+        assert asyncio.run(self.client.new_account(messages.NewRegistration())) == regr
+        assert self.net.account == regr
+
+    def test_new_account_conflict(self):
+        self.response.headers['Location'] = 'https://www.letsencrypt-demo.org/acme/reg/1'
+        with pytest.raises(errors.ConflictError):
+            asyncio.run(self.client.new_account(messages.NewRegistration()))
+
+    def test_new_order(self):
+        self._json_by_uri({DIRECTORY_V2['newOrder']: self.order,
+                           self.authzr.uri: self.authz,
+                           self.authzr_uri2: self.authz2})
+        orderr = asyncio.run(self.client.new_order(CSR_MIXED_PEM))
+        assert orderr.authorizations == [self.authzr, self.authzr2]
+        assert orderr.csr_pem == CSR_MIXED_PEM
+        assert self.net.post.call_args[1]['new_nonce_url'] == DIRECTORY_V2['newNonce']
+
+    def test_answer_challenge(self):
+        self.response.links['up'] = {'url': self.challr.authzr_uri}
+        self.response.json.return_value = self.challr.body.to_json()
+        chall_response = challenges.DNSResponse(validation=None)
+        assert asyncio.run(self.client.answer_challenge(
+            self.challr.body, chall_response)) == self.challr
+
+        with pytest.raises(errors.UnexpectedUpdate):
+            asyncio.run(self.client.answer_challenge(
+                self.challr.body.update(uri='foo'), chall_response))
+
+    def test_answer_challenge_missing_next(self):
+        with pytest.raises(errors.ClientError):
+            asyncio.run(self.client.answer_challenge(
+                self.challr.body, challenges.DNSResponse(validation=None)))
+
+    def test_poll(self):
+        self.response.json.return_value = self.authz.to_json()
+        authzr, response = asyncio.run(self.client.poll(self.authzr))
+        assert authzr == self.authzr
+        assert response is self.response
+
+    def test_poll_authorizations_success(self):
+        updated_authz2 = self.authz2.update(status=messages.STATUS_VALID)
+        self._json_by_uri({self.authzr.uri: self.authz,
+                           self.authzr_uri2: [self.authz2, updated_authz2]})
+        deadline = datetime.datetime(9999, 9, 9)
+        orderr = asyncio.run(self.client.poll_authorizations(self.orderr, deadline))
+        assert orderr.authorizations == [
+            self.authzr, messages.AuthorizationResource(body=updated_authz2,
+                                                        uri=self.authzr_uri2)]
+        assert self.mock_sleep.await_count == 1
+
+    def test_poll_authorizations_failure(self):
+        challb = self.challr.body.update(status=messages.STATUS_INVALID,
+                                         error=messages.Error.with_code('unauthorized'))
+        self.response.json.return_value = self.authz.update(
+            status=messages.STATUS_INVALID, challenges=(challb,)).to_json()
+        with pytest.raises(errors.ValidationError):
+            asyncio.run(self.client.poll_authorizations(
+                self.orderr, datetime.datetime(9999, 9, 9)))
+
+    def test_poll_authorizations_timeout(self):
+        with pytest.raises(errors.TimeoutError):
+            asyncio.run(self.client.poll_authorizations(
+                self.orderr, datetime.datetime.now() - datetime.timedelta(seconds=1)))
+
+    def test_finalize_order_success(self):
+        updated_order = self.order.update(
+            certificate='https://www.letsencrypt-demo.org/acme/cert/',
+            status=messages.STATUS_VALID)
+        self.response.json.return_value = updated_order.to_json()
+        self.response.text = CERT_SAN_PEM
+        orderr = asyncio.run(self.client.finalize_order(
+            self.orderr, datetime.datetime(9999, 9, 9)))
+        assert orderr == self.orderr.update(body=updated_order, fullchain_pem=CERT_SAN_PEM)
+
+    def test_finalize_order_alt_chains(self):
+        updated_order = self.order.update(
+            certificate='https://www.letsencrypt-demo.org/acme/cert/',
+            status=messages.STATUS_VALID)
+        self.response.json.return_value = updated_order.to_json()
+        self.response.text = CERT_SAN_PEM
+        self.response.headers['Link'] = \
+            '<https://example.com/acme/cert/1>;rel="alternate", ' + \
+            '<https://example.com/acme/cert/2>;title="foo";rel="alternate"'
+        orderr = asyncio.run(self.client.finalize_order(
+            self.orderr, datetime.datetime(9999, 9, 9), fetch_alternative_chains=True))
+        assert orderr.alternative_fullchains_pem == [CERT_SAN_PEM, CERT_SAN_PEM]
+
+    def test_finalize_order_error(self):
+        self.response.json.return_value = self.order.update(
+            error=messages.Error.with_code('unauthorized'),
+            status=messages.STATUS_INVALID).to_json()
+        with pytest.raises(errors.IssuanceError):
+            asyncio.run(self.client.finalize_order(self.orderr, datetime.datetime(9999, 9, 9)))
+
+    def test_finalize_order_invalid_status(self):
+        self.response.json.return_value = self.order.update(
+            error=None, status=messages.STATUS_INVALID).to_json()
+        with pytest.raises(errors.Error, match="The certificate order failed"):
+            asyncio.run(self.client.finalize_order(self.orderr, datetime.datetime(9999, 9, 9)))
+
+    def test_finalize_order_not_ready(self):
+        processing = self.order.update(status=messages.STATUS_PROCESSING)
+        ready = self.order.update(status=messages.STATUS_READY)
+        valid = self.order.update(
+            certificate='https://www.letsencrypt-demo.org/acme/cert/',
+            status=messages.STATUS_VALID)
+        self.response.text = CERT_SAN_PEM
+        self.response.json.side_effect = [processing.to_json(), ready.to_json(),
+                                          ready.to_json(), valid.to_json()]
+        self.net.post.side_effect = [messages.Error.with_code('orderNotReady'),
+                                     self.response, self.response, self.response,
+                                     self.response, self.response]
+        orderr = asyncio.run(self.client.finalize_order(
+            self.orderr, datetime.datetime(9999, 9, 9)))
+        assert orderr.fullchain_pem == CERT_SAN_PEM
+
+    def test_finalize_order_other_error(self):
+        self.net.post.side_effect = messages.Error.with_code('serverInternal')
+        with pytest.raises(messages.Error):
+            asyncio.run(self.client.finalize_order(self.orderr, datetime.datetime(9999, 9, 9)))
+
+    def test_poll_and_finalize(self):
+        with mock.patch.object(self.client, 'poll_authorizations',
+                               new=mock.AsyncMock(return_value=self.orderr)), \
+             mock.patch.object(self.client, 'finalize_order',
+                               new=mock.AsyncMock(return_value=mock.sentinel.orderr)):
+            assert asyncio.run(self.client.poll_and_finalize(self.orderr)) == \
+                mock.sentinel.orderr
+
+    @mock.patch('acme.client.datetime')
+    def test_renewal_time(self, dt_mock):
+        dt_mock.datetime.now.return_value = datetime.datetime(
+            2025, 3, 15, tzinfo=datetime.timezone.utc)
+        dt_mock.timedelta = datetime.timedelta
+        cert_pem = make_cert_for_renewal(
+            not_before=datetime.datetime(2025, 3, 12, 00, 00, 00),
+            not_after=datetime.datetime(2025, 3, 20, 00, 00, 00),
+        )
+        start = datetime.datetime(2025, 3, 16, tzinfo=datetime.timezone.utc)
+        end = datetime.datetime(2025, 3, 17, tzinfo=datetime.timezone.utc)
+        self.response.json.return_value = {
+            'suggestedWindow': {'start': '2025-03-16T00:00:00Z', 'end': '2025-03-17T00:00:00Z'}}
+        suggested, _ = asyncio.run(self.client.renewal_time(cert_pem))
+        assert start <= suggested <= end
+        assert self.net.get.call_args[0][0].startswith(DIRECTORY_V2['renewalInfo'] + '/')
+
+    @mock.patch('acme.client.datetime')
+    def test_renewal_time_expired_cert(self, dt_mock):
+        dt_mock.datetime.now.return_value = datetime.datetime(
+            2026, 1, 1, tzinfo=datetime.timezone.utc)
+        cert = x509.load_pem_x509_certificate(make_cert_for_renewal(
+            not_before=datetime.datetime(2025, 3, 12, 00, 00, 00),
+            not_after=datetime.datetime(2025, 3, 20, 00, 00, 00),
+        ))
+        suggested, _ = asyncio.run(self.client.renewal_time(cert))
+        assert suggested == cert.not_valid_after_utc
+        assert not self.net.get.called
+
+    def test_renewal_time_no_renewal_info(self):
+        self.client.directory = messages.Directory({})
+        cert_pem = make_cert_for_renewal(
+            not_before=datetime.datetime.now() - datetime.timedelta(days=1),
+            not_after=datetime.datetime.now() + datetime.timedelta(days=1),
+        )
+        suggested, _ = asyncio.run(self.client.renewal_time(cert_pem))
+        assert suggested is None
+
+    def test_renewal_info_same_as_client_v2(self):
+        from acme.client import ClientV2
+        cert = x509.load_pem_x509_certificate(make_cert_for_renewal(
+            not_before=datetime.datetime.now() - datetime.timedelta(days=1),
+            not_after=datetime.datetime.now() + datetime.timedelta(days=1),
+        ))
+        self.response.headers = {'Retry-After': 'Wed, 20 Mar 2030 00:00:00 GMT'}
+        self.response.json.return_value = {
+            'suggestedWindow': {'start': '2025-03-16T00:00:00Z', 'end': '2025-03-17T00:00:00Z'}}
+        sync_net = mock.MagicMock()
+        sync_net.get.return_value = self.response
+
+        result = asyncio.run(self.client.renewal_info(cert))
+
+        assert result == ClientV2(DIRECTORY_V2, sync_net).renewal_info(cert)
+        assert result[1] == datetime.datetime(2030, 3, 20)
+        assert self.net.get.call_args == sync_net.get.call_args
+
+    def test_renewal_info_error(self):
+        cert = x509.load_pem_x509_certificate(make_cert_for_renewal(
+            not_before=datetime.datetime(2025, 3, 12, 00, 00, 00),
+            not_after=datetime.datetime(2025, 3, 20, 00, 00, 00),
+        ))
+        self.net.get.side_effect = ValueError('foo')
+        with pytest.raises(errors.ARIError):
+            asyncio.run(self.client.renewal_info(cert))
+
+    def test_revoke(self):
+        cert = x509.load_pem_x509_certificate(CERT_SAN_PEM)
+        asyncio.run(self.client.revoke(cert, 1))
+        assert self.net.post.call_args[0][0] == DIRECTORY_V2['revokeCert']
+
+        self.response.status_code = http_client.ACCEPTED
+        with pytest.raises(errors.ClientError):
+            asyncio.run(self.client.revoke(cert, 1))
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
@@ -1,10 +1,14 @@
 """Tests for acme.client."""
 # pylint: disable=too-many-lines
+import concurrent.futures
 import copy
 import datetime
 import http.client as http_client
+import http.server
+import itertools
 import json
 import sys
+import threading
 from typing import Dict
 import unittest
 from unittest import mock
@@ -19,6 +23,7 @@ from acme import challenges
 from acme import errors
 from acme import jws as acme_jws
 from acme import messages
+from acme import polling
 from acme._internal.tests import messages_test
 from acme._internal.tests import test_util
 from acme.client import ClientNetwork
@@ -228,6 +233,21 @@ class ClientV2Test(unittest.TestCase):
             self.authz.to_json(), self.authz2.to_json(), updated_authz2.to_json())
         assert self.client.poll_authorizations(self.orderr, deadline) == updated_orderr
 
+    @mock.patch('acme.client.time.sleep')
+    def test_poll_authorizations_polling_strategy(self, mock_sleep):
+        self.client.polling_strategy = mock.MagicMock()
+        self.client.polling_strategy.delay.return_value = 7
+        updated_authz2 = self.authz2.update(status=messages.STATUS_VALID)
+        self.response.headers['Retry-After'] = '30'
+        self.response.json.side_effect = (
+            self.authz.to_json(), self.authz2.to_json(), self.authz2.to_json(),
+            updated_authz2.to_json())
+        self.client.poll_authorizations(self.orderr, datetime.datetime(9999, 9, 9))
+        assert mock_sleep.call_args_list == [mock.call(7), mock.call(7)]
+        delay_calls = self.client.polling_strategy.delay.call_args_list
+        assert [call[0][0] for call in delay_calls] == [1, 2]
+        assert 29 <= delay_calls[0][0][1] <= 30
+
     def test_poll_unexpected_update(self):
         updated_authz = self.authz.update(identifier=self.identifier.update(value='foo'))
         self.response.json.return_value = updated_authz.to_json()
@@ -322,6 +342,21 @@ class ClientV2Test(unittest.TestCase):
         assert self.net.post.call_count == 6
         assert mock_sleep.call_args_list == [((1,),), ((50,),), ((1,),)]
 
+    @mock.patch('acme.client.time.sleep')
+    def test_finalize_order_polling_strategy(self, mock_sleep):
+        self.client.polling_strategy = polling.PollingStrategy(
+            initial_delay=2, interval=3, multiplier=2)
+        processing = self.order.update(status=messages.STATUS_PROCESSING)
+        valid = self.order.update(
+            certificate='https://www.letsencrypt-demo.org/acme/cert/',
+            status=messages.STATUS_VALID)
+        # begin_finalization, then three polls
+        self.response.json.side_effect = [processing.to_json(), processing.to_json(),
+                                          processing.to_json(), valid.to_json()]
+        self.response.text = CERT_SAN_PEM
+        self.client.finalize_order(self.orderr, datetime.datetime(9999, 9, 9))
+        assert mock_sleep.call_args_list == [mock.call(2), mock.call(3), mock.call(6)]
+
     def test_finalize_order_otherErrorCode(self):
         post = mock.MagicMock()
         post.side_effect = [messages.Error.with_code('serverInternal')]
@@ -478,6 +513,9 @@ class ClientV2Test(unittest.TestCase):
         t, _ = self.client.renewal_time(cert_pem)
         assert t == cert.not_valid_after_utc
 
+        t, _ = self.client.renewal_time(cert)
+        assert t == cert.not_valid_after_utc
+
     @mock.patch('acme.client.datetime')
     def test_renewal_time_no_renewal_info(self, dt_mock):
         utc_now = datetime.datetime(2025, 3, 15, tzinfo=datetime.timezone.utc)
@@ -501,7 +539,7 @@ class ClientV2Test(unittest.TestCase):
     @mock.patch('acme.client.datetime')
     def test_renewal_time_with_renewal_info(self, dt_mock):
         from cryptography import x509
-        from acme.client import _renewal_info_path_component
+        from acme.client import renewal_info_cert_id
         utc_now = datetime.datetime(2025, 3, 15, tzinfo=datetime.timezone.utc)
         dt_mock.datetime.now.return_value = utc_now
         dt_mock.timedelta = datetime.timedelta
@@ -524,7 +562,7 @@ class ClientV2Test(unittest.TestCase):
         }
         t, _ = self.client.renewal_time(cert_pem)
         cert_parsed = x509.load_pem_x509_certificate(cert_pem)
-        ari_path_component = _renewal_info_path_component(cert_parsed)
+        ari_path_component = renewal_info_cert_id(cert_parsed)
         self.net.get.assert_called_once_with("https://www.letsencrypt-demo.org/acme/renewal-info/" +
                                              ari_path_component,
                                              content_type='application/json')
@@ -546,6 +584,34 @@ class ClientV2Test(unittest.TestCase):
         assert t >= datetime.datetime(2025, 3, 16, 1, 1, 1, tzinfo=datetime.timezone.utc)
         assert t <= datetime.datetime(2025, 3, 17, 1, 1, 1, tzinfo=datetime.timezone.utc)
 
+    def test_renewal_info(self):
+        from cryptography import x509
+        cert = x509.load_pem_x509_certificate(make_cert_for_renewal(
+            not_before=datetime.datetime(2025, 3, 12, 00, 00, 00),
+            not_after=datetime.datetime(2025, 3, 20, 00, 00, 00),
+        ))
+
+        renewal_info, _ = self.client.renewal_info(cert)
+        assert renewal_info is None
+        assert self.net.get.call_count == 0
+
+        self.client.directory = messages.Directory({
+            'renewalInfo': 'https://www.letsencrypt-demo.org/acme/renewal-info',
+        })
+        self.response.json.return_value = {
+            "suggestedWindow": {
+                "start": "2025-03-16T01:01:01Z",
+                "end": "2025-03-17T01:01:01Z",
+            },
+        }
+        self.response.headers['Retry-After'] = '100'
+        renewal_info, retry_after = self.client.renewal_info(cert)
+        assert renewal_info.suggested_window.start == datetime.datetime(
+            2025, 3, 16, 1, 1, 1, tzinfo=datetime.timezone.utc)
+        assert renewal_info.suggested_window.end == datetime.datetime(
+            2025, 3, 17, 1, 1, 1, tzinfo=datetime.timezone.utc)
+        assert retry_after > datetime.datetime.now()
+
     @mock.patch('acme.client.datetime')
     def test_renewal_time_renewal_info_errors(self, dt_mock):
         def now(tzinfo=None):
@@ -613,13 +679,13 @@ class ClientV2Test(unittest.TestCase):
         _, retry_after = self.client.renewal_time(cert_pem)
         assert retry_after == datetime.datetime(2025, 3, 15, 00, 1, 40)
 
-def test_renewal_info_path_component():
+def test_renewal_info_cert_id():
     from cryptography import x509
-    from acme.client import _renewal_info_path_component
+    from acme.client import renewal_info_cert_id
 
     cert = x509.load_pem_x509_certificate(test_util.load_vector('rsa2048_cert.pem'))
 
-    assert _renewal_info_path_component(cert) == "fL5sRirC8VS5AtOQh9DfoAzYNCI.ALVG_VbBb5U7"
+    assert renewal_info_cert_id(cert) == "fL5sRirC8VS5AtOQh9DfoAzYNCI.ALVG_VbBb5U7"
 
     # From https://www.ietf.org/archive/id/draft-ietf-acme-ari-08.html appendix A.
     ARI_TEST_CERT = b"""
@@ -635,7 +701,7 @@ yNQwCgYIKoZIzj0EAwIDRwAwRAIge09+S5TZAlw5tgtiVvuERV6cT4mfutXIlwTb
 """
 
     cert = x509.load_pem_x509_certificate(ARI_TEST_CERT)
-    assert _renewal_info_path_component(cert) == "aYhba4dGQEHhs3uEe6CuLN4ByNQ.AIdlQyE"
+    assert renewal_info_cert_id(cert) == "aYhba4dGQEHhs3uEe6CuLN4ByNQ.AIdlQyE"
 
 if __name__ == '__main__':
     sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
@@ -720,6 +786,30 @@ class ClientNetworkTest(unittest.TestCase):
         assert jws.signature.combined.kid == u'acct-uri'
         assert jws.signature.combined.url == u'url'
 
+    def test_wrap_in_jws_compact(self):
+        # pylint: disable=protected-access
+        jws_dump = self.net._wrap_in_jws(
+            MockJSONDeSerializable('foo'), nonce=b'Tg', url="url")
+        assert ' ' not in jws_dump
+        assert '\n' not in jws_dump
+
+    def test_check_response_decodes_json_once(self):
+        response = requests.Response()
+        response.status_code = http_client.OK
+        response.headers['Content-Type'] = self.net.JSON_CONTENT_TYPE
+        response._content = b'{"foo": "bar"}'  # pylint: disable=protected-access
+        with mock.patch.object(requests.Response, 'json', autospec=True,
+                               return_value={'foo': 'bar'}) as mock_json:
+            # pylint: disable=protected-access
+            checked = self.net._check_response(response)
+            assert checked.json() == {'foo': 'bar'}
+            assert checked.json() == {'foo': 'bar'}
+            assert self.net._check_response(checked) is checked
+            assert mock_json.call_count == 1
+        assert checked.status_code == http_client.OK
+        assert checked.headers['Content-Type'] == self.net.JSON_CONTENT_TYPE
+        assert checked.json(parse_float=str) == {'foo': 'bar'}
+
     def test_check_response_not_ok_jobj_no_error(self):
         self.response.ok = False
         self.response.json.return_value = {}
@@ -737,6 +827,16 @@ class ClientNetworkTest(unittest.TestCase):
         with pytest.raises(messages.Error):
             self.net._check_response(self.response)
 
+    def test_check_response_not_ok_jobj_error_retry_after(self):
+        self.response.ok = False
+        self.response.headers['Retry-After'] = '60'
+        self.response.json.return_value = messages.Error.with_code(
+            'rateLimited', detail='foo').to_json()
+        # pylint: disable=protected-access
+        with pytest.raises(messages.Error) as exc_info:
+            self.net._check_response(self.response)
+        assert exc_info.value.retry_after > datetime.datetime.now()
+
     def test_check_response_not_ok_no_jobj(self):
         self.response.ok = False
         self.response.json.side_effect = ValueError
@@ -826,6 +926,19 @@ class ClientNetworkTest(unittest.TestCase):
             'Received response:\nHTTP %d\n%s\n\n%s', 200,
             '', b'aGk=')
 
+    @mock.patch('acme.client.logger')
+    def test_send_request_no_debug(self, mock_logger):
+        mock_logger.isEnabledFor.return_value = False
+        self.net.session = mock.MagicMock()
+        self.net.session.request.return_value = self.response
+        text = mock.PropertyMock(return_value='foo')
+        type(self.response).text = text
+        # pylint: disable=protected-access
+        self.net._send_request('POST', 'http://example.com/', data='qux')
+        assert not mock_logger.debug.called
+        assert not text.called
+        assert self.response.encoding == 'utf-8'
+
     def test_send_request_post(self):
         self.net.session = mock.MagicMock()
         self.net.session.request.return_value = self.response
@@ -896,6 +1009,61 @@ class ClientNetworkTest(unittest.TestCase):
             self.net._send_request('GET', 'uri')
 
 
+class ClientNetworkConnectionPoolTest(unittest.TestCase):
+    """Tests for connection pooling in acme.client.ClientNetwork."""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        # pylint: disable=missing-docstring
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            body = b'{}'
+            self.send_response(http_client.OK)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            pass
+
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), self.Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.url = 'http://127.0.0.1:{0}/'.format(self.server.server_address[1])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_pool_options(self):
+        net = ClientNetwork(pool_connections=3, pool_maxsize=7, pool_block=True, get_retries=2)
+        adapter = net.session.get_adapter(self.url)
+        # pylint: disable=protected-access
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 7
+        assert adapter._pool_block is True
+        assert adapter.max_retries.total == 2
+        assert adapter.max_retries.is_retry('GET', http_client.SERVICE_UNAVAILABLE)
+        assert not adapter.max_retries.is_retry('POST', http_client.SERVICE_UNAVAILABLE)
+        assert ClientNetwork().session.get_adapter(self.url).max_retries.total == 0
+
+    def test_connection_stats(self):
+        net = ClientNetwork()
+        assert net.connection_stats() == {}
+        with mock.patch('acme.client.logger') as mock_logger:
+            mock_logger.isEnabledFor.return_value = True
+            for _ in range(3):
+                net.get(self.url)
+        host = '127.0.0.1:{0}'.format(self.server.server_address[1])
+        assert net.connection_stats() == {host: (3, 1)}
+        mock_logger.debug.assert_called_with(
+            'Sent %d requests to %s over %d connections', 3, host, 1)
+
+
 class ClientNetworkWithMockedResponseTest(unittest.TestCase):
     """Tests for acme.client.ClientNetwork which mock out response."""
 
@@ -1064,5 +1232,82 @@ class ClientNetworkWithMockedResponseTest(unittest.TestCase):
             'uri', content_type=self.content_type, bar='baz')
 
 
+class ClientNetworkNoncePoolTest(unittest.TestCase):
+    """Tests for the nonce pool of acme.client.ClientNetwork."""
+    # pylint: disable=protected-access
+
+    def setUp(self):
+        self.net = ClientNetwork(key='fake', alg=None, nonce_low_water=2)
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+        self.sent = []
+
+        def send_request(method, url, *args, **kwargs):
+            # pylint: disable=unused-argument
+            with self.lock:
+                self.sent.append(method)
+                nonce = jose.b64encode(str(next(self.counter)).encode()).decode()
+            response = mock.MagicMock(ok=True, status_code=http_client.OK)
+            response.headers = {self.net.REPLAY_NONCE_HEADER: nonce}
+            return response
+
+        self.net._send_request = mock.MagicMock(side_effect=send_request)
+        self.net._check_response = mock.MagicMock(side_effect=lambda r, content_type: r)
+        self.net._wrap_in_jws = mock.MagicMock(side_effect=lambda obj, nonce, url: nonce)
+
+    def _run_prefetch_synchronously(self):
+        def thread(target, **kwargs):
+            # pylint: disable=unused-argument
+            return mock.MagicMock(start=target)
+        patcher = mock.patch('acme.client.threading.Thread', side_effect=thread)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _post(self):
+        return self.net.post('uri', mock.sentinel.obj, new_nonce_url='new_nonce_uri')
+
+    def test_no_prefetch(self):
+        self.net = ClientNetwork(key='fake', alg=None)
+        self.net._send_request = mock.MagicMock()
+        assert self.net._take_nonce('new_nonce_uri') is None
+        assert not self.net._send_request.called
+
+    def test_prefetch(self):
+        self._run_prefetch_synchronously()
+        self._post()
+        # the HEAD the first POST waited for, two prefetched HEADs, the POST
+        assert self.sent == ['HEAD', 'HEAD', 'HEAD', 'POST']
+        assert self.net.nonce_stats == {'requested': 1, 'prefetched': 2, 'reused': 0}
+
+        self.sent = []
+        for _ in range(3):
+            self._post()
+        assert self.sent == ['POST'] * 3
+        assert self.net.nonce_stats == {'requested': 1, 'prefetched': 2, 'reused': 3}
+        assert not self.net._prefetching
+
+    def test_prefetch_error(self):
+        self._run_prefetch_synchronously()
+        self.net._take_nonce('new_nonce_uri')
+        self.net._send_request.side_effect = requests.exceptions.ConnectionError
+        self.net._nonces.clear()
+        with mock.patch('acme.client.logger') as mock_logger:
+            assert self.net._take_nonce(None) is None
+        assert mock_logger.debug.called
+        assert not self.net._prefetching
+
+    def test_concurrent_posts(self):
+        self.net._nonce_low_water = 0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(lambda _: self._post(), range(50)))
+        nonces = [call[1]['data'] for call in self.net._send_request.call_args_list
+                  if call[0][0] == 'POST']
+        assert len(responses) == 50
+        assert len(set(nonces)) == 50
+        stats = self.net.nonce_stats
+        assert stats['requested'] + stats['reused'] == 50
+        assert stats['requested'] == self.sent.count('HEAD')
+
+
 if __name__ == '__main__':
     sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
@@ -0,0 +1,64 @@
+"""Tests for acme.polling."""
+import sys
+import unittest
+from unittest import mock
+
+import pytest
+
+from acme import polling
+from acme.polling import PollingStrategy
+
+
+class PollingStrategyTest(unittest.TestCase):
+    """Tests for acme.polling.PollingStrategy."""
+
+    def test_default(self):
+        assert [polling.DEFAULT.delay(attempt) for attempt in range(4)] == [1, 1, 1, 1]
+
+    def test_exponential_backoff(self):
+        strategy = PollingStrategy(initial_delay=0, interval=1, multiplier=2, max_interval=5)
+        assert [strategy.delay(attempt) for attempt in range(6)] == [0, 1, 2, 4, 5, 5]
+
+    @mock.patch('acme.polling.random.uniform')
+    def test_jitter(self, mock_uniform):
+        strategy = PollingStrategy(interval=4, jitter=0.5, max_interval=5)
+        mock_uniform.return_value = 0.5
+        assert strategy.delay(1) == 2
+        mock_uniform.assert_called_once_with(0.5, 1.5)
+        mock_uniform.return_value = 1.5
+        assert strategy.delay(1) == 5
+        # the initial delay is not randomized
+        assert strategy.delay(0) == 1
+
+    def test_jitter_range(self):
+        strategy = PollingStrategy(interval=10, jitter=0.2, max_interval=100)
+        for _ in range(20):
+            assert 8 <= strategy.delay(3) <= 12
+
+    def test_invalid_jitter(self):
+        with pytest.raises(ValueError):
+            PollingStrategy(jitter=2)
+
+    def test_retry_after(self):
+        assert polling.DEFAULT.delay(1, retry_after=30) == 30
+        assert polling.DEFAULT.delay(1, retry_after=0.5) == 1
+        assert PollingStrategy(respect_retry_after=False).delay(1, retry_after=30) == 1
+
+    def test_remaining(self):
+        assert polling.DEFAULT.delay(1, retry_after=30, remaining=10) == 10
+        assert polling.DEFAULT.delay(1, remaining=-5) == 0
+
+    def test_profiles(self):
+        for attempt in range(20):
+            assert polling.AGGRESSIVE.delay(attempt) <= 5
+            assert polling.GENTLE.delay(attempt) <= 60
+        assert polling.AGGRESSIVE.delay(1) < polling.DEFAULT.delay(1) < polling.GENTLE.delay(1)
+
+    def test_repr(self):
+        assert repr(polling.DEFAULT) == (
+            'PollingStrategy(initial_delay=1, interval=1, multiplier=1, max_interval=60, '
+            'jitter=0, respect_retry_after=True)')
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
@@ -0,0 +1,356 @@
+"""Asyncio ACME client API."""
+import asyncio
+import concurrent.futures
+import datetime
+import functools
+import http.client as http_client
+import logging
+from typing import Any
+from typing import Callable
+from typing import Optional
+from typing import Tuple
+from typing import TypeVar
+from typing import Union
+
+from cryptography import x509
+import josepy as jose
+import requests
+
+from acme import challenges
+from acme import client
+from acme import errors
+from acme import messages
+from acme import polling
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class AsyncClientNetwork:
+    """Asyncio interface to an ACME server over a `.ClientNetwork`.
+
+    requests has no asyncio support, so HTTP requests are sent by `net` in a
+    pool of at most `max_workers` threads. Nonces, JWS signing and waiting
+    between requests happen in the event loop, so coroutines waiting for the
+    server don't hold a thread and many orders can be in flight in a single
+    process.
+
+    :param .ClientNetwork net: network used to send the requests
+    :param int max_workers: maximum number of concurrent HTTP requests. It
+        defaults to the number of connections `net` keeps per host.
+
+    """
+    JSON_CONTENT_TYPE = client.ClientNetwork.JSON_CONTENT_TYPE
+    JOSE_CONTENT_TYPE = client.ClientNetwork.JOSE_CONTENT_TYPE
+
+    def __init__(self, net: client.ClientNetwork, max_workers: int = 10) -> None:
+        self.net = net
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='acme-async')
+
+    @property
+    def account(self) -> Optional[messages.RegistrationResource]:
+        """Account object used to sign requests, see `.ClientNetwork`."""
+        return self.net.account
+
+    @account.setter
+    def account(self, account: Optional[messages.RegistrationResource]) -> None:
+        self.net.account = account
+
+    def close(self) -> None:
+        """Stop the request threads and close the underlying session."""
+        self._executor.shutdown(wait=False)
+        self.net.session.close()
+
+    async def _run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor,
+                                          functools.partial(func, *args, **kwargs))
+
+    async def _send_and_check(self, method: str, url: str, content_type: Optional[str],
+                              **kwargs: Any) -> requests.Response:
+        # pylint: disable=protected-access
+        return await self._run(lambda: self.net._check_response(
+            self.net._send_request(method, url, **kwargs), content_type=content_type))
+
+    async def head(self, *args: Any, **kwargs: Any) -> requests.Response:
+        """Send HEAD request without checking the response, see `.ClientNetwork.head`."""
+        return await self._run(self.net.head, *args, **kwargs)
+
+    async def get(self, url: str, content_type: str = JSON_CONTENT_TYPE,
+                  **kwargs: Any) -> requests.Response:
+        """Send GET request and check response, see `.ClientNetwork.get`."""
+        return await self._send_and_check('GET', url, content_type, **kwargs)
+
+    async def post(self, *args: Any, **kwargs: Any) -> requests.Response:
+        """POST object wrapped in `.JWS` and check response, see `.ClientNetwork.post`.
+
+        If the server responded with a badNonce error, the request will
+        be retried once.
+
+        """
+        try:
+            return await self._post_once(*args, **kwargs)
+        except messages.Error as error:
+            if error.code == 'badNonce':
+                logger.debug('Retrying request after error:\n%s', error)
+                return await self._post_once(*args, **kwargs)
+            raise
+
+    async def _post_once(self, url: str, obj: jose.JSONDeSerializable,
+                         content_type: str = JOSE_CONTENT_TYPE,
+                         **kwargs: Any) -> requests.Response:
+        # pylint: disable=protected-access
+        new_nonce_url = kwargs.pop('new_nonce_url', None)
+        if not self.net.key:
+            raise errors.Error("acme.ClientNetwork with no private key can't POST.")
+        nonce = await self._get_nonce(url, new_nonce_url)
+        data = self.net._wrap_in_jws(obj, nonce, url)
+        kwargs.setdefault('headers', {'Content-Type': content_type})
+        response = await self._send_and_check('POST', url, content_type, data=data, **kwargs)
+        self.net._add_nonce(response)
+        return response
+
+    async def _get_nonce(self, url: str, new_nonce_url: Optional[str]) -> str:
+        # pylint: disable=protected-access
+        nonce = self.net._take_nonce(new_nonce_url)
+        while nonce is None:
+            logger.debug('Requesting fresh nonce')
+            if new_nonce_url is None:
+                response = await self.head(url)
+            else:
+                response = await self._send_and_check('HEAD', new_nonce_url, None)
+            nonce = self.net._take_fresh_nonce(response)
+        return nonce
+
+
+class AsyncClientV2:
+    """Asyncio ACME client for a v2 API.
+
+    This offers the same operations as `.ClientV2` as coroutines, sharing its
+    message handling. Requests which don't depend on each other, such as
+    fetching or polling the authorizations of an order, are sent
+    concurrently.
+
+    :ivar messages.Directory directory:
+    :ivar .AsyncClientNetwork net: Client network.
+    :ivar .PollingStrategy polling_strategy: How long to wait between polls.
+
+    """
+
+    def __init__(self, directory: messages.Directory, net: AsyncClientNetwork,
+                 polling_strategy: Optional[polling.PollingStrategy] = None) -> None:
+        """Initialize.
+
+        :param .messages.Directory directory: Directory Resource
+        :param .AsyncClientNetwork net: Client network.
+        :param .PollingStrategy polling_strategy: How long to wait between
+            polls of authorizations and orders, `.polling.DEFAULT` if not set.
+        """
+        self.directory = directory
+        self.net = net
+        self.polling_strategy = polling_strategy or polling.DEFAULT
+
+    @classmethod
+    async def get_directory(cls, url: str, net: AsyncClientNetwork) -> messages.Directory:
+        """Retrieve the ACME directory (RFC 8555 section 7.1.1) from the ACME server.
+
+        :param str url: the URL where the ACME directory is available
+        :param AsyncClientNetwork net: the network to use to make the request
+
+        :returns: the ACME directory object
+        :rtype: messages.Directory
+
+        """
+        return messages.Directory.from_json((await net.get(url)).json())
+
+    async def new_account(self, new_account: messages.NewRegistration
+                          ) -> messages.RegistrationResource:
+        """Register, see `.ClientV2.new_account`."""
+        response = await self._post(self.directory['newAccount'], new_account)
+        # if account already exists
+        if response.status_code == 200 and 'Location' in response.headers:
+            raise errors.ConflictError(response.headers['Location'])
+        # pylint: disable=protected-access
+        regr = client.ClientV2._regr_from_response(response)
+        self.net.account = regr
+        return regr
+
+    async def new_order(self, csr_pem: bytes,
+                        profile: Optional[str] = None) -> messages.OrderResource:
+        """Request a new Order object from the server, see `.ClientV2.new_order`."""
+        order = client._new_order_message(csr_pem, profile)  # pylint: disable=protected-access
+        response = await self._post(self.directory['newOrder'], order)
+        body = messages.Order.from_json(response.json())
+        # pylint: disable=not-an-iterable
+        authorizations = await asyncio.gather(*(self._get_authzr(url)
+                                                for url in body.authorizations))
+        return messages.OrderResource(
+            body=body,
+            uri=response.headers.get('Location'),
+            authorizations=list(authorizations),
+            csr_pem=csr_pem)
+
+    async def poll(self, authzr: messages.AuthorizationResource
+                   ) -> Tuple[messages.AuthorizationResource, requests.Response]:
+        """Poll Authorization Resource for status, see `.ClientV2.poll`."""
+        response = await self._post_as_get(authzr.uri)
+        # pylint: disable=protected-access
+        updated_authzr = client.ClientV2._authzr_from_response(
+            response, authzr.body.identifier, authzr.uri)
+        return updated_authzr, response
+
+    async def answer_challenge(self, challb: messages.ChallengeBody,
+                               response: challenges.ChallengeResponse
+                               ) -> messages.ChallengeResource:
+        """Answer challenge, see `.ClientV2.answer_challenge`."""
+        resp = await self._post(challb.uri, response)
+        try:
+            authzr_uri = resp.links['up']['url']
+        except KeyError:
+            raise errors.ClientError('"up" Link header missing')
+        challr = messages.ChallengeResource(
+            authzr_uri=authzr_uri,
+            body=messages.ChallengeBody.from_json(resp.json()))
+        if challr.uri != challb.uri:
+            raise errors.UnexpectedUpdate(challr.uri)
+        return challr
+
+    async def poll_authorizations(self, orderr: messages.OrderResource,
+                                  deadline: datetime.datetime) -> messages.OrderResource:
+        """Poll the authorizations of an order concurrently until none is pending.
+
+        :raises .TimeoutError: if an authorization is still pending at `deadline`
+        :raises .ValidationError: if an authorization failed
+
+        """
+        async def poll_one(url: str) -> Optional[messages.AuthorizationResource]:
+            attempt = 0
+            while datetime.datetime.now() < deadline:
+                response = await self._post_as_get(url)
+                attempt += 1
+                # pylint: disable=protected-access
+                authzr = client.ClientV2._authzr_from_response(response, uri=url)
+                if authzr.body.status != messages.STATUS_PENDING:  # pylint: disable=no-member
+                    return authzr
+                await asyncio.sleep(client._poll_delay(self.polling_strategy, attempt,
+                                                       response, deadline))
+            return None
+
+        polled = await asyncio.gather(*(poll_one(url) for url in orderr.body.authorizations))
+        responses = [authzr for authzr in polled if authzr is not None]
+        return client._check_authorizations(orderr, responses)  # pylint: disable=protected-access
+
+    async def poll_and_finalize(self, orderr: messages.OrderResource,
+                                deadline: Optional[datetime.datetime] = None
+                                ) -> messages.OrderResource:
+        """Poll authorizations and finalize the order, see `.ClientV2.poll_and_finalize`."""
+        if deadline is None:
+            deadline = datetime.datetime.now() + datetime.timedelta(seconds=90)
+        orderr = await self.poll_authorizations(orderr, deadline)
+        return await self.finalize_order(orderr, deadline)
+
+    async def begin_finalization(self, orderr: messages.OrderResource
+                                 ) -> messages.OrderResource:
+        """Start the process of finalizing an order, see `.ClientV2.begin_finalization`."""
+        csr = x509.load_pem_x509_csr(orderr.csr_pem)
+        wrapped_csr = messages.CertificateRequest(csr=csr)
+        res = await self._post(orderr.body.finalize, wrapped_csr)
+        return orderr.update(body=messages.Order.from_json(res.json()))
+
+    async def poll_finalization(self, orderr: messages.OrderResource,
+                                deadline: datetime.datetime,
+                                fetch_alternative_chains: bool = False
+                                ) -> messages.OrderResource:
+        """Poll a finalized order until it is valid, see `.ClientV2.poll_finalization`."""
+        # pylint: disable=protected-access
+        attempt = 0
+        response: Optional[requests.Response] = None
+        while datetime.datetime.now() < deadline:
+            sleep_seconds = client._poll_delay(self.polling_strategy, attempt, response, deadline)
+            if sleep_seconds > 0:
+                await asyncio.sleep(sleep_seconds)
+            response = await self._post_as_get(orderr.uri)
+            attempt += 1
+            body = messages.Order.from_json(response.json())
+            if body.status == messages.STATUS_INVALID:
+                if body.error is not None:
+                    raise errors.IssuanceError(body.error)
+                raise errors.Error(
+                    "The certificate order failed. No further information was provided "
+                    "by the server.")
+            elif body.status == messages.STATUS_READY:
+                await self.begin_finalization(orderr)
+                attempt = 0
+                response = None
+            elif body.status == messages.STATUS_VALID and body.certificate is not None:
+                certificate_response = await self._post_as_get(body.certificate)
+                orderr = orderr.update(body=body, fullchain_pem=certificate_response.text)
+                if fetch_alternative_chains:
+                    alt_chains_urls = client.ClientV2._get_links(certificate_response,
+                                                                 'alternate')
+                    alt_chains = await asyncio.gather(*(self._post_as_get(url)
+                                                        for url in alt_chains_urls))
+                    orderr = orderr.update(
+                        alternative_fullchains_pem=[chain.text for chain in alt_chains])
+                return orderr
+        raise errors.TimeoutError()
+
+    async def finalize_order(self, orderr: messages.OrderResource,
+                             deadline: datetime.datetime,
+                             fetch_alternative_chains: bool = False) -> messages.OrderResource:
+        """Finalize an order and obtain a certificate, see `.ClientV2.finalize_order`."""
+        try:
+            await self.begin_finalization(orderr)
+        except messages.Error as e:
+            if e.code != 'orderNotReady':
+                raise e
+        return await self.poll_finalization(orderr, deadline, fetch_alternative_chains)
+
+    async def renewal_time(self, cert_pem: Union[bytes, x509.Certificate]
+                           ) -> Tuple[Optional[datetime.datetime], datetime.datetime]:
+        """Return when to renew the certificate, see `.ClientV2.renewal_time`."""
+        # pylint: disable=protected-access
+        cert = client._load_cert(cert_pem)
+        expired = client._expired_renewal_time(cert)
+        if expired is not None:
+            return expired
+
+        renewal_info, retry_after = await self.renewal_info(cert)
+        if renewal_info is None:
+            return None, retry_after
+        return client._random_renewal_time(renewal_info), retry_after
+
+    async def renewal_info(self, cert: x509.Certificate
+                           ) -> Tuple[Optional[messages.RenewalInfo], datetime.datetime]:
+        """Fetch the renewal info resource of the certificate, see `.ClientV2.renewal_info`."""
+        # pylint: disable=protected-access
+        ari_url = client._renewal_info_url(self.directory, cert)
+        if ari_url is None:
+            return None, client._default_ari_retry_after()
+        try:
+            resp = await self.net.get(ari_url, content_type='application/json')
+        except Exception as e:  # pylint: disable=broad-except
+            raise client._ari_fetch_error(ari_url) from e
+        return client._parse_renewal_info(resp)
+
+    async def revoke(self, cert: x509.Certificate, rsn: int) -> None:
+        """Revoke certificate, see `.ClientV2.revoke`."""
+        response = await self._post(self.directory['revokeCert'],
+                                    messages.Revocation(certificate=cert, reason=rsn))
+        if response.status_code != http_client.OK:
+            raise errors.ClientError(
+                'Successful revocation must return HTTP OK status')
+
+    async def _get_authzr(self, url: str) -> messages.AuthorizationResource:
+        # pylint: disable=protected-access
+        return client.ClientV2._authzr_from_response(await self._post_as_get(url), uri=url)
+
+    async def _post_as_get(self, url: str, **kwargs: Any) -> requests.Response:
+        return await self._post(url, None, **kwargs)
+
+    async def _post(self, url: str, obj: Optional[jose.JSONDeSerializable],
+                    **kwargs: Any) -> requests.Response:
+        kwargs.setdefault('new_nonce_url', getattr(self.directory, 'newNonce'))
+        return await self.net.post(url, obj, **kwargs)
@@ -6,9 +6,12 @@ import http.client as http_client
 import logging
 import math
 import random
+import threading
 import time
+import urllib.parse
 from typing import Any
 from typing import cast
+from typing import Dict
 from typing import List
 from typing import Mapping
 from typing import Optional
@@ -20,35 +23,46 @@ from cryptography import x509
 
 import josepy as jose
 import requests
+from requests.adapters import DEFAULT_POOLSIZE
 from requests.adapters import HTTPAdapter
 from requests.utils import parse_header_links
+from urllib3.util.retry import Retry
 
 from acme import challenges
 from acme import crypto_util
 from acme import errors
 from acme import jws
 from acme import messages
+from acme import polling
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_NETWORK_TIMEOUT = 45
 
+# Separators leaving no whitespace in JWS, which aren't meant to be read by humans
+_COMPACT_SEPARATORS = (',', ':')
+
 
 class ClientV2:
     """ACME client for a v2 API.
 
     :ivar messages.Directory directory:
     :ivar .ClientNetwork net: Client network.
+    :ivar .PollingStrategy polling_strategy: How long to wait between polls.
     """
 
-    def __init__(self, directory: messages.Directory, net: 'ClientNetwork') -> None:
+    def __init__(self, directory: messages.Directory, net: 'ClientNetwork',
+                 polling_strategy: Optional[polling.PollingStrategy] = None) -> None:
         """Initialize.
 
         :param .messages.Directory directory: Directory Resource
         :param .ClientNetwork net: Client network.
+        :param .PollingStrategy polling_strategy: How long to wait between
+            polls of authorizations and orders, `.polling.DEFAULT` if not set.
         """
         self.directory = directory
         self.net = net
+        self.polling_strategy = polling_strategy or polling.DEFAULT
 
     def new_account(self, new_account: messages.NewRegistration) -> messages.RegistrationResource:
         """Register.
@@ -123,24 +137,7 @@ class ClientV2:
         :returns: The newly created order.
         :rtype: OrderResource
         """
-        csr = x509.load_pem_x509_csr(csr_pem)
-        dnsNames = crypto_util.get_names_from_subject_and_extensions(csr.subject, csr.extensions)
-        try:
-            san_ext = csr.extensions.get_extension_for_class(x509.SubjectAlternativeName)
-        except x509.ExtensionNotFound:
-            ipNames = []
-        else:
-            ipNames = san_ext.value.get_values_for_type(x509.IPAddress)
-        identifiers = []
-        for name in dnsNames:
-            identifiers.append(messages.Identifier(typ=messages.IDENTIFIER_FQDN,
-                value=name))
-        for ip in ipNames:
-            identifiers.append(messages.Identifier(typ=messages.IDENTIFIER_IP,
-                value=str(ip)))
-        if profile is None:
-            profile = ""
-        order = messages.NewOrder(identifiers=identifiers, profile=profile)
+        order = _new_order_message(csr_pem, profile)
         response = self._post(self.directory['newOrder'], order)
         body = messages.Order.from_json(response.json())
         authorizations = []
@@ -196,25 +193,16 @@ class ClientV2:
         """Poll Order Resource for status."""
         responses = []
         for url in orderr.body.authorizations:
+            attempt = 0
             while datetime.datetime.now() < deadline:
-                authzr = self._authzr_from_response(self._post_as_get(url), uri=url)
+                response = self._post_as_get(url)
+                attempt += 1
+                authzr = self._authzr_from_response(response, uri=url)
                 if authzr.body.status != messages.STATUS_PENDING:  # pylint: disable=no-member
                     responses.append(authzr)
                     break
-                time.sleep(1)
-        # If we didn't get a response for every authorization, we fell through
-        # the bottom of the loop due to hitting the deadline.
-        if len(responses) < len(orderr.body.authorizations):
-            raise errors.TimeoutError()
-        failed = []
-        for authzr in responses:
-            if authzr.body.status != messages.STATUS_VALID:
-                for chall in authzr.body.challenges:
-                    if chall.error is not None:
-                        failed.append(authzr)
-        if failed:
-            raise errors.ValidationError(failed)
-        return orderr.update(authorizations=responses)
+                time.sleep(_poll_delay(self.polling_strategy, attempt, response, deadline))
+        return _check_authorizations(orderr, responses)
 
     def begin_finalization(self, orderr: messages.OrderResource
                            ) -> messages.OrderResource:
@@ -252,11 +240,17 @@ class ClientV2:
         :returns: finalized order (with certificate)
         :rtype: messages.OrderResource
         """
-        sleep_seconds: float = 1
+        attempt = 0
+        response: Optional[requests.Response] = None
         while datetime.datetime.now() < deadline:
+            # While the order is "processing", the certificate is being issued: wait at
+            # least for the time given in the Retry-After header field of the last
+            # response, if any, but never past the deadline.
+            sleep_seconds = _poll_delay(self.polling_strategy, attempt, response, deadline)
             if sleep_seconds > 0:
                 time.sleep(sleep_seconds)
             response = self._post_as_get(orderr.uri)
+            attempt += 1
             body = messages.Order.from_json(response.json())
             if body.status == messages.STATUS_INVALID:
                 # "invalid": The certificate will not be issued.  Consider this
@@ -271,7 +265,9 @@ class ClientV2:
                 # fulfilled, and is awaiting finalization.  Submit a finalization
                 # request.
                 self.begin_finalization(orderr)
-                sleep_seconds = 1
+                # Wait as if the order had just been finalized
+                attempt = 0
+                response = None
             elif body.status == messages.STATUS_VALID and body.certificate is not None:
                 # "valid": The server has issued the certificate and provisioned its
                 # URL to the "certificate" field of the order.  Download the
@@ -283,14 +279,6 @@ class ClientV2:
                     alt_chains = [self._post_as_get(url).text for url in alt_chains_urls]
                     orderr = orderr.update(alternative_fullchains_pem=alt_chains)
                 return orderr
-            elif body.status == messages.STATUS_PROCESSING:
-                # "processing": The certificate is being issued.  Send a POST-as-GET request after
-                # the time given in the Retry-After header field of the response, if any.
-                retry_after = self.retry_after(response, 1)
-                # Whatever Retry-After the ACME server requests, the polling must not take
-                # longer than the overall deadline
-                retry_after = min(retry_after, deadline)
-                sleep_seconds = (retry_after - datetime.datetime.now()).total_seconds()
         raise errors.TimeoutError()
 
     def finalize_order(self, orderr: messages.OrderResource, deadline: datetime.datetime,
@@ -313,7 +301,7 @@ class ClientV2:
                 raise e
         return self.poll_finalization(orderr, deadline, fetch_alternative_chains)
 
-    def renewal_time(self, cert_pem: bytes
+    def renewal_time(self, cert_pem: Union[bytes, x509.Certificate]
         ) -> Tuple[Optional[datetime.datetime], datetime.datetime]:
         """Return an appropriate time to attempt renewal of the certificate,
         and the next time to ask the ACME server for renewal info.
@@ -332,7 +320,8 @@ class ClientV2:
         This function may make other network calls in the future (e.g., OCSP
         or CRL).
 
-        :param bytes cert_pem: cert as pem file
+        :param cert_pem: cert as pem file, or the already parsed cert
+        :type cert_pem: bytes or cryptography.x509.Certificate
 
         :returns: Tuple of time to attempt renewal, next time to ask for renewal info
 
@@ -342,43 +331,45 @@ class ClientV2:
             desired.
 
         """
-        now = datetime.datetime.now()
-        # https://www.ietf.org/archive/id/draft-ietf-acme-ari-08.html#section-4.3.3
-        default_retry_after = datetime.timedelta(seconds=6 * 60 * 60)
+        cert = _load_cert(cert_pem)
+        expired = _expired_renewal_time(cert)
+        if expired is not None:
+            return expired
 
-        cert = x509.load_pem_x509_certificate(cert_pem)
+        renewal_info, retry_after = self.renewal_info(cert)
+        if renewal_info is None:
+            return None, retry_after
+        return _random_renewal_time(renewal_info), retry_after
 
-        # from https://www.ietf.org/archive/id/draft-ietf-acme-ari-08.html#section-4.3, "Clients
-        # MUST NOT check a certificate's RenewalInfo after the certificate has expired."
-        #
-        # we call datetime.datetime.now here with the UTC argument to create a timezone aware
-        # datetime object that can be compared with the UTC notAfter from cryptography
-        if cert.not_valid_after_utc < datetime.datetime.now(datetime.timezone.utc):
-            return cert.not_valid_after_utc, now + default_retry_after
-
-        try:
-            renewal_info_base_url = self.directory['renewalInfo']
-        except KeyError:
-            return None, now + default_retry_after
+    def renewal_info(self, cert: x509.Certificate
+        ) -> Tuple[Optional[messages.RenewalInfo], datetime.datetime]:
+        """Fetch the renewal info resource of the certificate.
 
-        ari_url = renewal_info_base_url + '/' + _renewal_info_path_component(cert)
-        try:
-            resp = self.net.get(ari_url, content_type='application/json')
-        except Exception as e:  # pylint: disable=broad-except
-            error_msg = f'failed to fetch renewal_info URL {ari_url}'
-            raise errors.ARIError(error_msg, now + default_retry_after) from e
-        renewal_info: messages.RenewalInfo = messages.RenewalInfo.from_json(resp.json())
+        Unlike `renewal_time`, this always fetches renewal info if the ACME
+        directory has a "renewalInfo" field, so callers must not use it for
+        expired certificates. If there is no "renewalInfo" field, this function
+        will return a tuple of None, and the next time to ask the ACME server
+        for renewal info.
 
-        start = renewal_info.suggested_window.start # pylint: disable=no-member
-        end = renewal_info.suggested_window.end # pylint: disable=no-member
+        :param x509.Certificate cert: certificate to fetch renewal info for
 
-        delta_seconds = (end - start).total_seconds()
-        random_seconds = random.uniform(0, delta_seconds)
-        random_time = start + datetime.timedelta(seconds=random_seconds)
+        :returns: Tuple of renewal info, next time to ask for renewal info
+        :rtype: tuple
 
-        retry_after = self.retry_after(resp, default_retry_after.seconds)
-        return random_time, retry_after
+        :raises errors.ARIError: If an error occurs fetching ARI from the
+            server. Explicit exception chaining is used so the original error
+            can be accessed through the __cause__ attribute on the ARIError if
+            desired.
 
+        """
+        ari_url = _renewal_info_url(self.directory, cert)
+        if ari_url is None:
+            return None, _default_ari_retry_after()
+        try:
+            resp = self.net.get(ari_url, content_type='application/json')
+        except Exception as e:  # pylint: disable=broad-except
+            raise _ari_fetch_error(ari_url) from e
+        return _parse_renewal_info(resp)
 
     def revoke(self, cert: x509.Certificate, rsn: int) -> None:
         """Revoke certificate.
@@ -408,7 +399,8 @@ class ClientV2:
         new_args = args[:1] + (None,) + args[1:]
         return self._post(*new_args, **kwargs)
 
-    def _get_links(self, response: requests.Response, relation_type: str) -> List[str]:
+    @classmethod
+    def _get_links(cls, response: requests.Response, relation_type: str) -> List[str]:
         """
         Retrieves all Link URIs of relation_type from the response.
         :param requests.Response response: The requests HTTP response.
@@ -500,7 +492,8 @@ class ClientV2:
         return self._authzr_from_response(response,
             authzr.body.identifier, authzr.uri)
 
-    def _authzr_from_response(self, response: requests.Response,
+    @classmethod
+    def _authzr_from_response(cls, response: requests.Response,
                               identifier: Optional[messages.Identifier] = None,
                               uri: Optional[str] = None) -> messages.AuthorizationResource:
         authzr = messages.AuthorizationResource(
@@ -592,10 +585,36 @@ class ClientV2:
                 'Successful revocation must return HTTP OK status')
 
 
+class _CachedJSONResponse(requests.Response):
+    """A `requests.Response` which decodes its JSON body only once."""
+    _json: Any
+
+    @classmethod
+    def from_response(cls, response: requests.Response) -> requests.Response:
+        """Wrap `response`, unless it already is wrapped."""
+        if isinstance(response, cls):
+            return response
+        cached = cls()
+        cached.__dict__.update(response.__dict__)
+        return cached
+
+    def json(self, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().json(**kwargs)
+        if not hasattr(self, '_json'):
+            self._json = super().json()
+        return self._json
+
+
 class ClientNetwork:
     """Wrapper around requests that signs POSTs for authentication.
 
     Also adds user agent, and handles Content-Type.
+
+    A single instance may be shared by several threads. Nonces returned by the
+    server are kept in a pool, and if `nonce_low_water` is set, the pool is
+    topped up in a background thread whenever it runs low so that POSTs
+    rarely have to wait for a HEAD to ``newNonce``.
     """
     JSON_CONTENT_TYPE = 'application/json'
     JOSE_CONTENT_TYPE = 'application/jose+json'
@@ -612,20 +631,49 @@ class ClientNetwork:
     :param bool verify_ssl: Whether to verify certificates on SSL connections.
     :param str user_agent: String to send as User-Agent header.
     :param int timeout: Timeout for requests.
+    :param int nonce_low_water: Number of spare nonces to keep in the pool.
+            Once fewer are left after taking one, more are fetched from
+            ``newNonce`` in the background. 0 disables prefetching.
+    :param int pool_connections: Number of hosts to keep connection pools for.
+    :param int pool_maxsize: Maximum number of connections kept open per host.
+            Set it to at least the number of threads sharing this object, or
+            connections will be closed and reopened with a new TLS handshake.
+    :param bool pool_block: Whether to wait for a free connection instead of
+            opening a connection that won't be kept once `pool_maxsize`
+            connections to a host are in use.
+    :param int get_retries: Number of times to retry idempotent requests such
+            as GET and HEAD after connection errors or 5xx responses, with
+            exponential backoff. POSTs are never retried once sent.
     """
     def __init__(self, key: Optional[jose.JWK] = None,
                  account: Optional[messages.RegistrationResource] = None,
                  alg: jose.JWASignature = jose.RS256, verify_ssl: bool = True,
-                 user_agent: str = 'acme-python', timeout: int = DEFAULT_NETWORK_TIMEOUT) -> None:
+                 user_agent: str = 'acme-python', timeout: int = DEFAULT_NETWORK_TIMEOUT,
+                 nonce_low_water: int = 0, pool_connections: int = DEFAULT_POOLSIZE,
+                 pool_maxsize: int = DEFAULT_POOLSIZE, pool_block: bool = False,
+                 get_retries: int = 0) -> None:
         self.key = key
         self.account = account
         self.alg = alg
         self.verify_ssl = verify_ssl
         self._nonces: Set[str] = set()
+        self._nonces_lock = threading.Lock()
+        self._nonce_low_water = nonce_low_water
+        self._new_nonce_url: Optional[str] = None
+        self._prefetching = False
+        self._nonce_stats = {'requested': 0, 'prefetched': 0, 'reused': 0}
         self.user_agent = user_agent
         self.session = requests.Session()
         self._default_timeout = timeout
-        adapter = HTTPAdapter()
+        max_retries: Union[int, Retry] = 0
+        if get_retries:
+            # Retry's default allowed methods are the idempotent ones, so a
+            # POST (and its nonce) is never sent twice.
+            max_retries = Retry(total=get_retries, backoff_factor=0.5,
+                                status_forcelist=(500, 502, 503, 504),
+                                raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              pool_block=pool_block, max_retries=max_retries)
 
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
@@ -649,7 +697,7 @@ class ClientNetwork:
         :rtype: str
 
         """
-        jobj = obj.json_dumps(indent=2).encode() if obj else b''
+        jobj = obj.json_dumps(separators=_COMPACT_SEPARATORS).encode() if obj else b''
         logger.debug('JWS payload:\n%s', jobj)
         assert self.key
         kwargs = {
@@ -662,7 +710,8 @@ class ClientNetwork:
         # newAccount must not have kid
         if self.account is not None:
             kwargs["kid"] = self.account["uri"]
-        return jws.JWS.sign(jobj, **cast(Mapping[str, Any], kwargs)).json_dumps(indent=2)
+        return jws.JWS.sign(jobj, **cast(Mapping[str, Any], kwargs)).json_dumps(
+            separators=_COMPACT_SEPARATORS)
 
     @classmethod
     def _check_response(cls, response: requests.Response,
@@ -684,13 +733,14 @@ class ClientNetwork:
         :raises .ClientError: In case of other networking errors.
 
         """
+        if isinstance(response, requests.Response):
+            # Callers decode the body again, so make that free
+            response = _CachedJSONResponse.from_response(response)
         response_ct = response.headers.get('Content-Type')
         # Strip parameters from the media-type (rfc2616#section-3.7)
         if response_ct:
             response_ct = response_ct.split(';')[0].strip()
         try:
-            # TODO: response.json() is called twice, once here, and
-            # once in _get and _post clients
             jobj = response.json()
         except ValueError:
             jobj = None
@@ -705,10 +755,13 @@ class ClientNetwork:
                         'Ignoring wrong Content-Type (%r) for JSON Error',
                         response_ct)
                 try:
-                    raise messages.Error.from_json(jobj)
-                except jose.DeserializationError as error:
+                    error = messages.Error.from_json(jobj)
+                except jose.DeserializationError as deserialization_error:
                     # Couldn't deserialize JSON object
-                    raise errors.ClientError((response, error))
+                    raise errors.ClientError((response, deserialization_error))
+                if 'Retry-After' in response.headers:
+                    error.retry_after = ClientV2.retry_after(response, default=0)
+                raise error
             else:
                 # response is not JSON object
                 raise errors.ClientError(response)
@@ -740,11 +793,13 @@ class ClientNetwork:
 
 
         """
-        if method == "POST":
-            logger.debug('Sending POST request to %s:\n%s',
-                          url, kwargs['data'])
-        else:
-            logger.debug('Sending %s request to %s.', method, url)
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            if method == "POST":
+                logger.debug('Sending POST request to %s:\n%s',
+                              url, kwargs['data'])
+            else:
+                logger.debug('Sending %s request to %s.', method, url)
         kwargs['verify'] = self.verify_ssl
         kwargs.setdefault('headers', {})
         kwargs['headers'].setdefault('User-Agent', self.user_agent)
@@ -754,23 +809,62 @@ class ClientNetwork:
         # If an Accept header was sent in the request, the response may not be
         # UTF-8 encoded. In this case, we don't set response.encoding and log
         # the base64 response instead of raw bytes to keep binary data out of the logs.
-        debug_content: Union[bytes, str]
-        if "Accept" in kwargs["headers"]:
-            debug_content = base64.b64encode(response.content)
-        else:
+        binary = "Accept" in kwargs["headers"]
+        if not binary:
             # We set response.encoding so response.text knows the response is
             # UTF-8 encoded instead of trying to guess the encoding that was
             # used which is error prone. This setting affects all future
             # accesses of .text made on the returned response object as well.
             response.encoding = "utf-8"
-            debug_content = response.text
-        logger.debug('Received response:\nHTTP %d\n%s\n\n%s',
-                     response.status_code,
-                     "\n".join("{0}: {1}".format(k, v)
-                                for k, v in response.headers.items()),
-                     debug_content)
+        if debug:
+            debug_content: Union[bytes, str]
+            if binary:
+                debug_content = base64.b64encode(response.content)
+            else:
+                debug_content = response.text
+            logger.debug('Received response:\nHTTP %d\n%s\n\n%s',
+                         response.status_code,
+                         "\n".join("{0}: {1}".format(k, v)
+                                    for k, v in response.headers.items()),
+                         debug_content)
+            host = urllib.parse.urlsplit(url).netloc
+            stats = self.connection_stats().get(host)
+            if stats is not None:
+                logger.debug('Sent %d requests to %s over %d connections',
+                             stats[0], host, stats[1])
         return response
 
+    def connection_stats(self) -> Dict[str, Tuple[int, int]]:
+        """Count the requests sent and the connections opened to each host.
+
+        The more requests per connection, the more TLS handshakes were saved
+        by reusing connections.
+
+        :returns: numbers of requests and connections, keyed by host and port
+            as they appear in URLs (e.g. ``example.com`` or ``example.com:8443``)
+        :rtype: `dict`
+
+        """
+        stats: Dict[str, Tuple[int, int]] = {}
+        # The same adapter is usually mounted for both schemes
+        adapters = {id(adapter): adapter for adapter in self.session.adapters.values()}
+        for adapter in adapters.values():
+            if not isinstance(adapter, HTTPAdapter):
+                continue
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                default_port = 443 if key.key_scheme == 'https' else 80
+                host = key.key_host
+                if key.key_port not in (None, default_port):
+                    host = f'{host}:{key.key_port}'
+                requests_sent, connections = stats.get(host, (0, 0))
+                stats[host] = (requests_sent + pool.num_requests,
+                               connections + pool.num_connections)
+        return stats
+
     def head(self, *args: Any, **kwargs: Any) -> requests.Response:
         """Send HEAD request without checking the response.
 
@@ -795,20 +889,86 @@ class ClientNetwork:
             except jose.DeserializationError as error:
                 raise errors.BadNonce(nonce, error)
             logger.debug('Storing nonce: %s', nonce)
-            self._nonces.add(decoded_nonce)
+            with self._nonces_lock:
+                self._nonces.add(decoded_nonce)
         else:
             raise errors.MissingNonce(response)
 
+    @property
+    def nonce_stats(self) -> Dict[str, int]:
+        """Counts of nonces obtained so far.
+
+        ``requested`` is the number of HEAD requests a POST had to wait for,
+        ``prefetched`` the number of HEAD requests sent in the background and
+        ``reused`` the number of POSTs which took a spare nonce from the pool
+        instead of sending a HEAD request.
+
+        """
+        with self._nonces_lock:
+            return dict(self._nonce_stats)
+
+    def _take_nonce(self, new_nonce_url: Optional[str]) -> Optional[str]:
+        """Take a nonce from the pool, topping it up in the background if it runs low.
+
+        :returns: a spare nonce, or `None` if the pool is empty
+
+        """
+        with self._nonces_lock:
+            if new_nonce_url is not None:
+                self._new_nonce_url = new_nonce_url
+            nonce = self._nonces.pop() if self._nonces else None
+            if nonce is not None:
+                self._nonce_stats['reused'] += 1
+            prefetch = (not self._prefetching and self._new_nonce_url is not None
+                        and len(self._nonces) < self._nonce_low_water)
+            if prefetch:
+                self._prefetching = True
+        if prefetch:
+            threading.Thread(target=self._prefetch_nonces, name='acme-nonce-prefetch',
+                             daemon=True).start()
+        return nonce
+
+    def _prefetch_nonces(self) -> None:
+        """Fetch nonces from ``newNonce`` until the pool reaches `nonce_low_water`."""
+        try:
+            for _ in range(self._nonce_low_water):
+                with self._nonces_lock:
+                    if len(self._nonces) >= self._nonce_low_water:
+                        break
+                    new_nonce_url = self._new_nonce_url
+                assert new_nonce_url is not None
+                self._add_nonce(
+                    self._check_response(self.head(new_nonce_url), content_type=None))
+                with self._nonces_lock:
+                    self._nonce_stats['prefetched'] += 1
+        except Exception:  # pylint: disable=broad-except
+            logger.debug('Unable to prefetch nonces', exc_info=True)
+        finally:
+            with self._nonces_lock:
+                self._prefetching = False
+
     def _get_nonce(self, url: str, new_nonce_url: str) -> str:
-        if not self._nonces:
+        nonce = self._take_nonce(new_nonce_url)
+        while nonce is None:
             logger.debug('Requesting fresh nonce')
             if new_nonce_url is None:
                 response = self.head(url)
             else:
                 # request a new nonce from the acme newNonce endpoint
                 response = self._check_response(self.head(new_nonce_url), content_type=None)
-            self._add_nonce(response)
-        return self._nonces.pop()
+            nonce = self._take_fresh_nonce(response)
+        return nonce
+
+    def _take_fresh_nonce(self, response: requests.Response) -> Optional[str]:
+        """Store the nonce of a HEAD request a POST waited for and take a nonce.
+
+        :returns: a nonce, or `None` if other threads emptied the pool first
+
+        """
+        self._add_nonce(response)
+        with self._nonces_lock:
+            self._nonce_stats['requested'] += 1
+            return self._nonces.pop() if self._nonces else None
 
     def post(self, *args: Any, **kwargs: Any) -> requests.Response:
         """POST object wrapped in `.JWS` and check response.
@@ -837,7 +997,135 @@ class ClientNetwork:
         self._add_nonce(response)
         return response
 
-def _renewal_info_path_component(cert: x509.Certificate) -> str:
+def _new_order_message(csr_pem: bytes, profile: Optional[str]) -> messages.NewOrder:
+    """Build the newOrder request for the identifiers of a CSR."""
+    csr = x509.load_pem_x509_csr(csr_pem)
+    dnsNames = crypto_util.get_names_from_subject_and_extensions(csr.subject, csr.extensions)
+    try:
+        san_ext = csr.extensions.get_extension_for_class(x509.SubjectAlternativeName)
+    except x509.ExtensionNotFound:
+        ipNames = []
+    else:
+        ipNames = san_ext.value.get_values_for_type(x509.IPAddress)
+    identifiers = []
+    for name in dnsNames:
+        identifiers.append(messages.Identifier(typ=messages.IDENTIFIER_FQDN,
+            value=name))
+    for ip in ipNames:
+        identifiers.append(messages.Identifier(typ=messages.IDENTIFIER_IP,
+            value=str(ip)))
+    if profile is None:
+        profile = ""
+    return messages.NewOrder(identifiers=identifiers, profile=profile)
+
+
+def _check_authorizations(orderr: messages.OrderResource,
+                          responses: List[messages.AuthorizationResource]
+                          ) -> messages.OrderResource:
+    """Check the final state of polled authorizations and update the order with them."""
+    # If we didn't get a response for every authorization, we fell through
+    # the bottom of the loop due to hitting the deadline.
+    if len(responses) < len(orderr.body.authorizations):
+        raise errors.TimeoutError()
+    failed = []
+    for authzr in responses:
+        if authzr.body.status != messages.STATUS_VALID:
+            for chall in authzr.body.challenges:
+                if chall.error is not None:
+                    failed.append(authzr)
+    if failed:
+        raise errors.ValidationError(failed)
+    return orderr.update(authorizations=responses)
+
+
+def _poll_delay(strategy: polling.PollingStrategy, attempt: int,
+                response: Optional[requests.Response], deadline: datetime.datetime) -> float:
+    """Seconds to wait before the next poll, given the response to the previous one."""
+    retry_after = None
+    if response is not None and 'Retry-After' in response.headers:
+        retry_after = ClientV2.retry_after(response, 0)
+    now = datetime.datetime.now()
+    return strategy.delay(attempt, None if retry_after is None else
+                          (retry_after - now).total_seconds(),
+                          (deadline - now).total_seconds())
+
+
+# https://www.ietf.org/archive/id/draft-ietf-acme-ari-08.html#section-4.3.3
+_DEFAULT_ARI_RETRY_AFTER = datetime.timedelta(seconds=6 * 60 * 60)
+
+
+def _default_ari_retry_after() -> datetime.datetime:
+    """Next time to ask for renewal info when the ACME server didn't say."""
+    return datetime.datetime.now() + _DEFAULT_ARI_RETRY_AFTER
+
+
+def _load_cert(cert_pem: Union[bytes, x509.Certificate]) -> x509.Certificate:
+    """Parse `cert_pem` unless it's already a parsed certificate."""
+    if isinstance(cert_pem, x509.Certificate):
+        return cert_pem
+    return x509.load_pem_x509_certificate(cert_pem)
+
+
+def _expired_renewal_time(cert: x509.Certificate
+                          ) -> Optional[Tuple[datetime.datetime, datetime.datetime]]:
+    """Return the renewal time of `cert` if it has expired, otherwise `None`.
+
+    From https://www.ietf.org/archive/id/draft-ietf-acme-ari-08.html#section-4.3,
+    "Clients MUST NOT check a certificate's RenewalInfo after the certificate
+    has expired.", so expired certificates should be renewed immediately.
+
+    """
+    # we call datetime.datetime.now here with the UTC argument to create a timezone aware
+    # datetime object that can be compared with the UTC notAfter from cryptography
+    if cert.not_valid_after_utc < datetime.datetime.now(datetime.timezone.utc):
+        return cert.not_valid_after_utc, _default_ari_retry_after()
+    return None
+
+
+def _renewal_info_url(directory: messages.Directory, cert: x509.Certificate) -> Optional[str]:
+    """Return the renewal info URL of `cert`, or `None` if the server doesn't support ARI."""
+    try:
+        renewal_info_base_url = directory['renewalInfo']
+    except KeyError:
+        return None
+    return renewal_info_base_url + '/' + renewal_info_cert_id(cert)
+
+
+def _ari_fetch_error(ari_url: str) -> errors.ARIError:
+    """Return the error to raise when `ari_url` can't be fetched."""
+    return errors.ARIError(f'failed to fetch renewal_info URL {ari_url}',
+                           _default_ari_retry_after())
+
+
+def _parse_renewal_info(response: requests.Response
+                        ) -> Tuple[messages.RenewalInfo, datetime.datetime]:
+    """Return the renewal info in `response` and the next time to ask for it."""
+    renewal_info: messages.RenewalInfo = messages.RenewalInfo.from_json(response.json())
+    return renewal_info, ClientV2.retry_after(response, _DEFAULT_ARI_RETRY_AFTER.seconds)
+
+
+def _random_renewal_time(renewal_info: messages.RenewalInfo) -> datetime.datetime:
+    """Pick a random time in the suggested window of `renewal_info`."""
+    start = renewal_info.suggested_window.start # pylint: disable=no-member
+    end = renewal_info.suggested_window.end # pylint: disable=no-member
+
+    delta_seconds = (end - start).total_seconds()
+    random_seconds = random.uniform(0, delta_seconds)
+    return start + datetime.timedelta(seconds=random_seconds)
+
+
+def renewal_info_cert_id(cert: x509.Certificate) -> str:
+    """Return the unique identifier of a certificate used by ACME Renewal Info.
+
+    This identifier is the last path component of the certificate's renewal
+    info URL (https://www.ietf.org/archive/id/draft-ietf-acme-ari-08.html#section-4.1).
+
+    :param x509.Certificate cert: certificate to identify
+
+    :returns: the certificate identifier
+    :rtype: str
+
+    """
     akid_ext = cert.extensions.get_extension_for_oid(x509.ExtensionOID.AUTHORITY_KEY_IDENTIFIER)
     key_identifier = akid_ext.value.key_identifier # type: ignore[attr-defined]
 
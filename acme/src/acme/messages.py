@@ -133,6 +133,9 @@ class Error(jose.JSONObjectWithFields, errors.Error):
     :ivar Identifier identifier:
     :ivar tuple subproblems: An array of ACME Errors which may be present when the CA
             returns multiple errors related to the same request, `tuple` of `Error`.
+    :ivar datetime.datetime retry_after: When the request may be retried, if the
+            server sent a ``Retry-After`` header with the error, such as with
+            ``rateLimited`` errors. This is not part of the JSON object.
 
     """
     typ: str = jose.field('type', omitempty=True, default='about:blank')
@@ -141,6 +144,7 @@ class Error(jose.JSONObjectWithFields, errors.Error):
     identifier: Optional['Identifier'] = jose.field(
         'identifier', decoder=Identifier.from_json, omitempty=True)
     subproblems: Optional[Tuple['Error', ...]] = jose.field('subproblems', omitempty=True)
+    retry_after: Optional[datetime.datetime] = None
 
     # Mypy does not understand the josepy magic happening here, and falsely claims
     # that subproblems is redefined. Let's ignore the type check here.
@@ -0,0 +1,83 @@
+"""Strategies deciding how long to wait between polls of ACME resources."""
+import random
+from typing import Optional
+
+
+class PollingStrategy:
+    """How long to wait between polls of an order or authorizations.
+
+    The delay before the first poll is `initial_delay`. The delay before
+    the following polls starts at `interval` and is multiplied by
+    `multiplier` after each poll, up to `max_interval`. With `jitter`, each
+    delay is randomly shortened or lengthened by up to that fraction, so
+    clients which started polling together don't keep polling together.
+
+    Delays are never shorter than what the server asked for with a
+    ``Retry-After`` header, unless `respect_retry_after` is `False`, and
+    never extend past the deadline.
+
+    :param float initial_delay: seconds to wait before the first poll
+    :param float interval: seconds to wait before the second poll
+    :param float multiplier: factor by which the delay grows after each poll
+    :param float max_interval: maximum delay between polls in seconds
+    :param float jitter: fraction of each delay, between 0 and 1, by which
+        it may randomly vary
+    :param bool respect_retry_after: whether to wait at least as long as
+        the server asked for
+
+    """
+    def __init__(self, initial_delay: float = 1, interval: float = 1, multiplier: float = 1,
+                 max_interval: float = 60, jitter: float = 0,
+                 respect_retry_after: bool = True) -> None:
+        if not 0 <= jitter <= 1:
+            raise ValueError('jitter must be between 0 and 1')
+        self.initial_delay = initial_delay
+        self.interval = interval
+        self.multiplier = multiplier
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.respect_retry_after = respect_retry_after
+
+    def __repr__(self) -> str:
+        return ('{0}(initial_delay={1!r}, interval={2!r}, multiplier={3!r}, '
+                'max_interval={4!r}, jitter={5!r}, respect_retry_after={6!r})').format(
+            self.__class__.__name__, self.initial_delay, self.interval, self.multiplier,
+            self.max_interval, self.jitter, self.respect_retry_after)
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None,
+              remaining: Optional[float] = None) -> float:
+        """How long to wait before polling again?
+
+        :param int attempt: number of polls done so far, 0 before the first one
+        :param float retry_after: seconds the server asked to wait with a
+            ``Retry-After`` header, if any
+        :param float remaining: seconds left until the polling deadline, if any
+
+        :returns: seconds to wait, never negative
+        :rtype: float
+
+        """
+        if attempt <= 0:
+            seconds = self.initial_delay
+        else:
+            seconds = min(self.interval * self.multiplier ** (attempt - 1), self.max_interval)
+            if self.jitter:
+                seconds *= random.uniform(1 - self.jitter, 1 + self.jitter)
+                seconds = min(seconds, self.max_interval)
+        if retry_after is not None and self.respect_retry_after:
+            seconds = max(seconds, retry_after)
+        if remaining is not None:
+            seconds = min(seconds, remaining)
+        return max(seconds, 0.0)
+
+
+#: Poll every second, or as often as the server allows with ``Retry-After``.
+DEFAULT = PollingStrategy()
+
+#: Poll quickly at first for fast CAs, backing off up to every 5 seconds.
+AGGRESSIVE = PollingStrategy(initial_delay=0.5, interval=0.5, multiplier=1.5, max_interval=5,
+                             jitter=0.1)
+
+#: Poll slowly and back off up to every minute, to spare busy CAs.
+GENTLE = PollingStrategy(initial_delay=2, interval=3, multiplier=2, max_interval=60,
+                         jitter=0.25)
@@ -27,6 +27,8 @@ class Authenticator(dns_common.DNSAuthenticator):
     description = ('Obtain certificates using a DNS TXT record (if you are using Cloudflare for '
                    'DNS).')
     ttl = 120
+    # Each record is created with its own API client
+    _thread_safe = True
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
@@ -3,7 +3,9 @@ import logging
 from typing import Any
 from typing import Callable
 from typing import Dict
+from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import cast
 
 import google.auth
@@ -76,6 +78,12 @@ class Authenticator(dns_common.DNSAuthenticator):
     def _cleanup(self, domain: str, validation_name: str, validation: str) -> None:
         self._get_google_client().del_txt_record(domain, validation_name, validation, self.ttl)
 
+    def _perform_batch(self, records: List[Tuple[str, str, str]]) -> None:
+        self._get_google_client().add_txt_records(records, self.ttl)
+
+    def _cleanup_batch(self, records: List[Tuple[str, str, str]]) -> None:
+        self._get_google_client().del_txt_records(records, self.ttl)
+
     def _get_google_client(self) -> '_GoogleClient':
         if self.google_client is None:
             self.google_client = _GoogleClient(self.conf('credentials'), self.conf('project'))
@@ -133,64 +141,79 @@ class _GoogleClient:
         :param int record_ttl: The record TTL (number of seconds that the record may be cached).
         :raises certbot.errors.PluginError: if an error occurs communicating with the Google API
         """
+        self.add_txt_records([(domain, record_name, record_content)], record_ttl)
 
-        zone_id = self._find_managed_zone_id(domain)
-
-        record_contents = self.get_existing_txt_rrset(zone_id, record_name)
-        if record_contents is None:
-            # If it wasn't possible to fetch the records at this label (missing .list permission),
-            # assume there aren't any (#5678). If there are actually records here, this will fail
-            # with HTTP 409/412 API errors.
-            record_contents = {"rrdatas": []}
-        add_records = record_contents["rrdatas"][:]
-
-        if "\""+record_content+"\"" in record_contents["rrdatas"]:
-            # The process was interrupted previously and validation token exists
-            return
+    def add_txt_records(self, records: List[Tuple[str, str, str]], record_ttl: int) -> None:
+        """
+        Add TXT records, with one change per managed zone.
 
-        add_records.append(record_content)
+        :param list records: The (domain, record name, record content) of each record.
+        :param int record_ttl: The record TTL (number of seconds that the record may be cached).
+        :raises certbot.errors.PluginError: if an error occurs communicating with the Google API
+        """
 
-        data = {
-            "kind": "dns#change",
-            "additions": [
-                {
+        for zone_id, zone_records in self._records_by_zone(records).items():
+            additions = []
+            deletions = []
+            for record_name, new_contents in zone_records.items():
+                record_contents = self.get_existing_txt_rrset(zone_id, record_name)
+                if record_contents is None:
+                    # If it wasn't possible to fetch the records at this label (missing .list
+                    # permission), assume there aren't any (#5678). If there are actually records
+                    # here, this will fail with HTTP 409/412 API errors.
+                    record_contents = {"rrdatas": []}
+
+                # The process may have been interrupted previously and validation tokens exist
+                new_contents = [c for c in new_contents
+                                if "\""+c+"\"" not in record_contents["rrdatas"]]
+                if not new_contents:
+                    continue
+
+                additions.append({
                     "kind": "dns#resourceRecordSet",
                     "type": "TXT",
                     "name": record_name + ".",
-                    "rrdatas": add_records,
+                    "rrdatas": record_contents["rrdatas"] + new_contents,
                     "ttl": record_ttl,
-                },
-            ],
-        }
-
-        if record_contents["rrdatas"]:
-            # We need to remove old records in the same request
-            data["deletions"] = [
-                {
-                    "kind": "dns#resourceRecordSet",
-                    "type": "TXT",
-                    "name": record_name + ".",
-                    "rrdatas": record_contents["rrdatas"],
-                    "ttl": record_contents["ttl"],
-                },
-            ]
+                })
+
+                if record_contents["rrdatas"]:
+                    # We need to remove old records in the same request
+                    deletions.append({
+                        "kind": "dns#resourceRecordSet",
+                        "type": "TXT",
+                        "name": record_name + ".",
+                        "rrdatas": record_contents["rrdatas"],
+                        "ttl": record_contents["ttl"],
+                    })
+
+            if not additions:
+                continue
+
+            data: Dict[str, Any] = {
+                "kind": "dns#change",
+                "additions": additions,
+            }
+            if deletions:
+                data["deletions"] = deletions
+
+            changes = self.dns.changes()
 
-        changes = self.dns.changes()
-
-        try:
-            request = changes.create(project=self.project_id, managedZone=zone_id, body=data)
-            response = request.execute()
-
-            status = response['status']
-            change = response['id']
-            while status == 'pending':
-                request = changes.get(project=self.project_id, managedZone=zone_id, changeId=change)
+            try:
+                request = changes.create(project=self.project_id, managedZone=zone_id, body=data)
                 response = request.execute()
+
                 status = response['status']
-        except googleapiclient_errors.Error as e:
-            logger.error('Encountered error adding TXT record: %s', e)
-            raise errors.PluginError('Error communicating with the Google Cloud DNS API: {0}'
-                                     .format(e))
+                change = response['id']
+                while status == 'pending':
+                    request = changes.get(project=self.project_id, managedZone=zone_id,
+                                          changeId=change)
+                    response = request.execute()
+                    status = response['status']
+            except googleapiclient_errors.Error as e:
+                logger.error('Encountered error adding TXT record: %s', e)
+                raise errors.PluginError('Error communicating with the Google Cloud DNS API: {0}'
+                                         .format(e))
 
     def del_txt_record(self, domain: str, record_name: str, record_content: str,
                        record_ttl: int) -> None:
@@ -203,55 +226,93 @@ class _GoogleClient:
         :param int record_ttl: The record TTL (number of seconds that the record may be cached).
         :raises certbot.errors.PluginError: if an error occurs communicating with the Google API
         """
+        self.del_txt_records([(domain, record_name, record_content)], record_ttl)
 
-        try:
-            zone_id = self._find_managed_zone_id(domain)
-        except errors.PluginError:
-            logger.warning('Error finding zone. Skipping cleanup.')
-            return
-
-        record_contents = self.get_existing_txt_rrset(zone_id, record_name)
-        if record_contents is None:
-            # If it wasn't possible to fetch the records at this label (missing .list permission),
-            # assume there aren't any (#5678). If there are actually records here, this will fail
-            # with HTTP 409/412 API errors.
-            record_contents = {"rrdatas": ["\"" + record_content + "\""], "ttl": record_ttl}
-
-        data = {
-            "kind": "dns#change",
-            "deletions": [
-                {
+    def del_txt_records(self, records: List[Tuple[str, str, str]], record_ttl: int) -> None:
+        """
+        Delete TXT records, with one change per managed zone.
+
+        Records whose managed zone cannot be found are skipped.
+
+        :param list records: The (domain, record name, record content) of each record.
+        :param int record_ttl: The record TTL (number of seconds that the record may be cached).
+        """
+
+        for zone_id, zone_records in self._records_by_zone(records, cleanup=True).items():
+            additions = []
+            deletions = []
+            for record_name, old_contents in zone_records.items():
+                quoted_contents = ["\"" + c + "\"" for c in old_contents]
+                record_contents = self.get_existing_txt_rrset(zone_id, record_name)
+                if record_contents is None:
+                    # If it wasn't possible to fetch the records at this label (missing .list
+                    # permission), assume there aren't any (#5678). If there are actually records
+                    # here, this will fail with HTTP 409/412 API errors.
+                    record_contents = {"rrdatas": quoted_contents, "ttl": record_ttl}
+
+                deletions.append({
                     "kind": "dns#resourceRecordSet",
                     "type": "TXT",
                     "name": record_name + ".",
                     "rrdatas": record_contents["rrdatas"],
                     "ttl": record_contents["ttl"],
-                },
-            ],
-        }
-
-        # Remove the record being deleted from the list
-        readd_contents = [r for r in record_contents["rrdatas"]
-                            if r != "\"" + record_content + "\""]
-        if readd_contents:
-            # We need to remove old records in the same request
-            data["additions"] = [
-                {
-                    "kind": "dns#resourceRecordSet",
-                    "type": "TXT",
-                    "name": record_name + ".",
-                    "rrdatas": readd_contents,
-                    "ttl": record_contents["ttl"],
-                },
-            ]
+                })
+
+                # Remove the records being deleted from the list
+                readd_contents = [r for r in record_contents["rrdatas"]
+                                    if r not in quoted_contents]
+                if readd_contents:
+                    # We need to remove old records in the same request
+                    additions.append({
+                        "kind": "dns#resourceRecordSet",
+                        "type": "TXT",
+                        "name": record_name + ".",
+                        "rrdatas": readd_contents,
+                        "ttl": record_contents["ttl"],
+                    })
+
+            data: Dict[str, Any] = {
+                "kind": "dns#change",
+                "deletions": deletions,
+            }
+            if additions:
+                data["additions"] = additions
+
+            changes = self.dns.changes()
 
-        changes = self.dns.changes()
+            try:
+                request = changes.create(project=self.project_id, managedZone=zone_id, body=data)
+                request.execute()
+            except googleapiclient_errors.Error as e:
+                logger.warning('Encountered error deleting TXT record: %s', e)
 
-        try:
-            request = changes.create(project=self.project_id, managedZone=zone_id, body=data)
-            request.execute()
-        except googleapiclient_errors.Error as e:
-            logger.warning('Encountered error deleting TXT record: %s', e)
+    def _records_by_zone(self, records: List[Tuple[str, str, str]], cleanup: bool = False
+                         ) -> Dict[str, Dict[str, List[str]]]:
+        """
+        Group records by managed zone, and by record name within each zone.
+
+        :param list records: The (domain, record name, record content) of each record.
+        :param bool cleanup: Whether to skip, rather than fail on, records whose managed
+            zone cannot be found.
+        :returns: The contents of each record name of each managed zone ID.
+        :rtype: dict
+        :raises certbot.errors.PluginError: if a managed zone cannot be found.
+        """
+        zone_ids: Dict[str, Optional[str]] = {}
+        zones: Dict[str, Dict[str, List[str]]] = {}
+        for domain, record_name, record_content in records:
+            if domain not in zone_ids:
+                try:
+                    zone_ids[domain] = self._find_managed_zone_id(domain)
+                except errors.PluginError:
+                    if not cleanup:
+                        raise
+                    logger.warning('Error finding zone. Skipping cleanup.')
+                    zone_ids[domain] = None
+            zone_id = zone_ids[domain]
+            if zone_id is not None:
+                zones.setdefault(zone_id, {}).setdefault(record_name, []).append(record_content)
+        return zones
 
     def get_existing_txt_rrset(self, zone_id: str, record_name: str) -> Optional[Dict[str, Any]]:
         """
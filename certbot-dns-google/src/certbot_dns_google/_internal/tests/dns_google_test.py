@@ -51,7 +51,8 @@ class AuthenticatorTest(test_util.TempDirTestCase, dns_test_common.BaseAuthentic
         setattr(self.auth, '_get_google_client', mock.MagicMock(return_value=self.mock_client))
         self.auth.perform([self.achall])
 
-        expected = [mock.call.add_txt_record(DOMAIN, '_acme-challenge.'+DOMAIN, mock.ANY, mock.ANY)]
+        expected = [mock.call.add_txt_records([(DOMAIN, '_acme-challenge.'+DOMAIN, mock.ANY)],
+                                              mock.ANY)]
         assert expected == self.mock_client.mock_calls
 
     def test_cleanup(self):
@@ -63,7 +64,8 @@ class AuthenticatorTest(test_util.TempDirTestCase, dns_test_common.BaseAuthentic
         self.auth._attempt_cleanup = True
         self.auth.cleanup([self.achall])
 
-        expected = [mock.call.del_txt_record(DOMAIN, '_acme-challenge.'+DOMAIN, mock.ANY, mock.ANY)]
+        expected = [mock.call.del_txt_records([(DOMAIN, '_acme-challenge.'+DOMAIN, mock.ANY)],
+                                              mock.ANY)]
         assert expected == self.mock_client.mock_calls
 
     @test_util.patch_display_util()
@@ -220,6 +222,31 @@ class GoogleClientTest(unittest.TestCase):
                                                managedZone=self.zone,
                                                project=PROJECT_ID)
 
+    @mock.patch('google.auth.load_credentials_from_file')
+    @mock.patch('certbot_dns_google._internal.dns_google.open',
+                mock.mock_open(read_data='{"project_id": "' + PROJECT_ID + '"}'), create=True)
+    def test_add_txt_records(self, credential_mock):
+        credential_mock.return_value = (mock.MagicMock(), PROJECT_ID)
+
+        client, changes = self._setUp_client_with_mock(
+            [{'managedZones': [{'id': self.zone, 'visibility': self.visibility}]}])
+
+        client.add_txt_records([(DOMAIN, "_acme-challenge.example.org", "example-txt-contents"),
+                                (DOMAIN, self.record_name, self.record_content),
+                                (DOMAIN, self.record_name, "baz")], self.record_ttl)
+
+        changes.create.assert_called_once_with(body=mock.ANY, managedZone=self.zone,
+                                               project=PROJECT_ID)
+        body = changes.create.call_args[1]["body"]
+        assert body["additions"] == [{
+            "kind": "dns#resourceRecordSet",
+            "type": "TXT",
+            "name": self.record_name + ".",
+            "rrdatas": [self.record_content, "baz"],
+            "ttl": self.record_ttl,
+        }]
+        assert "deletions" not in body
+
     @mock.patch('google.auth.load_credentials_from_file')
     @mock.patch('certbot_dns_google._internal.dns_google.open',
                 mock.mock_open(read_data='{"project_id": "' + PROJECT_ID + '"}'), create=True)
@@ -416,6 +443,27 @@ class GoogleClientTest(unittest.TestCase):
                                                managedZone=self.zone,
                                                project=PROJECT_ID)
 
+    @mock.patch('google.auth.load_credentials_from_file')
+    @mock.patch('certbot_dns_google._internal.dns_google.open',
+                mock.mock_open(read_data='{"project_id": "' + PROJECT_ID + '"}'), create=True)
+    def test_del_txt_records(self, credential_mock):
+        credential_mock.return_value = (mock.MagicMock(), PROJECT_ID)
+
+        client, changes = self._setUp_client_with_mock(
+            [{'managedZones': [{'id': self.zone, 'visibility': self.visibility}]},
+             {'managedZones': []}, {'managedZones': []}])
+
+        client.del_txt_records([(DOMAIN, "_acme-challenge.example.org", "example-txt-contents"),
+                                (DOMAIN, self.record_name, self.record_content),
+                                ("example.net", self.record_name, "baz")], self.record_ttl)
+
+        changes.create.assert_called_once_with(body=mock.ANY, managedZone=self.zone,
+                                               project=PROJECT_ID)
+        body = changes.create.call_args[1]["body"]
+        assert [d["name"] for d in body["deletions"]] == ["_acme-challenge.example.org.",
+                                                           self.record_name + "."]
+        assert "additions" not in body
+
     @mock.patch('google.auth.load_credentials_from_file')
     @mock.patch('certbot_dns_google._internal.dns_google.open',
                 mock.mock_open(read_data='{"project_id": "' + PROJECT_ID + '"}'), create=True)
@@ -1,10 +1,15 @@
 """DNS Authenticator using RFC 2136 Dynamic Updates."""
 import logging
+import socket
 from typing import Any
 from typing import Callable
 from typing import cast
+from typing import Dict
+from typing import List
 from typing import Optional
+from typing import Tuple
 
+import dns.exception
 import dns.flags
 import dns.message
 import dns.name
@@ -15,6 +20,7 @@ import dns.tsig
 import dns.tsigkeyring
 import dns.update
 
+from certbot import achallenges
 from certbot import errors
 from certbot.plugins import dns_common
 from certbot.plugins.dns_common import CredentialsConfiguration
@@ -48,6 +54,7 @@ class Authenticator(dns_common.DNSAuthenticator):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.credentials: Optional[CredentialsConfiguration] = None
+        self._rfc2136_client: Optional[_RFC2136Client] = None
 
     @classmethod
     def add_parser_arguments(cls, add: Callable[..., None],
@@ -81,24 +88,45 @@ class Authenticator(dns_common.DNSAuthenticator):
             self._validate_credentials
         )
 
+    def cleanup(self, achalls: List[achallenges.AnnotatedChallenge]) -> None:
+        try:
+            super().cleanup(achalls)
+        finally:
+            if self._rfc2136_client:
+                self._rfc2136_client.close()
+
     def _perform(self, _domain: str, validation_name: str, validation: str) -> None:
         self._get_rfc2136_client().add_txt_record(validation_name, validation, self.ttl)
 
     def _cleanup(self, _domain: str, validation_name: str, validation: str) -> None:
         self._get_rfc2136_client().del_txt_record(validation_name, validation)
 
+    def _perform_batch(self, records: List[Tuple[str, str, str]]) -> None:
+        self._get_rfc2136_client().add_txt_records(
+            [(validation_name, validation) for _, validation_name, validation in records],
+            self.ttl)
+
+    def _cleanup_batch(self, records: List[Tuple[str, str, str]]) -> None:
+        self._get_rfc2136_client().del_txt_records(
+            [(validation_name, validation) for _, validation_name, validation in records])
+
     def _get_rfc2136_client(self) -> "_RFC2136Client":
         if not self.credentials:  # pragma: no cover
             raise errors.Error("Plugin has not been prepared.")
 
-        algorithm: str = (self.credentials.conf('algorithm') or '').upper()
+        # The same client is used from perform to cleanup, so that zones are only looked up once
+        # and all the queries and updates go over the same connection.
+        if self._rfc2136_client is None:
+            algorithm: str = (self.credentials.conf('algorithm') or '').upper()
 
-        return _RFC2136Client(cast(str, self.credentials.conf('server')),
-                              int(cast(str, self.credentials.conf('port')) or self.PORT),
-                              cast(str, self.credentials.conf('name')),
-                              cast(str, self.credentials.conf('secret')),
-                              self.ALGORITHMS.get(algorithm, dns.tsig.HMAC_MD5),
-                              (self.credentials.conf('sign_query') or '').upper() == "TRUE")
+            self._rfc2136_client = _RFC2136Client(
+                cast(str, self.credentials.conf('server')),
+                int(cast(str, self.credentials.conf('port')) or self.PORT),
+                cast(str, self.credentials.conf('name')),
+                cast(str, self.credentials.conf('secret')),
+                self.ALGORITHMS.get(algorithm, dns.tsig.HMAC_MD5),
+                (self.credentials.conf('sign_query') or '').upper() == "TRUE")
+        return self._rfc2136_client
 
 
 class _RFC2136Client:
@@ -116,6 +144,16 @@ class _RFC2136Client:
         self.algorithm = key_algorithm
         self.sign_query = sign_query
         self._default_timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._soa_found: Dict[str, bool] = {}
+
+    def close(self) -> None:
+        """
+        Close the connection to the target DNS server, if one is open.
+        """
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
 
     def add_txt_record(self, record_name: str, record_content: str, record_ttl: int) -> None:
         """
@@ -126,31 +164,27 @@ class _RFC2136Client:
         :param int record_ttl: The record TTL (number of seconds that the record may be cached).
         :raises certbot.errors.PluginError: if an error occurs communicating with the DNS server
         """
+        self.add_txt_records([(record_name, record_content)], record_ttl)
 
-        domain = self._find_domain(record_name)
-
-        n = dns.name.from_text(record_name)
-        o = dns.name.from_text(domain)
-        rel = n.relativize(o)
-
-        update = dns.update.Update(
-            domain,
-            keyring=self.keyring,
-            keyalgorithm=self.algorithm)
-        update.add(rel, record_ttl, dns.rdatatype.TXT, record_content)
-
-        try:
-            response = dns.query.tcp(update, self.server, self._default_timeout, self.port)
-        except Exception as e:
-            raise errors.PluginError('Encountered error adding TXT record: {0}'
-                                     .format(e))
-        rcode = response.rcode()
+    def add_txt_records(self, records: List[Tuple[str, str]], record_ttl: int) -> None:
+        """
+        Add TXT records, with one update per zone.
 
-        if rcode == dns.rcode.NOERROR:
-            logger.debug('Successfully added TXT record %s', record_name)
-        else:
-            raise errors.PluginError('Received response from server: {0}'
-                                     .format(dns.rcode.to_text(rcode)))
+        :param list records: The (record name, record content) of each record.
+        :param int record_ttl: The record TTL (number of seconds that the record may be cached).
+        :raises certbot.errors.PluginError: if an error occurs communicating with the DNS server
+        """
+        for domain, zone_records in self._records_by_zone(records).items():
+            update = dns.update.Update(
+                domain,
+                keyring=self.keyring,
+                keyalgorithm=self.algorithm)
+            for rel, record_content in zone_records:
+                update.add(rel, record_ttl, dns.rdatatype.TXT, record_content)
+
+            self._send_update(update, 'adding')
+            logger.debug('Successfully added TXT records %s in %s',
+                         ', '.join(str(rel) for rel, _ in zone_records), domain)
 
     def del_txt_record(self, record_name: str, record_content: str) -> None:
         """
@@ -161,29 +195,62 @@ class _RFC2136Client:
         :param int record_ttl: The record TTL (number of seconds that the record may be cached).
         :raises certbot.errors.PluginError: if an error occurs communicating with the DNS server
         """
+        self.del_txt_records([(record_name, record_content)])
 
-        domain = self._find_domain(record_name)
+    def del_txt_records(self, records: List[Tuple[str, str]]) -> None:
+        """
+        Delete TXT records, with one update per zone.
 
-        n = dns.name.from_text(record_name)
-        o = dns.name.from_text(domain)
-        rel = n.relativize(o)
+        :param list records: The (record name, record content) of each record.
+        :raises certbot.errors.PluginError: if an error occurs communicating with the DNS server
+        """
+        for domain, zone_records in self._records_by_zone(records).items():
+            update = dns.update.Update(
+                domain,
+                keyring=self.keyring,
+                keyalgorithm=self.algorithm)
+            for rel, record_content in zone_records:
+                update.delete(rel, dns.rdatatype.TXT, record_content)
+
+            self._send_update(update, 'deleting')
+            logger.debug('Successfully deleted TXT records %s in %s',
+                         ', '.join(str(rel) for rel, _ in zone_records), domain)
+
+    def _records_by_zone(self, records: List[Tuple[str, str]]
+                         ) -> Dict[str, List[Tuple[dns.name.Name, str]]]:
+        """
+        Group records by the zone they belong to.
 
-        update = dns.update.Update(
-            domain,
-            keyring=self.keyring,
-            keyalgorithm=self.algorithm)
-        update.delete(rel, dns.rdatatype.TXT, record_content)
+        :param list records: The (record name, record content) of each record.
+        :returns: The (name relative to the zone, record content) of the records of each zone.
+        :rtype: dict
+        :raises certbot.errors.PluginError: if the zone of a record cannot be found.
+        """
+        zones: Dict[str, List[Tuple[dns.name.Name, str]]] = {}
+        for record_name, record_content in records:
+            domain = self._find_domain(record_name)
+
+            n = dns.name.from_text(record_name)
+            o = dns.name.from_text(domain)
+            zones.setdefault(domain, []).append((n.relativize(o), record_content))
+        return zones
+
+    def _send_update(self, update: dns.update.Update, action: str) -> None:
+        """
+        Send an update to the target DNS server.
 
+        :param dns.update.Update update: The update to send.
+        :param str action: What the update does, for error messages.
+        :raises certbot.errors.PluginError: if an error occurs communicating with the DNS server
+        """
         try:
-            response = dns.query.tcp(update, self.server, self._default_timeout, self.port)
+            response = self._tcp(update)
         except Exception as e:
-            raise errors.PluginError('Encountered error deleting TXT record: {0}'
-                                     .format(e))
+            raise errors.PluginError('Encountered error {0} TXT record: {1}'
+                                     .format(action, e))
         rcode = response.rcode()
 
-        if rcode == dns.rcode.NOERROR:
-            logger.debug('Successfully deleted TXT record %s', record_name)
-        else:
+        if rcode != dns.rcode.NOERROR:
             raise errors.PluginError('Received response from server: {0}'
                                      .format(dns.rcode.to_text(rcode)))
 
@@ -199,9 +266,12 @@ class _RFC2136Client:
 
         domain_name_guesses = dns_common.base_domain_name_guesses(record_name)
 
-        # Loop through until we find an authoritative SOA record
+        # Loop through until we find an authoritative SOA record. The answers are kept, so that
+        # records sharing a zone don't query it again.
         for guess in domain_name_guesses:
-            if self._query_soa(guess):
+            if guess not in self._soa_found:
+                self._soa_found[guess] = self._query_soa(guess)
+            if self._soa_found[guess]:
                 return guess
 
         raise errors.PluginError('Unable to determine base domain for {0} using names: {1}.'
@@ -228,7 +298,7 @@ class _RFC2136Client:
 
         try:
             try:
-                response = dns.query.tcp(request, self.server, self._default_timeout, self.port)
+                response = self._tcp(request)
             except (OSError, dns.exception.Timeout) as e:
                 logger.debug('TCP query failed, fallback to UDP: %s', e)
                 response = dns.query.udp(request, self.server, self._default_timeout, self.port)
@@ -247,3 +317,33 @@ class _RFC2136Client:
         except Exception as e:
             raise errors.PluginError('Encountered error when making query: {0}'
                                      .format(e))
+
+    def _tcp(self, message: dns.message.Message) -> dns.message.Message:
+        """
+        Send a message to the target DNS server over a persistent TCP connection.
+
+        The connection is opened on first use. If the server closed it since, it is opened
+        again once.
+
+        :param dns.message.Message message: The query or update to send.
+        :returns: The response of the server.
+        :rtype: dns.message.Message
+        """
+        reused = self._sock is not None
+        if self._sock is None:
+            self._sock = socket.create_connection((self.server, self.port), self._default_timeout)
+            # dnspython expects non-blocking sockets and handles the timeout itself
+            self._sock.setblocking(False)
+        try:
+            return dns.query.tcp(message, self.server, self._default_timeout, self.port,
+                                 sock=self._sock)
+        except (OSError, EOFError) as e:
+            self.close()
+            if not reused:
+                raise
+            logger.debug('Connection to %s was closed, reconnecting: %s', self.server, e)
+            return self._tcp(message)
+        except Exception:
+            # Whatever the error, the state of the connection is unknown
+            self.close()
+            raise
@@ -4,6 +4,7 @@ import sys
 import unittest
 from unittest import mock
 
+import dns.exception
 import dns.flags
 import dns.rcode
 import dns.tsig
@@ -59,7 +60,7 @@ class AuthenticatorTest(test_util.TempDirTestCase, dns_test_common.BaseAuthentic
     def test_perform(self, unused_mock_get_utility):
         self.auth.perform([self.achall])
 
-        expected = [mock.call.add_txt_record('_acme-challenge.'+DOMAIN, mock.ANY, mock.ANY)]
+        expected = [mock.call.add_txt_records([('_acme-challenge.'+DOMAIN, mock.ANY)], mock.ANY)]
         assert expected == self.mock_client.mock_calls
 
     def test_cleanup(self):
@@ -67,9 +68,25 @@ class AuthenticatorTest(test_util.TempDirTestCase, dns_test_common.BaseAuthentic
         self.auth._attempt_cleanup = True
         self.auth.cleanup([self.achall])
 
-        expected = [mock.call.del_txt_record('_acme-challenge.'+DOMAIN, mock.ANY)]
+        expected = [mock.call.del_txt_records([('_acme-challenge.'+DOMAIN, mock.ANY)])]
         assert expected == self.mock_client.mock_calls
 
+    @test_util.patch_display_util()
+    def test_client_kept_until_cleanup(self, unused_mock_get_utility):
+        setattr(self.auth, '_get_rfc2136_client', self.orig_get_client)
+        with mock.patch('certbot_dns_rfc2136._internal.dns_rfc2136._RFC2136Client') as client:
+            self.auth.perform([self.achall])
+            self.auth.perform([self.achall])
+            assert not client.return_value.close.called
+
+            self.auth.cleanup([self.achall])
+
+        assert client.call_count == 1
+        assert client.return_value.add_txt_records.call_count == 2
+        client.return_value.del_txt_records.assert_called_once_with(
+            [('_acme-challenge.'+DOMAIN, mock.ANY)])
+        client.return_value.close.assert_called_once_with()
+
     def test_invalid_algorithm_raises(self):
         config = VALID_CONFIG.copy()
         config["rfc2136_algorithm"] = "INVALID"
@@ -120,6 +137,11 @@ class RFC2136ClientTest(unittest.TestCase):
         self.rfc2136_client = _RFC2136Client(SERVER, PORT, NAME, SECRET, dns.tsig.HMAC_MD5,
         False, TIMEOUT)
 
+        patcher = mock.patch('certbot_dns_rfc2136._internal.dns_rfc2136.socket.create_connection')
+        self.mock_connect = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_sock = self.mock_connect.return_value
+
     @mock.patch("dns.query.tcp")
     def test_add_txt_record(self, query_mock):
         query_mock.return_value.rcode.return_value = dns.rcode.NOERROR
@@ -130,9 +152,27 @@ class RFC2136ClientTest(unittest.TestCase):
 
         self.rfc2136_client.add_txt_record("bar", "baz", 42)
 
-        query_mock.assert_called_with(mock.ANY, SERVER, TIMEOUT, PORT)
+        query_mock.assert_called_with(mock.ANY, SERVER, TIMEOUT, PORT, sock=self.mock_sock)
         assert 'bar. 42 IN TXT "baz"' in str(query_mock.call_args[0][0])
 
+    @mock.patch("dns.query.tcp")
+    def test_add_txt_records(self, query_mock):
+        query_mock.return_value.rcode.return_value = dns.rcode.NOERROR
+        with mock.patch.object(self.rfc2136_client, '_find_domain',
+                               side_effect=lambda name: name.split('.', 2)[-1]) as find_domain:
+            self.rfc2136_client.add_txt_records([("_acme-challenge.a.example.com", "foo"),
+                                                 ("_acme-challenge.b.example.com", "bar"),
+                                                 ("_acme-challenge.a.example.com", "baz"),
+                                                 ("_acme-challenge.c.example.org", "qux")], 42)
+
+        assert find_domain.call_count == 4
+        assert query_mock.call_count == 2
+        example_com = str(query_mock.call_args_list[0][0][0])
+        assert '_acme-challenge.a 42 IN TXT "foo"' in example_com
+        assert '_acme-challenge.b 42 IN TXT "bar"' in example_com
+        assert '_acme-challenge.a 42 IN TXT "baz"' in example_com
+        assert '_acme-challenge.c 42 IN TXT "qux"' in str(query_mock.call_args_list[1][0][0])
+
     @mock.patch("dns.query.tcp")
     def test_add_txt_record_wraps_errors(self, query_mock):
         query_mock.side_effect = Exception
@@ -165,9 +205,24 @@ class RFC2136ClientTest(unittest.TestCase):
 
         self.rfc2136_client.del_txt_record("bar", "baz")
 
-        query_mock.assert_called_with(mock.ANY, SERVER, TIMEOUT, PORT)
+        query_mock.assert_called_with(mock.ANY, SERVER, TIMEOUT, PORT, sock=self.mock_sock)
         assert 'bar. 0 NONE TXT "baz"' in str(query_mock.call_args[0][0])
 
+    @mock.patch("dns.query.tcp")
+    def test_del_txt_records(self, query_mock):
+        query_mock.return_value.rcode.return_value = dns.rcode.NOERROR
+        # _find_domain | pylint: disable=protected-access
+        # workaround for wont-fix https://github.com/python/mypy/issues/2427 that works with
+        # both strict and non-strict mypy
+        setattr(self.rfc2136_client, '_find_domain', mock.MagicMock(return_value="example.com"))
+
+        self.rfc2136_client.del_txt_records([("foo.example.com", "bar"),
+                                             ("baz.example.com", "qux")])
+
+        query_mock.assert_called_once_with(mock.ANY, SERVER, TIMEOUT, PORT, sock=self.mock_sock)
+        assert 'foo 0 NONE TXT "bar"' in str(query_mock.call_args[0][0])
+        assert 'baz 0 NONE TXT "qux"' in str(query_mock.call_args[0][0])
+
     @mock.patch("dns.query.tcp")
     def test_del_txt_record_wraps_errors(self, query_mock):
         query_mock.side_effect = Exception
@@ -201,6 +256,18 @@ class RFC2136ClientTest(unittest.TestCase):
 
         assert domain == DOMAIN
 
+    def test_find_domain_cached(self):
+        # _query_soa | pylint: disable=protected-access
+        with mock.patch.object(self.rfc2136_client, '_query_soa',
+                               side_effect=lambda name: name == DOMAIN) as query_soa:
+            # _find_domain | pylint: disable=protected-access
+            assert self.rfc2136_client._find_domain('foo.bar.'+DOMAIN) == DOMAIN
+            assert self.rfc2136_client._find_domain('foo.bar.'+DOMAIN) == DOMAIN
+            assert self.rfc2136_client._find_domain('baz.bar.'+DOMAIN) == DOMAIN
+
+        assert [c[0][0] for c in query_soa.call_args_list] == \
+            ['foo.bar.'+DOMAIN, 'bar.'+DOMAIN, DOMAIN, 'baz.bar.'+DOMAIN]
+
     def test_find_domain_wraps_errors(self):
         # _query_soa | pylint: disable=protected-access
         # workaround for wont-fix https://github.com/python/mypy/issues/2427 that works with
@@ -220,7 +287,7 @@ class RFC2136ClientTest(unittest.TestCase):
         # _query_soa | pylint: disable=protected-access
         result = self.rfc2136_client._query_soa(DOMAIN)
 
-        query_mock.assert_called_with(mock.ANY, SERVER, TIMEOUT, PORT)
+        query_mock.assert_called_with(mock.ANY, SERVER, TIMEOUT, PORT, sock=self.mock_sock)
         mock_make_query.return_value.use_tsig.assert_not_called()
         assert result
 
@@ -231,7 +298,7 @@ class RFC2136ClientTest(unittest.TestCase):
         # _query_soa | pylint: disable=protected-access
         result = self.rfc2136_client._query_soa(DOMAIN)
 
-        query_mock.assert_called_with(mock.ANY, SERVER, TIMEOUT, PORT)
+        query_mock.assert_called_with(mock.ANY, SERVER, TIMEOUT, PORT, sock=self.mock_sock)
         assert not result
 
     @mock.patch("dns.query.tcp")
@@ -251,10 +318,64 @@ class RFC2136ClientTest(unittest.TestCase):
         # _query_soa | pylint: disable=protected-access
         result = self.rfc2136_client._query_soa(DOMAIN)
 
-        tcp_mock.assert_called_with(mock.ANY, SERVER, TIMEOUT, PORT)
+        tcp_mock.assert_called_with(mock.ANY, SERVER, TIMEOUT, PORT, sock=self.mock_sock)
         udp_mock.assert_called_with(mock.ANY, SERVER, TIMEOUT, PORT)
         assert result
 
+    @mock.patch("dns.query.tcp")
+    def test_connection_reused(self, query_mock):
+        query_mock.return_value.rcode.return_value = dns.rcode.NOERROR
+        # _find_domain | pylint: disable=protected-access
+        # workaround for wont-fix https://github.com/python/mypy/issues/2427 that works with
+        # both strict and non-strict mypy
+        setattr(self.rfc2136_client, '_find_domain', mock.MagicMock(return_value="example.com"))
+
+        self.rfc2136_client.add_txt_record("bar", "baz", 42)
+        self.rfc2136_client.del_txt_record("bar", "baz")
+
+        self.mock_connect.assert_called_once_with((SERVER, PORT), TIMEOUT)
+        self.mock_sock.setblocking.assert_called_once_with(False)
+        assert query_mock.call_count == 2
+
+        self.rfc2136_client.close()
+        self.mock_sock.close.assert_called_once_with()
+        self.rfc2136_client.close()
+        self.mock_sock.close.assert_called_once_with()
+
+    @mock.patch("dns.query.tcp")
+    def test_connection_reopened(self, query_mock):
+        response = mock.MagicMock()
+        response.rcode.return_value = dns.rcode.NOERROR
+        query_mock.side_effect = [response, EOFError, response]
+        # _find_domain | pylint: disable=protected-access
+        # workaround for wont-fix https://github.com/python/mypy/issues/2427 that works with
+        # both strict and non-strict mypy
+        setattr(self.rfc2136_client, '_find_domain', mock.MagicMock(return_value="example.com"))
+
+        self.rfc2136_client.add_txt_record("bar", "baz", 42)
+        self.rfc2136_client.del_txt_record("bar", "baz")
+
+        assert self.mock_connect.call_count == 2
+        assert self.mock_sock.close.call_count == 1
+        assert query_mock.call_count == 3
+
+    @mock.patch("dns.query.tcp")
+    def test_connection_not_reopened_on_timeout(self, query_mock):
+        response = mock.MagicMock()
+        response.rcode.return_value = dns.rcode.NOERROR
+        query_mock.side_effect = [response, dns.exception.Timeout]
+        # _find_domain | pylint: disable=protected-access
+        # workaround for wont-fix https://github.com/python/mypy/issues/2427 that works with
+        # both strict and non-strict mypy
+        setattr(self.rfc2136_client, '_find_domain', mock.MagicMock(return_value="example.com"))
+
+        self.rfc2136_client.add_txt_record("bar", "baz", 42)
+        with pytest.raises(errors.PluginError):
+            self.rfc2136_client.del_txt_record("bar", "baz")
+
+        assert self.mock_connect.call_count == 1
+        assert self.mock_sock.close.call_count == 1
+
     @mock.patch("dns.query.tcp")
     @mock.patch("dns.message.make_query")
     def test_query_soa_signed(self, mock_make_query, unused_mock_query):
@@ -8,6 +8,8 @@ from typing import DefaultDict
 from typing import Dict
 from typing import Iterable
 from typing import List
+from typing import Optional
+from typing import Tuple
 from typing import Type
 from typing import cast
 
@@ -16,6 +18,7 @@ from botocore.exceptions import ClientError
 from botocore.exceptions import NoCredentialsError
 
 from acme import challenges
+from acme import polling
 from certbot import achallenges
 from certbot import errors
 from certbot import interfaces
@@ -29,6 +32,12 @@ INSTRUCTIONS = (
     "https://boto3.readthedocs.io/en/latest/guide/configuration.html#best-practices-for-configuring-credentials "  # pylint: disable=line-too-long
     "and add the necessary permissions for Route53 access.")
 
+#: Seconds to wait for changes to be propagated to all Route53 DNS servers
+CHANGE_TIMEOUT = 600
+
+#: How long to wait between checks of pending changes
+CHANGE_POLLING = polling.PollingStrategy(interval=1, multiplier=2, max_interval=10)
+
 
 class Authenticator(common.Plugin, interfaces.Authenticator):
     """Route53 Authenticator
@@ -47,6 +56,7 @@ class Authenticator(common.Plugin, interfaces.Authenticator):
         self._attempt_cleanup = False
         self._resource_records: DefaultDict[str, List[Dict[str, str]]] = \
             collections.defaultdict(list)
+        self._hosted_zones: Optional[Dict[str, str]] = None
 
     def more_info(self) -> str:
         return "Solve a DNS01 challenge using AWS Route53"
@@ -72,15 +82,7 @@ class Authenticator(common.Plugin, interfaces.Authenticator):
         self._attempt_cleanup = True
 
         try:
-            change_ids = [
-                self._change_txt_record("UPSERT",
-                  achall.validation_domain_name(achall.domain),
-                  achall.validation(achall.account_key))
-                for achall in achalls
-            ]
-
-            for change_id in change_ids:
-                self._wait_for_change(change_id)
+            self._perform_batch(self._records(achalls))
         except (NoCredentialsError, ClientError) as e:
             logger.debug('Encountered error during perform: %s', e, exc_info=True)
             raise errors.PluginError("\n".join([str(e), INSTRUCTIONS]))
@@ -88,18 +90,47 @@ class Authenticator(common.Plugin, interfaces.Authenticator):
 
     def cleanup(self, achalls: List[achallenges.AnnotatedChallenge]) -> None:
         if self._attempt_cleanup:
-            for achall in achalls:
-                domain = achall.domain
-                validation_domain_name = achall.validation_domain_name(domain)
-                validation = achall.validation(achall.account_key)
-
-                self._cleanup(validation_domain_name, validation)
-
-    def _cleanup(self, validation_name: str, validation: str) -> None:
-        try:
-            self._change_txt_record("DELETE", validation_name, validation)
-        except (NoCredentialsError, ClientError) as e:
-            logger.debug('Encountered error during cleanup: %s', e, exc_info=True)
+            self._cleanup_batch(self._records(achalls))
+
+    @staticmethod
+    def _records(achalls: List[achallenges.AnnotatedChallenge]) -> List[Tuple[str, str]]:
+        """The (validation domain name, validation) of each challenge."""
+        return [(achall.validation_domain_name(achall.domain),
+                 achall.validation(achall.account_key)) for achall in achalls]
+
+    def _perform_batch(self, records: List[Tuple[str, str]]) -> None:
+        """Create the TXT records, with one ChangeBatch per hosted zone."""
+        change_ids = [self._change_txt_records("UPSERT", zone_id, zone_records)
+                      for zone_id, zone_records in self._records_by_zone(records).items()]
+
+        self._wait_for_changes(change_ids)
+
+    def _cleanup_batch(self, records: List[Tuple[str, str]]) -> None:
+        """Delete the TXT records, with one ChangeBatch per hosted zone."""
+        for zone_id, zone_records in self._records_by_zone(records, cleanup=True).items():
+            try:
+                self._change_txt_records("DELETE", zone_id, zone_records)
+            except (NoCredentialsError, ClientError) as e:
+                logger.debug('Encountered error during cleanup: %s', e, exc_info=True)
+
+    def _records_by_zone(self, records: List[Tuple[str, str]], cleanup: bool = False
+                         ) -> Dict[str, Dict[str, List[str]]]:
+        """Group the validations by hosted zone id, and by record name within each zone.
+
+           During cleanup, records whose hosted zone cannot be found are skipped
+           rather than failing the others.
+        """
+        zones: Dict[str, Dict[str, List[str]]] = {}
+        for validation_domain_name, validation in records:
+            try:
+                zone_id = self._find_zone_id_for_domain(validation_domain_name)
+            except (NoCredentialsError, ClientError, errors.PluginError) as e:
+                if not cleanup:
+                    raise
+                logger.debug('Encountered error during cleanup: %s', e, exc_info=True)
+                continue
+            zones.setdefault(zone_id, {}).setdefault(validation_domain_name, []).append(validation)
+        return zones
 
     def _find_zone_id_for_domain(self, domain: str) -> str:
         """Find the zone id responsible a given FQDN.
@@ -107,78 +138,109 @@ class Authenticator(common.Plugin, interfaces.Authenticator):
            That is, the id for the zone whose name is the longest parent of the
            domain.
         """
-        paginator = self.r53.get_paginator("list_hosted_zones")
-        zones: list[tuple[str, str]] = []
+        hosted_zones = self._get_hosted_zones()
         target_labels = domain.rstrip(".").split(".")
-        for page in paginator.paginate():
-            for zone in page["HostedZones"]:
-                if zone["Config"]["PrivateZone"]:
-                    continue
-
-                candidate_labels = zone["Name"].rstrip(".").split(".")
-                if candidate_labels == target_labels[-len(candidate_labels):]:
-                    zones.append((zone["Name"], zone["Id"]))
-
-        if not zones:
-            raise errors.PluginError(
-                "Unable to find a Route53 hosted zone for {0}".format(domain)
-            )
-
-        # Order the zones that are suffixes for our desired to domain by
-        # length, this puts them in an order like:
+        # Try the suffixes of our desired domain from the longest, in an order like:
         # ["foo.bar.baz.com", "bar.baz.com", "baz.com", "com"]
-        # And then we choose the first one, which will be the most specific.
-        zones.sort(key=lambda z: len(z[0]), reverse=True)
-        return zones[0][1]
-
-    def _change_txt_record(self, action: str, validation_domain_name: str, validation: str) -> str:
-        zone_id = self._find_zone_id_for_domain(validation_domain_name)
-
-        rrecords = self._resource_records[validation_domain_name]
-        challenge = {"Value": '"{0}"'.format(validation)}
-        if action == "DELETE":
-            # Remove the record being deleted from the list of tracked records
-            rrecords.remove(challenge)
-            if rrecords:
-                # Need to update instead, as we're not deleting the rrset
-                action = "UPSERT"
+        # so the first zone found is the most specific.
+        for i in range(len(target_labels)):
+            zone_id = hosted_zones.get(".".join(target_labels[i:]))
+            if zone_id is not None:
+                return zone_id
+
+        raise errors.PluginError(
+            "Unable to find a Route53 hosted zone for {0}".format(domain)
+        )
+
+    def _get_hosted_zones(self) -> Dict[str, str]:
+        """Get the ids of the public hosted zones, by zone name.
+
+           The zones are listed once, then cached for the other domains.
+        """
+        if self._hosted_zones is None:
+            hosted_zones: Dict[str, str] = {}
+            paginator = self.r53.get_paginator("list_hosted_zones")
+            for page in paginator.paginate():
+                for zone in page["HostedZones"]:
+                    if zone["Config"]["PrivateZone"]:
+                        continue
+
+                    hosted_zones.setdefault(zone["Name"].rstrip("."), zone["Id"])
+            self._hosted_zones = hosted_zones
+        return self._hosted_zones
+
+    def _change_txt_records(self, action: str, zone_id: str,
+                            zone_records: Dict[str, List[str]]) -> str:
+        """Change TXT records of a hosted zone in a single ChangeBatch.
+
+        :param str action: "UPSERT" to add the validations, "DELETE" to remove them.
+        :param str zone_id: The id of the hosted zone of all the records.
+        :param dict zone_records: The validations of each validation domain name.
+        :returns: The id of the change.
+        """
+        changes = []
+        for validation_domain_name, validations in zone_records.items():
+            rrecords = self._resource_records[validation_domain_name]
+            values = [{"Value": '"{0}"'.format(validation)} for validation in validations]
+            record_action = action
+            if action == "DELETE":
+                # Remove the records being deleted from the list of tracked records
+                for challenge in values:
+                    rrecords.remove(challenge)
+                if rrecords:
+                    # Need to update instead, as we're not deleting the rrset
+                    record_action = "UPSERT"
+                else:
+                    # Create a new list containing the records to use with DELETE
+                    rrecords = values
             else:
-                # Create a new list containing the record to use with DELETE
-                rrecords = [challenge]
-        else:
-            rrecords.append(challenge)
+                rrecords.extend(values)
+
+            changes.append({
+                "Action": record_action,
+                "ResourceRecordSet": {
+                    "Name": validation_domain_name,
+                    "Type": "TXT",
+                    "TTL": self.ttl,
+                    "ResourceRecords": list(rrecords),
+                }
+            })
 
         response = self.r53.change_resource_record_sets(
             HostedZoneId=zone_id,
             ChangeBatch={
                 "Comment": "certbot-dns-route53 certificate validation " + action,
-                "Changes": [
-                    {
-                        "Action": action,
-                        "ResourceRecordSet": {
-                            "Name": validation_domain_name,
-                            "Type": "TXT",
-                            "TTL": self.ttl,
-                            "ResourceRecords": rrecords,
-                        }
-                    }
-                ]
+                "Changes": changes,
             }
         )
         return cast(str, response["ChangeInfo"]["Id"])
 
-    def _wait_for_change(self, change_id: str) -> None:
-        """Wait for a change to be propagated to all Route53 DNS servers.
+    def _wait_for_changes(self, change_ids: List[str]) -> None:
+        """Wait for changes to be propagated to all Route53 DNS servers.
            https://docs.aws.amazon.com/Route53/latest/APIReference/API_GetChange.html
+
+           All pending changes are checked in each round, and rounds are spaced
+           out by `CHANGE_POLLING`.
         """
-        for unused_n in range(0, 120):
-            response = self.r53.get_change(Id=change_id)
-            if response["ChangeInfo"]["Status"] == "INSYNC":
+        deadline = time.monotonic() + CHANGE_TIMEOUT
+        pending = list(change_ids)
+        attempt = 0
+        while True:
+            statuses = {}
+            for change_id in pending:
+                response = self.r53.get_change(Id=change_id)
+                statuses[change_id] = response["ChangeInfo"]["Status"]
+            pending = [change_id for change_id in pending if statuses[change_id] != "INSYNC"]
+            if not pending:
                 return
-            time.sleep(5)
-        raise errors.PluginError(
-            "Timed out waiting for Route53 change. Current status: %s" %
-            response["ChangeInfo"]["Status"])
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise errors.PluginError(
+                    "Timed out waiting for Route53 change. Current status: %s" %
+                    ", ".join(statuses[change_id] for change_id in pending))
+            attempt += 1
+            time.sleep(CHANGE_POLLING.delay(attempt, remaining=remaining))
 
 
 # Our route53 plugin was initially a 3rd party plugin named `certbot-route53:auth` as described at
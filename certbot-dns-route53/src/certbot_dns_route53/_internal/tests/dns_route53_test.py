@@ -1,6 +1,7 @@
 """Tests for certbot_dns_route53._internal.dns_route53.Authenticator"""
 
 import sys
+from typing import Any
 import unittest
 from unittest import mock
 
@@ -50,27 +51,49 @@ class AuthenticatorTest(unittest.TestCase):
     def test_get_chall_pref(self) -> None:
         self.assertEqual(self.auth.get_chall_pref("example.org"), [challenges.DNS01])
 
+    def _mock_change_txt_records(self, **kwargs: Any) -> None:
+        self.auth._find_zone_id_for_domain = mock.MagicMock( # type: ignore[method-assign, unused-ignore]
+            return_value="ZONE")
+        self.mock_change_txt_records = mock.MagicMock(**kwargs)
+        self.auth._change_txt_records = self.mock_change_txt_records # type: ignore[method-assign, unused-ignore]
+
     def test_perform(self):
-        self.auth._change_txt_record = mock.MagicMock() # type: ignore[method-assign, unused-ignore]
-        self.auth._wait_for_change = mock.MagicMock() # type: ignore [method-assign, unused-ignore]
+        self._mock_change_txt_records()
+        self.auth._wait_for_changes = mock.MagicMock() # type: ignore [method-assign, unused-ignore]
 
         self.auth.perform([self.achall])
 
-        self.auth._change_txt_record.assert_called_once_with("UPSERT",
-                                                             '_acme-challenge.' + DOMAIN,
-                                                             mock.ANY)
-        assert self.auth._wait_for_change.call_count == 1
+        self.mock_change_txt_records.assert_called_once_with(
+            "UPSERT", "ZONE", {'_acme-challenge.' + DOMAIN: [mock.ANY]})
+        assert self.auth._wait_for_changes.call_count == 1
+
+    def test_perform_batch(self):
+        self.auth._find_zone_id_for_domain = mock.MagicMock( # type: ignore[method-assign, unused-ignore]
+            side_effect=lambda name: name.split('.', 2)[-1])
+        self.auth._change_txt_records = mock.MagicMock( # type: ignore[method-assign, unused-ignore]
+            side_effect=["change-com", "change-org"])
+        self.auth._wait_for_changes = mock.MagicMock() # type: ignore [method-assign, unused-ignore]
+
+        self.auth._perform_batch([("_acme-challenge.a.example.com", "foo"),
+                                  ("_acme-challenge.b.example.com", "bar"),
+                                  ("_acme-challenge.a.example.com", "baz"),
+                                  ("_acme-challenge.c.example.org", "qux")])
+
+        assert self.auth._change_txt_records.call_args_list == [
+            mock.call("UPSERT", "example.com", {"_acme-challenge.a.example.com": ["foo", "baz"],
+                                                "_acme-challenge.b.example.com": ["bar"]}),
+            mock.call("UPSERT", "example.org", {"_acme-challenge.c.example.org": ["qux"]}),
+        ]
+        self.auth._wait_for_changes.assert_called_once_with(["change-com", "change-org"])
 
     def test_perform_no_credentials_error(self):
-        self.auth._change_txt_record = mock.MagicMock( # type: ignore [method-assign, unused-ignore]
-            side_effect=NoCredentialsError)
+        self._mock_change_txt_records(side_effect=NoCredentialsError)
 
         with pytest.raises(errors.PluginError):
             self.auth.perform([self.achall])
 
     def test_perform_client_error(self):
-        self.auth._change_txt_record = mock.MagicMock( # type: ignore [method-assign, unused-ignore]
-            side_effect=ClientError({"Error": {"Code": "foo"}}, "bar"))
+        self._mock_change_txt_records(side_effect=ClientError({"Error": {"Code": "foo"}}, "bar"))
 
         with pytest.raises(errors.PluginError):
             self.auth.perform([self.achall])
@@ -78,30 +101,63 @@ class AuthenticatorTest(unittest.TestCase):
     def test_cleanup(self):
         self.auth._attempt_cleanup = True
 
-        self.auth._change_txt_record = mock.MagicMock() # type: ignore[method-assign, unused-ignore]
+        self._mock_change_txt_records()
 
         self.auth.cleanup([self.achall])
 
-        self.auth._change_txt_record.assert_called_once_with("DELETE",
-                                                             '_acme-challenge.'+DOMAIN,
-                                                             mock.ANY)
+        self.mock_change_txt_records.assert_called_once_with(
+            "DELETE", "ZONE", {'_acme-challenge.' + DOMAIN: [mock.ANY]})
 
     def test_cleanup_no_credentials_error(self):
         self.auth._attempt_cleanup = True
 
-        self.auth._change_txt_record = mock.MagicMock( # type: ignore [method-assign, unused-ignore]
-        side_effect=NoCredentialsError)
+        self._mock_change_txt_records(side_effect=NoCredentialsError)
 
         self.auth.cleanup([self.achall])
 
     def test_cleanup_client_error(self):
         self.auth._attempt_cleanup = True
 
-        self.auth._change_txt_record = mock.MagicMock( # type: ignore [method-assign, unused-ignore]
-            side_effect=ClientError({"Error": {"Code": "foo"}}, "bar"))
+        self._mock_change_txt_records(side_effect=ClientError({"Error": {"Code": "foo"}}, "bar"))
+
+        self.auth.cleanup([self.achall])
+
+    def test_cleanup_zone_error(self):
+        self.auth._attempt_cleanup = True
+
+        self.auth._find_zone_id_for_domain = mock.MagicMock( # type: ignore[method-assign, unused-ignore]
+            side_effect=NoCredentialsError)
 
         self.auth.cleanup([self.achall])
 
+    def test_cleanup_batch_partial_zone_error(self):
+        def find_zone_id(name: str) -> str:
+            if name.endswith(".org"):
+                raise errors.PluginError("No zone")
+            if name.endswith(".net"):
+                raise ClientError({"Error": {"Code": "foo"}}, "bar")
+            return "ZONE"
+        self._mock_change_txt_records()
+        find_zone_id_for_domain = mock.MagicMock(side_effect=find_zone_id)
+        self.auth._find_zone_id_for_domain = find_zone_id_for_domain # type: ignore[method-assign, unused-ignore]
+
+        self.auth._cleanup_batch([("_acme-challenge.example.org", "foo"),
+                                  ("_acme-challenge.example.net", "bar"),
+                                  ("_acme-challenge.example.com", "baz")])
+
+        assert find_zone_id_for_domain.call_count == 3
+        self.mock_change_txt_records.assert_called_once_with(
+            "DELETE", "ZONE", {"_acme-challenge.example.com": ["baz"]})
+
+    def test_perform_batch_zone_error(self):
+        self._mock_change_txt_records()
+        self.auth._find_zone_id_for_domain = mock.MagicMock( # type: ignore[method-assign, unused-ignore]
+            side_effect=errors.PluginError("No zone"))
+
+        with pytest.raises(errors.PluginError):
+            self.auth._perform_batch([("_acme-challenge.example.org", "foo")])
+        self.mock_change_txt_records.assert_not_called()
+
 
 class ClientTest(unittest.TestCase):
     # pylint: disable=protected-access
@@ -188,6 +244,26 @@ class ClientTest(unittest.TestCase):
         result = self.client._find_zone_id_for_domain("foo.example.com")
         assert result == "FOO"
 
+    def test_find_zone_id_for_domain_cached(self):
+        self.client.r53.get_paginator = mock.MagicMock()
+        self.client.r53.get_paginator().paginate.return_value = [
+            {
+                "HostedZones": [
+                    self.EXAMPLE_NET_ZONE,
+                    self.EXAMPLE_COM_ZONE,
+                    self.FOO_EXAMPLE_COM_ZONE,
+                ]
+            }
+        ]
+
+        assert self.client._find_zone_id_for_domain("bar.foo.example.com.") == "FOO"
+        assert self.client._find_zone_id_for_domain("bar.example.com") == "EXAMPLE"
+        assert self.client._find_zone_id_for_domain("example.net") == "BAD-WRONG-TLD"
+        with pytest.raises(errors.PluginError):
+            self.client._find_zone_id_for_domain("example.org")
+
+        assert self.client.r53.get_paginator().paginate.call_count == 1
+
     def test_find_zone_id_for_domain_no_results(self):
         self.client.r53.get_paginator = mock.MagicMock()
         self.client.r53.get_paginator().paginate.return_value = []
@@ -209,18 +285,25 @@ class ClientTest(unittest.TestCase):
         with pytest.raises(errors.PluginError):
             self.client._find_zone_id_for_domain("foo.example.com")
 
-    def test_change_txt_record(self):
-        self.client._find_zone_id_for_domain = mock.MagicMock() # type: ignore [method-assign, unused-ignore]
+    def test_change_txt_records(self):
         self.client.r53.change_resource_record_sets = mock.MagicMock(
             return_value={"ChangeInfo": {"Id": 1}})
 
-        self.client._change_txt_record("FOO", DOMAIN, "foo")
+        self.client._change_txt_records("UPSERT", "ZONE", {DOMAIN: ["foo", "bar"],
+                                                           "www." + DOMAIN: ["baz"]})
 
         call_count = self.client.r53.change_resource_record_sets.call_count
         assert call_count == 1
+        call_args = self.client.r53.change_resource_record_sets.call_args_list[0][1]
+        assert call_args["HostedZoneId"] == "ZONE"
+        changes = call_args["ChangeBatch"]["Changes"]
+        assert [(c["Action"], c["ResourceRecordSet"]["Name"],
+                 c["ResourceRecordSet"]["ResourceRecords"]) for c in changes] == [
+            ("UPSERT", DOMAIN, [{"Value": '"foo"'}, {"Value": '"bar"'}]),
+            ("UPSERT", "www." + DOMAIN, [{"Value": '"baz"'}]),
+        ]
 
-    def test_change_txt_record_delete(self):
-        self.client._find_zone_id_for_domain = mock.MagicMock() # type: ignore[ method-assign, unused-ignore]
+    def test_change_txt_records_delete(self):
         self.client.r53.change_resource_record_sets = mock.MagicMock(
             return_value={"ChangeInfo": {"Id": 1}})
 
@@ -228,7 +311,7 @@ class ClientTest(unittest.TestCase):
         validation_record = {"Value": '"{0}"'.format(validation)}
         self.client._resource_records[DOMAIN] = [validation_record]
 
-        self.client._change_txt_record("DELETE", DOMAIN, validation)
+        self.client._change_txt_records("DELETE", "ZONE", {DOMAIN: [validation]})
 
         call_count = self.client.r53.change_resource_record_sets.call_count
         assert call_count == 1
@@ -238,8 +321,7 @@ class ClientTest(unittest.TestCase):
         assert call_args_batch["ResourceRecordSet"]["ResourceRecords"] == \
             [validation_record]
 
-    def test_change_txt_record_multirecord(self):
-        self.client._find_zone_id_for_domain = mock.MagicMock() # type: ignore [method-assign, unused-ignore]
+    def test_change_txt_records_multirecord(self):
         self.client._resource_records[DOMAIN] = [
             {"Value": "\"pre-existing-value\""},
             {"Value": "\"pre-existing-value-two\""},
@@ -247,7 +329,7 @@ class ClientTest(unittest.TestCase):
         self.client.r53.change_resource_record_sets = mock.MagicMock(
             return_value={"ChangeInfo": {"Id": 1}})
 
-        self.client._change_txt_record("DELETE", DOMAIN, "pre-existing-value")
+        self.client._change_txt_records("DELETE", "ZONE", {DOMAIN: ["pre-existing-value"]})
 
         call_count = self.client.r53.change_resource_record_sets.call_count
         call_args = self.client.r53.change_resource_record_sets.call_args_list[0][1]
@@ -258,14 +340,30 @@ class ClientTest(unittest.TestCase):
 
         assert call_count == 1
 
-    def test_wait_for_change(self):
+    @mock.patch('certbot_dns_route53._internal.dns_route53.time.sleep')
+    def test_wait_for_changes(self, mock_sleep):
+        statuses = {"1": ["PENDING", "INSYNC"], "2": ["PENDING", "PENDING", "INSYNC"]}
+        self.client.r53.get_change = mock.MagicMock(
+            side_effect=lambda Id: {"ChangeInfo": {"Status": statuses[Id].pop(0)}})
+
+        self.client._wait_for_changes(["1", "2"])
+
+        assert [c[1]["Id"] for c in self.client.r53.get_change.call_args_list] == \
+            ["1", "2", "1", "2", "2"]
+        assert [c[0][0] for c in mock_sleep.call_args_list] == [1, 2]
+
+    @mock.patch('certbot_dns_route53._internal.dns_route53.time.monotonic')
+    @mock.patch('certbot_dns_route53._internal.dns_route53.time.sleep')
+    def test_wait_for_changes_timeout(self, mock_sleep, mock_monotonic):
+        mock_monotonic.side_effect = [0, 595, 601]
         self.client.r53.get_change = mock.MagicMock(
-            side_effect=[{"ChangeInfo": {"Status": "PENDING"}},
-                         {"ChangeInfo": {"Status": "INSYNC"}}])
+            return_value={"ChangeInfo": {"Status": "PENDING"}})
 
-        self.client._wait_for_change("1")
+        with pytest.raises(errors.PluginError, match="PENDING"):
+            self.client._wait_for_changes(["1"])
 
-        assert self.client.r53.get_change.called
+        assert self.client.r53.get_change.call_count == 2
+        mock_sleep.assert_called_once_with(1)
 
 
 if __name__ == "__main__":
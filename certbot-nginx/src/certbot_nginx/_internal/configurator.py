@@ -31,6 +31,7 @@ from acme import crypto_util as acme_crypto_util
 from certbot import achallenges
 from certbot import crypto_util
 from certbot import errors
+from certbot import ocsp
 from certbot import util
 from certbot.compat import os
 from certbot.display import util as display_util
@@ -998,7 +999,13 @@ class NginxConfigurator(common.Configurator):
         stapling_directives = [
             ['\n    ', 'ssl_trusted_certificate', ' ', chain_path],
             ['\n    ', 'ssl_stapling', ' ', 'on'],
-            ['\n    ', 'ssl_stapling_verify', ' ', 'on'], ['\n']]
+            ['\n    ', 'ssl_stapling_verify', ' ', 'on']]
+        # Staple the OCSP response exported by Certbot, if any, rather than
+        # having nginx query the OCSP responder
+        staple_path = ocsp.staple_path(os.path.dirname(chain_path))
+        if os.path.isfile(staple_path):
+            stapling_directives.append(['\n    ', 'ssl_stapling_file', ' ', staple_path])
+        stapling_directives.append(['\n'])
 
         try:
             self.parser.add_server_directives(vhost,
@@ -1013,6 +1020,8 @@ class NginxConfigurator(common.Configurator):
         self.save_notes += "\tssl_trusted_certificate {0}\n".format(chain_path)
         self.save_notes += "\tssl_stapling on\n"
         self.save_notes += "\tssl_stapling_verify on\n"
+        if os.path.isfile(staple_path):
+            self.save_notes += "\tssl_stapling_file {0}\n".format(staple_path)
 
     ######################################
     # Nginx server management (Installer)
@@ -12,6 +12,7 @@ from acme import messages
 from certbot import achallenges
 from certbot import crypto_util
 from certbot import errors
+from certbot.compat import filesystem
 from certbot.compat import os
 from certbot.tests import util as certbot_test_util
 from certbot_nginx._internal import obj
@@ -743,6 +744,24 @@ class NginxConfiguratorTest(util.NginxTest):
             generated_conf, ['ssl_stapling', 'on'], 2)
         assert util.contains_at_depth(
             generated_conf, ['ssl_stapling_verify', 'on'], 2)
+        assert not util.contains_at_depth(
+            generated_conf, ['ssl_stapling_file', 'example/ocsp.der'], 2)
+
+    def test_staple_ocsp_exported_staple(self):
+        live_dir = os.path.join(self.temp_dir, "live")
+        filesystem.mkdir(live_dir)
+        chain_path = os.path.join(live_dir, "chain.pem")
+        staple_path = os.path.join(live_dir, "ocsp.der")
+        with open(staple_path, "wb"):
+            pass
+        self.config.enhance("www.example.com", "staple-ocsp", chain_path)
+
+        example_conf = self.config.parser.abs_path('sites-enabled/example.com')
+        generated_conf = self.config.parser.parsed[example_conf]
+
+        assert util.contains_at_depth(
+            generated_conf, ['ssl_stapling_file', staple_path], 2)
+        assert staple_path in self.config.save_notes
 
     def test_deploy_no_match_default_set(self):
         default_conf = self.config.parser.abs_path('sites-enabled/default')
@@ -65,6 +65,8 @@ docs_extras = [
 # pinned and installed during automated testing.
 test_extras = [
     'coverage',
+    # Optional dependency of certbot.plugins.dns_common, needed by its tests.
+    'dnspython>=2.6.1',
     'mypy',
     'pip',
     'pylint',
@@ -1,4 +1,5 @@
 """ACME AuthHandler."""
+import concurrent.futures
 import datetime
 import logging
 import time
@@ -17,6 +18,7 @@ from acme import challenges
 from acme import client
 from acme import errors as acme_errors
 from acme import messages
+from acme import polling
 from certbot import achallenges
 from certbot import configuration
 from certbot import errors
@@ -28,6 +30,10 @@ from certbot.plugins import common as plugin_common
 
 logger = logging.getLogger(__name__)
 
+# Give an initial second to the ACME CA server to check the authorizations,
+# then poll every 3 seconds unless the server asks to wait longer.
+DEFAULT_POLLING_STRATEGY = polling.PollingStrategy(initial_delay=1, interval=3)
+
 
 class AuthHandler:
     """ACME Authorization Handler for a client.
@@ -44,14 +50,24 @@ class AuthHandler:
     :ivar list pref_challs: sorted user specified preferred challenges
         type strings with the most preferred challenge listed first
 
+    :ivar acme.polling.PollingStrategy polling_strategy: how long to wait
+        between polls of the authorizations
+
+    :ivar int max_poll_workers: maximum number of authorizations polled at
+        the same time
+
     """
     def __init__(self, auth: interfaces.Authenticator, acme_client: Optional[client.ClientV2],
-                 account: Optional[Account], pref_challs: List[str]) -> None:
+                 account: Optional[Account], pref_challs: List[str],
+                 polling_strategy: Optional[polling.PollingStrategy] = None,
+                 max_poll_workers: int = 10) -> None:
         self.auth = auth
         self.acme = acme_client
 
         self.account = account
         self.pref_challs = pref_challs
+        self.polling_strategy = polling_strategy or DEFAULT_POLLING_STRATEGY
+        self.max_poll_workers = max_poll_workers
 
     def handle_authorizations(self, orderr: messages.OrderResource,
                               config: configuration.NamespaceConfig, best_effort: bool = False,
@@ -144,6 +160,28 @@ class AuthHandler:
 
         return (deactivated, failed)
 
+    def _poll_pending(self, authzrs_to_check: Dict[int, Tuple[messages.AuthorizationResource,
+                                                               Optional[Response]]]
+                      ) -> Dict[int, Tuple[messages.AuthorizationResource,
+                                           Optional[Response]]]:
+        """Poll the pending authorizations, several at a time.
+
+        The ACME client network is thread-safe and shares its nonces between
+        threads, so large orders don't wait for one round trip per name.
+
+        :returns: the updated authorizations and responses, by the same keys
+        """
+        assert self.acme
+        pending = [authzr for authzr, _ in authzrs_to_check.values()]
+        workers = min(self.max_poll_workers, len(pending))
+        if workers <= 1:
+            return {index: self.acme.poll(authzr) for index, (authzr, _)
+                    in authzrs_to_check.items()}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers,
+                                                   thread_name_prefix='certbot-poll') as executor:
+            # map() returns the results in order, whatever order they arrive in
+            return dict(zip(authzrs_to_check, executor.map(self.acme.poll, pending)))
+
     def _poll_authorizations(self, authzrs: List[messages.AuthorizationResource], max_retries: int,
                              deadline_minutes: float, best_effort: bool) -> None:
         """
@@ -159,15 +197,13 @@ class AuthHandler:
                             for index, authzr in enumerate(authzrs)}
         authzrs_failed_to_report = []
         deadline = datetime.datetime.now() + datetime.timedelta(minutes=deadline_minutes)
-        # Give an initial second to the ACME CA server to check the authorizations
-        sleep_seconds: float = 1
-        for _ in range(max_retries):
+        sleep_seconds = self.polling_strategy.delay(0)
+        for attempt in range(1, max_retries + 1):
             # Wait for appropriate time (from Retry-After, initial wait, or no wait)
             if sleep_seconds > 0:
                 time.sleep(sleep_seconds)
             # Poll all updated authorizations.
-            authzrs_to_check = {index: self.acme.poll(authzr) for index, (authzr, _)
-                                in authzrs_to_check.items()}
+            authzrs_to_check = self._poll_pending(authzrs_to_check)
             # Update the original list of authzr with the updated authzrs from server.
             for index, (authzr, _) in authzrs_to_check.items():
                 authzrs[index] = authzr
@@ -192,17 +228,20 @@ class AuthHandler:
                 break
 
             # Be merciful with the ACME server CA, check the Retry-After header returned,
-            # and wait this time before polling again in next loop iteration.
+            # and wait at least this time before polling again in next loop iteration.
             # From all the pending authorizations, we take the greatest Retry-After value
             # to avoid polling an authorization before its relevant Retry-After value.
             # (by construction resp cannot be None at that time, but mypy do not know it).
-            retry_after = max(self.acme.retry_after(resp, 3)
-                              for _, resp in authzrs_to_check.values()
-                              if resp is not None)
+            retry_after = max((self.acme.retry_after(resp, 0)
+                               for _, resp in authzrs_to_check.values()
+                               if resp is not None and 'Retry-After' in resp.headers),
+                              default=None)
+            now = datetime.datetime.now()
             # Whatever Retry-After the ACME server requests, the polling must not take
             # longer than the overall deadline (https://github.com/certbot/certbot/issues/9526).
-            retry_after = min(retry_after, deadline)
-            sleep_seconds = (retry_after - datetime.datetime.now()).total_seconds()
+            sleep_seconds = self.polling_strategy.delay(
+                attempt, None if retry_after is None else (retry_after - now).total_seconds(),
+                (deadline - now).total_seconds())
 
         # In case of failed authzrs, create a report to the user.
         if authzrs_failed_to_report:
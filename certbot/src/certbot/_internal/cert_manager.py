@@ -15,8 +15,9 @@ from typing import Union
 from certbot import configuration
 from certbot import crypto_util
 from certbot import errors
-from certbot import ocsp
 from certbot import util
+from certbot._internal import constants
+from certbot._internal import lineage_index
 from certbot._internal import storage
 from certbot.compat import os
 from certbot.display import util as display_util
@@ -62,10 +63,11 @@ def certificates(config: configuration.NamespaceConfig) -> None:
     """
     parsed_certs = []
     parse_failures = []
+    index = _lineage_index(config)
     for renewal_file in storage.renewal_conf_files(config):
         try:
             renewal_candidate = storage.RenewableCert(renewal_file, config)
-            crypto_util.verify_renewable_cert(renewal_candidate)
+            index.get(renewal_candidate, verify=True)
             parsed_certs.append(renewal_candidate)
         except Exception as e:  # pylint: disable=broad-except
             logger.warning("Renewal configuration file %s produced an "
@@ -74,7 +76,9 @@ def certificates(config: configuration.NamespaceConfig) -> None:
             parse_failures.append(renewal_file)
 
     # Describe all the certs
-    _describe_certs(config, parsed_certs, parse_failures)
+    _describe_certs(config, parsed_certs, parse_failures, index)
+    _save_lineage_index(index)
+    _save_ocsp_cache(config)
 
 
 def delete(config: configuration.NamespaceConfig) -> None:
@@ -164,7 +168,7 @@ def find_duplicative_certs(config: configuration.NamespaceConfig,
         # TODO: Handle these differently depending on whether they are
         #       expired or still valid?
         identical_names_cert, subset_names_cert = rv
-        candidate_names = set(candidate_lineage.names())
+        candidate_names = set(index.get(candidate_lineage).names)
         if candidate_names == set(domains):
             identical_names_cert = candidate_lineage
         elif candidate_names.issubset(set(domains)):
@@ -172,13 +176,16 @@ def find_duplicative_certs(config: configuration.NamespaceConfig,
             # in the case where there are several available.
             if subset_names_cert is None:
                 subset_names_cert = candidate_lineage
-            elif len(candidate_names) > len(subset_names_cert.names()):
+            elif len(candidate_names) > len(index.get(subset_names_cert).names):
                 subset_names_cert = candidate_lineage
         return (identical_names_cert, subset_names_cert)
 
     init: Tuple[Optional[storage.RenewableCert], Optional[storage.RenewableCert]] = (None, None)
 
-    return _search_lineages(config, update_certs_for_domain_matches, init)
+    index = _lineage_index(config)
+    rv = _search_lineages(config, update_certs_for_domain_matches, init)
+    _save_lineage_index(index)
+    return rv
 
 
 def _archive_files(candidate_lineage: storage.RenewableCert, filetype: str) -> Optional[List[str]]:
@@ -274,29 +281,39 @@ def match_and_check_overlaps(cli_config: configuration.NamespaceConfig,
 
 
 def human_readable_cert_info(config: configuration.NamespaceConfig, cert: storage.RenewableCert,
-                             skip_filter_checks: bool = False) -> Optional[str]:
-    """ Returns a human readable description of info about a RenewableCert object"""
+                             skip_filter_checks: bool = False,
+                             metadata: Optional[lineage_index.LineageMetadata] = None,
+                             revoked: Optional[bool] = None) -> Optional[str]:
+    """ Returns a human readable description of info about a RenewableCert object
+
+    If `metadata` about the lineage is provided, the names, expiry, serial
+    number and key type of the certificate are taken from it instead of being
+    read from the certificate and key files. If `revoked` is provided, OCSP
+    isn't queried for the revocation status of the certificate.
+    """
     certinfo = []
-    checker = ocsp.RevocationChecker()
 
-    if config.certname and cert.lineagename != config.certname and not skip_filter_checks:
-        return None
-    if config.domains and not set(config.domains).issubset(cert.names()):
+    if not _matches_filters(config, cert, metadata, skip_filter_checks):
         return None
+    names = metadata.names if metadata else cert.names()
     now = datetime.datetime.now(datetime.timezone.utc)
+    expiry = metadata.not_after if metadata else cert.target_expiry
 
     reasons = []
     if cert.is_test_cert:
         reasons.append('TEST_CERT')
-    if cert.target_expiry <= now:
+    if expiry <= now:
         reasons.append('EXPIRED')
-    elif checker.ocsp_revoked(cert):
-        reasons.append('REVOKED')
+    else:
+        if revoked is None:
+            revoked = storage.revocation_checker(config).ocsp_revoked(cert)
+        if revoked:
+            reasons.append('REVOKED')
 
     if reasons:
         status = "INVALID: " + ", ".join(reasons)
     else:
-        diff = cert.target_expiry - now
+        diff = expiry - now
         if diff.days == 1:
             status = "VALID: 1 day"
         elif diff.days < 1:
@@ -304,18 +321,33 @@ def human_readable_cert_info(config: configuration.NamespaceConfig, cert: storag
         else:
             status = f"VALID: {diff.days} days"
 
-    valid_string = "{0} ({1})".format(cert.target_expiry, status)
-    serial = format(crypto_util.get_serial_from_cert(cert.cert_path), 'x')
+    valid_string = "{0} ({1})".format(expiry, status)
+    if metadata:
+        serial = format(metadata.serial, 'x')
+        key_type = metadata.key_type
+    else:
+        serial = format(crypto_util.get_serial_from_cert(cert.cert_path), 'x')
+        key_type = cert.private_key_type
     certinfo.append(f"  Certificate Name: {cert.lineagename}\n"
                     f"    Serial Number: {serial}\n"
-                    f"    Key Type: {cert.private_key_type}\n"
-                    f'    Domains: {" ".join(cert.names())}\n'
+                    f"    Key Type: {key_type}\n"
+                    f'    Domains: {" ".join(names)}\n'
                     f"    Expiry Date: {valid_string}\n"
                     f"    Certificate Path: {cert.fullchain}\n"
                     f"    Private Key Path: {cert.privkey}")
     return "".join(certinfo)
 
 
+def _matches_filters(config: configuration.NamespaceConfig, cert: storage.RenewableCert,
+                     metadata: Optional[lineage_index.LineageMetadata] = None,
+                     skip_filter_checks: bool = False) -> bool:
+    """Does the lineage match the --cert-name and --domains given by the user?"""
+    if config.certname and cert.lineagename != config.certname and not skip_filter_checks:
+        return False
+    names = metadata.names if metadata else cert.names()
+    return not config.domains or set(config.domains).issubset(names)
+
+
 def get_certnames(config: configuration.NamespaceConfig, verb: str, allow_multiple: bool = False,
                   custom_prompt: Optional[str] = None) -> List[str]:
     """Get certname from flag, interactively, or error out."""
@@ -361,11 +393,28 @@ def _report_lines(msgs: Iterable[str]) -> str:
 
 
 def _report_human_readable(config: configuration.NamespaceConfig,
-                           parsed_certs: Iterable[storage.RenewableCert]) -> str:
+                           parsed_certs: Iterable[storage.RenewableCert],
+                           index: Optional[lineage_index.LineageIndex] = None) -> str:
     """Format a results report for a parsed cert"""
-    certinfo = []
+    lineages = []
     for cert in parsed_certs:
-        cert_info = human_readable_cert_info(config, cert)
+        metadata = index.get(cert) if index else None
+        if _matches_filters(config, cert, metadata):
+            lineages.append((cert, metadata))
+
+    # Query OCSP for all unexpired certificates at once rather than one
+    # lineage after the other.
+    now = datetime.datetime.now(datetime.timezone.utc)
+    unexpired = [cert for cert, metadata in lineages
+                 if (metadata.not_after if metadata else cert.target_expiry) > now]
+    revoked = dict(zip((id(cert) for cert in unexpired),
+                       storage.revocation_checker(config).ocsp_revoked_many(
+                           (cert.cert_path, cert.chain_path) for cert in unexpired)))
+
+    certinfo = []
+    for cert, metadata in lineages:
+        cert_info = human_readable_cert_info(config, cert, metadata=metadata,
+                                             revoked=revoked.get(id(cert), False))
         if cert_info is not None:
             certinfo.append(cert_info)
     return "\n".join(certinfo)
@@ -373,7 +422,8 @@ def _report_human_readable(config: configuration.NamespaceConfig,
 
 def _describe_certs(config: configuration.NamespaceConfig,
                     parsed_certs: Iterable[storage.RenewableCert],
-                    parse_failures: Iterable[str]) -> None:
+                    parse_failures: Iterable[str],
+                    index: Optional[lineage_index.LineageIndex] = None) -> None:
     """Print information about the certs we know about"""
     out: List[str] = []
 
@@ -385,7 +435,7 @@ def _describe_certs(config: configuration.NamespaceConfig,
         if parsed_certs:
             match = "matching " if config.certname or config.domains else ""
             notify("Found the following {0}certs:".format(match))
-            notify(_report_human_readable(config, parsed_certs))
+            notify(_report_human_readable(config, parsed_certs, index))
         if parse_failures:
             notify("\nThe following renewal configurations "
                "were invalid:")
@@ -394,6 +444,27 @@ def _describe_certs(config: configuration.NamespaceConfig,
     display_util.notification("\n".join(out), pause=False, wrap=False)
 
 
+def _lineage_index(config: configuration.NamespaceConfig) -> lineage_index.LineageIndex:
+    return lineage_index.LineageIndex(
+        os.path.join(config.config_dir, constants.LINEAGE_INDEX_FILE))
+
+
+def _save_lineage_index(index: lineage_index.LineageIndex) -> None:
+    """Save the lineage index, which is only a cache, ignoring any error."""
+    try:
+        index.save()
+    except OSError:
+        logger.debug("Unable to save the lineage index", exc_info=True)
+
+
+def _save_ocsp_cache(config: configuration.NamespaceConfig) -> None:
+    """Save the OCSP response cache, ignoring any error."""
+    try:
+        storage.ocsp_response_cache(config).save()
+    except OSError:
+        logger.debug("Unable to save the OCSP response cache", exc_info=True)
+
+
 T = TypeVar('T')
 
 def _search_lineages(cli_config: configuration.NamespaceConfig, func: Callable[..., T],
@@ -361,6 +361,15 @@ def prepare_and_parse_args(plugins: plugins_disco.PluginsRegistry, args: List[st
     helpful.add(
         "security", "--no-staple-ocsp", action="store_false", dest="staple",
         default=flag_default("staple"), help=argparse.SUPPRESS)
+    helpful.add(
+        "security", "--export-ocsp-staple", action="store_true",
+        dest="export_ocsp_staple", default=flag_default("export_ocsp_staple"),
+        help="Write the OCSP response for each certificate to ocsp.der in its live"
+        " directory, and refresh it halfway through its validity when running"
+        " \"certbot renew\", for web servers which staple OCSP responses read"
+        " from a file. The setting is saved for renewal, and the installer of"
+        " the certificate, if any, is reloaded after its response is refreshed."
+        " Other web servers need to be reloaded separately. (default: False)")
     helpful.add(
         "security", "--strict-permissions", action="store_true",
         default=flag_default("strict_permissions"),
@@ -398,6 +407,15 @@ def prepare_and_parse_args(plugins: plugins_disco.PluginsRegistry, args: List[st
         dest="issuance_timeout",
         default=flag_default("issuance_timeout"),
         help=config_help("issuance_timeout"))
+    helpful.add(
+        [None, "certonly", "run", "renew"], "--polling-profile",
+        choices=["default", "aggressive", "gentle"], dest="polling_profile",
+        default=flag_default("polling_profile"),
+        help="How often to check whether the ACME server validated the"
+        " challenges and issued the certificate. \"aggressive\" checks"
+        " quickly at first and backs off up to every 5 seconds, \"gentle\""
+        " backs off up to every minute to spare busy servers. Any Retry-After"
+        " the server sends is honored. (default: default)")
     helpful.add(
         ["renew", "reconfigure"], "--pre-hook",
         help="Command to be run in a shell before obtaining any certificates."
@@ -427,6 +445,92 @@ def prepare_and_parse_args(plugins: plugins_disco.PluginsRegistry, args: List[st
         "renew", "--no-random-sleep-on-renew", action="store_false",
         default=flag_default("random_sleep_on_renew"), dest="random_sleep_on_renew",
         help=argparse.SUPPRESS)
+    helpful.add(
+        "renew", "--renew-concurrency", type=nonnegative_int, metavar="N",
+        default=flag_default("renew_concurrency"), dest="renew_concurrency",
+        help="Number of certificates to check and renew at the same time."
+        " Certificates using an installer or the standalone plugin are still"
+        " renewed one at a time. Hooks are run as if certificates were renewed"
+        " sequentially: the deploy hooks of a certificate never run at the same"
+        " time as those of another one. (default: 1)")
+    helpful.add(
+        "renew", "--acme-pool-connections", type=nonnegative_int, metavar="N",
+        default=flag_default("acme_pool_connections"), dest="acme_pool_connections",
+        help="Number of ACME servers to keep pools of open connections for."
+        " (default: 10)")
+    helpful.add(
+        "renew", "--acme-pool-maxsize", type=nonnegative_int, metavar="N",
+        default=flag_default("acme_pool_maxsize"), dest="acme_pool_maxsize",
+        help="Maximum number of connections to keep open to each ACME server."
+        " When using --renew-concurrency, set it to at least the concurrency so"
+        " connections are reused instead of being reopened with a new TLS"
+        " handshake. (default: 10)")
+    helpful.add(
+        "renew", "--acme-pool-block", action="store_true",
+        default=flag_default("acme_pool_block"), dest="acme_pool_block",
+        help="Wait for a connection to the ACME server to be free instead of"
+        " opening one that won't be kept once --acme-pool-maxsize connections"
+        " are in use. (default: False)")
+    helpful.add(
+        "renew", "--acme-get-retries", type=nonnegative_int, metavar="N",
+        default=flag_default("acme_get_retries"), dest="acme_get_retries",
+        help="Number of times to retry GET and HEAD requests to the ACME server"
+        " after connection errors or server errors, with exponential backoff."
+        " Signed POST requests are never retried once sent. (default: 0)")
+    helpful.add(
+        "renew", "--daemon", action="store_true", default=flag_default("daemon"),
+        help="Keep running and renew each certificate when it's due instead of"
+        " checking all certificates once and exiting. Each certificate is only"
+        " checked again when its renewal time, its renew_before_expiry time"
+        " or the time to fetch its ACME Renewal Info again comes, or at least"
+        " every 12 hours. Renewal configuration files added, changed or removed"
+        " while running are noticed within a minute. Certbot's directories are"
+        " only locked while certificates are checked or renewed, so other"
+        " Certbot commands can run in the meantime. (default: False)")
+    helpful.add(
+        "renew", "--shard-count", type=nonnegative_int, metavar="N",
+        default=flag_default("shard_count"), dest="shard_count",
+        help="Split the certificates between N hosts sharing the same"
+        " configuration directory, each running certbot renew with its own"
+        " --shard-index. Certificates are assigned to hosts by hashing their"
+        " names, so changing N only moves the certificates of the added or"
+        " removed hosts. (default: 1)")
+    helpful.add(
+        "renew", "--shard-index", type=nonnegative_int, metavar="I",
+        default=flag_default("shard_index"), dest="shard_index",
+        help="Only renew the certificates assigned to host I, between 0 and"
+        " N-1, when using --shard-count N. (default: 0)")
+    helpful.add(
+        "renew", "--renewal-report", metavar="PATH",
+        default=flag_default("renewal_report"), dest="renewal_report",
+        help="Write the results of certbot renew to PATH as JSON. The reports"
+        " of all hosts using --shard-count can be merged into a single report"
+        " with --merge-renewal-reports. (default: None)")
+    helpful.add(
+        "renew", "--merge-renewal-reports", nargs="+", metavar="REPORT",
+        default=flag_default("merge_renewal_reports"), dest="merge_renewal_reports",
+        help="Instead of renewing certificates, combine the reports written with"
+        " --renewal-report by the hosts using --shard-count, show their results"
+        " and write the combined report to the path given by --renewal-report,"
+        " if any. Fails if the results of a shard are missing or if any"
+        " renewal failed. (default: None)")
+    helpful.add(
+        "renew", "--renew-rate-limit", type=nonnegative_int, metavar="N",
+        default=flag_default("renew_rate_limit"), dest="renew_rate_limit",
+        help="Renew at most N certificates per hour from each ACME server, in"
+        " bursts of up to N certificates. 0 means no limit. (default: 0)")
+    helpful.add(
+        "renew", "--renew-domain-rate-limit", type=nonnegative_int, metavar="N",
+        default=flag_default("renew_domain_rate_limit"), dest="renew_domain_rate_limit",
+        help="Renew at most N certificates per hour for each registered domain,"
+        " such as example.com, in bursts of up to N certificates. 0 means no"
+        " limit. (default: 0)")
+    helpful.add(
+        "renew", "--rate-limit-max-wait", type=nonnegative_int, metavar="SECONDS",
+        default=flag_default("rate_limit_max_wait"), dest="rate_limit_max_wait",
+        help="If the ACME server reports that a rate limit was reached and asks"
+        " to retry within SECONDS, pause renewals from that server and for the"
+        " same registered domains and retry instead of failing. (default: 600)")
     helpful.add(
         ["renew", "reconfigure"], "--deploy-hook", action=_DeployHookAction,
         help='Command to be run in a shell once for each successfully'
@@ -309,6 +309,21 @@ class HelpfulArgumentParser:
             raise errors.Error(
                 "Parameters --hsts and --auto-hsts cannot be used simultaneously.")
 
+        if config.shard_count < 1:
+            raise errors.Error("--shard-count must be at least 1.")
+
+        if config.shard_index >= config.shard_count:
+            raise errors.Error(
+                "--shard-index must be lower than --shard-count, starting at 0.")
+
+        if config.merge_renewal_reports and config.daemon:
+            raise errors.Error(
+                "Parameters --merge-renewal-reports and --daemon cannot be used simultaneously.")
+
+        if config.acme_pool_connections < 1 or config.acme_pool_maxsize < 1:
+            raise errors.Error(
+                "--acme-pool-connections and --acme-pool-maxsize must be at least 1.")
+
         if isinstance(config.key_type, list) and len(config.key_type) > 1:
             raise errors.Error(
                 "Only *one* --key-type type may be provided at this time.")
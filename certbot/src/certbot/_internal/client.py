@@ -25,6 +25,7 @@ from acme import client as acme_client
 from acme import crypto_util as acme_crypto_util
 from acme import errors as acme_errors
 from acme import messages
+from acme import polling
 import certbot
 from certbot import configuration
 from certbot import crypto_util
@@ -47,6 +48,13 @@ from certbot.interfaces import AccountStorage
 
 logger = logging.getLogger(__name__)
 
+# Polling strategies selectable with --polling-profile
+POLLING_PROFILES: Dict[str, Optional[polling.PollingStrategy]] = {
+    "default": None,
+    "aggressive": polling.AGGRESSIVE,
+    "gentle": polling.GENTLE,
+}
+
 
 def create_acme_client(config: configuration.NamespaceConfig,
                          key: Optional[jose.JWK] = None,
@@ -69,13 +77,45 @@ def create_acme_client(config: configuration.NamespaceConfig,
             )
     net = acme_client.ClientNetwork(key, alg=alg, account=regr,
                                     verify_ssl=(not config.no_verify_ssl),
-                                    user_agent=determine_user_agent(config))
+                                    user_agent=determine_user_agent(config),
+                                    **network_options(config))
 
     server = config.server
     if server_override:
         server = server_override
     directory = acme_client.ClientV2.get_directory(server, net)
-    return acme_client.ClientV2(directory, net)
+    return acme_client.ClientV2(directory, net, polling_strategy=polling_strategy(config))
+
+
+def network_options(config: configuration.NamespaceConfig) -> Dict[str, Any]:
+    """Connection pooling and retry options for `acme.client.ClientNetwork`.
+
+    :param configuration.NamespaceConfig config: Configuration object
+
+    :returns: keyword arguments for `acme.client.ClientNetwork`
+    :rtype: `dict`
+
+    """
+    return {
+        "pool_connections": config.acme_pool_connections,
+        "pool_maxsize": config.acme_pool_maxsize,
+        "pool_block": config.acme_pool_block,
+        "get_retries": config.acme_get_retries,
+    }
+
+
+def polling_strategy(config: configuration.NamespaceConfig
+                     ) -> Optional[polling.PollingStrategy]:
+    """How long to wait between polls of orders and authorizations.
+
+    :param configuration.NamespaceConfig config: Configuration object
+
+    :returns: the strategy of the profile chosen with --polling-profile, or
+        `None` to keep the default of each polling step
+    :rtype: `acme.polling.PollingStrategy` or `None`
+
+    """
+    return POLLING_PROFILES[config.polling_profile]
 
 
 def determine_user_agent(config: configuration.NamespaceConfig) -> str:
@@ -302,7 +342,10 @@ class Client:
         self.auth_handler: Optional[auth_handler.AuthHandler]
         if auth is not None:
             self.auth_handler = auth_handler.AuthHandler(
-                auth, self.acme, self.account, self.config.pref_challs)
+                auth, self.acme, self.account, self.config.pref_challs,
+                polling_strategy(self.config),
+                # Don't poll on more threads than the ACME client keeps connections for
+                max_poll_workers=self.config.acme_pool_maxsize)
         else:
             self.auth_handler = None
 
@@ -56,6 +56,10 @@ CLI_DEFAULTS: Dict[str, Any] = dict(  # pylint: disable=use-dict-literal
     debug=False,
     debug_challenges=False,
     no_verify_ssl=False,
+    acme_pool_connections=10,
+    acme_pool_maxsize=10,
+    acme_pool_block=False,
+    acme_get_retries=0,
     http01_port=challenges.HTTP01Response.PORT,
     http01_address="",
     https_port=443,
@@ -69,6 +73,7 @@ CLI_DEFAULTS: Dict[str, Any] = dict(  # pylint: disable=use-dict-literal
     hsts=None, # listed as False in help output
     uir=None, # listed as False in help output
     staple=None, # listed as False in help output
+    export_ocsp_staple=False,
     strict_permissions=False,
     required_profile=None,
     preferred_profile=None,
@@ -80,10 +85,20 @@ CLI_DEFAULTS: Dict[str, Any] = dict(  # pylint: disable=use-dict-literal
     new_key=False,
     disable_renew_updates=False,
     random_sleep_on_renew=True,
+    renew_concurrency=1,
+    daemon=False,
+    shard_count=1,
+    shard_index=0,
+    renewal_report=None,
+    merge_renewal_reports=None,
+    renew_rate_limit=0,
+    renew_domain_rate_limit=0,
+    rate_limit_max_wait=600,
     eab_hmac_key=None,
     eab_kid=None,
     eab_hmac_alg="HS256",
     issuance_timeout=90,
+    polling_profile="default",
     run_deploy_hooks=False,
 
     # Subparsers
@@ -194,6 +209,18 @@ RENEWAL_CONFIGS_DIR = "renewal"
 """Renewal configs directory, relative
 to `certbot.configuration.NamespaceConfig.config_dir`."""
 
+ARI_CACHE_FILE = "ari-cache.json"
+"""File caching ACME Renewal Info (ARI) for certificates, relative
+to `certbot.configuration.NamespaceConfig.config_dir`."""
+
+LINEAGE_INDEX_FILE = "lineage-index.json"
+"""File indexing metadata about certificate lineages, relative to
+`certbot.configuration.NamespaceConfig.config_dir`."""
+
+OCSP_CACHE_FILE = "ocsp-cache.json"
+"""File caching verified OCSP responses, relative to
+`certbot.configuration.NamespaceConfig.config_dir`."""
+
 RENEWAL_HOOKS_DIR = "renewal-hooks"
 """Basename of directory containing hooks to run with the renew command."""
 
@@ -2,6 +2,7 @@
 import functools
 import logging
 import signal
+import threading
 import traceback
 from types import TracebackType
 from typing import Any
@@ -134,7 +135,15 @@ class ErrorHandler:
             self.funcs.pop()
 
     def _set_signal_handlers(self) -> None:
-        """Sets signal handlers for signals in _SIGNALS."""
+        """Sets signal handlers for signals in _SIGNALS.
+
+        Signal handlers can only be installed from the main thread, so when
+        used from a worker thread (e.g. during `certbot renew
+        --renew-concurrency`), only exceptions trigger the cleanup functions.
+
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
         for signum in _SIGNALS:
             prev_handler = signal.getsignal(signum)
             # If prev_handler is None, the handler was set outside of Python
@@ -1,6 +1,7 @@
 """Facilities for implementing hooks that call shell commands."""
 
 import logging
+import threading
 from typing import Dict
 from typing import List
 from typing import Optional
@@ -83,6 +84,7 @@ def pre_hook(config: configuration.NamespaceConfig) -> None:
 
 
 executed_pre_hooks: Set[str] = set()
+_pre_hooks_lock = threading.Lock()
 
 
 def _run_pre_hook_if_necessary(command: str) -> None:
@@ -94,11 +96,14 @@ def _run_pre_hook_if_necessary(command: str) -> None:
     :param str command: pre-hook to be run
 
     """
-    if command in executed_pre_hooks:
-        logger.info("Pre-hook command already run, skipping: %s", command)
-    else:
-        _run_hook("pre-hook", command)
-        executed_pre_hooks.add(command)
+    # Hold the lock while the hook runs so that concurrent renewals wait for
+    # the pre-hook to finish before trying to obtain their certificates.
+    with _pre_hooks_lock:
+        if command in executed_pre_hooks:
+            logger.info("Pre-hook command already run, skipping: %s", command)
+        else:
+            _run_hook("pre-hook", command)
+            executed_pre_hooks.add(command)
 
 
 def post_hook(
@@ -151,6 +156,7 @@ def post_hook(
 
 
 post_hooks: List[str] = []
+_post_hooks_lock = threading.Lock()
 
 
 def _run_eventually(command: str) -> None:
@@ -162,8 +168,9 @@ def _run_eventually(command: str) -> None:
     :param str command: post-hook to register to be run
 
     """
-    if command not in post_hooks:
-        post_hooks.append(command)
+    with _post_hooks_lock:
+        if command not in post_hooks:
+            post_hooks.append(command)
 
 
 def run_saved_post_hooks(renewed_domains: List[str], failed_domains: List[str]) -> None:
@@ -192,6 +199,25 @@ def run_saved_post_hooks(renewed_domains: List[str], failed_domains: List[str])
         )
 
 
+def reset_saved_hooks() -> None:
+    """Forget which pre-hooks were run and which post-hooks were saved.
+
+    This lets the hooks run again for the next batch of renewals of a
+    long-running Certbot process, such as `certbot renew --daemon`.
+
+    """
+    with _pre_hooks_lock:
+        executed_pre_hooks.clear()
+    with _post_hooks_lock:
+        post_hooks.clear()
+
+
+# Deploy hooks often reload the same server, and are given the renewed lineage
+# through the environment of the process, so the deploy hooks of certificates
+# renewed concurrently are run one lineage at a time.
+_deploy_hooks_lock = threading.Lock()
+
+
 def deploy_hook(config: configuration.NamespaceConfig, domains: List[str],
                 lineage_path: str) -> None:
     """Run post-issuance hook if defined.
@@ -203,8 +229,9 @@ def deploy_hook(config: configuration.NamespaceConfig, domains: List[str],
 
     """
     if config.deploy_hook:
-        _run_deploy_hook(config.deploy_hook, domains,
-                         lineage_path, config.dry_run, config.run_deploy_hooks)
+        with _deploy_hooks_lock:
+            _run_deploy_hook(config.deploy_hook, domains,
+                             lineage_path, config.dry_run, config.run_deploy_hooks)
 
 
 def renew_hook(config: configuration.NamespaceConfig, domains: List[str],
@@ -217,7 +244,9 @@ def renew_hook(config: configuration.NamespaceConfig, domains: List[str],
     config.renewal_deploy_hooks_dir, it is not run twice.
 
     If Certbot is doing a dry run, no hooks are run and messages are
-    logged saying that they were skipped.
+    logged saying that they were skipped. When certificates are renewed
+    concurrently, the hooks of another certificate wait for these ones to
+    finish.
 
     :param configuration.NamespaceConfig config: Certbot settings
     :param domains: domains in the obtained certificate
@@ -229,12 +258,14 @@ def renew_hook(config: configuration.NamespaceConfig, domains: List[str],
     all_hooks: List[str] = (list_hooks(config.renewal_deploy_hooks_dir)if config.directory_hooks
         else [])
     all_hooks += [config.renew_hook] if config.renew_hook else []
-    for hook in all_hooks:
-        if hook in executed_hooks:
-            logger.info("Skipping deploy-hook '%s' as it was already run.", hook)
-        else:
-            _run_deploy_hook(hook, domains, lineage_path, config.dry_run, config.run_deploy_hooks)
-            executed_hooks.add(hook)
+    with _deploy_hooks_lock:
+        for hook in all_hooks:
+            if hook in executed_hooks:
+                logger.info("Skipping deploy-hook '%s' as it was already run.", hook)
+            else:
+                _run_deploy_hook(hook, domains, lineage_path, config.dry_run,
+                                 config.run_deploy_hooks)
+                executed_hooks.add(hook)
 
 
 def _run_deploy_hook(command: str, domains: List[str], lineage_path: str, dry_run: bool,
@@ -0,0 +1,243 @@
+"""An index of metadata about the certificate lineages managed by Certbot."""
+import datetime
+import logging
+import threading
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+from cryptography import x509
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from acme import client as acme_client
+
+from certbot import crypto_util
+from certbot import errors
+from certbot._internal import state_file
+from certbot._internal import storage
+from certbot.compat import filesystem
+from certbot.compat import os
+
+logger = logging.getLogger(__name__)
+
+
+class LineageMetadata(NamedTuple):
+    """Metadata about the current certificate of a lineage.
+
+    Times are timezone aware. `version` is the archive version the live
+    certificate symlink points to and `deployed` tells whether it is the
+    latest version in the archive. `ari_cert_id` is the ACME Renewal Info
+    identifier of the certificate, if it has one. `autorenew`,
+    `renew_before_expiry`, `installer` and `export_ocsp_staple` come from the
+    renewal configuration file.
+    """
+    names: List[str]
+    not_before: datetime.datetime
+    not_after: datetime.datetime
+    serial: int
+    key_type: str
+    server: Optional[str]
+    version: int
+    fullchain: str
+    deployed: bool
+    ari_cert_id: Optional[str]
+    autorenew: bool
+    renew_before_expiry: Optional[str]
+    installer: Optional[str]
+    export_ocsp_staple: bool
+
+
+class _IndexEntry(NamedTuple):
+    paths: List[str]
+    stamp: List[List[int]]
+    metadata: LineageMetadata
+    verified: bool
+
+
+class LineageIndex:
+    """A persistent index of `LineageMetadata` for each lineage.
+
+    Finding the names or expiry of a lineage requires reading and parsing its
+    certificate and private key. This index keeps that information in a JSON
+    file so it only needs to be read from the PEM files again when the lineage
+    changes.
+
+    Entries are keyed by the path of the renewal configuration file of the
+    lineage and are only used if the inode and modification time of that file,
+    of the live symlinks, of their targets and of the archive directory haven't
+    changed since the entry was created.
+    """
+    VERSION = 3
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._entries: Optional[Dict[str, _IndexEntry]] = None
+        self._dirty = False
+        # With --renew-concurrency, lineages are examined from several threads at once
+        self._lock = threading.Lock()
+
+    def get(self, lineage: storage.RenewableCert, verify: bool = False) -> LineageMetadata:
+        """Return the metadata of a lineage, reading its files only if it changed.
+
+        :param storage.RenewableCert lineage: the lineage
+        :param bool verify: whether the lineage must also have been checked
+            with `certbot.crypto_util.verify_renewable_cert` since it last
+            changed
+
+        :returns: metadata about the current certificate of the lineage
+        :rtype: LineageMetadata
+
+        :raises errors.Error: if `verify` is set and verification fails
+
+        """
+        key = lineage.configfile.filename
+        # The stamp is taken before reading the lineage, so a concurrent
+        # change is noticed the next time this lineage is looked up.
+        paths = _lineage_paths(lineage)
+        stamp = _stamp(paths)
+        with self._lock:
+            entry = self._load().get(key)
+
+        if entry is not None and entry.stamp == stamp:
+            if entry.verified or not verify:
+                return entry.metadata
+            metadata = entry.metadata
+        else:
+            logger.debug("Reading metadata of lineage %s", lineage.lineagename)
+            metadata = _read_metadata(lineage)
+        if verify:
+            crypto_util.verify_renewable_cert(lineage)
+
+        with self._lock:
+            self._load()[key] = _IndexEntry(paths, stamp, metadata, verify)
+            self._dirty = True
+        return metadata
+
+    def lookup(self, renewal_file: str) -> Optional[LineageMetadata]:
+        """Return the metadata of a lineage without reading its renewal configuration.
+
+        :param str renewal_file: path to the renewal configuration file of the lineage
+
+        :returns: the metadata of the lineage, or `None` if it isn't in the
+            index or changed since it was last read with `get`
+        :rtype: LineageMetadata or None
+
+        """
+        with self._lock:
+            entry = self._load().get(renewal_file)
+        if entry is None:
+            return None
+        try:
+            if _stamp(entry.paths) != entry.stamp:
+                return None
+        except OSError:
+            return None
+        return entry.metadata
+
+    def save(self) -> None:
+        """Write the index to disk, dropping lineages which no longer exist."""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = {key: {"paths": entry.paths,
+                             "stamp": entry.stamp,
+                             "verified": entry.verified,
+                             "metadata": _serialize(entry.metadata)}
+                       for key, entry in self._load().items() if os.path.exists(key)}
+            state_file.save_json(self._path, self.VERSION, {"entries": entries})
+            self._dirty = False
+
+    def _load(self) -> Dict[str, _IndexEntry]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = state_file.load_json(
+            self._path, self.VERSION, _parse_index, "lineage index") or {}
+        return self._entries
+
+
+def _parse_index(data: Dict[str, Any]) -> Dict[str, _IndexEntry]:
+    return {key: _IndexEntry(list(fields["paths"]), fields["stamp"],
+                             _deserialize(fields["metadata"]), bool(fields["verified"]))
+            for key, fields in data["entries"].items()}
+
+
+def _lineage_paths(lineage: storage.RenewableCert) -> List[str]:
+    """Paths whose state identifies the current state of a lineage."""
+    # The state of the symlinks is the state of the archived files they point to
+    paths = [lineage.configfile.filename]
+    paths.extend(getattr(lineage, kind) for kind in storage.ALL_FOUR)
+    # New versions in the archive directory change its modification time
+    paths.append(os.path.dirname(filesystem.realpath(lineage.cert)))
+    return paths
+
+
+def _stamp(paths: List[str]) -> List[List[int]]:
+    """Inodes and modification times identifying the current state of `paths`."""
+    stamp = []
+    for path in paths:
+        state = filesystem.file_state(path)
+        stamp.append([state.inode, state.mtime_ns])
+    return stamp
+
+
+def _read_metadata(lineage: storage.RenewableCert) -> LineageMetadata:
+    cert_path = lineage.current_target("cert")
+    version = lineage.current_version("cert")
+    if cert_path is None or version is None:
+        raise errors.CertStorageError("could not find the certificate file")
+    cert = crypto_util.load_cert(cert_path)
+    try:
+        ari_cert_id: Optional[str] = acme_client.renewal_info_cert_id(cert)
+    except (x509.ExtensionNotFound, ValueError):
+        ari_cert_id = None
+    renewalparams = lineage.configuration.get("renewalparams", {})
+    installer = renewalparams.get("installer")
+    return LineageMetadata(
+        names=lineage.names(),
+        not_before=cert.not_valid_before_utc,
+        not_after=cert.not_valid_after_utc,
+        serial=cert.serial_number,
+        # Same as lineage.private_key_type, without reading the private key
+        key_type="RSA" if isinstance(cert.public_key(), rsa.RSAPublicKey) else "ECDSA",
+        # Unlike lineage.server, this tolerates lineages without renewal parameters
+        server=renewalparams.get("server"),
+        version=version,
+        fullchain=lineage.fullchain,
+        deployed=not lineage.has_pending_deployment(),
+        ari_cert_id=ari_cert_id,
+        # Same as lineage.autorenewal_is_enabled(), tolerating missing renewal parameters
+        autorenew=("autorenew" not in renewalparams
+                   or renewalparams.as_bool("autorenew")),
+        renew_before_expiry=lineage.configuration.get("renew_before_expiry"),
+        installer=installer if installer not in (None, "None") else None,
+        export_ocsp_staple=("export_ocsp_staple" in renewalparams
+                            and renewalparams.as_bool("export_ocsp_staple")),
+    )
+
+
+def _serialize(metadata: LineageMetadata) -> Dict[str, Any]:
+    fields = metadata._asdict()
+    fields["not_before"] = metadata.not_before.isoformat()
+    fields["not_after"] = metadata.not_after.isoformat()
+    return fields
+
+
+def _deserialize(fields: Dict[str, Any]) -> LineageMetadata:
+    return LineageMetadata(
+        names=list(fields["names"]),
+        not_before=datetime.datetime.fromisoformat(fields["not_before"]),
+        not_after=datetime.datetime.fromisoformat(fields["not_after"]),
+        serial=int(fields["serial"]),
+        key_type=fields["key_type"],
+        server=fields["server"],
+        version=int(fields["version"]),
+        fullchain=fields["fullchain"],
+        deployed=bool(fields["deployed"]),
+        ari_cert_id=fields["ari_cert_id"],
+        autorenew=bool(fields["autorenew"]),
+        renew_before_expiry=fields["renew_before_expiry"],
+        installer=fields["installer"],
+        export_ocsp_staple=bool(fields["export_ocsp_staple"]),
+    )
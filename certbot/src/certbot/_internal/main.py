@@ -38,6 +38,7 @@ from certbot._internal import constants
 from certbot._internal import eff
 from certbot._internal import hooks
 from certbot._internal import log
+from certbot._internal import ocsp_staple
 from certbot._internal import renewal
 from certbot._internal import snap_config
 from certbot._internal import storage
@@ -147,6 +148,9 @@ def _get_and_save_cert(le_client: client.Client, config: configuration.Namespace
     finally:
         hooks.post_hook(config, renewed_domains)
 
+    if lineage is not None and config.export_ocsp_staple and not config.dry_run:
+        ocsp_staple.export_staple(config, lineage, force=True)
+
     return lineage
 
 
@@ -1606,20 +1610,25 @@ def certonly(config: configuration.NamespaceConfig, plugins: plugins_disco.Plugi
 
 
 def renew(config: configuration.NamespaceConfig,
-          unused_plugins: plugins_disco.PluginsRegistry) -> None:
+          plugins: plugins_disco.PluginsRegistry) -> None:
     """Renew previously-obtained certificates.
 
     :param config: Configuration object
     :type config: configuration.NamespaceConfig
 
-    :param unused_plugins: List of plugins (deprecated)
-    :type unused_plugins: plugins_disco.PluginsRegistry
+    :param plugins: List of plugins
+    :type plugins: plugins_disco.PluginsRegistry
 
     :returns: `None`
     :rtype: None
 
     """
-    renewal.handle_renewal_request(config)
+    if config.merge_renewal_reports:
+        renewal.merge_renewal_reports(config)
+    elif config.daemon:
+        renewal.run_renewal_daemon(config, plugins)
+    else:
+        renewal.handle_renewal_request(config, plugins)
 
 
 def make_or_verify_needed_dirs(config: configuration.NamespaceConfig) -> None:
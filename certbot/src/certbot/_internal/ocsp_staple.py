@@ -0,0 +1,123 @@
+"""Exporting OCSP responses next to lineages for web servers to staple from disk."""
+import datetime
+import logging
+from typing import Optional
+
+from cryptography import x509
+from cryptography.exceptions import UnsupportedAlgorithm
+from cryptography.hazmat.primitives import serialization
+from cryptography.x509 import ocsp as ocsp_lib
+
+from certbot import configuration
+from certbot import ocsp
+from certbot._internal import state_file
+from certbot._internal import storage
+
+logger = logging.getLogger(__name__)
+
+# How long responses without nextUpdate are used before being refreshed
+REFRESH_WITHOUT_NEXT_UPDATE = datetime.timedelta(hours=12)
+
+
+def refresh_time(response: ocsp_lib.OCSPResponse) -> datetime.datetime:
+    """When should an exported OCSP response be replaced by a newer one?
+
+    Responses are refreshed halfway through their validity period, so web
+    servers always have a current response even if the OCSP responder is
+    unavailable for a while.
+
+    :param cryptography.x509.ocsp.OCSPResponse response: the response
+
+    :returns: time at which the response should be refreshed
+    :rtype: datetime.datetime
+
+    """
+    if response.next_update_utc is None:
+        return response.this_update_utc + REFRESH_WITHOUT_NEXT_UPDATE
+    return response.this_update_utc + (response.next_update_utc - response.this_update_utc) / 2
+
+
+def exported_refresh_time(live_dir: str, fullchain_path: str) -> Optional[datetime.datetime]:
+    """When should the OCSP response exported in `live_dir` be refreshed?
+
+    A response about another certificate than the current one of the
+    lineage, such as the one it replaced when it was renewed, must be
+    refreshed right away.
+
+    :param str live_dir: live directory of the lineage
+    :param str fullchain_path: path to the current certificate and chain of
+        the lineage
+
+    :returns: time at which the exported response should be refreshed, or
+        `None` if there is no readable exported response about the current
+        certificate
+    :rtype: datetime.datetime or None
+
+    """
+    try:
+        with open(ocsp.staple_path(live_dir), "rb") as f:
+            response = ocsp_lib.load_der_ocsp_response(f.read())
+        if response.response_status != ocsp_lib.OCSPResponseStatus.SUCCESSFUL:
+            return None
+        if not _is_about(response, fullchain_path):
+            logger.debug("OCSP staple in %s is about another certificate", live_dir)
+            return None
+        return refresh_time(response)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, UnsupportedAlgorithm):
+        logger.debug("Ignoring unreadable OCSP staple in %s", live_dir, exc_info=True)
+        return None
+
+
+def _is_about(response: ocsp_lib.OCSPResponse, fullchain_path: str) -> bool:
+    """Is `response` about the certificate at the start of `fullchain_path`?"""
+    with open(fullchain_path, "rb") as f:
+        certs = x509.load_pem_x509_certificates(f.read())
+    if len(certs) < 2:
+        return False
+    request = ocsp_lib.OCSPRequestBuilder().add_certificate(
+        certs[0], certs[1], response.hash_algorithm).build()
+    return (response.serial_number == request.serial_number
+            and response.issuer_key_hash == request.issuer_key_hash)
+
+
+def export_staple(config: configuration.NamespaceConfig, lineage: storage.RenewableCert,
+                  force: bool = False) -> Optional[datetime.datetime]:
+    """Write the OCSP response about the certificate of `lineage` to its live directory.
+
+    The response is only fetched again once the exported one is due for a
+    refresh or is about another certificate, unless `force` is set. It is
+    replaced atomically, so web servers never read a partial response.
+    Errors are logged rather than raised.
+
+    :param configuration.NamespaceConfig config: Configuration object
+    :param storage.RenewableCert lineage: the lineage
+    :param bool force: whether to fetch a new response even if the exported
+        one is still current, such as after the certificate was renewed
+
+    :returns: time at which the exported response should be refreshed, or
+        `None` if no response could be exported
+    :rtype: datetime.datetime or None
+
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    if not force:
+        refresh = exported_refresh_time(lineage.live_dir, lineage.fullchain_path)
+        if refresh is not None and refresh > now:
+            return refresh
+
+    path = ocsp.staple_path(lineage.live_dir)
+    try:
+        response = storage.revocation_checker(config).ocsp_response(
+            lineage.cert_path, lineage.chain_path, use_cached=False)
+        if response is None:
+            logger.warning("Unable to fetch an OCSP response to export to %s", path)
+            return None
+        state_file.write(path, response.public_bytes(serialization.Encoding.DER))
+    except Exception as error:  # pylint: disable=broad-except
+        logger.warning("Unable to export the OCSP response to %s: %s", path, error)
+        logger.debug("Exception was:", exc_info=True)
+        return None
+    logger.debug("Exported OCSP response for stapling to %s", path)
+    return refresh_time(response)
@@ -1,4 +1,5 @@
 """Utilities for plugins discovery and selection."""
+import copy
 import logging
 import sys
 from typing import Callable
@@ -125,6 +126,18 @@ class PluginEntryPoint:
         # Mypy seems to fail to understand the actual type here, let's help it.
         return cast(Union[bool, Error], self._prepared)
 
+    def uninitialized_copy(self) -> 'PluginEntryPoint':
+        """Copy of this entry point whose plugin is neither initialized nor prepared.
+
+        The plugin class is shared with the copy, so the entry point isn't loaded again.
+
+        """
+        plugin_ep = copy.copy(self)
+        # pylint: disable=protected-access
+        plugin_ep._initialized = None
+        plugin_ep._prepared = None
+        return plugin_ep
+
     @property
     def misconfigured(self) -> bool:
         """Is plugin misconfigured?"""
@@ -167,6 +180,9 @@ class PluginEntryPoint:
 class PluginsRegistry(Mapping):
     """Plugins registry."""
 
+    discoveries = 0
+    """Number of times plugins were discovered by `find_all` in this process."""
+
     def __init__(self, plugins: Mapping[str, PluginEntryPoint]) -> None:
         # plugins are sorted so the same order is used between runs.
         # This prevents deadlock caused by plugins acquiring a lock
@@ -200,6 +216,9 @@ class PluginsRegistry(Mapping):
                     "You may need to remove or update this plugin. The Certbot log will "
                     "contain the full error details and this should be reported to the "
                     "plugin developer.") from e
+        PluginsRegistry.discoveries += 1
+        logger.debug("Discovered %d plugins (plugin discovery #%d in this process)",
+                     len(plugins), PluginsRegistry.discoveries)
         return cls(plugins)
 
     @classmethod
@@ -240,6 +259,18 @@ class PluginsRegistry(Mapping):
         return type(self)({name: plugin_ep for name, plugin_ep
                            in self._plugins.items() if pred(plugin_ep)})
 
+    def uninitialized_copy(self) -> "PluginsRegistry":
+        """Copy the registry without any of its initialized or prepared plugins.
+
+        Initialized plugins are memoized along with the configuration they
+        were initialized with. This provides plugins which can be initialized
+        with another configuration, such as the one of another lineage being
+        renewed, without discovering and loading the plugins again.
+
+        """
+        return type(self)({name: plugin_ep.uninitialized_copy() for name, plugin_ep
+                           in self._plugins.items()})
+
     def visible(self) -> "PluginsRegistry":
         """Filter plugins based on visibility."""
         return self.filter(lambda plugin_ep: not plugin_ep.hidden)
@@ -0,0 +1,126 @@
+"""Pacing of certificate issuance during `certbot renew`."""
+import logging
+import threading
+import time
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """A token bucket allowing `rate` requests per hour, in bursts of up to `rate`.
+
+    A `rate` of 0 doesn't limit requests, but the bucket can still be paused
+    with `pause_until`, for example until the time given by a server in a
+    ``Retry-After`` header.
+
+    This class is thread safe.
+    """
+    def __init__(self, rate: float) -> None:
+        self._rate = rate / 3600
+        self._capacity = float(rate)
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token from the bucket.
+
+        The bucket may go into debt, so callers reserve tokens in the order
+        they call this method.
+
+        :returns: seconds to wait before the token may be used
+        :rtype: float
+
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            if self._rate:
+                self._tokens = min(self._capacity,
+                                   self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self._rate)
+            return wait
+
+    def pause_until(self, until: float) -> None:
+        """Don't let any token be used before `until`, in `time.monotonic` time."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, until)
+
+
+def registered_domain(name: str) -> str:
+    """Approximate the registered domain of a certificate name.
+
+    Without the Public Suffix List, the registered domain is taken to be the
+    last two labels of the name. Names under suffixes such as co.uk are then
+    grouped together, which only makes the limit more conservative.
+
+    :param str name: domain name, possibly a wildcard
+
+    :returns: registered domain of `name`
+    :rtype: str
+
+    """
+    labels = name.lower().rstrip(".").split(".")
+    return ".".join(labels[-2:])
+
+
+class IssuanceRateLimiter:
+    """Token buckets pacing the renewals of each ACME server and registered domain.
+
+    :param float server_rate: certificates per hour to request from each ACME
+        server, or 0 for no limit
+    :param float domain_rate: certificates per hour to request for each
+        registered domain, or 0 for no limit
+
+    """
+    def __init__(self, server_rate: float, domain_rate: float) -> None:
+        self._server_rate = server_rate
+        self._domain_rate = domain_rate
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, server: str, names: Iterable[str]) -> None:
+        """Sleep until a certificate for `names` may be requested from `server`.
+
+        :param str server: ACME directory URL
+        :param names: names of the certificate
+        :type names: `list` of `str`
+
+        """
+        delay = max(bucket.reserve() for bucket in self._lineage_buckets(server, names))
+        if delay > 0:
+            logger.info("Waiting %d seconds before requesting a certificate from %s to "
+                        "respect issuance rate limits", delay, server)
+            time.sleep(delay)
+
+    def back_off(self, server: str, names: Iterable[str], delay: float) -> None:
+        """Pause requests to `server` and for `names` for `delay` seconds.
+
+        :param str server: ACME directory URL
+        :param names: names of the certificate which was rate limited
+        :type names: `list` of `str`
+        :param float delay: seconds to wait, such as given by ``Retry-After``
+
+        """
+        until = time.monotonic() + delay
+        for bucket in self._lineage_buckets(server, names):
+            bucket.pause_until(until)
+
+    def _lineage_buckets(self, server: str, names: Iterable[str]) -> List[TokenBucket]:
+        keys = [("server", server)]
+        keys.extend(("domain", domain) for domain in
+                    sorted({registered_domain(name) for name in names}))
+        with self._lock:
+            for kind, key in keys:
+                if (kind, key) not in self._buckets:
+                    rate = self._server_rate if kind == "server" else self._domain_rate
+                    self._buckets[(kind, key)] = TokenBucket(rate)
+            return [self._buckets[key] for key in keys]
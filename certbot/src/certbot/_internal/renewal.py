@@ -1,19 +1,25 @@
 """Functionality for autorenewal and associated juggling of configurations"""
+# pylint: disable=too-many-lines
 
-import copy
+import concurrent.futures
 import datetime
+import heapq
 import itertools
 import logging
 import random
 import sys
+import threading
 import time
 import traceback
 from typing import Any
+from typing import Callable
 from typing import Dict
 from typing import Iterable
 from typing import List
 from typing import Mapping
+from typing import NamedTuple
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 from cryptography.hazmat.backends import default_backend
@@ -23,19 +29,28 @@ from cryptography.hazmat.primitives.serialization import load_pem_private_key
 from cryptography import x509
 
 from acme import client as acme_client
+from acme import messages as acme_messages
 
 from certbot import configuration
 from certbot import crypto_util
 from certbot import errors
+from certbot import interfaces
 from certbot import util
 from certbot._internal import cli
 from certbot._internal import client
 from certbot._internal import constants
 from certbot._internal import hooks
+from certbot._internal import lineage_index
+from certbot._internal import ocsp_staple
+from certbot._internal import rate_limit
+from certbot._internal import renewal_shards
+from certbot._internal import state_file
 from certbot._internal import storage
 from certbot._internal import updater
 from certbot._internal.display import obj as display_obj
 from certbot._internal.plugins import disco as plugins_disco
+from certbot._internal.plugins import selection as plug_sel
+from certbot.compat import filesystem
 from certbot.compat import os
 from certbot.display import util as display_util
 
@@ -52,7 +67,7 @@ STR_CONFIG_ITEMS = ["config_dir", "logs_dir", "work_dir", "user_agent",
                     "preferred_profile", "required_profile"]
 INT_CONFIG_ITEMS = ["rsa_key_size", "http01_port"]
 BOOL_CONFIG_ITEMS = ["must_staple", "allow_subset_of_names", "reuse_key",
-                     "autorenew"]
+                     "autorenew", "export_ocsp_staple"]
 
 CONFIG_ITEMS = set(itertools.chain(
     BOOL_CONFIG_ITEMS, INT_CONFIG_ITEMS, STR_CONFIG_ITEMS, ('pref_challs',)))
@@ -65,12 +80,15 @@ class AriClientPool:
     one acme.ClientV2 per server.
 
     This takes a command line configuration object so it can set the User-Agent header and
-    observe the --no-verify-ssl flag.
+    observe the --no-verify-ssl and connection pooling flags.
     """
     def __init__(self, cli_config: configuration.NamespaceConfig):
         self._verify_ssl = not cli_config.no_verify_ssl
         self._user_agent = client.determine_user_agent(cli_config)
+        self._network_options = client.network_options(cli_config)
         self._pool: Dict[str, acme_client.ClientV2] = {}
+        # With --renew-concurrency, lineages are examined from several threads at once
+        self._lock = threading.Lock()
 
     def get(self, server: str) -> acme_client.ClientV2:
         """
@@ -79,16 +97,110 @@ class AriClientPool:
         Returns:
             acme_client.ClientV2: The ACME client associated with the specified server.
         """
-        ari_client = self._pool.get(server, None)
-        if ari_client:
+        with self._lock:
+            ari_client = self._pool.get(server, None)
+            if ari_client:
+                return ari_client
+
+            net = acme_client.ClientNetwork(verify_ssl=self._verify_ssl,
+                                            user_agent=self._user_agent,
+                                            **self._network_options)
+            directory = acme_client.ClientV2.get_directory(server, net)
+            ari_client = acme_client.ClientV2(directory, net)
+
+            self._pool[server] = ari_client
             return ari_client
 
-        net = acme_client.ClientNetwork(verify_ssl=self._verify_ssl, user_agent=self._user_agent)
-        directory = acme_client.ClientV2.get_directory(server, net)
-        ari_client = acme_client.ClientV2(directory, net)
 
-        self._pool[server] = ari_client
-        return ari_client
+class AriCacheEntry(NamedTuple):
+    """ACME Renewal Info (ARI) previously fetched for a certificate.
+
+    The window is None if the ACME server does not support ARI. All times are
+    timezone aware.
+    """
+    window_start: Optional[datetime.datetime]
+    window_end: Optional[datetime.datetime]
+    renewal_time: Optional[datetime.datetime]
+    retry_after: datetime.datetime
+
+
+class AriCache:
+    """A persistent cache of ACME Renewal Info (ARI) for certificates.
+
+    ARI responses include a Retry-After time before which the ACME server
+    shouldn't be asked about the certificate again. This cache keeps the
+    suggested renewal window, the renewal time we randomly picked within it
+    and the Retry-After time of each certificate, so that `certbot renew` only
+    queries ARI for certificates whose Retry-After time has passed.
+
+    Entries are keyed by the certificate's ARI identifier (see
+    `acme.client.renewal_info_cert_id`) and kept in a JSON file.
+    """
+    VERSION = 1
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._entries: Optional[Dict[str, AriCacheEntry]] = None
+        self._dirty = False
+        # With --renew-concurrency, lineages are examined from several threads at once
+        self._lock = threading.Lock()
+
+    def get(self, cert_id: str) -> Optional[AriCacheEntry]:
+        """Return the cached ARI for a certificate if it isn't time to ask again.
+
+        :param str cert_id: ARI identifier of the certificate
+
+        :returns: the cached entry, or None if ARI should be fetched
+        :rtype: AriCacheEntry or None
+
+        """
+        with self._lock:
+            entry = self._load().get(cert_id)
+        if entry is None or entry.retry_after <= datetime.datetime.now(datetime.timezone.utc):
+            return None
+        return entry
+
+    def set(self, cert_id: str, entry: AriCacheEntry) -> None:
+        """Remember freshly fetched ARI for a certificate.
+
+        :param str cert_id: ARI identifier of the certificate
+        :param AriCacheEntry entry: ARI to remember
+
+        """
+        with self._lock:
+            self._load()[cert_id] = entry
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache to disk, dropping entries that are due to be fetched again."""
+        with self._lock:
+            if not self._dirty:
+                return
+            now = datetime.datetime.now(datetime.timezone.utc)
+            entries = {cert_id: {field: value.isoformat() if value else None
+                                 for field, value in entry._asdict().items()}
+                       for cert_id, entry in self._load().items() if entry.retry_after > now}
+            state_file.save_json(self._path, self.VERSION, {"entries": entries})
+            self._dirty = False
+
+    def _load(self) -> Dict[str, AriCacheEntry]:
+        if self._entries is not None:
+            return self._entries
+        self._entries = state_file.load_json(
+            self._path, self.VERSION, _parse_ari_cache, "ARI cache") or {}
+        return self._entries
+
+
+def _parse_ari_cache(data: Dict[str, Any]) -> Dict[str, AriCacheEntry]:
+    return {cert_id: AriCacheEntry(_optional_datetime(fields["window_start"]),
+                                   _optional_datetime(fields["window_end"]),
+                                   _optional_datetime(fields["renewal_time"]),
+                                   datetime.datetime.fromisoformat(fields["retry_after"]))
+            for cert_id, fields in data["entries"].items()}
+
+
+def _optional_datetime(value: Optional[str]) -> Optional[datetime.datetime]:
+    return datetime.datetime.fromisoformat(value) if value else None
 
 
 def reconstitute(config: configuration.NamespaceConfig,
@@ -343,15 +455,20 @@ def _restore_str(name: str, value: str) -> Optional[str]:
 
 def should_renew(config: configuration.NamespaceConfig,
                  lineage: storage.RenewableCert,
-                 ari_clients: AriClientPool) -> bool:
-    """Return true if any of the circumstances for automatic renewal apply."""
+                 ari_clients: AriClientPool,
+                 ari_cache: Optional[AriCache] = None,
+                 revoked: Optional[bool] = None) -> bool:
+    """Return true if any of the circumstances for automatic renewal apply.
+
+    `ari_cache` and `revoked` are passed to `should_autorenew`.
+    """
     if config.renew_by_default:
         logger.debug("Auto-renewal forced with --force-renewal...")
         return True
     if config.dry_run:
         logger.info("Certificate not due for renewal, but simulating renewal for dry run")
         return True
-    if should_autorenew(lineage, ari_clients):
+    if should_autorenew(lineage, ari_clients, ari_cache, revoked):
         logger.info("Certificate is due for renewal, auto-renewing...")
         return True
     display_util.notify("Certificate not yet due for renewal")
@@ -359,9 +476,14 @@ def should_renew(config: configuration.NamespaceConfig,
 
 
 def _ari_renewal_time(lineage: storage.RenewableCert,
-                     cert_pem: bytes,
-                     ari_clients: AriClientPool) -> Optional[datetime.datetime]:
-    """Return the ARI suggested renewal time if it's available."""
+                     cert: x509.Certificate,
+                     ari_clients: AriClientPool,
+                     ari_cache: Optional[AriCache] = None) -> Optional[datetime.datetime]:
+    """Return the ARI suggested renewal time if it's available.
+
+    If `ari_cache` is provided, ARI is only fetched from the ACME server if
+    the Retry-After time of the cached response has passed.
+    """
     # For ARI requests, we want to use the ACME directory URL from which the
     # cert was originally requested. Since `NamespaceConfig.server` can be overridden on
     # the command line, we're using the server stored in the cert's renewal
@@ -373,11 +495,14 @@ def _ari_renewal_time(lineage: storage.RenewableCert,
                        "prevent certificate renewal", lineage.configfile.filename)
         return None
     try:
+        if ari_cache is not None:
+            return _cached_ari_renewal_time(lineage.server, cert, ari_clients, ari_cache)
+
         ari_client = ari_clients.get(lineage.server)
 
         # Attempt to get the ARI-defined renewal time
         if ari_client:
-            return ari_client.renewal_time(cert_pem)[0]
+            return ari_client.renewal_time(cert)[0]
     except Exception:  # pylint: disable=broad-except
         # We want to stop errors around ARI preventing renewal so we catch all exceptions here
         # with a warning asking users to tell us about any problems they are experiencing
@@ -389,19 +514,50 @@ def _ari_renewal_time(lineage: storage.RenewableCert,
     return None
 
 
-def _default_renewal_time(cert_pem: bytes) -> datetime.datetime:
+def _cached_ari_renewal_time(server: str, cert: x509.Certificate, ari_clients: AriClientPool,
+                             ari_cache: AriCache) -> Optional[datetime.datetime]:
+    """Return the ARI suggested renewal time from `ari_cache`, fetching it if needed."""
+    cert_id = acme_client.renewal_info_cert_id(cert)
+    entry = ari_cache.get(cert_id)
+    if entry is not None:
+        logger.debug("Using cached ARI for certificate %s until %s", cert_id, entry.retry_after)
+        return entry.renewal_time
+
+    # Clients must not check a certificate's RenewalInfo after the certificate has
+    # expired: https://www.ietf.org/archive/id/draft-ietf-acme-ari-08.html#section-4.3
+    if cert.not_valid_after_utc < datetime.datetime.now(datetime.timezone.utc):
+        return cert.not_valid_after_utc
+
+    renewal_info, retry_after = ari_clients.get(server).renewal_info(cert)
+    window_start = window_end = renewal_time = None
+    if renewal_info is not None:
+        window_start = renewal_info.suggested_window.start
+        window_end = renewal_info.suggested_window.end
+        renewal_time = window_start + datetime.timedelta(
+            seconds=random.uniform(0, (window_end - window_start).total_seconds()))
+    # acme.client.ClientV2.retry_after returns a naive datetime in local time
+    ari_cache.set(cert_id, AriCacheEntry(window_start, window_end, renewal_time,
+                                         retry_after.astimezone(datetime.timezone.utc)))
+    return renewal_time
+
+
+def _default_renewal_time(cert: x509.Certificate) -> datetime.datetime:
     """Return an reasonable default time to attempt renewal of the certificate
     based on the certificate lifetime.
 
-    :param bytes cert_pem: cert as pem file
+    :param x509.Certificate cert: the certificate
 
     :returns: Time to attempt renewal
     :rtype: `datetime.datetime`
     """
-    cert = x509.load_pem_x509_certificate(cert_pem)
+    return _default_renewal_time_for_validity(cert.not_valid_before_utc,
+                                              cert.not_valid_after_utc)
+
 
-    not_before = cert.not_valid_before_utc
-    lifetime = cert.not_valid_after_utc - not_before
+def _default_renewal_time_for_validity(not_before: datetime.datetime,
+                                       not_after: datetime.datetime) -> datetime.datetime:
+    """Same as `_default_renewal_time`, given the validity period of the certificate."""
+    lifetime = not_after - not_before
     if lifetime.total_seconds() < 10 * 86400:
         default_rt = not_before + lifetime / 2
     else:
@@ -410,7 +566,9 @@ def _default_renewal_time(cert_pem: bytes) -> datetime.datetime:
     return default_rt
 
 def should_autorenew(lineage: storage.RenewableCert,
-                     ari_clients: AriClientPool) -> bool:
+                     ari_clients: AriClientPool,
+                     ari_cache: Optional[AriCache] = None,
+                     revoked: Optional[bool] = None) -> bool:
     """Should we now try to autorenew the most recent cert version?
 
     If automatic renewal is disabled for the lineage, this function
@@ -426,6 +584,11 @@ def should_autorenew(lineage: storage.RenewableCert,
     Note that this examines the numerically most recent cert version,
     not the currently deployed version.
 
+    If `ari_cache` is provided, ARI is only fetched from the ACME server if
+    the Retry-After time of the cached response has passed. If `revoked` is
+    provided, OCSP isn't queried for the revocation status of the most recent
+    cert version.
+
     :returns: whether an attempt should now be made to autorenew the
         most current cert version in this lineage
     :rtype: bool
@@ -434,26 +597,47 @@ def should_autorenew(lineage: storage.RenewableCert,
     if not lineage.autorenewal_is_enabled():
         return False
 
-    cert = lineage.version("cert", lineage.latest_common_version())
-    with open(cert, 'rb') as f:
-        cert_pem = f.read()
+    if _due_regardless_of_revocation(lineage, ari_clients, ari_cache):
+        return True
+
+    # Renewals on the basis of revocation. OCSP is only queried when nothing
+    # else says to renew.
+    if revoked is None:
+        revoked = lineage.ocsp_revoked(lineage.latest_common_version())
+    if revoked:
+        logger.debug("Should renew, certificate is revoked.")
+        return True
+
+    return False
+
+
+def _due_regardless_of_revocation(lineage: storage.RenewableCert,
+                                  ari_clients: AriClientPool,
+                                  ari_cache: Optional[AriCache] = None) -> bool:
+    """Do ARI or the certificate's expiry say to renew the most recent cert version?
+
+    These are the checks of `should_autorenew` which don't need to query OCSP.
+
+    :returns: whether the most recent cert version is due for renewal
+        whatever its revocation status is
+    :rtype: bool
+
+    """
+    # The certificate is parsed once here and shared by the checks below.
+    # OCSP loads it through the same cache in crypto_util.load_cert.
+    cert = crypto_util.load_cert(lineage.version("cert", lineage.latest_common_version()))
 
-    renewal_time = _ari_renewal_time(lineage, cert_pem, ari_clients)
+    renewal_time = _ari_renewal_time(lineage, cert, ari_clients, ari_cache)
 
     now = datetime.datetime.now(datetime.timezone.utc)
 
     if renewal_time and now > renewal_time:
         return True
 
-    # Renewals on the basis of revocation
-    if lineage.ocsp_revoked(lineage.latest_common_version()):
-        logger.debug("Should renew, certificate is revoked.")
-        return True
-
     # If the renew_before_expiry config field is set, check if it says we should renew
     config_interval = lineage.configuration.get("renew_before_expiry")
     if config_interval is not None:
-        notAfter = crypto_util.notAfter(cert)
+        notAfter = cert.not_valid_after_utc
         if notAfter < storage.add_time_interval(now, config_interval):
             logger.debug("Should renew, less than %s before certificate "
                             "expiry %s.", config_interval,
@@ -461,7 +645,7 @@ def should_autorenew(lineage: storage.RenewableCert,
             return True
     # Only use the default if we don't have an ARI or renew_before_expiry value
     elif renewal_time is None:
-        default_renewal_time = _default_renewal_time(cert_pem)
+        default_renewal_time = _default_renewal_time(cert)
         if now > default_renewal_time:
             return True
 
@@ -608,9 +792,396 @@ def _renew_describe_results(config: configuration.NamespaceConfig, renew_success
     notify(display_obj.SIDE_FRAME)
 
 
-def handle_renewal_request(config: configuration.NamespaceConfig) -> None:
-    """Examine each lineage; renew if due and report results"""
+class _LineageOutcome:
+    """Bookkeeping for a single renewal configuration file during `certbot renew`.
+
+    :ivar str renewal_file: path to the renewal configuration file
+    :ivar str lineagename: name of the lineage defined by `renewal_file`
+    :ivar config: configuration for the lineage, once it was reconstituted
+    :type config: configuration.NamespaceConfig or None
+    :ivar lineage: the lineage, once it was reconstituted
+    :type lineage: storage.RenewableCert or None
+    :ivar metadata: cached metadata about the lineage, if it was found not to
+        be due from it alone and so wasn't reconstituted
+    :type metadata: lineage_index.LineageMetadata or None
+    :ivar staple_refresh: when the OCSP response exported for the lineage
+        should be refreshed, if one was exported
+    :type staple_refresh: datetime.datetime or None
+    :ivar revoked: whether OCSP reports the most recent certificate of the
+        lineage as revoked, if it was queried by `_check_revocation`
+    :type revoked: bool or None
+    :ivar bool staple_refreshed: whether a new OCSP response was exported for
+        the lineage without it being renewed
+
+    """
+    def __init__(self, renewal_file: str) -> None:
+        self.renewal_file = renewal_file
+        self.lineagename = storage.lineagename_for_filename(renewal_file)
+        self.config: Optional[configuration.NamespaceConfig] = None
+        self.lineage: Optional[storage.RenewableCert] = None
+        self.metadata: Optional[lineage_index.LineageMetadata] = None
+        self.parse_failed = False
+        self.due = False
+        self.renewed = False
+        self.failed = False
+        self.skipped_message: Optional[str] = None
+        self.revoked: Optional[bool] = None
+        self.staple_refresh: Optional[datetime.datetime] = None
+        self.staple_refreshed = False
+
+    def fail(self, error: Exception) -> None:
+        """Record that processing this lineage failed with `error`."""
+        # obtain_cert (presumably) encountered an unanticipated problem.
+        logger.error("Failed to renew certificate %s with error: %s", self.lineagename, error)
+        logger.debug("Traceback was:\n%s", traceback.format_exc())
+        self.failed = True
+
+
+def _cached_not_due(config: configuration.NamespaceConfig, renewal_file: str,
+                    ari_cache: AriCache,
+                    index: lineage_index.LineageIndex) -> Optional[lineage_index.LineageMetadata]:
+    """Decide from cached data alone whether a lineage is certainly not due for renewal.
+
+    This avoids reconstituting the lineage and checking ARI and OCSP when
+    nothing changed since the lineage was last examined, its cached ARI
+    window starts in the future and its certificate isn't near expiry. The
+    check is conservative: lineages for which any of this is unknown, and
+    lineages whose installer would run updaters, are examined as usual.
+
+    Revocation is noticed once the cached ARI response expires, as CAs move
+    the ARI window of revoked certificates into the past.
+
+    :param configuration.NamespaceConfig config: configuration for the renew run
+    :param str renewal_file: renewal configuration file of the lineage
+    :param AriCache ari_cache: cached ARI responses
+    :param lineage_index.LineageIndex index: metadata about the lineages
+
+    :returns: metadata of the lineage if it isn't due, otherwise `None`
+    :rtype: lineage_index.LineageMetadata or None
+
+    """
+    if config.renew_by_default or config.dry_run or config.installer is not None:
+        return None
+    metadata = index.lookup(renewal_file)
+    if metadata is None or not metadata.deployed or metadata.installer is not None:
+        return None
+    if not metadata.autorenew:
+        logger.debug("Auto-renewal is disabled for %s", renewal_file)
+        return metadata
+    if metadata.ari_cert_id is None:
+        return None
+    ari_entry = ari_cache.get(metadata.ari_cert_id)
+    if ari_entry is None or ari_entry.window_start is None:
+        return None
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    if ari_entry.window_start <= now:
+        return None
+    if (metadata.renew_before_expiry is not None and
+            metadata.not_after < storage.add_time_interval(now, metadata.renew_before_expiry)):
+        return None
+    if _default_renewal_time_for_validity(metadata.not_before, metadata.not_after) <= now:
+        return None
+    logger.debug("Certificate of %s is not due for renewal until the ARI window starting "
+                 "at %s", renewal_file, ari_entry.window_start)
+    return metadata
+
+
+def _load_lineage(config: configuration.NamespaceConfig, outcome: _LineageOutcome,
+                  ari_cache: AriCache, index: lineage_index.LineageIndex) -> None:
+    """Reconstitute the lineage of `outcome`, unless cached data shows it isn't due.
+
+    :param configuration.NamespaceConfig config: configuration for the renew run
+    :param _LineageOutcome outcome: where to record the results
+    :param AriCache ari_cache: cached ARI responses
+    :param lineage_index.LineageIndex index: metadata about the lineages
+
+    """
+    metadata = _cached_not_due(config, outcome.renewal_file, ari_cache, index)
+    if metadata is not None:
+        outcome.metadata = metadata
+        outcome.skipped_message = "%s expires on %s" % (metadata.fullchain,
+                                                       metadata.not_after.strftime("%Y-%m-%d"))
+        return
+
+    # config is shared by all lineages and isn't modified during the run,
+    # so each lineage only needs a layer on top of it
+    lineage_config = config.overlay()
+
+    # Note that this modifies config (to add back the configuration
+    # elements from within the renewal configuration file).
+    try:
+        renewal_candidate = reconstitute(lineage_config, outcome.renewal_file)
+    except Exception as e:  # pylint: disable=broad-except
+        logger.error("Renewal configuration file %s (cert: %s) "
+                       "produced an unexpected error: %s. Skipping.",
+                       outcome.renewal_file, outcome.lineagename, e)
+        logger.debug("Traceback was:\n%s", traceback.format_exc())
+        outcome.parse_failed = True
+        return
+
+    if not renewal_candidate:
+        outcome.parse_failed = True
+        return
+    outcome.config = lineage_config
+    outcome.lineage = renewal_candidate
+
+    try:
+        renewal_candidate.ensure_deployed()
+    except Exception as e:  # pylint: disable=broad-except
+        outcome.fail(e)
+
+
+def _check_revocation(config: configuration.NamespaceConfig,
+                      outcomes: List[_LineageOutcome], ari_clients: AriClientPool,
+                      ari_cache: AriCache) -> None:
+    """Query OCSP about the loaded lineages of `outcomes` all at once.
+
+    `should_autorenew` would otherwise query OCSP for one lineage after the
+    other. Lineages which ARI or their certificate's expiry already say to
+    renew aren't queried. The results are recorded in the outcomes and passed
+    to `should_autorenew`.
+
+    :param configuration.NamespaceConfig config: configuration for the renew run
+    :param list outcomes: outcomes whose lineages were loaded by `_load_lineage`
+    :param AriClientPool ari_clients: ACME clients to use for ARI checks
+    :param AriCache ari_cache: cached ARI responses
+
+    """
+    if config.renew_by_default or config.dry_run:
+        return
+    pending = []
+    for outcome in outcomes:
+        lineage = outcome.lineage
+        if lineage is None or outcome.failed or not lineage.autorenewal_is_enabled():
+            continue
+        try:
+            if _due_regardless_of_revocation(lineage, ari_clients, ari_cache):
+                continue
+            version = lineage.latest_common_version()
+            pending.append((outcome, (lineage.version("cert", version),
+                                      lineage.version("chain", version))))
+        except Exception:  # pylint: disable=broad-except
+            # The error is reported when deciding whether to renew the lineage
+            logger.debug("Unable to check whether %s is due for renewal", outcome.lineagename,
+                         exc_info=True)
+    if not pending:
+        return
+    revoked = storage.revocation_checker(config).ocsp_revoked_many(
+        paths for _, paths in pending)
+    for (outcome, _), is_revoked in zip(pending, revoked):
+        outcome.revoked = is_revoked
+
+
+def _decide_renewal(outcome: _LineageOutcome, ari_clients: AriClientPool, ari_cache: AriCache,
+                    index: lineage_index.LineageIndex) -> None:
+    """Decide whether the lineage loaded by `_load_lineage` is due for renewal.
+
+    :param _LineageOutcome outcome: where to record the results
+    :param AriClientPool ari_clients: ACME clients to use for ARI checks
+    :param AriCache ari_cache: cached ARI responses
+    :param lineage_index.LineageIndex index: metadata about the lineages
+
+    """
+    display_util.notification("Processing " + outcome.renewal_file, pause=False)
+    if outcome.lineage is None or outcome.failed:
+        return
+    assert outcome.config is not None
+    try:
+        outcome.due = should_renew(outcome.config, outcome.lineage, ari_clients, ari_cache,
+                                   revoked=outcome.revoked)
+        if not outcome.due:
+            # ensure_deployed made the live certificate the latest version
+            expiry = index.get(outcome.lineage).not_after
+            outcome.skipped_message = "%s expires on %s" % (outcome.lineage.fullchain,
+                                                           expiry.strftime("%Y-%m-%d"))
+    except Exception as e:  # pylint: disable=broad-except
+        outcome.fail(e)
+
+
+RATE_LIMITED_ATTEMPTS = 3
+"""Number of times a lineage is renewed if the ACME server reports rate limits."""
+
+
+def _renew_lineage(outcome: _LineageOutcome, plugins: plugins_disco.PluginsRegistry,
+                   limiter: rate_limit.IssuanceRateLimiter) -> None:
+    """Renew the lineage of `outcome`, which must have been found to be due.
+
+    Renewals are paced by `limiter`. If the ACME server reports that a rate
+    limit was reached and asks to retry within --rate-limit-max-wait seconds,
+    renewals from that server and for the same registered domains are paused
+    and the lineage is renewed again.
+
+    :param _LineageOutcome outcome: lineage to renew and where to record the results
+    :param plugins_disco.PluginsRegistry plugins: plugins to renew the lineage with
+    :param rate_limit.IssuanceRateLimiter limiter: rate limiter for renewals
+
+    """
+    from certbot._internal import main
+    assert outcome.config is not None and outcome.lineage is not None
+    try:
+        server = outcome.config.server
+        names = outcome.lineage.names()
+    except Exception as e:  # pylint: disable=broad-except
+        outcome.fail(e)
+        return
+    for attempt in range(1, RATE_LIMITED_ATTEMPTS + 1):
+        limiter.wait(server, names)
+        try:
+            # domains have been restored into the lineage config by reconstitute
+            # but they're unnecessary anyway because renew_cert here
+            # will just grab them from the certificate
+            # we already know it's time to renew based on should_renew
+            # and we have a lineage in outcome.lineage
+            main.renew_cert(outcome.config, plugins, outcome.lineage)
+            outcome.renewed = True
+            return
+        except acme_messages.Error as e:
+            delay = _rate_limit_delay(e)
+            if (delay is None or delay > outcome.config.rate_limit_max_wait
+                    or attempt == RATE_LIMITED_ATTEMPTS):
+                outcome.fail(e)
+                return
+            logger.warning("Renewal of %s was rate limited by the ACME server, retrying in "
+                           "%d seconds: %s", outcome.lineagename, delay, e)
+            limiter.back_off(server, names, delay)
+        except Exception as e:  # pylint: disable=broad-except
+            outcome.fail(e)
+            return
+
+
+def _rate_limit_delay(error: acme_messages.Error) -> Optional[float]:
+    """Seconds to wait before retrying after `error`, if it's a rate limit with Retry-After."""
+    if error.code != "rateLimited" or error.retry_after is None:
+        return None
+    # acme.client.ClientV2.retry_after returns a naive datetime in local time
+    retry_after = error.retry_after.astimezone(datetime.timezone.utc)
+    return max(0.0, (retry_after - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
 
+def _update_lineage(outcome: _LineageOutcome, plugins: plugins_disco.PluginsRegistry) -> None:
+    """Run updater interface methods for the lineage of `outcome`.
+
+    :param _LineageOutcome outcome: lineage to update and where to record the results
+    :param plugins_disco.PluginsRegistry plugins: plugins to update the lineage with
+
+    """
+    assert outcome.config is not None and outcome.lineage is not None
+    try:
+        updater.run_generic_updaters(outcome.config, outcome.lineage, plugins)
+    except Exception as e:  # pylint: disable=broad-except
+        outcome.fail(e)
+
+
+def _renews_concurrently(outcome: _LineageOutcome,
+                         plugins: plugins_disco.PluginsRegistry) -> bool:
+    """Can this lineage be renewed at the same time as other lineages?
+
+    Installers modify server configuration shared between lineages and the
+    standalone plugin binds a fixed port, so lineages using them (including
+    authenticators which are also installers) are renewed one at a time.
+
+    """
+    assert outcome.config is not None
+    if outcome.config.installer is not None or outcome.config.authenticator == "standalone":
+        return False
+    auth_ep = plugins.get(outcome.config.authenticator)
+    return auth_ep is None or not auth_ep.ifaces((interfaces.Installer,))
+
+
+def _random_sleep_once(config: configuration.NamespaceConfig) -> Callable[[], None]:
+    """Return a function applying the random delay before the first renewal, if needed."""
+    # Noninteractive renewals include a random delay in order to spread
+    # out the load on the certificate authority servers, even if many
+    # users all pick the same time for renewals.  This delay precedes
+    # running any hooks, so that side effects of the hooks (such as
+    # shutting down a web service) aren't prolonged unnecessarily.
+    apply_random_sleep = not sys.stdin.isatty() and config.random_sleep_on_renew
+
+    def sleep() -> None:
+        nonlocal apply_random_sleep
+        if apply_random_sleep:
+            sleep_time = random.uniform(1, 60 * 8)
+            logger.info("Non-interactive renewal: random delay of %s seconds", sleep_time)
+            time.sleep(sleep_time)
+            # We will sleep only once this day, folks.
+            apply_random_sleep = False
+
+    return sleep
+
+
+def _process_lineages_serially(config: configuration.NamespaceConfig,
+                               outcomes: List[_LineageOutcome],
+                               ari_clients: AriClientPool, ari_cache: AriCache,
+                               index: lineage_index.LineageIndex,
+                               plugins_found: plugins_disco.PluginsRegistry,
+                               limiter: rate_limit.IssuanceRateLimiter) -> None:
+    """Examine and, if due, renew each lineage before moving on to the next one."""
+    random_sleep = _random_sleep_once(config)
+    for outcome in outcomes:
+        _load_lineage(config, outcome, ari_cache, index)
+        _decide_renewal(outcome, ari_clients, ari_cache, index)
+        if outcome.lineage is None or outcome.failed:
+            continue
+        plugins = plugins_found.uninitialized_copy()
+        if outcome.due:
+            # Apply random sleep upon first renewal if needed
+            random_sleep()
+            _renew_lineage(outcome, plugins, limiter)
+            if outcome.failed:
+                continue
+        _update_lineage(outcome, plugins)
+
+
+def _process_lineages_concurrently(config: configuration.NamespaceConfig,
+                                   outcomes: List[_LineageOutcome],
+                                   ari_clients: AriClientPool, ari_cache: AriCache,
+                                   index: lineage_index.LineageIndex,
+                                   plugins_found: plugins_disco.PluginsRegistry,
+                                   limiter: rate_limit.IssuanceRateLimiter,
+                                   workers: int) -> None:
+    """Examine all lineages and then renew the due ones using up to `workers` threads.
+
+    Lineages which can't safely be renewed alongside others (see
+    `_renews_concurrently`) are renewed one at a time in the main thread once
+    the other renewals are complete. Updaters are then run serially in the
+    order of the renewal configuration files.
+
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda outcome: _load_lineage(config, outcome, ari_cache, index),
+                          outcomes))
+        _check_revocation(config, outcomes, ari_clients, ari_cache)
+        list(executor.map(
+            lambda outcome: _decide_renewal(outcome, ari_clients, ari_cache, index),
+            outcomes))
+
+    examined = [(outcome, plugins_found.uninitialized_copy()) for outcome in outcomes
+                if outcome.lineage is not None and not outcome.failed]
+    due = [(outcome, plugins) for outcome, plugins in examined if outcome.due]
+    if due:
+        _random_sleep_once(config)()
+
+    concurrent_renewals = []
+    serial_renewals = []
+    for outcome, plugins in due:
+        if _renews_concurrently(outcome, plugins):
+            concurrent_renewals.append((outcome, plugins))
+        else:
+            serial_renewals.append((outcome, plugins))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda args: _renew_lineage(args[0], args[1], limiter),
+                          concurrent_renewals))
+    for outcome, plugins in serial_renewals:
+        _renew_lineage(outcome, plugins, limiter)
+
+    for outcome, plugins in examined:
+        if not outcome.failed:
+            _update_lineage(outcome, plugins)
+
+
+def _check_renewal_request(config: configuration.NamespaceConfig) -> None:
+    """Raise an error if the renew verb can't handle the requested domains."""
     # This is trivially False if config.domains is empty
     if any(domain not in config.webroot_map for domain in config.domains):
         # If more plugins start using cli.add_domains,
@@ -623,10 +1194,152 @@ def handle_renewal_request(config: configuration.NamespaceConfig) -> None:
                            "instead. The renew verb may provide other options "
                            "for selecting certificates to renew in the future.")
 
-    if config.certname:
-        conf_files = [storage.renewal_file_for_certname(config, config.certname)]
+
+def _shard_conf_files(config: configuration.NamespaceConfig,
+                      conf_files: List[str]) -> List[str]:
+    """Return the renewal configuration files of the shard set by --shard-index."""
+    if config.shard_count == 1:
+        return conf_files
+    shard_files = renewal_shards.filter_conf_files(conf_files, config.shard_index,
+                                                   config.shard_count)
+    logger.info("Shard %d of %d handles %d of %d certificates", config.shard_index,
+                config.shard_count, len(shard_files), len(conf_files))
+    return shard_files
+
+
+def _export_ocsp_staple(config: configuration.NamespaceConfig,
+                        outcome: _LineageOutcome) -> None:
+    """Refresh the OCSP response exported for the lineage of `outcome`, if it is due.
+
+    Responses are exported for lineages whose renewal configuration enables
+    export_ocsp_staple, or for all lineages with --export-ocsp-staple. The
+    response of a lineage which was just renewed, or which is about another
+    certificate, is refreshed right away. Lineages found not to be due for
+    renewal from cached data are only reconstituted when their exported
+    response needs to be refreshed.
+
+    """
+    if outcome.parse_failed:
+        return
+    lineage = outcome.lineage
+    if lineage is not None:
+        if outcome.config is None or not outcome.config.export_ocsp_staple:
+            return
+        live_dir, fullchain = lineage.live_dir, lineage.fullchain_path
+    elif outcome.metadata is not None:
+        if not (config.export_ocsp_staple or outcome.metadata.export_ocsp_staple):
+            return
+        fullchain = outcome.metadata.fullchain
+        live_dir = os.path.dirname(fullchain)
+    else:
+        return
+
+    if not outcome.renewed:
+        refresh = ocsp_staple.exported_refresh_time(live_dir, fullchain)
+        if refresh is not None and refresh > datetime.datetime.now(datetime.timezone.utc):
+            outcome.staple_refresh = refresh
+            return
+    if lineage is None:
+        try:
+            lineage = storage.RenewableCert(outcome.renewal_file, config)
+        except (errors.CertStorageError, OSError) as error:
+            logger.warning("Unable to export the OCSP response of %s: %s",
+                           outcome.lineagename, error)
+            return
+    outcome.staple_refresh = ocsp_staple.export_staple(config, lineage, force=True)
+    outcome.staple_refreshed = outcome.staple_refresh is not None
+
+
+def _reload_installers(outcomes: List[_LineageOutcome],
+                       plugins_found: plugins_disco.PluginsRegistry) -> None:
+    """Reload the servers of the lineages whose exported OCSP response was refreshed.
+
+    Servers such as nginx only read the response named by ssl_stapling_file
+    when their configuration is loaded. Each installer is restarted once.
+    This includes the installers of renewed lineages, as their server was
+    reloaded when the new certificate was deployed, before its response was
+    exported.
+
+    """
+    reloaded = set()
+    for outcome in outcomes:
+        if not outcome.staple_refreshed or outcome.config is None:
+            continue
+        installer_name = outcome.config.installer
+        if installer_name is None or installer_name in reloaded:
+            continue
+        reloaded.add(installer_name)
+        try:
+            installer = plug_sel.get_unprepared_installer(
+                outcome.config, plugins_found.uninitialized_copy())
+            if installer is None:
+                continue
+            installer.prepare()
+            display_util.notify(
+                f"Reloading {installer_name} server after refreshing the OCSP response "
+                "it staples")
+            installer.restart()
+        except errors.Error as error:
+            logger.warning("Unable to reload %s server after refreshing the OCSP "
+                           "response it staples: %s", installer_name, error)
+            logger.debug("Traceback was:\n%s", traceback.format_exc())
+
+
+def _renew_lineages(config: configuration.NamespaceConfig, conf_files: List[str],
+                    ari_clients: AriClientPool, ari_cache: AriCache,
+                    index: lineage_index.LineageIndex,
+                    plugins: plugins_disco.PluginsRegistry,
+                    limiter: rate_limit.IssuanceRateLimiter) -> List[_LineageOutcome]:
+    """Examine the lineages of `conf_files`, renew the due ones and report the results.
+
+    :param configuration.NamespaceConfig config: Configuration object
+    :param list conf_files: renewal configuration files of the lineages
+    :param AriClientPool ari_clients: ACME clients to use for ARI checks
+    :param AriCache ari_cache: cached ARI responses
+    :param lineage_index.LineageIndex index: metadata about the lineages
+    :param plugins_disco.PluginsRegistry plugins: discovered plugins, of which
+        each lineage gets its own uninitialized copy
+    :param rate_limit.IssuanceRateLimiter limiter: rate limiter for renewals
+
+    :returns: the outcome for each lineage, in the order of `conf_files`
+    :rtype: `list` of `_LineageOutcome`
+
+    """
+    # make sure lineagename_for_filename will not error
+    assert all(renewal_file.endswith(".conf") for renewal_file in conf_files)
+    outcomes = [_LineageOutcome(renewal_file) for renewal_file in conf_files]
+
+    if config.renew_concurrency > 1:
+        _process_lineages_concurrently(config, outcomes, ari_clients, ari_cache, index,
+                                       plugins, limiter, config.renew_concurrency)
     else:
-        conf_files = storage.renewal_conf_files(config)
+        _process_lineages_serially(config, outcomes, ari_clients, ari_cache, index, plugins,
+                                   limiter)
+
+    if not config.dry_run:
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(1, config.renew_concurrency)) as executor:
+            list(executor.map(lambda outcome: _export_ocsp_staple(config, outcome), outcomes))
+        _reload_installers(outcomes, plugins)
+
+    if not config.dry_run:
+        try:
+            ari_cache.save()
+        except OSError as error:
+            logger.warning("Unable to save the ARI cache: %s", error)
+            logger.debug("Traceback was:\n%s", traceback.format_exc())
+        try:
+            index.save()
+        except OSError:
+            logger.debug("Unable to save the lineage index", exc_info=True)
+        try:
+            storage.ocsp_response_cache(config).save()
+        except OSError:
+            logger.debug("Unable to save the OCSP response cache", exc_info=True)
+
+    # Don't keep connections to OCSP responders open until the next run
+    # of the daemon or the end of the process
+    storage.revocation_checker(config).close()
 
     renew_successes = []
     renew_failures = []
@@ -636,92 +1349,334 @@ def handle_renewal_request(config: configuration.NamespaceConfig) -> None:
     renewed_domains = []
     failed_domains = []
 
-    # Noninteractive renewals include a random delay in order to spread
-    # out the load on the certificate authority servers, even if many
-    # users all pick the same time for renewals.  This delay precedes
-    # running any hooks, so that side effects of the hooks (such as
-    # shutting down a web service) aren't prolonged unnecessarily.
-    apply_random_sleep = not sys.stdin.isatty() and config.random_sleep_on_renew
+    for outcome in outcomes:
+        if outcome.parse_failed:
+            parse_failures.append(outcome.renewal_file)
+            continue
+        if outcome.skipped_message is not None:
+            renew_skipped.append(outcome.skipped_message)
+        # Lineages found not to be due from cached data aren't reconstituted
+        if outcome.lineage is None:
+            continue
+        if outcome.renewed:
+            renew_successes.append(outcome.lineage.fullchain)
+            renewed_domains.extend(outcome.lineage.names())
+        if outcome.failed:
+            renew_failures.append(outcome.lineage.fullchain)
+            failed_domains.extend(outcome.lineage.names())
+
+    # Describe all the results
+    _renew_describe_results(config, renew_successes, renew_failures,
+                            renew_skipped, parse_failures)
+
+    if config.renewal_report:
+        renewal_report = renewal_shards.RenewalReport(
+            renew_successes, renew_failures, renew_skipped, parse_failures,
+            shards=[config.shard_index], shard_count=config.shard_count)
+        try:
+            renewal_report.save(config.renewal_report)
+        except OSError as error:
+            logger.warning("Unable to save the renewal report to %s: %s",
+                           config.renewal_report, error)
+
+    hooks.run_saved_post_hooks(renewed_domains, failed_domains)
+
+    return outcomes
+
+
+def handle_renewal_request(config: configuration.NamespaceConfig,
+                           plugins: Optional[plugins_disco.PluginsRegistry] = None) -> None:
+    """Examine each lineage; renew if due and report results
+
+    :param configuration.NamespaceConfig config: Configuration object
+    :param plugins: Plugins discovered for this run of Certbot. If omitted,
+        plugins are discovered once here. Each lineage is renewed with its own
+        uninitialized copy of these plugins.
+    :type plugins: plugins_disco.PluginsRegistry or None
+
+    """
+    _check_renewal_request(config)
+
+    if config.certname:
+        conf_files = [storage.renewal_file_for_certname(config, config.certname)]
+    else:
+        conf_files = _shard_conf_files(config, storage.renewal_conf_files(config))
 
     # We initialize acme clients on a per-server basis, but most
     # lineages use the same server. Memoize clients here so we can
     # share the connection pool and reuse a single fetched directory.
     ari_clients = AriClientPool(config)
+    ari_cache = AriCache(os.path.join(config.config_dir, constants.ARI_CACHE_FILE))
+    index = lineage_index.LineageIndex(
+        os.path.join(config.config_dir, constants.LINEAGE_INDEX_FILE))
 
-    for renewal_file in conf_files:
-        display_util.notification("Processing " + renewal_file, pause=False)
-        lineage_config = copy.deepcopy(config)
-        assert renewal_file.endswith(".conf") # make sure lineagename_for_filename will not error
-        lineagename = storage.lineagename_for_filename(renewal_file)
+    # Plugins are initialized with the configuration of a single lineage, so
+    # each lineage gets its own copy, but discovering and loading them is only
+    # done once per run.
+    if plugins is None:
+        plugins = plugins_disco.PluginsRegistry.find_all()
 
-        # Note that this modifies config (to add back the configuration
-        # elements from within the renewal configuration file).
-        try:
-            renewal_candidate = reconstitute(lineage_config, renewal_file)
-        except Exception as e:  # pylint: disable=broad-except
-            logger.error("Renewal configuration file %s (cert: %s) "
-                           "produced an unexpected error: %s. Skipping.",
-                           renewal_file, lineagename, e)
-            logger.debug("Traceback was:\n%s", traceback.format_exc())
-            parse_failures.append(renewal_file)
-            continue
+    limiter = rate_limit.IssuanceRateLimiter(config.renew_rate_limit,
+                                             config.renew_domain_rate_limit)
+
+    with crypto_util.cached_certs():
+        outcomes = _renew_lineages(config, conf_files, ari_clients, ari_cache, index, plugins,
+                                   limiter)
+
+    renew_failures = sum(1 for outcome in outcomes if outcome.failed)
+    parse_failures = sum(1 for outcome in outcomes if outcome.parse_failed)
+    if renew_failures or parse_failures:
+        raise errors.Error(
+            f"{renew_failures} renew failure(s), {parse_failures} parse failure(s)")
 
+    logger.debug("no renewal failures")
+
+
+def merge_renewal_reports(config: configuration.NamespaceConfig) -> None:
+    """Combine the reports written by the shards of `certbot renew`.
+
+    The reports given with --merge-renewal-reports are described like the
+    results of a single `certbot renew` run, and the combined report is
+    written to --renewal-report if it is set.
+
+    :param configuration.NamespaceConfig config: Configuration object
+
+    :raises errors.Error: if a report cannot be read, if the reports cannot
+        be merged, if the results of a shard are missing or if any renewal
+        failed
+
+    """
+    try:
+        merged = renewal_shards.RenewalReport.merge(
+            renewal_shards.RenewalReport.load(path) for path in config.merge_renewal_reports)
+    except (OSError, ValueError) as error:
+        raise errors.Error(f"Unable to merge the renewal reports: {error}") from error
+
+    _renew_describe_results(config, merged.renew_successes, merged.renew_failures,
+                            merged.renew_skipped, merged.parse_failures)
+
+    if config.renewal_report:
         try:
-            if not renewal_candidate:
-                parse_failures.append(renewal_file)
-            else:
-                renewal_candidate.ensure_deployed()
-                from certbot._internal import main
-                plugins = plugins_disco.PluginsRegistry.find_all()
-                if should_renew(lineage_config, renewal_candidate, ari_clients):
-                    # Apply random sleep upon first renewal if needed
-                    if apply_random_sleep:
-                        sleep_time = random.uniform(1, 60 * 8)
-                        logger.info("Non-interactive renewal: random delay of %s seconds",
-                                    sleep_time)
-                        time.sleep(sleep_time)
-                        # We will sleep only once this day, folks.
-                        apply_random_sleep = False
-
-                    # domains have been restored into lineage_config by reconstitute
-                    # but they're unnecessary anyway because renew_cert here
-                    # will just grab them from the certificate
-                    # we already know it's time to renew based on should_renew
-                    # and we have a lineage in renewal_candidate
-                    main.renew_cert(lineage_config, plugins, renewal_candidate)
-                    renew_successes.append(renewal_candidate.fullchain)
-                    renewed_domains.extend(renewal_candidate.names())
-                else:
-                    expiry = crypto_util.notAfter(renewal_candidate.version(
-                        "cert", renewal_candidate.latest_common_version()))
-                    renew_skipped.append("%s expires on %s" % (renewal_candidate.fullchain,
-                                         expiry.strftime("%Y-%m-%d")))
-                # Run updater interface methods
-                updater.run_generic_updaters(lineage_config, renewal_candidate,
-                                             plugins)
+            merged.save(config.renewal_report)
+        except OSError as error:
+            logger.warning("Unable to save the renewal report to %s: %s",
+                           config.renewal_report, error)
 
-        except Exception as e:  # pylint: disable=broad-except
-            # obtain_cert (presumably) encountered an unanticipated problem.
-            logger.error(
-                "Failed to renew certificate %s with error: %s",
-                lineagename, e
-            )
-            logger.debug("Traceback was:\n%s", traceback.format_exc())
-            if renewal_candidate:
-                renew_failures.append(renewal_candidate.fullchain)
-                failed_domains.extend(renewal_candidate.names())
+    if merged.missing_shards:
+        raise errors.Error("Missing the renewal reports of shard(s) " +
+                           ", ".join(str(shard) for shard in merged.missing_shards) +
+                           f" out of {merged.shard_count}")
+    if merged.renew_failures or merged.parse_failures:
+        raise errors.Error(f"{len(merged.renew_failures)} renew failure(s), "
+                           f"{len(merged.parse_failures)} parse failure(s)")
 
-    # Describe all the results
-    _renew_describe_results(config, renew_successes, renew_failures,
-                            renew_skipped, parse_failures)
 
-    hooks.run_saved_post_hooks(renewed_domains, failed_domains)
+DAEMON_MAX_INTERVAL = datetime.timedelta(hours=12)
+"""Longest time `certbot renew --daemon` waits before checking a certificate again.
 
-    if renew_failures or parse_failures:
-        raise errors.Error(
-            f"{len(renew_failures)} renew failure(s), {len(parse_failures)} parse failure(s)")
+Revocation can't be anticipated, so certificates are still checked at least
+as often as with the usual twice daily `certbot renew`."""
 
-    logger.debug("no renewal failures")
+DAEMON_RETRY_INTERVAL = datetime.timedelta(hours=1)
+"""Time `certbot renew --daemon` waits before checking a certificate again if
+processing it failed or if it is overdue."""
+
+DAEMON_WATCH_INTERVAL = 60
+"""Seconds between checks for changes to the renewal configuration files by
+`certbot renew --daemon`."""
+
+
+def run_renewal_daemon(config: configuration.NamespaceConfig,
+                       plugins: Optional[plugins_disco.PluginsRegistry] = None) -> None:
+    """Renew each lineage when it is due, until Certbot is interrupted.
+
+    All lineages are examined first. Each lineage is then examined again
+    (and renewed if due) at the time given by `_next_check_time`. Lineages are
+    kept in a priority queue ordered by that time, so only the lineages which
+    are due are examined whenever Certbot wakes up. The renewal configuration
+    directory is scanned every `DAEMON_WATCH_INTERVAL` seconds and added or
+    changed lineages are examined right away.
+
+    The configuration, work and logs directories are only locked while
+    lineages are examined and renewed, and all locks are released while
+    waiting, so other instances of Certbot can run in the meantime. Lineages
+    due while another instance holds the locks are examined once it is done.
+
+    :param configuration.NamespaceConfig config: Configuration object
+    :param plugins: Plugins discovered for this run of Certbot. If omitted,
+        plugins are discovered once here.
+    :type plugins: plugins_disco.PluginsRegistry or None
+
+    """
+    _check_renewal_request(config)
+    if config.dry_run or config.renew_by_default:
+        raise errors.Error("--daemon can't be used with --dry-run or --force-renewal.")
+    if config.certname:
+        # Errors out early if the certificate doesn't exist
+        storage.renewal_file_for_certname(config, config.certname)
+
+    ari_clients = AriClientPool(config)
+    ari_cache = AriCache(os.path.join(config.config_dir, constants.ARI_CACHE_FILE))
+    index = lineage_index.LineageIndex(
+        os.path.join(config.config_dir, constants.LINEAGE_INDEX_FILE))
+    if plugins is None:
+        plugins = plugins_disco.PluginsRegistry.find_all()
+    # Shared between batches so renewals stay paced while the daemon runs
+    limiter = rate_limit.IssuanceRateLimiter(config.renew_rate_limit,
+                                             config.renew_domain_rate_limit)
+
+    # Lazily invalidated heap: an entry is only current if it matches the
+    # time in scheduled for its renewal configuration file.
+    queue: List[Tuple[datetime.datetime, str]] = []
+    scheduled: Dict[str, datetime.datetime] = {}
+    conf_mtimes: Dict[str, int] = {}
+    next_watch = datetime.datetime.now(datetime.timezone.utc)
+
+    def schedule(renewal_file: str, check_time: datetime.datetime) -> None:
+        scheduled[renewal_file] = check_time
+        heapq.heappush(queue, (check_time, renewal_file))
+
+    while True:
+        now = datetime.datetime.now(datetime.timezone.utc)
+        if now >= next_watch:
+            new_mtimes = _renewal_conf_mtimes(config)
+            for renewal_file in set(conf_mtimes) - set(new_mtimes):
+                logger.info("Renewal configuration file %s was removed", renewal_file)
+                scheduled.pop(renewal_file, None)
+            for renewal_file, mtime in new_mtimes.items():
+                if conf_mtimes.get(renewal_file) != mtime:
+                    schedule(renewal_file, now)
+            conf_mtimes = new_mtimes
+            next_watch = now + datetime.timedelta(seconds=DAEMON_WATCH_INTERVAL)
+
+        due = []
+        while queue and queue[0][0] <= now:
+            check_time, renewal_file = heapq.heappop(queue)
+            if scheduled.get(renewal_file) == check_time:
+                del scheduled[renewal_file]
+                due.append(renewal_file)
+
+        if not due:
+            # Let other instances of Certbot (and installers) run while waiting
+            util.release_locks()
+            wake_time = min(queue[0][0], next_watch) if queue else next_watch
+            time.sleep(max(0.0, (wake_time - now).total_seconds()))
+            continue
+
+        try:
+            for directory in (config.config_dir, config.work_dir, config.logs_dir):
+                util.lock_dir_until_exit(directory)
+        except errors.LockError as error:
+            logger.info("Waiting for another instance of Certbot to finish: %s", error)
+            retry_time = now + datetime.timedelta(seconds=DAEMON_WATCH_INTERVAL)
+            for renewal_file in due:
+                schedule(renewal_file, retry_time)
+            continue
+
+        try:
+            with crypto_util.cached_certs():
+                outcomes = _renew_lineages(config, sorted(due), ari_clients, ari_cache, index,
+                                           plugins, limiter)
+        except Exception:  # pylint: disable=broad-except
+            logger.error("An unexpected error occurred while renewing certificates. "
+                         "They will be checked again later.", exc_info=True)
+            outcomes = [_LineageOutcome(renewal_file) for renewal_file in sorted(due)]
+            for outcome in outcomes:
+                outcome.failed = True
+        finally:
+            # Hooks are run again by the next batch of renewals
+            hooks.reset_saved_hooks()
+
+        # Renewing a certificate updates its renewal configuration file, which
+        # mustn't be taken for a change by the user
+        conf_mtimes.update((renewal_file, mtime) for renewal_file, mtime
+                           in _renewal_conf_mtimes(config).items() if renewal_file in due)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for outcome in outcomes:
+            if outcome.renewal_file in conf_mtimes:
+                check_time = _next_check_time(outcome, ari_cache, now)
+                logger.info("Next check of %s at %s", outcome.renewal_file,
+                            check_time.strftime("%Y-%m-%d %H:%M:%S %Z"))
+                schedule(outcome.renewal_file, check_time)
+
+
+def _renewal_conf_mtimes(config: configuration.NamespaceConfig) -> Dict[str, int]:
+    """Modification times of the renewal configuration files `certbot renew` handles."""
+    if config.certname:
+        conf_files = [storage.renewal_filename_for_lineagename(config, config.certname)]
+    else:
+        conf_files = _shard_conf_files(config, storage.renewal_conf_files(config))
+    mtimes = {}
+    for renewal_file in conf_files:
+        try:
+            mtimes[renewal_file] = filesystem.file_state(renewal_file).mtime_ns
+        except FileNotFoundError:
+            pass
+    return mtimes
+
+
+def _next_check_time(outcome: _LineageOutcome, ari_cache: AriCache,
+                     now: datetime.datetime) -> datetime.datetime:
+    """When should the lineage of `outcome` be examined again by `certbot renew --daemon`?
+
+    This is the earliest of the times at which `should_autorenew` could
+    change its answer without the lineage changing: the ARI suggested renewal
+    time and the time ARI should be fetched again, the time given by the
+    renew_before_expiry option, or otherwise the default renewal time. The
+    time at which the exported OCSP response of the lineage should be
+    refreshed is also taken into account. It is never later than
+    `DAEMON_MAX_INTERVAL` from now and lineages which are overdue or failed
+    are checked again after `DAEMON_RETRY_INTERVAL`. Lineages found not to
+    be due from cached data alone are scheduled from their cached metadata.
+
+    """
+    lineage, metadata = outcome.lineage, outcome.metadata
+    if outcome.failed or (lineage is None and metadata is None):
+        return now + DAEMON_RETRY_INTERVAL
+
+    check_times = [now + DAEMON_MAX_INTERVAL]
+    if outcome.staple_refresh is not None:
+        check_times.append(outcome.staple_refresh)
+    if lineage is not None:
+        autorenew = lineage.autorenewal_is_enabled()
+    else:
+        assert metadata is not None
+        autorenew = metadata.autorenew
+    if autorenew:
+        if lineage is not None:
+            try:
+                cert = crypto_util.load_cert(
+                    lineage.version("cert", lineage.latest_common_version()))
+            except (OSError, ValueError, errors.Error):
+                logger.debug("Unable to read the certificate of %s", lineage.lineagename,
+                             exc_info=True)
+                return now + DAEMON_RETRY_INTERVAL
+            not_before, not_after = cert.not_valid_before_utc, cert.not_valid_after_utc
+            ari_cert_id: Optional[str] = None
+            try:
+                ari_cert_id = acme_client.renewal_info_cert_id(cert)
+            except (x509.ExtensionNotFound, ValueError):
+                logger.debug("Certificate of %s has no ARI identifier", lineage.lineagename)
+            interval = lineage.configuration.get("renew_before_expiry")
+        else:
+            assert metadata is not None
+            not_before, not_after = metadata.not_before, metadata.not_after
+            ari_cert_id = metadata.ari_cert_id
+            interval = metadata.renew_before_expiry
+
+        ari_entry = ari_cache.get(ari_cert_id) if ari_cert_id is not None else None
+        if ari_entry is not None:
+            check_times.append(ari_entry.retry_after)
+            if ari_entry.renewal_time is not None:
+                check_times.append(ari_entry.renewal_time)
+
+        if interval is not None:
+            check_times.append(not_after - (storage.add_time_interval(not_after, interval)
+                                            - not_after))
+        elif ari_entry is None or ari_entry.renewal_time is None:
+            check_times.append(_default_renewal_time_for_validity(not_before, not_after))
+
+    return max(min(check_times), now + DAEMON_RETRY_INTERVAL)
 
 
 def _update_renewal_params_from_key(key_path: str, config: configuration.NamespaceConfig) -> None:
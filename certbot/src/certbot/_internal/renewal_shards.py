@@ -0,0 +1,132 @@
+"""Splitting `certbot renew` between several hosts sharing the same lineages."""
+import hashlib
+import json
+import logging
+from typing import Iterable
+from typing import List
+from typing import NamedTuple
+
+from certbot._internal import state_file
+from certbot._internal import storage
+
+logger = logging.getLogger(__name__)
+
+_REPORT_VERSION = 1
+
+
+def lineage_shard(lineagename: str, shard_count: int) -> int:
+    """Return the shard which renews the lineage `lineagename`.
+
+    Shards are chosen by rendezvous hashing of the lineage name, so every
+    host sharing the lineages agrees on the shard of each lineage and, unlike
+    with a modulo, changing the number of shards only moves the lineages
+    which belong to the added or removed shards.
+
+    :param str lineagename: name of the lineage
+    :param int shard_count: number of shards
+
+    :returns: shard index between 0 and `shard_count` - 1
+    :rtype: int
+
+    """
+    return max(range(shard_count), key=lambda shard: hashlib.sha256(
+        f"{shard}:{lineagename}".encode("utf-8")).digest())
+
+
+def filter_conf_files(conf_files: Iterable[str], shard_index: int,
+                      shard_count: int) -> List[str]:
+    """Return the renewal configuration files handled by the shard `shard_index`.
+
+    :param conf_files: paths of renewal configuration files
+    :type conf_files: `list` of `str`
+    :param int shard_index: index of the shard
+    :param int shard_count: number of shards
+
+    :returns: the files of `conf_files` whose lineage belongs to the shard
+    :rtype: `list` of `str`
+
+    """
+    return [conf_file for conf_file in conf_files
+            if lineage_shard(storage.lineagename_for_filename(conf_file),
+                             shard_count) == shard_index]
+
+
+class RenewalReport(NamedTuple):
+    """Results of `certbot renew`, which can be merged across shards.
+
+    The lists are those shown by `certbot renew` at the end of a run.
+    `shards` are the indices of the shards, out of `shard_count`, whose
+    results are included.
+    """
+    renew_successes: List[str]
+    renew_failures: List[str]
+    renew_skipped: List[str]
+    parse_failures: List[str]
+    shards: List[int]
+    shard_count: int
+
+    def save(self, path: str) -> None:
+        """Write the report to `path` as JSON.
+
+        :param str path: path of the report
+
+        """
+        state_file.save_json(path, _REPORT_VERSION,
+                             self._asdict(), indent=2)  # pylint: disable=no-member
+
+    @classmethod
+    def load(cls, path: str) -> "RenewalReport":
+        """Read a report written by `save`.
+
+        :param str path: path of the report
+
+        :returns: the report
+        :rtype: RenewalReport
+
+        :raises ValueError: if `path` isn't a renewal report
+        :raises OSError: if `path` can't be read
+
+        """
+        with open(path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or data.get("version") != _REPORT_VERSION:
+            raise ValueError(f"{path} is not a supported renewal report")
+        try:
+            return cls(*(data[field] for field in cls._fields))
+        except KeyError as error:
+            raise ValueError(f"{path} is missing {error}") from error
+
+    @classmethod
+    def merge(cls, reports: Iterable["RenewalReport"]) -> "RenewalReport":
+        """Combine the reports of several shards into a single report.
+
+        :param reports: reports of shards using the same number of shards
+        :type reports: `list` of `RenewalReport`
+
+        :returns: the combined report
+        :rtype: RenewalReport
+
+        :raises ValueError: if the reports use different numbers of shards
+            or include the same shard more than once
+
+        """
+        reports = list(reports)
+        shard_counts = {report.shard_count for report in reports}
+        if len(shard_counts) > 1:
+            raise ValueError("Cannot merge reports using different numbers of shards")
+        shards = [shard for report in reports for shard in report.shards]
+        if len(set(shards)) != len(shards):
+            raise ValueError("Cannot merge several reports of the same shard")
+        return cls(
+            renew_successes=[path for report in reports for path in report.renew_successes],
+            renew_failures=[path for report in reports for path in report.renew_failures],
+            renew_skipped=[msg for report in reports for msg in report.renew_skipped],
+            parse_failures=[path for report in reports for path in report.parse_failures],
+            shards=sorted(shards),
+            shard_count=shard_counts.pop() if shard_counts else 1,
+        )
+
+    @property
+    def missing_shards(self) -> List[int]:
+        """Indices of the shards whose results aren't included."""
+        return sorted(set(range(self.shard_count)) - set(self.shards))
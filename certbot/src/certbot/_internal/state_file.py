@@ -0,0 +1,83 @@
+"""Files where Certbot keeps state between runs, such as its caches."""
+import json
+import logging
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import TypeVar
+from typing import Union
+
+from certbot import util
+from certbot.compat import filesystem
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+def write(path: str, content: Union[str, bytes]) -> None:
+    """Atomically replace the file `path` with `content`.
+
+    The content is written to a temporary file next to `path` which is then
+    moved over it, so that readers never see a partially written file.
+
+    :param str path: path of the file
+    :param content: new content of the file
+    :type content: str or bytes
+
+    :raises OSError: if the file cannot be written
+
+    """
+    new_path = path + ".new"
+    util.safely_remove(new_path)
+    with util.safe_open(new_path, "wb" if isinstance(content, bytes) else "w",
+                        chmod=0o644) as f:
+        f.write(content)
+    filesystem.replace(new_path, path)
+
+
+def save_json(path: str, version: int, data: Dict[str, Any],
+              indent: Optional[int] = None) -> None:
+    """Atomically write `data` to `path` as a JSON object tagged with `version`.
+
+    :param str path: path of the file
+    :param int version: version of the format of `data`
+    :param dict data: JSON serializable fields to save along with the version
+    :param indent: indentation of the JSON document, or `None` to keep it compact
+    :type indent: int or None
+
+    :raises OSError: if the file cannot be written
+
+    """
+    write(path, json.dumps({"version": version, **data}, indent=indent))
+
+
+def load_json(path: str, version: int, parse: Callable[[Dict[str, Any]], T],
+              description: str) -> Optional[T]:
+    """Read a file written by `save_json`.
+
+    Missing files, files saved with another version of the format and files
+    which cannot be read or parsed are ignored, as the state they contain can
+    always be rebuilt.
+
+    :param str path: path of the file
+    :param int version: expected version of the format
+    :param callable parse: function building the state from the JSON object
+        read from the file. It may raise `ValueError`, `KeyError`,
+        `TypeError` or `AttributeError` if the object is malformed.
+    :param str description: description of the file used in log messages
+
+    :returns: the state returned by `parse`, or `None` if the file was ignored
+
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") == version:
+            return parse(data)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        logger.debug("Ignoring unreadable %s %s", description, path, exc_info=True)
+    return None
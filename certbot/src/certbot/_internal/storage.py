@@ -6,6 +6,7 @@ import logging
 import re
 import shutil
 import stat
+import threading
 from typing import Any
 from typing import cast
 from typing import Dict
@@ -23,6 +24,7 @@ from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
 from cryptography.hazmat.primitives.serialization import load_pem_private_key
 import parsedatetime
 
+from acme import crypto_util as acme_crypto_util
 import certbot
 from certbot import configuration
 from certbot import crypto_util
@@ -30,6 +32,7 @@ from certbot import errors
 from certbot import interfaces
 from certbot import ocsp
 from certbot import util
+from certbot._internal import constants
 from certbot._internal import error_handler
 from certbot._internal.plugins import disco as plugins_disco
 from certbot.compat import filesystem
@@ -82,6 +85,53 @@ def cert_path_for_cert_name(config: configuration.NamespaceConfig, cert_name: st
         cert_name_implied_conf, encoding='utf-8', default_encoding='utf-8')["fullchain"]
 
 
+_ocsp_response_caches: Dict[str, ocsp.OCSPResponseCache] = {}
+_ocsp_response_caches_lock = threading.Lock()
+
+
+def ocsp_response_cache(config: configuration.NamespaceConfig) -> ocsp.OCSPResponseCache:
+    """Return the OCSP response cache of the configuration directory.
+
+    The same cache is shared by all lineages in this process. It is written
+    to disk by calling its `save` method.
+
+    :param configuration.NamespaceConfig config: Configuration object
+
+    :returns: the OCSP response cache
+    :rtype: ocsp.OCSPResponseCache
+
+    """
+    path = os.path.join(config.config_dir, constants.OCSP_CACHE_FILE)
+    with _ocsp_response_caches_lock:
+        if path not in _ocsp_response_caches:
+            _ocsp_response_caches[path] = ocsp.OCSPResponseCache(path)
+        return _ocsp_response_caches[path]
+
+
+_revocation_checkers: Dict[str, ocsp.RevocationChecker] = {}
+_revocation_checkers_lock = threading.Lock()
+
+
+def revocation_checker(config: configuration.NamespaceConfig) -> ocsp.RevocationChecker:
+    """Return the OCSP revocation checker of the configuration directory.
+
+    The same checker, using the cache returned by `ocsp_response_cache`, is
+    shared by all lineages in this process so that its HTTP sessions to OCSP
+    responders are reused. `certbot renew` closes them at the end of each run.
+
+    :param configuration.NamespaceConfig config: Configuration object
+
+    :returns: the revocation checker
+    :rtype: ocsp.RevocationChecker
+
+    """
+    cache = ocsp_response_cache(config)
+    with _revocation_checkers_lock:
+        if config.config_dir not in _revocation_checkers:
+            _revocation_checkers[config.config_dir] = ocsp.RevocationChecker(cache=cache)
+        return _revocation_checkers[config.config_dir]
+
+
 def add_time_interval(base_time: datetime.datetime, interval: str,
                       textparser: parsedatetime.Calendar = parsedatetime.Calendar()
                       ) -> datetime.datetime:
@@ -377,17 +427,17 @@ def delete_files(config: configuration.NamespaceConfig, certname: str) -> None:
         directory_names.add(directory)
 
     # if all four were in the same directory, and the only thing left
-    # is the README file (or nothing), delete that directory.
-    # this will be wrong in very few but some cases.
+    # is the README file and exported OCSP staple (or nothing), delete that
+    # directory. this will be wrong in very few but some cases.
     if len(directory_names) == 1:
-        # delete the README file
+        # delete the README file and OCSP staple
         directory = directory_names.pop()
-        readme_path = os.path.join(directory, README)
-        try:
-            os.remove(readme_path)
-            logger.debug("Removed %s", readme_path)
-        except OSError:
-            logger.debug("Unable to delete %s", readme_path)
+        for path in (os.path.join(directory, README), ocsp.staple_path(directory)):
+            try:
+                os.remove(path)
+                logger.debug("Removed %s", path)
+            except OSError:
+                logger.debug("Unable to delete %s", path)
         # if it's now empty, delete the directory
         try:
             os.rmdir(directory) # only removes empty directories
@@ -917,8 +967,8 @@ class RenewableCert(interfaces.RenewableCert):
         target = self.current_target("cert")
         if target is None:
             raise errors.CertStorageError("could not find the certificate file")
-        with open(target, "rb") as f:
-            return crypto_util.get_names_from_cert(f.read())
+        cert = crypto_util.load_cert(target)
+        return acme_crypto_util.get_names_from_subject_and_extensions(cert.subject, cert.extensions)
 
     def ocsp_revoked(self, version: int) -> bool:
         """Is the specified cert version revoked according to OCSP?
@@ -939,8 +989,8 @@ class RenewableCert(interfaces.RenewableCert):
         # determine the OCSP status, let's ensure we don't crash Certbot by
         # catching all exceptions here.
         try:
-            return ocsp.RevocationChecker().ocsp_revoked_by_paths(cert_path,
-                                                                  chain_path)
+            return revocation_checker(self.cli_config).ocsp_revoked_by_paths(
+                cert_path, chain_path)
         except Exception as e:  # pylint: disable=broad-except
             logger.warning(
                 "An error occurred determining the OCSP status of %s.",
@@ -2,6 +2,7 @@
 import datetime
 import logging
 import sys
+import threading
 import unittest
 from unittest import mock
 
@@ -257,6 +258,59 @@ class HandleAuthorizationsTest(unittest.TestCase):
         assert abs(mock_sleep.call_args_list[1][0][0] - (interval - 1)) <= 1
         assert abs(mock_sleep.call_args_list[2][0][0] - (interval/2 - 1)) <= 1
 
+    @mock.patch('certbot._internal.auth_handler.time.sleep')
+    def test_polling_strategy(self, mock_sleep):
+        from acme import polling
+        self.handler.polling_strategy = polling.PollingStrategy(
+            initial_delay=0.5, interval=2, multiplier=2)
+        authzrs = [gen_dom_authzr(domain="0", challs=acme_util.CHALLENGES)]
+        mock_order = mock.MagicMock(authorizations=authzrs)
+        self.mock_net.poll.side_effect = _gen_mock_on_poll(retry=2, wait_value=0)
+
+        self.handler.handle_authorizations(mock_order, self.mock_config)
+
+        assert [call[0][0] for call in mock_sleep.call_args_list] == [0.5, 2, 4]
+
+    @mock.patch('certbot._internal.auth_handler.time.sleep')
+    def test_concurrent_polling(self, mock_sleep):
+        authzrs = [gen_dom_authzr(domain=str(i), challs=acme_util.CHALLENGES) for i in range(3)]
+        mock_order = mock.MagicMock(authorizations=authzrs)
+        # Each poll waits until all three are in flight, so polling one at a time would time out
+        barrier = threading.Barrier(3, timeout=10)
+        valid_poll = _gen_mock_on_poll()
+        threads = set()
+
+        def _poll(authzr):
+            threads.add(threading.current_thread())
+            barrier.wait()
+            return valid_poll(authzr)
+        self.mock_net.poll.side_effect = _poll
+
+        authzrs_result = self.handler.handle_authorizations(mock_order, self.mock_config)
+
+        assert len(threads) == 3
+        assert threading.current_thread() not in threads
+        assert [authzr.body.identifier.value for authzr in authzrs_result] == ['0', '1', '2']
+        assert all(authzr.body.status == messages.STATUS_VALID for authzr in authzrs_result)
+
+    @mock.patch('certbot._internal.auth_handler.time.sleep')
+    def test_concurrent_polling_bounded(self, mock_sleep):
+        self.handler.max_poll_workers = 1
+        authzrs = [gen_dom_authzr(domain=str(i), challs=acme_util.CHALLENGES) for i in range(3)]
+        mock_order = mock.MagicMock(authorizations=authzrs)
+        threads = set()
+        valid_poll = _gen_mock_on_poll()
+
+        def _poll(authzr):
+            threads.add(threading.current_thread())
+            return valid_poll(authzr)
+        self.mock_net.poll.side_effect = _poll
+
+        self.handler.handle_authorizations(mock_order, self.mock_config)
+
+        assert threads == {threading.current_thread()}
+        assert self.mock_net.poll.call_count == 3
+
     def test_no_domains(self):
         mock_order = mock.MagicMock(authorizations=[])
         with pytest.raises(errors.AuthorizationError):
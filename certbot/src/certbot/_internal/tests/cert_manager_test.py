@@ -174,20 +174,20 @@ class CertificatesTest(BaseCertManagerTest):
         assert mock_utility.notification.called is False
         assert mock_logger.warning.called #pylint: disable=no-member
 
-    @mock.patch('certbot.crypto_util.verify_renewable_cert')
+    @mock.patch('certbot._internal.lineage_index.LineageIndex.get')
     @mock.patch('certbot._internal.cert_manager.logger')
     @test_util.patch_display_util()
     @mock.patch("certbot._internal.storage.RenewableCert")
     @mock.patch('certbot._internal.cert_manager._report_human_readable')
     def test_certificates_parse_success(self, mock_report, mock_renewable_cert,
-        mock_utility, mock_logger, mock_verifier):
-        mock_verifier.return_value = None
+        mock_utility, mock_logger, mock_index_get):
         mock_report.return_value = ""
         self._certificates(self.config)
         assert mock_logger.warning.called is False
         assert mock_report.called
         assert mock_utility.called
         assert mock_renewable_cert.called
+        mock_index_get.assert_called_with(mock_renewable_cert(), verify=True)
 
     @mock.patch('certbot._internal.cert_manager.logger')
     @test_util.patch_display_util()
@@ -207,7 +207,7 @@ class CertificatesTest(BaseCertManagerTest):
         shutil.rmtree(empty_tempdir)
 
     @mock.patch('certbot.crypto_util.get_serial_from_cert')
-    @mock.patch('certbot._internal.cert_manager.ocsp.RevocationChecker.ocsp_revoked')
+    @mock.patch('certbot.ocsp.RevocationChecker.ocsp_revoked_by_paths')
     def test_report_human_readable(self, mock_revoked, mock_serial):
         mock_revoked.return_value = None
         mock_serial.return_value = 1234567890
@@ -280,6 +280,38 @@ class CertificatesTest(BaseCertManagerTest):
         out = get_report()
         assert len(re.findall("INVALID:", out)) == 0
 
+    @mock.patch('certbot.crypto_util.get_serial_from_cert')
+    @mock.patch('certbot.ocsp.RevocationChecker.ocsp_revoked')
+    def test_human_readable_cert_info_metadata(self, mock_revoked, mock_serial):
+        import datetime
+
+        from certbot._internal import cert_manager
+        from certbot._internal import lineage_index
+        mock_revoked.return_value = False
+        now = datetime.datetime.now(datetime.timezone.utc)
+        metadata = lineage_index.LineageMetadata(
+            names=["nameone", "nametwo"], not_before=now,
+            not_after=now + datetime.timedelta(days=3, hours=1), serial=0xabc,
+            key_type="ECDSA", server=None, version=1, fullchain="/live/fullchain.pem",
+            deployed=True, ari_cert_id=None, autorenew=True, renew_before_expiry=None,
+            installer=None,
+            export_ocsp_staple=False)
+        cert = mock.MagicMock(lineagename="nameone", is_test_cert=False)
+        mock_config = mock.MagicMock(certname=None, domains=["nametwo"])
+
+        out = cert_manager.human_readable_cert_info(mock_config, cert, metadata=metadata)
+        assert "Serial Number: abc" in out
+        assert "Key Type: ECDSA" in out
+        assert "Domains: nameone nametwo" in out
+        assert "VALID: 3 days" in out
+        assert cert.names.called is False
+        assert mock_serial.called is False
+
+        out = cert_manager.human_readable_cert_info(mock_config, cert, metadata=metadata,
+                                                    revoked=True)
+        assert "INVALID: REVOKED" in out
+        assert mock_revoked.call_count == 1
+
 
 class SearchLineagesTest(BaseCertManagerTest):
     """Tests for certbot._internal.cert_manager._search_lineages."""
@@ -521,6 +521,41 @@ class ParseTest(unittest.TestCase):
         with pytest.raises(errors.Error):
             self.parse(['--hsts', '--auto-hsts'])
 
+    def test_shards(self):
+        namespace = self.parse(['renew', '--shard-count', '3', '--shard-index', '2'])
+        assert namespace.shard_count == 3
+        assert namespace.shard_index == 2
+        with pytest.raises(errors.Error):
+            self.parse(['renew', '--shard-count', '3', '--shard-index', '3'])
+        with pytest.raises(errors.Error):
+            self.parse(['renew', '--shard-count', '0'])
+
+    def test_merge_renewal_reports(self):
+        assert self.parse(['renew']).merge_renewal_reports is None
+        namespace = self.parse(['renew', '--merge-renewal-reports', 'a.json', 'b.json',
+                                '--renewal-report', 'all.json'])
+        assert namespace.merge_renewal_reports == ['a.json', 'b.json']
+        assert namespace.renewal_report == 'all.json'
+        with pytest.raises(errors.Error):
+            self.parse(['renew', '--daemon', '--merge-renewal-reports', 'a.json'])
+
+    def test_polling_profile(self):
+        assert self.parse(['certonly']).polling_profile == 'default'
+        assert self.parse(['renew', '--polling-profile', 'gentle']).polling_profile == 'gentle'
+        with pytest.raises(SystemExit):
+            self.parse(['certonly', '--polling-profile', 'fast'])
+
+    def test_acme_connection_pool(self):
+        namespace = self.parse(['renew', '--acme-pool-connections', '2',
+                                '--acme-pool-maxsize', '16', '--acme-pool-block',
+                                '--acme-get-retries', '3'])
+        assert namespace.acme_pool_connections == 2
+        assert namespace.acme_pool_maxsize == 16
+        assert namespace.acme_pool_block is True
+        assert namespace.acme_get_retries == 3
+        with pytest.raises(errors.Error):
+            self.parse(['renew', '--acme-pool-maxsize', '0'])
+
     def test_parse_with_multiple_argument_sources(self):
         DEFAULT_VALUE = flag_default('server')
         CONFIG_FILE_VALUE = 'configfile.biz'
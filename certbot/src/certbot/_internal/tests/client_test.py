@@ -282,6 +282,27 @@ class ClientTest(ClientTestCommon):
     def test_init_acme_verify_ssl(self):
         assert self.client_network.call_args[1]['verify_ssl'] is True
 
+    def test_init_polling_strategy(self):
+        from acme import polling
+        assert self.acme_client.call_args[1]['polling_strategy'] is None
+        assert self.client.auth_handler is None
+
+        from certbot._internal.client import Client
+        self.config.polling_profile = 'gentle'
+        with mock.patch("certbot._internal.client.acme_client") as acme:
+            client = Client(config=self.config, account_=self.account,
+                            auth=mock.MagicMock(), installer=None)
+        assert acme.ClientV2.call_args[1]['polling_strategy'] is polling.GENTLE
+        assert client.auth_handler.polling_strategy is polling.GENTLE
+        assert client.auth_handler.max_poll_workers == self.config.acme_pool_maxsize
+
+    def test_init_acme_network_options(self):
+        kwargs = self.client_network.call_args[1]
+        assert kwargs['pool_connections'] == 10
+        assert kwargs['pool_maxsize'] == 10
+        assert kwargs['pool_block'] is False
+        assert kwargs['get_retries'] == 0
+
     def _mock_obtain_certificate(self):
         self.client.auth_handler = mock.MagicMock()
         self.client.auth_handler.handle_authorizations.return_value = [None]
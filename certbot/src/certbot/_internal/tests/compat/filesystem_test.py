@@ -528,6 +528,38 @@ class OsReplaceTest(test_util.TempDirTestCase):
         assert os.path.exists(dst) is True
 
 
+class FileStateTest(test_util.TempDirTestCase):
+    """Tests for file_state method"""
+    def setUp(self):
+        super().setUp()
+        self.probe_path = _create_probe(self.tempdir)
+        with open(self.probe_path, 'w') as f:
+            f.write('probe')
+
+    def test_file_state(self):
+        state = filesystem.file_state(self.probe_path)
+        assert state.size == 5
+
+        with open(self.probe_path, 'a') as f:
+            f.write('d')
+        os.utime(self.probe_path, ns=(0, state.mtime_ns + 10**9))
+
+        new_state = filesystem.file_state(self.probe_path)
+        assert new_state.inode == state.inode
+        assert new_state.size == 6
+        assert new_state.mtime_ns == state.mtime_ns + 10**9
+
+    def test_follows_symlinks(self):
+        link_path = os.path.join(self.tempdir, 'link')
+        os.symlink(self.probe_path, link_path)
+
+        assert filesystem.file_state(link_path) == filesystem.file_state(self.probe_path)
+
+    def test_missing_file(self):
+        with pytest.raises(OSError):
+            filesystem.file_state(os.path.join(self.tempdir, 'missing'))
+
+
 class RealpathTest(test_util.TempDirTestCase):
     """Tests for realpath method"""
     def setUp(self):
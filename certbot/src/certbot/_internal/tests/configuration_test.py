@@ -1,4 +1,5 @@
 """Tests for certbot.configuration."""
+import copy
 import sys
 from unittest import mock
 
@@ -166,6 +167,39 @@ class NamespaceConfigTest(test_util.ConfigTestCase):
         self.config.domains.append('example.org')
         assert self.config.set_by_user('domains')
 
+    def test_overlay(self):
+        import argparse
+
+        from certbot.configuration import NamespaceConfig
+        config = NamespaceConfig(argparse.Namespace(**constants.CLI_DEFAULTS))
+        config.set_argument_sources({})
+        config.domains = ['example.com']
+        config.webroot_map = {'example.com': '/var/www'}
+
+        lineage_config = config.overlay()
+        assert lineage_config.domains == ['example.com']
+        assert lineage_config.to_dict() == config.to_dict()
+        assert lineage_config.set_by_user('domains')
+        assert not lineage_config.set_by_user('webroot_path')
+
+        lineage_config.domains.append('example.org')
+        lineage_config.webroot_map['example.org'] = '/var/www'
+        lineage_config.rsa_key_size = 4096
+        lineage_config.webroot_path = ['/var/www']
+        assert lineage_config.set_by_user('webroot_path')
+        assert lineage_config.to_dict()['rsa_key_size'] == 4096
+
+        assert config.domains == ['example.com']
+        assert config.webroot_map == {'example.com': '/var/www'}
+        assert config.rsa_key_size == constants.CLI_DEFAULTS['rsa_key_size']
+        assert not config.set_by_user('webroot_path')
+        assert not config.set_by_user('rsa_key_size')
+
+        dry_run_config = copy.deepcopy(lineage_config)
+        dry_run_config.domains.append('example.net')
+        assert lineage_config.domains == ['example.com', 'example.org']
+        assert dry_run_config.rsa_key_size == 4096
+
 
 if __name__ == '__main__':
     sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
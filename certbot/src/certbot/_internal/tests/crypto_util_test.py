@@ -398,6 +398,61 @@ class GetNamesFromReqTest(unittest.TestCase):
             self._call(test_util.load_vector('csr_512.der'), typ=acme_crypto_util.Format.DER)
 
 
+class LoadCertTest(test_util.TempDirTestCase):
+    """Tests for certbot.crypto_util.load_cert"""
+
+    def setUp(self):
+        super().setUp()
+        self.cert_path = os.path.join(self.tempdir, 'cert.pem')
+        with open(self.cert_path, 'wb') as f:
+            f.write(test_util.load_vector('cert_512.pem'))
+
+    def test_load_cert(self):
+        from certbot.crypto_util import load_cert
+        cert = load_cert(self.cert_path)
+        assert cert.serial_number == x509.load_pem_x509_certificate(
+            test_util.load_vector('cert_512.pem')).serial_number
+
+    def test_parsed_once(self):
+        from certbot.crypto_util import cached_certs
+        from certbot.crypto_util import load_cert
+        link_path = os.path.join(self.tempdir, 'link.pem')
+        os.symlink(self.cert_path, link_path)
+        with cached_certs():
+            cert = load_cert(self.cert_path)
+            assert load_cert(link_path) is cert
+            with cached_certs():
+                assert load_cert(self.cert_path) is cert
+            # Leaving a nested context keeps the certificates
+            assert load_cert(self.cert_path) is cert
+        # They are forgotten when leaving the outermost one
+        assert load_cert(self.cert_path) is not cert
+        assert load_cert(self.cert_path) is not load_cert(self.cert_path)
+
+    def test_many_certs(self):
+        from certbot.crypto_util import cached_certs
+        from certbot.crypto_util import load_cert
+        paths = []
+        for i in range(300):
+            path = os.path.join(self.tempdir, f'cert{i}.pem')
+            with open(path, 'wb') as f:
+                f.write(test_util.load_vector('cert_512.pem'))
+            paths.append(path)
+        with cached_certs():
+            certs = [load_cert(path) for path in paths]
+            # No certificate was evicted by the other ones
+            assert all(load_cert(path) is cert for path, cert in zip(paths, certs))
+
+    def test_changed_file(self):
+        from certbot.crypto_util import cached_certs
+        from certbot.crypto_util import load_cert
+        with cached_certs():
+            cert = load_cert(self.cert_path)
+            with open(self.cert_path, 'wb') as f:
+                f.write(test_util.load_vector('cert_2048.pem'))
+            assert load_cert(self.cert_path) != cert
+
+
 class NotBeforeTest(unittest.TestCase):
     """Tests for certbot.crypto_util.notBefore"""
 
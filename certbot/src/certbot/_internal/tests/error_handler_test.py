@@ -2,6 +2,7 @@
 import contextlib
 import signal
 import sys
+import threading
 from typing import Callable
 from typing import Dict
 from typing import Union
@@ -67,6 +68,26 @@ class ErrorHandlerTest(unittest.TestCase):
         self.init_func.assert_called_once_with(*self.init_args,
                                                **self.init_kwargs)
 
+    def test_context_manager_in_thread(self):
+        init_signals = get_signals(self.signals)
+        errors = []
+
+        def run():
+            try:
+                with self.handler:
+                    assert get_signals(self.signals) == init_signals
+                    raise ValueError
+            except ValueError as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+
+        assert len(errors) == 1
+        self.init_func.assert_called_once_with(*self.init_args,
+                                               **self.init_kwargs)
+
     def test_context_manager_with_signal(self):
         if not self.signals:
             self.skipTest(reason='Signals cannot be handled on Windows.')
@@ -1,5 +1,7 @@
 """Tests for certbot._internal.hooks."""
+import concurrent.futures
 import sys
+import time
 import unittest
 from platform import python_version_tuple
 from unittest import mock
@@ -317,6 +319,18 @@ class RunSavedPostHooksTest(HookTest):
         assert mock_execute.call_args.kwargs['env']["FAILED_DOMAINS"] == "failed.org"
 
 
+class ResetSavedHooksTest(unittest.TestCase):
+    """Tests for certbot._internal.hooks.reset_saved_hooks."""
+
+    def test_reset(self):
+        from certbot._internal import hooks
+        with mock.patch.object(hooks, "executed_pre_hooks", {"foo"}) as executed:
+            with mock.patch.object(hooks, "post_hooks", ["bar"]) as saved:
+                hooks.reset_saved_hooks()
+                assert not executed
+                assert not saved
+
+
 class RenewalHookTest(HookTest):
     """Common base class for testing deploy/renew hooks."""
     # Needed for https://github.com/PyCQA/pylint/issues/179
@@ -449,6 +463,32 @@ class RenewHookTest(RenewalHookTest):
         mock_execute.assert_any_call("deploy-hook", self.dir_hook, env=mock.ANY)
         mock_execute.assert_called_with("deploy-hook", self.config.renew_hook, env=mock.ANY)
 
+    def test_concurrent_renewals(self):
+        calls = []
+        running = []
+
+        def execute(unused_name, hook, env):
+            running.append(hook)
+            assert len(running) == 1, "deploy hooks overlap"
+            calls.append((env["RENEWED_LINEAGE"], hook))
+            time.sleep(0.01)
+            running.remove(hook)
+            return (0, "", "")
+
+        lineages = [f"/etc/letsencrypt/live/example{i}.org" for i in range(4)]
+        with mock.patch("certbot.compat.misc.execute_command_status") as mock_execute:
+            mock_execute.side_effect = execute
+            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(
+                    lambda lineage: self._call(self.config, ["example.org"], lineage), lineages))
+
+        # Each lineage runs all of its hooks before another one starts
+        assert len(calls) == 8
+        for i in range(0, 8, 2):
+            assert calls[i] == (calls[i][0], self.dir_hook)
+            assert calls[i + 1] == (calls[i][0], self.config.renew_hook)
+        assert sorted(lineage for lineage, _ in calls[::2]) == lineages
+
 
 class ListHooksTest(test_util.TempDirTestCase):
     """Tests for certbot._internal.hooks.list_hooks."""
@@ -0,0 +1,131 @@
+"""Tests for certbot._internal.lineage_index."""
+import datetime
+import sys
+from unittest import mock
+
+import pytest
+
+from certbot import errors
+from certbot._internal import constants
+from certbot._internal import storage
+from certbot.compat import filesystem
+from certbot.compat import os
+import certbot.tests.util as test_util
+
+
+class LineageIndexTest(test_util.ConfigTestCase):
+    """Tests for certbot._internal.lineage_index.LineageIndex."""
+
+    def setUp(self):
+        super().setUp()
+        self.renewal_file = test_util.make_lineage(
+            self.config.config_dir, 'sample-renewal.conf')
+        self.lineage = storage.RenewableCert(self.renewal_file, self.config)
+        self.index_path = os.path.join(self.config.config_dir, constants.LINEAGE_INDEX_FILE)
+
+    def _index(self):
+        from certbot._internal.lineage_index import LineageIndex
+        return LineageIndex(self.index_path)
+
+    def test_get(self):
+        metadata = self._index().get(self.lineage)
+        assert metadata.names == ['c.encryption-example.com']
+        assert metadata.not_before == datetime.datetime(
+            2020, 10, 12, 21, 7, 40, tzinfo=datetime.timezone.utc)
+        assert metadata.not_after == self.lineage.target_expiry
+        assert metadata.serial == 502930490010985199
+        assert metadata.key_type == self.lineage.private_key_type
+        assert metadata.server == self.lineage.server
+        assert metadata.version == 1
+
+    def test_get_saved(self):
+        index = self._index()
+        metadata = index.get(self.lineage)
+        index.save()
+
+        with mock.patch('certbot._internal.lineage_index._read_metadata') as mock_read:
+            assert self._index().get(self.lineage) == metadata
+        assert mock_read.called is False
+
+    def test_get_changed_lineage(self):
+        index = self._index()
+        index.get(self.lineage)
+        index.save()
+
+        stat_result = os.lstat(self.renewal_file)
+        os.utime(self.renewal_file, ns=(stat_result.st_atime_ns,
+                                        stat_result.st_mtime_ns + 10**9))
+        with mock.patch('certbot._internal.lineage_index._read_metadata') as mock_read:
+            assert self._index().get(self.lineage) == mock_read.return_value
+        assert mock_read.called
+
+    @mock.patch('certbot.crypto_util.verify_renewable_cert')
+    def test_get_verify(self, mock_verify):
+        index = self._index()
+        index.get(self.lineage)
+        assert mock_verify.called is False
+
+        index.get(self.lineage, verify=True)
+        index.get(self.lineage, verify=True)
+        assert mock_verify.call_count == 1
+
+        mock_verify.reset_mock()
+        index.save()
+        self._index().get(self.lineage, verify=True)
+        assert mock_verify.called is False
+
+    @mock.patch('certbot.crypto_util.verify_renewable_cert')
+    def test_get_verify_failure(self, mock_verify):
+        mock_verify.side_effect = errors.Error
+        index = self._index()
+        with pytest.raises(errors.Error):
+            index.get(self.lineage, verify=True)
+        with pytest.raises(errors.Error):
+            index.get(self.lineage, verify=True)
+        assert mock_verify.call_count == 2
+
+    def test_lookup(self):
+        index = self._index()
+        assert index.lookup(self.renewal_file) is None
+        metadata = index.get(self.lineage)
+        assert index.lookup(self.renewal_file) == metadata
+        assert metadata.fullchain == self.lineage.fullchain
+        assert metadata.deployed
+        assert metadata.autorenew
+        assert not metadata.export_ocsp_staple
+
+        # A new version in the archive directory invalidates the entry
+        archive_dir = os.path.dirname(filesystem.realpath(self.lineage.cert))
+        with open(os.path.join(archive_dir, 'cert2.pem'), 'w'):
+            pass
+        stat_result = os.lstat(archive_dir)
+        os.utime(archive_dir, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+        assert index.lookup(self.renewal_file) is None
+
+    def test_lookup_removed_lineage(self):
+        index = self._index()
+        index.get(self.lineage)
+        os.remove(self.lineage.cert)
+        assert index.lookup(self.renewal_file) is None
+
+    def test_save_without_changes(self):
+        self._index().save()
+        assert os.path.exists(self.index_path) is False
+
+    def test_save_drops_deleted_lineages(self):
+        index = self._index()
+        index.get(self.lineage)
+        os.remove(self.renewal_file)
+        index.save()
+
+        with open(self.index_path) as f:
+            assert self.renewal_file not in f.read()
+
+    def test_unreadable_index(self):
+        with open(self.index_path, 'w') as f:
+            f.write('{"version": 1, "entries": {"foo": {}}}')
+        assert self._index().get(self.lineage).version == 1
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
@@ -129,6 +129,29 @@ class TestHandleCerts(unittest.TestCase):
         assert config.key_type == "ecdsa"
 
 
+class GetAndSaveCertTest(unittest.TestCase):
+    """Tests for certbot._internal.main._get_and_save_cert."""
+
+    @mock.patch('certbot._internal.main.ocsp_staple.export_staple')
+    @mock.patch('certbot._internal.main.renewal.renew_cert')
+    @mock.patch('certbot._internal.main.hooks')
+    @mock.patch('certbot._internal.main.display_util.notify')
+    def test_export_ocsp_staple(self, unused_notify, unused_hooks, unused_renew_cert,
+                                mock_export):
+        lineage = mock.MagicMock()
+        config = mock.MagicMock(export_ocsp_staple=False, dry_run=False)
+        main._get_and_save_cert(mock.MagicMock(), config, lineage=lineage)
+        assert mock_export.called is False
+
+        config.export_ocsp_staple = True
+        main._get_and_save_cert(mock.MagicMock(), config, lineage=lineage)
+        mock_export.assert_called_once_with(config, lineage, force=True)
+
+        config.dry_run = True
+        main._get_and_save_cert(mock.MagicMock(), config, lineage=lineage)
+        assert mock_export.call_count == 1
+
+
 class RunTest(test_util.ConfigTestCase):
     """Tests for certbot._internal.main.run."""
 
@@ -1088,7 +1111,8 @@ class MainTest(test_util.ConfigTestCase):
             args += ["--user-agent", ua]
             self._call_no_clientmock(args)
             acme_net.assert_called_once_with(mock.ANY, account=mock.ANY, verify_ssl=True,
-                user_agent=ua, alg=jose.RS256)
+                user_agent=ua, alg=jose.RS256, pool_connections=10, pool_maxsize=10,
+                pool_block=False, get_retries=0)
 
     @mock.patch('certbot._internal.main.plug_sel.record_chosen_plugins')
     @mock.patch('certbot._internal.main.plug_sel.pick_installer')
@@ -1610,6 +1634,15 @@ class MainTest(test_util.ConfigTestCase):
         args = ["renew", "--dry-run", "-tvv"]
         self._test_renewal_common(False, [], args=args, should_renew=False, error_expected=True)
 
+    @mock.patch('certbot._internal.renewal.handle_renewal_request')
+    @mock.patch('certbot._internal.renewal.merge_renewal_reports')
+    def test_renew_merge_renewal_reports(self, mock_merge, mock_handle):
+        self._call_no_clientmock(['renew', '--merge-renewal-reports', 'report0.json',
+                                  'report1.json'])
+        assert mock_handle.called is False
+        config = mock_merge.call_args[0][0]
+        assert config.merge_renewal_reports == ['report0.json', 'report1.json']
+
     def test_renew_with_certname(self):
         test_util.make_lineage(self.config.config_dir, 'sample-renewal.conf')
         self._test_renewal_common(True, [], should_renew=True,
@@ -0,0 +1,171 @@
+"""Tests for certbot._internal.ocsp_staple."""
+import datetime
+import sys
+import unittest
+from unittest import mock
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509 import ocsp as ocsp_lib
+import pytest
+
+from certbot.compat import os
+from certbot.tests import util as test_util
+
+
+_KEY = ec.generate_private_key(ec.SECP256R1())
+
+
+def _cert(serial_number, key=_KEY):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    name = x509.Name([x509.NameAttribute(x509.NameOID.COMMON_NAME, 'issuer')])
+    return x509.CertificateBuilder(
+        issuer_name=name,
+        subject_name=name if serial_number == 1 else x509.Name([]),
+        public_key=key.public_key(), serial_number=serial_number,
+        not_valid_before=now - datetime.timedelta(days=1),
+        not_valid_after=now + datetime.timedelta(days=90),
+    ).sign(_KEY, hashes.SHA256())
+
+
+_ISSUER = _cert(1)
+_CERT = _cert(2)
+
+
+def _response(this_update, next_update, cert=_CERT, issuer=_ISSUER):
+    return ocsp_lib.OCSPResponseBuilder().add_response(
+        cert=cert, issuer=issuer, algorithm=hashes.SHA1(),
+        cert_status=ocsp_lib.OCSPCertStatus.GOOD, this_update=this_update,
+        next_update=next_update, revocation_time=None, revocation_reason=None,
+    ).responder_id(ocsp_lib.OCSPResponderEncoding.HASH, issuer).sign(_KEY, hashes.SHA256())
+
+
+class RefreshTimeTest(unittest.TestCase):
+    """Tests for certbot._internal.ocsp_staple.refresh_time."""
+
+    def test_halfway(self):
+        from certbot._internal.ocsp_staple import refresh_time
+        now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+        response = _response(now, now + datetime.timedelta(days=4))
+        assert refresh_time(response) == now + datetime.timedelta(days=2)
+
+    def test_no_next_update(self):
+        from certbot._internal.ocsp_staple import REFRESH_WITHOUT_NEXT_UPDATE
+        from certbot._internal.ocsp_staple import refresh_time
+        now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+        assert refresh_time(_response(now, None)) == now + REFRESH_WITHOUT_NEXT_UPDATE
+
+
+class ExportStapleTest(test_util.TempDirTestCase):
+    """Tests for certbot._internal.ocsp_staple.export_staple."""
+
+    def setUp(self):
+        super().setUp()
+        self.config = mock.MagicMock(config_dir=self.tempdir)
+        self.fullchain_path = os.path.join(self.tempdir, 'fullchain.pem')
+        self._write_fullchain(_CERT, _ISSUER)
+        self.lineage = mock.MagicMock(live_dir=self.tempdir, cert_path='cert.pem',
+                                      chain_path='chain.pem', fullchain_path=self.fullchain_path)
+        self.staple_path = os.path.join(self.tempdir, 'ocsp.der')
+        now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+        self.now = now
+        self.response = _response(now - datetime.timedelta(hours=1),
+                                  now + datetime.timedelta(days=3))
+        patcher = mock.patch('certbot._internal.ocsp_staple.storage.revocation_checker')
+        self.mock_checker = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.mock_checker.ocsp_response.return_value = self.response
+
+    def _write_fullchain(self, *certs):
+        with open(self.fullchain_path, 'wb') as f:
+            for cert in certs:
+                f.write(cert.public_bytes(serialization.Encoding.PEM))
+
+    def _export(self, force=False):
+        from certbot._internal.ocsp_staple import export_staple
+        return export_staple(self.config, self.lineage, force)
+
+    def _exported(self):
+        with open(self.staple_path, 'rb') as f:
+            return f.read()
+
+    def test_export(self):
+        from certbot._internal.ocsp_staple import exported_refresh_time
+        from certbot._internal.ocsp_staple import refresh_time
+        assert exported_refresh_time(self.tempdir, self.fullchain_path) is None
+
+        assert self._export() == refresh_time(self.response)
+        self.mock_checker.ocsp_response.assert_called_once_with(
+            'cert.pem', 'chain.pem', use_cached=False)
+        assert self._exported() == self.response.public_bytes(serialization.Encoding.DER)
+        assert exported_refresh_time(
+            self.tempdir, self.fullchain_path) == refresh_time(self.response)
+        assert not os.path.exists(self.staple_path + '.new')
+
+    def test_current_staple_kept(self):
+        self._export()
+        self.mock_checker.ocsp_response.return_value = _response(
+            self.now, self.now + datetime.timedelta(days=7))
+        self._export()
+        assert self.mock_checker.ocsp_response.call_count == 1
+
+        self._export(force=True)
+        assert self.mock_checker.ocsp_response.call_count == 2
+        assert self._exported() == self.mock_checker.ocsp_response.return_value.public_bytes(
+            serialization.Encoding.DER)
+
+    def test_stale_staple_refreshed(self):
+        self.mock_checker.ocsp_response.return_value = _response(
+            self.now - datetime.timedelta(days=3), self.now + datetime.timedelta(days=1))
+        self._export()
+        self.mock_checker.ocsp_response.return_value = self.response
+        self._export()
+        assert self.mock_checker.ocsp_response.call_count == 2
+        assert self._exported() == self.response.public_bytes(serialization.Encoding.DER)
+
+    def test_corrupt_staple_refreshed(self):
+        from certbot._internal.ocsp_staple import exported_refresh_time
+        with open(self.staple_path, 'wb') as f:
+            f.write(b'garbage')
+        assert exported_refresh_time(self.tempdir, self.fullchain_path) is None
+        self._export()
+        assert self.mock_checker.ocsp_response.called
+
+    def test_staple_about_other_cert_refreshed(self):
+        from certbot._internal.ocsp_staple import exported_refresh_time
+        self._export()
+        assert exported_refresh_time(self.tempdir, self.fullchain_path) is not None
+
+        # The lineage was renewed: same issuer, new serial number
+        self._write_fullchain(_cert(3), _ISSUER)
+        assert exported_refresh_time(self.tempdir, self.fullchain_path) is None
+
+        # Same serial number from an issuer with another key
+        self._write_fullchain(_CERT, _cert(1, ec.generate_private_key(ec.SECP256R1())))
+        assert exported_refresh_time(self.tempdir, self.fullchain_path) is None
+
+        # No chain to identify the issuer
+        self._write_fullchain(_CERT)
+        assert exported_refresh_time(self.tempdir, self.fullchain_path) is None
+
+        self._export()
+        assert self.mock_checker.ocsp_response.call_count == 2
+
+    @mock.patch('certbot._internal.ocsp_staple.logger')
+    def test_no_response(self, mock_logger):
+        self.mock_checker.ocsp_response.return_value = None
+        assert self._export() is None
+        assert not os.path.exists(self.staple_path)
+        assert mock_logger.warning.called
+
+    @mock.patch('certbot._internal.ocsp_staple.logger')
+    def test_error(self, mock_logger):
+        self.mock_checker.ocsp_response.side_effect = ValueError('foo')
+        assert self._export() is None
+        assert 'foo' in str(mock_logger.warning.call_args)
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
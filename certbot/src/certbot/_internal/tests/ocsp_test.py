@@ -13,10 +13,12 @@ from cryptography.exceptions import InvalidSignature
 from cryptography.exceptions import UnsupportedAlgorithm
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.x509 import ocsp as ocsp_lib
 import pytest
 
 from certbot import errors
+from certbot.compat import os
 from certbot.tests import util as test_util
 
 out = """Missing = in header key=value
@@ -31,6 +33,8 @@ class OCSPTestOpenSSL(unittest.TestCase):
 
     def setUp(self):
         from certbot import ocsp
+        ocsp._openssl_header_probes.clear()
+        self.addCleanup(ocsp._openssl_header_probes.clear)
         with mock.patch('certbot.ocsp.subprocess.run') as mock_run:
             with mock.patch('certbot.util.exe_exists') as mock_exists:
                 mock_run.stderr = out
@@ -45,10 +49,17 @@ class OCSPTestOpenSSL(unittest.TestCase):
         mock_exists.return_value = True
 
         from certbot import ocsp
+        ocsp._openssl_header_probes.clear()
         checker = ocsp.RevocationChecker(enforce_openssl_binary_usage=True)
         assert mock_run.call_count == 1
         assert checker.host_args("x") == ["Host=x"]
 
+        # The probe is only run once per process
+        checker = ocsp.RevocationChecker(enforce_openssl_binary_usage=True)
+        assert mock_run.call_count == 1
+        assert checker.host_args("x") == ["Host=x"]
+
+        ocsp._openssl_header_probes.clear()
         mock_run.return_value.stderr = out.partition("\n")[2]
         checker = ocsp.RevocationChecker(enforce_openssl_binary_usage=True)
         assert checker.host_args("x") == ["Host", "x"]
@@ -61,6 +72,23 @@ class OCSPTestOpenSSL(unittest.TestCase):
         assert mock_log.call_count == 1
         assert checker.broken is True
 
+    @mock.patch('certbot.ocsp.subprocess.run')
+    @mock.patch('certbot.util.exe_exists')
+    def test_init_other_openssl_build(self, mock_exists, mock_run):
+        mock_run.return_value.stderr = out
+        mock_exists.return_value = True
+        from certbot import ocsp
+        ocsp._openssl_header_probes.clear()
+        ocsp.RevocationChecker(enforce_openssl_binary_usage=True)
+        assert mock_run.call_count == 1
+
+        # A different openssl build is probed again
+        mock_run.return_value.stderr = ""
+        with mock.patch('certbot.ocsp._openssl_build', return_value="other"):
+            checker = ocsp.RevocationChecker(enforce_openssl_binary_usage=True)
+        assert mock_run.call_count == 2
+        assert checker.host_args("x") == ["Host", "x"]
+
     @mock.patch('certbot.ocsp._determine_ocsp_server')
     @mock.patch('certbot.ocsp.crypto_util.notAfter')
     @mock.patch('certbot.util.run_script')
@@ -151,7 +179,8 @@ class OSCPTestCryptography(unittest.TestCase):
         mock_determine.return_value = ('http://example.com', 'example.com')
         self.checker.ocsp_revoked(self.cert_obj)
 
-        mock_check.assert_called_once_with(self.cert_path, self.chain_path, 'http://example.com', 10)
+        mock_check.assert_called_once_with(
+            self.cert_path, self.chain_path, 'http://example.com', 10, None, mock.ANY)
 
     def test_revoke(self):
         with _ocsp_mock(ocsp_lib.OCSPCertStatus.REVOKED, ocsp_lib.OCSPResponseStatus.SUCCESSFUL):
@@ -213,6 +242,79 @@ class OSCPTestCryptography(unittest.TestCase):
         assert mocks['mock_check'].call_args_list[3][0][0].public_numbers() == \
                          responder.public_key().public_numbers()
 
+    def test_cache(self):
+        from certbot import ocsp
+        cache = mock.MagicMock()
+        cache.get.return_value = None
+        checker = ocsp.RevocationChecker(cache=cache)
+        with _ocsp_mock(ocsp_lib.OCSPCertStatus.REVOKED,
+                        ocsp_lib.OCSPResponseStatus.SUCCESSFUL) as mocks:
+            assert checker.ocsp_revoked(self.cert_obj)
+        cache.set.assert_called_once_with(mocks['mock_response'].return_value)
+
+        cache.get.return_value = mocks['mock_response'].return_value
+        with _ocsp_mock(ocsp_lib.OCSPCertStatus.GOOD,
+                        ocsp_lib.OCSPResponseStatus.SUCCESSFUL) as mocks:
+            assert checker.ocsp_revoked(self.cert_obj)
+        assert mocks['mock_post'].called is False
+
+    @mock.patch('certbot.ocsp._determine_ocsp_server')
+    @mock.patch('certbot.ocsp._check_ocsp_cryptography')
+    def test_ocsp_revoked_many(self, mock_check, mock_determine):
+        mock_determine.return_value = ('http://example.com', 'example.com')
+        mock_check.side_effect = lambda cert_path, *args: cert_path == 'revoked'
+        paths = [('revoked', 'chain'), ('good', 'chain'), ('revoked', 'chain')]
+
+        assert self.checker.ocsp_revoked_many(paths) == [True, False, True]
+        assert mock_check.call_count == 2
+        sessions = {call[0][5] for call in mock_check.call_args_list}
+        assert len(sessions) == 1
+
+        assert self.checker.ocsp_revoked_many([]) == []
+
+    @mock.patch('certbot.ocsp._determine_ocsp_server')
+    @mock.patch('certbot.ocsp._check_ocsp_cryptography')
+    def test_ocsp_revoked_many_error(self, mock_check, mock_determine):
+        mock_determine.return_value = ('http://example.com', 'example.com')
+        mock_check.side_effect = [ValueError('foo'), True]
+        assert self.checker.ocsp_revoked_many(
+            [('a', 'chain'), ('b', 'chain')], max_workers=1) == [False, True]
+
+    @mock.patch('certbot.ocsp._determine_ocsp_server')
+    @mock.patch('certbot.ocsp._check_ocsp_cryptography')
+    def test_session_per_host(self, mock_check, mock_determine):
+        mock_determine.side_effect = [('http://a.example', 'a.example'),
+                                      ('http://b.example', 'b.example'),
+                                      ('http://a.example', 'a.example')]
+        for _ in range(3):
+            self.checker.ocsp_revoked(self.cert_obj)
+        sessions = [call[0][5] for call in mock_check.call_args_list]
+        assert sessions[0] is sessions[2]
+        assert sessions[0] is not sessions[1]
+
+        with mock.patch('certbot.ocsp.requests.Session.close') as mock_close:
+            self.checker.close()
+        assert mock_close.call_count == 2
+        assert self.checker._sessions == {}
+
+    def test_ocsp_response(self):
+        cache = mock.MagicMock()
+        from certbot import ocsp
+        checker = ocsp.RevocationChecker(cache=cache)
+        with _ocsp_mock(ocsp_lib.OCSPCertStatus.GOOD,
+                        ocsp_lib.OCSPResponseStatus.SUCCESSFUL) as mocks:
+            response = checker.ocsp_response(self.cert_path, self.chain_path, use_cached=False)
+        assert response is mocks['mock_response'].return_value
+        assert cache.get.called is False
+        cache.set.assert_called_once_with(response)
+
+        with mock.patch('certbot.ocsp._determine_ocsp_server', return_value=(None, None)):
+            assert checker.ocsp_response(self.cert_path, self.chain_path) is None
+
+        checker.use_openssl_binary = True
+        with pytest.raises(errors.Error):
+            checker.ocsp_response(self.cert_path, self.chain_path)
+
     def test_revoke_resiliency(self):
         # Server return an invalid HTTP response
         with _ocsp_mock(ocsp_lib.OCSPCertStatus.UNKNOWN, ocsp_lib.OCSPResponseStatus.SUCCESSFUL,
@@ -285,13 +387,94 @@ class OSCPTestCryptography(unittest.TestCase):
         assert revoked is False
 
 
+class OCSPResponseCacheTest(test_util.TempDirTestCase):
+    """Tests for certbot.ocsp.OCSPResponseCache."""
+
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.tempdir, 'ocsp-cache.json')
+        self.key = ec.generate_private_key(ec.SECP256R1())
+        now = datetime.now(timezone.utc)
+        name = x509.Name([x509.NameAttribute(x509.NameOID.COMMON_NAME, 'issuer')])
+        self.issuer = x509.CertificateBuilder(
+            issuer_name=name, subject_name=name, public_key=self.key.public_key(),
+            serial_number=1, not_valid_before=now - timedelta(days=1),
+            not_valid_after=now + timedelta(days=90),
+        ).sign(self.key, hashes.SHA256())
+
+    def _response(self, serial_number, next_update=timedelta(days=1)):
+        now = datetime.now(timezone.utc)
+        cert = x509.CertificateBuilder(
+            issuer_name=self.issuer.subject, subject_name=x509.Name([]),
+            public_key=self.key.public_key(), serial_number=serial_number,
+            not_valid_before=now - timedelta(days=1), not_valid_after=now + timedelta(days=90),
+        ).sign(self.key, hashes.SHA256())
+        builder = ocsp_lib.OCSPResponseBuilder().add_response(
+            cert=cert, issuer=self.issuer, algorithm=hashes.SHA1(),
+            cert_status=ocsp_lib.OCSPCertStatus.GOOD, this_update=now - timedelta(hours=1),
+            next_update=now + next_update if next_update else None,
+            revocation_time=None, revocation_reason=None,
+        ).responder_id(ocsp_lib.OCSPResponderEncoding.HASH, self.issuer)
+        return builder.sign(self.key, hashes.SHA256())
+
+    def _cache(self, max_entries=10):
+        from certbot.ocsp import OCSPResponseCache
+        return OCSPResponseCache(self.path, max_entries)
+
+    def test_get_set(self):
+        cache = self._cache()
+        response = self._response(2)
+        assert cache.get(response.issuer_key_hash, 2) is None
+        cache.set(response)
+        assert cache.get(response.issuer_key_hash, 2).serial_number == 2
+        assert cache.get(response.issuer_key_hash, 3) is None
+
+    def test_no_next_update(self):
+        cache = self._cache()
+        response = self._response(2, next_update=None)
+        cache.set(response)
+        assert cache.get(response.issuer_key_hash, 2) is None
+
+    def test_expired(self):
+        cache = self._cache()
+        response = self._response(2, next_update=timedelta(seconds=-1))
+        cache.set(response)
+        assert cache.get(response.issuer_key_hash, 2) is None
+
+    def test_lru_eviction(self):
+        cache = self._cache(max_entries=2)
+        responses = [self._response(serial) for serial in (2, 3, 4)]
+        cache.set(responses[0])
+        cache.set(responses[1])
+        # Using the first response makes the second one the least recently used
+        assert cache.get(responses[0].issuer_key_hash, 2) is not None
+        cache.set(responses[2])
+        assert cache.get(responses[0].issuer_key_hash, 3) is None
+        assert cache.get(responses[0].issuer_key_hash, 2) is not None
+        assert cache.get(responses[0].issuer_key_hash, 4) is not None
+
+    def test_save_and_load(self):
+        cache = self._cache()
+        cache.save()
+        assert not os.path.exists(self.path)
+        response = self._response(2)
+        cache.set(response)
+        cache.save()
+        assert self._cache().get(response.issuer_key_hash, 2).serial_number == 2
+
+    def test_load_corrupt(self):
+        with open(self.path, 'w') as f:
+            f.write('{"version": 1, "entries": {"foo": {}}}')
+        assert self._cache().get(b'foo', 2) is None
+
+
 @contextlib.contextmanager
 def _ocsp_mock(certificate_status, response_status,
                http_status_code=200, check_signature_side_effect=None):
     with mock.patch('certbot.ocsp.ocsp.load_der_ocsp_response') as mock_response:
         mock_response.return_value = _construct_mock_ocsp_response(
             certificate_status, response_status)
-        with mock.patch('certbot.ocsp.requests.post') as mock_post:
+        with mock.patch('certbot.ocsp.requests.Session.post') as mock_post:
             mock_post.return_value = mock.Mock(status_code=http_status_code)
             with mock.patch('certbot.ocsp.crypto_util.verify_signed_payload') \
                 as mock_check:
@@ -115,6 +115,16 @@ class PluginEntryPointTest(unittest.TestCase):
 
         assert self.plugin_ep.plugin_cls is standalone.Authenticator
 
+    def test_uninitialized_copy(self):
+        self.plugin_ep.init(config=mock.MagicMock())
+        self.plugin_ep.prepare()
+        plugin_ep_copy = self.plugin_ep.uninitialized_copy()
+        assert plugin_ep_copy.initialized is False
+        assert plugin_ep_copy.prepared is False
+        assert plugin_ep_copy.plugin_cls is self.plugin_ep.plugin_cls
+        assert plugin_ep_copy.entry_point is self.plugin_ep.entry_point
+        assert self.plugin_ep.initialized is True
+
     def test_init(self):
         config = mock.MagicMock()
         plugin = self.plugin_ep.init(config=config)
@@ -220,6 +230,15 @@ class PluginsRegistryTest(unittest.TestCase):
         assert plugins["ep1"].entry_point is self.ep1
         assert "p1:ep1" not in plugins
 
+    def test_find_all_counts_discoveries(self):
+        from certbot._internal.plugins.disco import PluginsRegistry
+        discoveries = PluginsRegistry.discoveries
+        with mock.patch("certbot._internal.plugins.disco.importlib_metadata") as mock_meta:
+            mock_meta.entry_points.return_value = []
+            PluginsRegistry.find_all()
+            PluginsRegistry.find_all()
+        assert PluginsRegistry.discoveries == discoveries + 2
+
     def test_find_all_error_message(self):
         from certbot._internal.plugins.disco import PluginsRegistry
         with mock.patch("certbot._internal.plugins.disco.importlib_metadata") as mock_meta:
@@ -246,6 +265,11 @@ class PluginsRegistryTest(unittest.TestCase):
         assert ["baz"] == self.reg.init("bar")
         self.plugin_ep.init.assert_called_once_with("bar")
 
+    def test_uninitialized_copy(self):
+        self.plugin_ep.uninitialized_copy.return_value = "copy"
+        # pylint: disable=protected-access
+        assert {"mock": "copy"} == self.reg.uninitialized_copy()._plugins
+
     def test_filter(self):
         assert self.plugins == \
             self.reg.filter(lambda p_ep: p_ep.name.startswith("m"))
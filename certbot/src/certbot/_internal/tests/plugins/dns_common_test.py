@@ -3,11 +3,18 @@
 import collections
 import logging
 import sys
+import threading
 import unittest
 from unittest import mock
 
+import dns.exception
+import dns.flags
+import dns.message
+import dns.resolver
+import dns.rrset
 import pytest
 
+from certbot import achallenges
 from certbot import errors
 from certbot import util
 from certbot.compat import os
@@ -47,6 +54,50 @@ class DNSAuthenticatorTest(test_util.TempDirTestCase, dns_test_common.BaseAuthen
 
         self.auth._perform.assert_called_once_with(dns_test_common.DOMAIN, mock.ANY, mock.ANY)
 
+    @test_util.patch_display_util()
+    @mock.patch('certbot.plugins.dns_common.sleep')
+    @mock.patch('certbot.plugins.dns_common.wait_for_propagation')
+    def test_perform_propagation_check(self, mock_wait, mock_sleep, unused_mock_get_utility):
+        self.config.fake_propagation_seconds = 30
+        self.config.fake_propagation_check = True
+        mock_wait.return_value = True
+
+        self.auth.perform([self.achall])
+
+        mock_wait.assert_called_once_with(
+            [('_acme-challenge.' + dns_test_common.DOMAIN, mock.ANY)], 30)
+        assert not mock_sleep.called
+
+        mock_wait.return_value = False
+        self.auth.perform([self.achall])
+        assert not mock_sleep.called
+
+    @test_util.patch_display_util()
+    @mock.patch('certbot.plugins.dns_common.sleep')
+    @mock.patch('certbot.plugins.dns_common.wait_for_propagation')
+    def test_perform_propagation_sleep(self, mock_wait, mock_sleep, unused_mock_get_utility):
+        self.config.fake_propagation_seconds = 30
+        self.config.fake_propagation_check = False
+
+        self.auth.perform([self.achall])
+
+        assert not mock_wait.called
+        mock_sleep.assert_called_once_with(30)
+
+    @test_util.patch_display_util()
+    @mock.patch('certbot.plugins.dns_common.logger')
+    @mock.patch('certbot.plugins.dns_common.dns', None)
+    @mock.patch('certbot.plugins.dns_common.sleep')
+    def test_perform_propagation_check_no_dnspython(self, mock_sleep, mock_logger,
+                                                    unused_mock_get_utility):
+        self.config.fake_propagation_seconds = 30
+        self.config.fake_propagation_check = True
+
+        self.auth.perform([self.achall])
+
+        assert 'dnspython' in mock_logger.warning.call_args[0][0]
+        mock_sleep.assert_called_once_with(30)
+
     def test_cleanup(self):
         self.auth._attempt_cleanup = True
 
@@ -54,6 +105,68 @@ class DNSAuthenticatorTest(test_util.TempDirTestCase, dns_test_common.BaseAuthen
 
         self.auth._cleanup.assert_called_once_with(dns_test_common.DOMAIN, mock.ANY, mock.ANY)
 
+    def _achalls(self, count):
+        return [achallenges.KeyAuthorizationAnnotatedChallenge(
+            challb=self.achall.challb, domain='%d.%s' % (i, dns_test_common.DOMAIN),
+            account_key=dns_test_common.KEY) for i in range(count)]
+
+    @test_util.patch_display_util()
+    def test_perform_and_cleanup_thread_safe(self, unused_mock_get_utility):
+        self.auth._thread_safe = True
+        self.auth._attempt_cleanup = True
+        # Each call waits until three are in flight, so serial calls would time out
+        barrier = threading.Barrier(3, timeout=10)
+        domains = []
+
+        def _record(domain, unused_validation_name, unused_validation):
+            barrier.wait()
+            domains.append(domain)
+
+        with mock.patch.object(self.auth, '_perform', side_effect=_record):
+            responses = self.auth.perform(self._achalls(3))
+        with mock.patch.object(self.auth, '_cleanup', side_effect=_record):
+            self.auth.cleanup(self._achalls(3))
+
+        assert len(responses) == 3
+        assert sorted(domains) == sorted(2 * [a.domain for a in self._achalls(3)])
+
+    @test_util.patch_display_util()
+    def test_perform_thread_safe_error(self, unused_mock_get_utility):
+        self.auth._thread_safe = True
+        self.auth._max_workers = 2
+        error = errors.PluginError('foo')
+
+        with mock.patch.object(self.auth, '_perform', side_effect=[None, error, None]) as perform:
+            with pytest.raises(errors.PluginError):
+                self.auth.perform(self._achalls(3))
+
+        assert perform.call_count == 3
+        assert self.auth._attempt_cleanup
+
+    @test_util.patch_display_util()
+    def test_perform_and_cleanup_batch(self, unused_mock_get_utility):
+        self.auth._attempt_cleanup = True
+        achalls = self._achalls(2)
+        records = [(a.domain, '_acme-challenge.' + a.domain, mock.ANY) for a in achalls]
+
+        with mock.patch.object(self.auth, '_perform_batch') as perform_batch:
+            self.auth.perform(achalls)
+        with mock.patch.object(self.auth, '_cleanup_batch') as cleanup_batch:
+            self.auth.cleanup(achalls)
+
+        perform_batch.assert_called_once_with(records)
+        cleanup_batch.assert_called_once_with(records)
+
+    @test_util.patch_display_util()
+    def test_perform_not_thread_safe(self, unused_mock_get_utility):
+        threads = set()
+
+        with mock.patch.object(self.auth, '_perform',
+                               side_effect=lambda *args: threads.add(threading.current_thread())):
+            self.auth.perform(self._achalls(3))
+
+        assert threads == {threading.current_thread()}
+
     @test_util.patch_display_util()
     def test_prompt(self, mock_get_utility):
         mock_display = mock_get_utility()
@@ -218,6 +331,133 @@ class CredentialsConfigurationRequireTest(test_util.TempDirTestCase):
             credentials_configuration.require({"test": ""})
 
 
+class WaitForPropagationTest(unittest.TestCase):
+    """Tests for certbot.plugins.dns_common.wait_for_propagation."""
+
+    def setUp(self):
+        self.records = [('_acme-challenge.example.com', 'foo'),
+                        ('_acme-challenge.example.com', 'bar')]
+
+        def _resolve(name, rdtype):
+            if rdtype == 'NS':
+                return [mock.MagicMock(target='ns1.example.com.'),
+                        mock.MagicMock(target='ns2.example.com.')]
+            if rdtype == 'AAAA':
+                raise dns.resolver.NoAnswer()
+            address = '192.0.2.1' if name == 'ns1.example.com.' else '192.0.2.2'
+            return [mock.MagicMock(**{'to_text.return_value': address})]
+
+        for target, kwargs in (('dns.resolver.zone_for_name', {'return_value': 'example.com.'}),
+                               ('dns.resolver.resolve', {'side_effect': _resolve}),
+                               ('dns.query.udp', {}),
+                               ('dns.query.tcp', {}),
+                               ('sleep', {}),
+                               ('monotonic', {'return_value': 0})):
+            patcher = mock.patch('certbot.plugins.dns_common.' + target, **kwargs)
+            setattr(self, 'mock_' + target.split('.')[-1], patcher.start())
+            self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def _answer(*contents, truncated=False):
+        def _answer(query, unused_nameserver, timeout):
+            response = dns.message.make_response(query)
+            if contents:
+                response.answer.append(dns.rrset.from_text(
+                    query.question[0].name, 60, 'IN', 'TXT', *('"%s"' % c for c in contents)))
+            if truncated:
+                response.flags |= dns.flags.TC
+            return response
+        return _answer
+
+    def test_propagated(self):
+        self.mock_udp.side_effect = self._answer('foo', 'bar', 'baz')
+
+        assert dns_common.wait_for_propagation(self.records, 30) is True
+
+        assert not self.mock_sleep.called
+        assert [c[0][1] for c in self.mock_udp.call_args_list] == ['192.0.2.1', '192.0.2.2']
+
+    def test_propagated_later(self):
+        answers = [self._answer('foo', 'bar'), self._answer('foo'),
+                   self._answer('foo', 'bar'), self._answer('foo', 'bar')]
+        self.mock_udp.side_effect = lambda *a, **k: answers.pop(0)(*a, **k)
+
+        assert dns_common.wait_for_propagation(self.records, 30) is True
+
+        self.mock_sleep.assert_called_once_with(dns_common.PROPAGATION_CHECK_INTERVAL)
+        assert self.mock_zone_for_name.call_count == 1
+        assert not answers
+
+    def test_timeout(self):
+        self.mock_udp.side_effect = self._answer()
+        self.mock_monotonic.side_effect = [0, 0, 29, 29, 31]
+
+        assert dns_common.wait_for_propagation(self.records, 30) is False
+
+        self.mock_sleep.assert_called_once_with(1)
+        assert [c[1]['timeout'] for c in self.mock_udp.call_args_list] == [
+            dns_common.PROPAGATION_QUERY_TIMEOUT, 1]
+
+    def test_no_query_after_deadline(self):
+        self.mock_udp.side_effect = self._answer()
+        self.mock_monotonic.side_effect = [0, 31, 31]
+
+        assert dns_common.wait_for_propagation(self.records, 30) is False
+
+        assert not self.mock_udp.called
+        assert not self.mock_sleep.called
+
+    def test_unreachable_address(self):
+        resolve = self.mock_resolve.side_effect
+
+        def _resolve(name, rdtype):
+            if rdtype == 'AAAA' and name == 'ns1.example.com.':
+                return [mock.MagicMock(**{'to_text.return_value': '2001:db8::1'})]
+            return resolve(name, rdtype)
+        self.mock_resolve.side_effect = _resolve
+        answer = self._answer('foo', 'bar')
+
+        def _udp(query, nameserver, timeout):
+            if nameserver == '192.0.2.1':
+                raise OSError('Network is unreachable')
+            return answer(query, nameserver, timeout)
+        self.mock_udp.side_effect = _udp
+
+        assert dns_common.wait_for_propagation(self.records, 30) is True
+
+        assert not self.mock_sleep.called
+        assert [c[0][1] for c in self.mock_udp.call_args_list] == [
+            '192.0.2.1', '2001:db8::1', '192.0.2.2']
+
+    def test_unreachable_nameserver(self):
+        answer = self._answer('foo', 'bar')
+
+        def _udp(query, nameserver, timeout):
+            if nameserver == '192.0.2.2':
+                raise dns.exception.Timeout()
+            return answer(query, nameserver, timeout)
+        self.mock_udp.side_effect = _udp
+        self.mock_monotonic.side_effect = [0, 0, 0, 31]
+
+        assert dns_common.wait_for_propagation(self.records, 30) is False
+
+    def test_dns_error(self):
+        self.mock_zone_for_name.side_effect = [dns.exception.Timeout(), 'example.com.']
+        self.mock_udp.side_effect = self._answer('foo', 'bar')
+
+        assert dns_common.wait_for_propagation(self.records, 30) is True
+
+        assert self.mock_sleep.call_count == 1
+
+    def test_truncated(self):
+        self.mock_udp.side_effect = self._answer(truncated=True)
+        self.mock_tcp.side_effect = self._answer('foo', 'bar')
+
+        assert dns_common.wait_for_propagation(self.records, 30) is True
+
+        assert self.mock_tcp.call_count == 2
+
+
 class DomainNameGuessTest(unittest.TestCase):
 
     def test_simple_case(self):
@@ -0,0 +1,76 @@
+"""Tests for certbot._internal.rate_limit."""
+import sys
+import unittest
+from unittest import mock
+
+import pytest
+
+
+class TokenBucketTest(unittest.TestCase):
+    """Tests for certbot._internal.rate_limit.TokenBucket."""
+
+    @mock.patch('certbot._internal.rate_limit.time.monotonic')
+    def test_reserve(self, mock_monotonic):
+        from certbot._internal.rate_limit import TokenBucket
+        mock_monotonic.return_value = 1000.0
+        bucket = TokenBucket(2)
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        # Tokens are refilled at 2 per hour
+        assert bucket.reserve() == 1800
+        assert bucket.reserve() == 3600
+        mock_monotonic.return_value = 1000.0 + 3600
+        assert bucket.reserve() == 1800
+
+    @mock.patch('certbot._internal.rate_limit.time.monotonic')
+    def test_unlimited(self, mock_monotonic):
+        from certbot._internal.rate_limit import TokenBucket
+        mock_monotonic.return_value = 1000.0
+        bucket = TokenBucket(0)
+        assert all(bucket.reserve() == 0 for _ in range(100))
+        bucket.pause_until(1060.0)
+        bucket.pause_until(1030.0)
+        assert bucket.reserve() == 60
+
+
+class RegisteredDomainTest(unittest.TestCase):
+    """Tests for certbot._internal.rate_limit.registered_domain."""
+
+    def test_registered_domain(self):
+        from certbot._internal.rate_limit import registered_domain
+        assert registered_domain('www.Example.com.') == 'example.com'
+        assert registered_domain('*.a.example.org') == 'example.org'
+        assert registered_domain('localhost') == 'localhost'
+
+
+class IssuanceRateLimiterTest(unittest.TestCase):
+    """Tests for certbot._internal.rate_limit.IssuanceRateLimiter."""
+
+    @mock.patch('certbot._internal.rate_limit.time')
+    def test_wait(self, mock_time):
+        from certbot._internal.rate_limit import IssuanceRateLimiter
+        mock_time.monotonic.return_value = 1000.0
+        limiter = IssuanceRateLimiter(0, 1)
+        limiter.wait('https://acme', ['a.example.com'])
+        limiter.wait('https://acme', ['example.org'])
+        assert mock_time.sleep.called is False
+        # Same registered domain as the first certificate
+        limiter.wait('https://acme', ['b.example.com', 'example.org'])
+        mock_time.sleep.assert_called_once_with(3600)
+
+    @mock.patch('certbot._internal.rate_limit.time')
+    def test_back_off(self, mock_time):
+        from certbot._internal.rate_limit import IssuanceRateLimiter
+        mock_time.monotonic.return_value = 1000.0
+        limiter = IssuanceRateLimiter(0, 0)
+        limiter.back_off('https://acme', ['example.com'], 120)
+        limiter.wait('https://other', ['example.net'])
+        assert mock_time.sleep.called is False
+        # Pauses both the ACME server and the registered domain
+        limiter.wait('https://acme', ['example.net'])
+        limiter.wait('https://other', ['www.example.com'])
+        assert mock_time.sleep.call_args_list == [mock.call(120), mock.call(120)]
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
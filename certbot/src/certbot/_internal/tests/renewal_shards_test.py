@@ -0,0 +1,98 @@
+"""Tests for certbot._internal.renewal_shards."""
+import json
+import sys
+import unittest
+
+import pytest
+
+from certbot.compat import os
+import certbot.tests.util as test_util
+
+
+class LineageShardTest(unittest.TestCase):
+    """Tests for certbot._internal.renewal_shards.lineage_shard."""
+
+    @classmethod
+    def _call(cls, *args):
+        from certbot._internal.renewal_shards import lineage_shard
+        return lineage_shard(*args)
+
+    def test_single_shard(self):
+        assert self._call('example.com', 1) == 0
+
+    def test_balanced(self):
+        shards = [self._call(f'example{i}.com', 4) for i in range(400)]
+        assert all(50 < shards.count(shard) < 150 for shard in range(4))
+
+    def test_adding_shard_moves_few_lineages(self):
+        names = [f'example{i}.com' for i in range(400)]
+        before = {name: self._call(name, 4) for name in names}
+        after = {name: self._call(name, 5) for name in names}
+        moved = [name for name in names if before[name] != after[name]]
+        # Lineages only move to the new shard
+        assert all(after[name] == 4 for name in moved)
+        assert len(moved) < 150
+
+
+def test_filter_conf_files():
+    from certbot._internal.renewal_shards import filter_conf_files
+    conf_files = [os.path.join('renewal', f'example{i}.com.conf') for i in range(20)]
+    shards = [filter_conf_files(conf_files, shard, 3) for shard in range(3)]
+    assert sorted(sum(shards, [])) == sorted(conf_files)
+    assert filter_conf_files(conf_files, 0, 1) == conf_files
+
+
+class RenewalReportTest(test_util.TempDirTestCase):
+    """Tests for certbot._internal.renewal_shards.RenewalReport."""
+
+    def _report(self, shard, shard_count=2):
+        from certbot._internal.renewal_shards import RenewalReport
+        return RenewalReport([f'success{shard}'], [f'failure{shard}'], [f'skipped{shard}'],
+                             [f'parsefail{shard}'], [shard], shard_count)
+
+    def test_save(self):
+        path = os.path.join(self.tempdir, 'report.json')
+        self._report(1).save(path)
+        with open(path) as f:
+            assert json.load(f) == {
+                'version': 1, 'renew_successes': ['success1'], 'renew_failures': ['failure1'],
+                'renew_skipped': ['skipped1'], 'parse_failures': ['parsefail1'], 'shards': [1],
+                'shard_count': 2}
+
+    def test_save_and_load(self):
+        from certbot._internal.renewal_shards import RenewalReport
+        path = os.path.join(self.tempdir, 'report.json')
+        report = self._report(1)
+        report.save(path)
+        assert RenewalReport.load(path) == report
+
+    def test_load_invalid(self):
+        from certbot._internal.renewal_shards import RenewalReport
+        path = os.path.join(self.tempdir, 'report.json')
+        for contents in ('[]', '{"version": 1000}', '{"version": 1}', 'garbage'):
+            with open(path, 'w') as f:
+                f.write(contents)
+            with pytest.raises(ValueError):
+                RenewalReport.load(path)
+
+    def test_merge(self):
+        from certbot._internal.renewal_shards import RenewalReport
+        merged = RenewalReport.merge([self._report(1), self._report(0)])
+        assert merged.renew_successes == ['success1', 'success0']
+        assert merged.renew_failures == ['failure1', 'failure0']
+        assert merged.renew_skipped == ['skipped1', 'skipped0']
+        assert merged.parse_failures == ['parsefail1', 'parsefail0']
+        assert merged.shards == [0, 1]
+        assert merged.missing_shards == []
+        assert self._report(0, shard_count=3).missing_shards == [1, 2]
+
+    def test_merge_mismatched(self):
+        from certbot._internal.renewal_shards import RenewalReport
+        with pytest.raises(ValueError):
+            RenewalReport.merge([self._report(0), self._report(1, shard_count=3)])
+        with pytest.raises(ValueError):
+            RenewalReport.merge([self._report(0), self._report(0)])
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
@@ -1,8 +1,10 @@
 """Tests for certbot._internal.renewal"""
 import copy
 import datetime
+import json
 import sys
 import tempfile
+import threading
 import unittest
 from unittest import mock
 
@@ -10,9 +12,11 @@ import pytest
 
 from acme import challenges
 from acme import errors as acme_errors
+from acme import messages as acme_messages
 from certbot import configuration
 from certbot import errors
 from certbot._internal import storage
+from certbot.compat import os
 import certbot.tests.util as test_util
 
 from cryptography.hazmat.primitives.asymmetric import ec
@@ -33,6 +37,9 @@ def make_cert_with_lifetime(not_before: datetime.datetime, lifetime_days: int) -
     ).add_extension(
         x509.SubjectAlternativeName([x509.DNSName("example.com")]),
         critical=False,
+    ).add_extension(
+        x509.AuthorityKeyIdentifier.from_issuer_public_key(key.public_key()),
+        critical=False,
     ).sign(
         private_key=key,
         algorithm=hashes.SHA256(),
@@ -224,11 +231,17 @@ class RenewalTest(test_util.ConfigTestCase):
         from certbot._internal import renewal
         acme_client = mock.MagicMock()
         mock_ari_client_get.return_value = acme_client
-        past = datetime.datetime(2025, 3, 19, 0, 0, 0, tzinfo=datetime.timezone.utc)
-        now = datetime.datetime(2025, 4, 19, 0, 0, 0, tzinfo=datetime.timezone.utc)
-        future = datetime.datetime(2025, 4, 19, 12, 0, 0, tzinfo=datetime.timezone.utc)
+        # The sample certificate expires on 2016-05-02
+        past = datetime.datetime(2016, 3, 19, 0, 0, 0, tzinfo=datetime.timezone.utc)
+        now = datetime.datetime(2016, 4, 19, 0, 0, 0, tzinfo=datetime.timezone.utc)
+        future = datetime.datetime(2016, 4, 19, 12, 0, 0, tzinfo=datetime.timezone.utc)
         mock_datetime.datetime.now.return_value = now
-        acme_client.renewal_time.return_value = past, future
+        mock_datetime.timedelta = datetime.timedelta
+        mock_datetime.timezone = datetime.timezone
+        renewal_info = mock.MagicMock()
+        renewal_info.suggested_window.start = past
+        renewal_info.suggested_window.end = past
+        acme_client.renewal_info.return_value = renewal_info, future
 
         test_util.make_lineage(self.config.config_dir, 'sample-renewal.conf', ec=False)
         config = configuration.NamespaceConfig(self.config)
@@ -243,6 +256,246 @@ class RenewalTest(test_util.ConfigTestCase):
         assert expected_server != config.server
         mock_ari_client_get.assert_called_once()
         assert mock_ari_client_get.call_args[0][0] == expected_server
+        # The ARI response was cached until its Retry-After time
+        assert os.path.exists(os.path.join(self.config.config_dir, 'ari-cache.json'))
+
+    @test_util.patch_display_util()
+    @mock.patch.object(configuration.NamespaceConfig, 'set_by_user')
+    @mock.patch('certbot._internal.renewal._renew_describe_results')
+    @mock.patch('certbot._internal.renewal.should_renew')
+    @mock.patch('certbot._internal.main.renew_cert')
+    def test_renew_concurrency(self, mock_renew_cert, mock_should_renew, mock_describe,
+                               mock_set_by_user, unused_mock_display):
+        mock_set_by_user.return_value = False
+        from certbot._internal import renewal
+
+        # sample-renewal uses the standalone plugin and must not be renewed in a worker thread
+        rc_path = test_util.make_lineage(self.config.config_dir, 'sample-renewal.conf')
+        with open(rc_path) as f:
+            contents = f.read().replace('authenticator = standalone', 'authenticator = webroot')
+        for name in ('webroot-due', 'webroot-not-due'):
+            with open(os.path.join(os.path.dirname(rc_path), name + '.conf'), 'w') as f:
+                f.write(contents)
+
+        mock_should_renew.side_effect = (
+            lambda config, lineage, *unused_args, **unused_kwargs:
+            'not-due' not in lineage.configfile.filename)
+        renewal_threads = {}
+        mock_renew_cert.side_effect = lambda config, plugins, lineage: renewal_threads.update(
+            {os.path.basename(lineage.configfile.filename): threading.current_thread()})
+        self.config.renew_concurrency = 2
+
+        with mock.patch('time.sleep'):
+            renewal.handle_renewal_request(self.config)
+
+        assert mock_should_renew.call_count == 3
+        assert renewal_threads['sample-renewal.conf'] is threading.main_thread()
+        assert renewal_threads['webroot-due.conf'] is not threading.main_thread()
+        assert 'webroot-not-due.conf' not in renewal_threads
+        # Results are reported in the same order as without concurrency
+        renew_successes, renew_failures, renew_skipped, parse_failures = (
+            mock_describe.call_args[0][1:])
+        assert len(renew_successes) == 2
+        assert len(renew_skipped) == 1
+        assert not renew_failures and not parse_failures
+
+    @test_util.patch_display_util()
+    @mock.patch.object(configuration.NamespaceConfig, 'set_by_user')
+    @mock.patch('certbot._internal.renewal.should_renew')
+    @mock.patch('certbot._internal.main.renew_cert')
+    def test_plugins_discovered_once(self, mock_renew_cert, mock_should_renew,
+                                     mock_set_by_user, unused_mock_display):
+        mock_set_by_user.return_value = False
+        mock_should_renew.return_value = True
+        from certbot._internal import renewal
+        from certbot._internal.plugins import disco
+
+        rc_path = test_util.make_lineage(self.config.config_dir, 'sample-renewal.conf')
+        with open(rc_path) as src:
+            with open(os.path.join(os.path.dirname(rc_path), 'other.conf'), 'w') as dst:
+                dst.write(src.read())
+
+        with mock.patch('time.sleep'):
+            with mock.patch.object(disco.PluginsRegistry, 'find_all',
+                                   wraps=disco.PluginsRegistry.find_all) as mock_find_all:
+                renewal.handle_renewal_request(self.config)
+
+        assert mock_find_all.call_count == 1
+        assert mock_renew_cert.call_count == 2
+        # Each lineage gets its own plugins which are initialized with its own config
+        plugins1 = mock_renew_cert.call_args_list[0][0][1]
+        plugins2 = mock_renew_cert.call_args_list[1][0][1]
+        assert plugins1['standalone'] is not plugins2['standalone']
+        assert plugins1['standalone'].plugin_cls is plugins2['standalone'].plugin_cls
+
+    @mock.patch('certbot._internal.renewal._renew_lineages')
+    def test_certs_cached_during_run(self, mock_renew_lineages):
+        from certbot import crypto_util
+        from certbot._internal import renewal
+        cache_users = []
+        mock_renew_lineages.side_effect = lambda *args: cache_users.append(
+            crypto_util._CertCache.users) or []
+
+        renewal.handle_renewal_request(self.config, mock.MagicMock())
+
+        assert cache_users == [1]
+        assert crypto_util._CertCache.users == 0
+
+    @test_util.patch_display_util()
+    @mock.patch.object(configuration.NamespaceConfig, 'set_by_user')
+    @mock.patch('certbot._internal.renewal.should_renew')
+    @mock.patch('certbot._internal.main.renew_cert')
+    def test_shards(self, mock_renew_cert, mock_should_renew, mock_set_by_user,
+                    unused_mock_display):
+        mock_set_by_user.return_value = False
+        mock_should_renew.return_value = True
+        from certbot._internal import renewal
+
+        rc_path = test_util.make_lineage(self.config.config_dir, 'sample-renewal.conf')
+        with open(rc_path) as f:
+            contents = f.read()
+        for i in range(5):
+            with open(os.path.join(os.path.dirname(rc_path), f'other{i}.conf'), 'w') as f:
+                f.write(contents)
+
+        self.config.shard_count = 2
+        reports = []
+        for shard in range(2):
+            self.config.shard_index = shard
+            self.config.renewal_report = os.path.join(self.tempdir, f'report{shard}.json')
+            with mock.patch('time.sleep'):
+                renewal.handle_renewal_request(self.config)
+            with open(self.config.renewal_report) as f:
+                reports.append(json.load(f))
+
+        # Each lineage was renewed by exactly one shard
+        assert mock_renew_cert.call_count == 6
+        renewed = [call[0][2].configfile.filename for call in mock_renew_cert.call_args_list]
+        assert len(set(renewed)) == 6
+        assert [report['shards'] for report in reports] == [[0], [1]]
+        assert all(report['shard_count'] == 2 for report in reports)
+        assert sum(len(report['renew_successes']) for report in reports) == 6
+
+        # The reports of both shards are merged into a complete report
+        self.config.merge_renewal_reports = [os.path.join(self.tempdir, f'report{shard}.json')
+                                             for shard in range(2)]
+        self.config.renewal_report = os.path.join(self.tempdir, 'report.json')
+        renewal.merge_renewal_reports(self.config)
+        with open(self.config.renewal_report) as f:
+            merged = json.load(f)
+        assert merged['shards'] == [0, 1]
+        assert sorted(merged['renew_successes']) == sorted(
+            sum((report['renew_successes'] for report in reports), []))
+
+    @test_util.patch_display_util()
+    @mock.patch.object(configuration.NamespaceConfig, 'set_by_user')
+    @mock.patch('certbot._internal.renewal.should_renew')
+    @mock.patch('certbot._internal.main.renew_cert')
+    def test_rate_limited(self, mock_renew_cert, mock_should_renew, mock_set_by_user,
+                          unused_mock_display):
+        mock_set_by_user.return_value = False
+        mock_should_renew.return_value = True
+        from certbot._internal import renewal
+        test_util.make_lineage(self.config.config_dir, 'sample-renewal.conf')
+
+        def rate_limited(seconds):
+            error = acme_messages.Error.with_code('rateLimited', detail='too many')
+            error.retry_after = datetime.datetime.now() + datetime.timedelta(seconds=seconds)
+            return error
+
+        mock_renew_cert.side_effect = [rate_limited(300), None]
+        with mock.patch('time.sleep') as mock_sleep:
+            renewal.handle_renewal_request(self.config)
+        assert mock_renew_cert.call_count == 2
+        assert 290 < mock_sleep.call_args[0][0] <= 300
+
+        # Retry-After is later than --rate-limit-max-wait
+        mock_renew_cert.reset_mock()
+        mock_renew_cert.side_effect = [rate_limited(3600)]
+        with mock.patch('time.sleep'):
+            with pytest.raises(errors.Error):
+                renewal.handle_renewal_request(self.config)
+        assert mock_renew_cert.call_count == 1
+
+    @test_util.patch_display_util()
+    @mock.patch('certbot._internal.renewal.storage.revocation_checker')
+    @mock.patch('certbot._internal.renewal.should_renew')
+    def test_revocation_checked_at_once(self, mock_should_renew, mock_revocation_checker,
+                                        unused_mock_display):
+        mock_should_renew.return_value = False
+        from certbot._internal import renewal
+        rc_path = test_util.make_lineage(self.config.config_dir, 'sample-renewal.conf')
+        with open(rc_path) as f:
+            contents = f.read()
+        with open(os.path.join(os.path.dirname(rc_path), 'other.conf'), 'w') as f:
+            f.write(contents)
+        checker = mock_revocation_checker.return_value
+        checker.ocsp_revoked_many.side_effect = lambda paths: [False for _ in paths]
+        self.config.renew_concurrency = 2
+
+        with mock.patch('certbot._internal.renewal._due_regardless_of_revocation',
+                        return_value=False):
+            renewal.handle_renewal_request(self.config)
+
+        assert checker.ocsp_revoked_many.call_count == 1
+        assert [call[1]['revoked'] for call in mock_should_renew.call_args_list] == [False, False]
+        # The pooled OCSP sessions are closed at the end of the run
+        checker.close.assert_called_once_with()
+
+    @test_util.patch_display_util()
+    @mock.patch('certbot._internal.renewal._renew_lineage')
+    @mock.patch('certbot._internal.renewal.storage.revocation_checker')
+    @mock.patch('certbot._internal.renewal.should_renew')
+    def test_serial_decide_then_renew(self, mock_should_renew, mock_revocation_checker,
+                                      mock_renew_lineage, unused_mock_display):
+        from certbot._internal import renewal
+        rc_path = test_util.make_lineage(self.config.config_dir, 'sample-renewal.conf')
+        with open(rc_path) as f:
+            contents = f.read()
+        with open(os.path.join(os.path.dirname(rc_path), 'other.conf'), 'w') as f:
+            f.write(contents)
+        events = []
+        mock_should_renew.side_effect = lambda config, lineage, *args, **kwargs: (
+            events.append(('decide', lineage.lineagename)) or True)
+        mock_renew_lineage.side_effect = lambda outcome, *args: (
+            events.append(('renew', outcome.lineagename)))
+
+        load_lineage = renewal._load_lineage
+
+        def _load(config, outcome, *args):
+            events.append(('load', outcome.lineagename))
+            load_lineage(config, outcome, *args)
+
+        with mock.patch('certbot._internal.renewal._load_lineage', side_effect=_load):
+            with mock.patch('time.sleep'):
+                renewal.handle_renewal_request(self.config)
+
+        # Each lineage is renewed before the next one is examined
+        assert events == [('load', 'other'), ('decide', 'other'), ('renew', 'other'),
+                          ('load', 'sample-renewal'), ('decide', 'sample-renewal'),
+                          ('renew', 'sample-renewal')]
+        assert mock_should_renew.call_args_list[0][1]['revoked'] is None
+        assert mock_revocation_checker.return_value.ocsp_revoked_many.called is False
+
+    @test_util.patch_display_util()
+    @mock.patch('certbot._internal.renewal.ocsp_staple.export_staple')
+    @mock.patch('certbot._internal.renewal.should_renew')
+    def test_export_ocsp_staple(self, mock_should_renew, mock_export, unused_mock_display):
+        mock_should_renew.return_value = False
+        from certbot._internal import renewal
+        test_util.make_lineage(self.config.config_dir, 'sample-renewal.conf')
+
+        renewal.handle_renewal_request(self.config)
+        assert mock_export.called is False
+
+        self.config.export_ocsp_staple = True
+        renewal.handle_renewal_request(self.config)
+        assert mock_export.call_count == 1
+        assert mock_export.call_args[0][1].lineagename == 'sample-renewal'
+
+        self.config.dry_run = True
+        renewal.handle_renewal_request(self.config)
+        assert mock_export.call_count == 1
 
     @test_util.patch_display_util()
     @mock.patch('acme.client.ClientNetwork.get')
@@ -272,11 +525,11 @@ class RenewalTest(test_util.ConfigTestCase):
     def test_default_renewal_time(self):
         from certbot._internal import renewal
         cert_pem = make_cert_with_lifetime(datetime.datetime(2025, 3, 12, 00, 00, 00), 8)
-        t = renewal._default_renewal_time(cert_pem)
+        t = renewal._default_renewal_time(x509.load_pem_x509_certificate(cert_pem))
         assert t == datetime.datetime(2025, 3, 16, 00, 00, 00, tzinfo=datetime.timezone.utc)
 
         cert_pem = make_cert_with_lifetime(datetime.datetime(2025, 3, 12, 00, 00, 00), 18)
-        t = renewal._default_renewal_time(cert_pem)
+        t = renewal._default_renewal_time(x509.load_pem_x509_certificate(cert_pem))
         assert t == datetime.datetime(2025, 3, 24, 00, 00, 00, tzinfo=datetime.timezone.utc)
 
     @mock.patch("certbot._internal.renewal.datetime")
@@ -402,9 +655,12 @@ class RenewalTest(test_util.ConfigTestCase):
         mock_acme.renewal_time.return_value = (future, future)
         ari_client_pool = mock.MagicMock()
         ari_client_pool.get.return_value = mock_acme
-        mock_rc = mock.MagicMock()
+        mock_rc = mock.MagicMock(configuration={})
 
-        with mock.patch('certbot._internal.renewal.open', mock.mock_open(read_data=b'')):
+        # The certificate is far from expiry, only OCSP says to renew
+        cert = x509.load_pem_x509_certificate(make_cert_with_lifetime(
+            datetime.datetime.now(datetime.timezone.utc), 90))
+        with mock.patch('certbot._internal.renewal.crypto_util.load_cert', return_value=cert):
             # Autorenewal turned off
             mock_rc.autorenewal_is_enabled.return_value = False
             mock_rc.server = ari_server
@@ -433,12 +689,15 @@ class RenewalTest(test_util.ConfigTestCase):
         ari_server = 'http://ari'
         ari_client_pool = mock.MagicMock()
         ari_client_pool.get.side_effect = messages.Error()
-        mock_rc = mock.MagicMock()
+        mock_rc = mock.MagicMock(configuration={})
         mock_rc.server = ari_server
         mock_rc.autorenewal_is_enabled.return_value = True
         mock_ocsp.return_value = True
 
-        with mock.patch('certbot._internal.renewal.open', mock.mock_open(read_data=b'')):
+        # The certificate is far from expiry, only OCSP says to renew
+        cert = x509.load_pem_x509_certificate(make_cert_with_lifetime(
+            datetime.datetime.now(datetime.timezone.utc), 90))
+        with mock.patch('certbot._internal.renewal.crypto_util.load_cert', return_value=cert):
             with mock.patch('certbot._internal.renewal.logger') as mock_logger:
                 assert renewal.should_autorenew(mock_rc, ari_client_pool)
 
@@ -460,7 +719,10 @@ class RenewalTest(test_util.ConfigTestCase):
 
         mock_ocsp.return_value = True
 
-        with mock.patch('certbot._internal.renewal.open', mock.mock_open(read_data=b'')):
+        # The certificate is far from expiry, only OCSP says to renew
+        cert = x509.load_pem_x509_certificate(make_cert_with_lifetime(
+            datetime.datetime.now(datetime.timezone.utc), 90))
+        with mock.patch('certbot._internal.renewal.crypto_util.load_cert', return_value=cert):
             with mock.patch('certbot._internal.renewal.logger') as mock_logger:
                 assert renewal.should_autorenew(renewable_cert, ari_client_pool)
         # Ensure we logged about skipping the ARI check and the underlying exception
@@ -468,6 +730,740 @@ class RenewalTest(test_util.ConfigTestCase):
         assert any(call.kwargs.get('exc_info') for call in mock_logger.debug.call_args_list)
 
 
+class AriCacheTest(test_util.TempDirTestCase):
+    """Tests for certbot._internal.renewal.AriCache."""
+
+    def setUp(self):
+        super().setUp()
+        from certbot._internal import renewal
+        self.path = os.path.join(self.tempdir, 'ari-cache.json')
+        self.cache = renewal.AriCache(self.path)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        self.entry = renewal.AriCacheEntry(
+            now + datetime.timedelta(days=1), now + datetime.timedelta(days=2),
+            now + datetime.timedelta(days=1, hours=3), now + datetime.timedelta(hours=6))
+
+    def test_get_set(self):
+        assert self.cache.get('id') is None
+        self.cache.set('id', self.entry)
+        assert self.cache.get('id') == self.entry
+
+    def test_retry_after_passed(self):
+        self.cache.set('id', self.entry._replace(
+            retry_after=datetime.datetime.now(datetime.timezone.utc)))
+        assert self.cache.get('id') is None
+
+    def test_save_and_load(self):
+        from certbot._internal import renewal
+        no_ari = self.entry._replace(window_start=None, window_end=None, renewal_time=None)
+        self.cache.set('id', self.entry)
+        self.cache.set('no-ari', no_ari)
+        self.cache.set('stale', self.entry._replace(
+            retry_after=datetime.datetime.now(datetime.timezone.utc)))
+        self.cache.save()
+
+        cache = renewal.AriCache(self.path)
+        assert cache.get('id') == self.entry
+        assert cache.get('no-ari') == no_ari
+        # pylint: disable=protected-access
+        assert 'stale' not in cache._load()
+
+    def test_save_not_dirty(self):
+        self.cache.save()
+        assert not os.path.exists(self.path)
+
+    def test_load_corrupt(self):
+        with open(self.path, 'w') as f:
+            f.write('{"version": 1, "entries": {"id": {"window_start": 42}}}')
+        assert self.cache.get('id') is None
+
+    def test_load_unknown_version(self):
+        with open(self.path, 'w') as f:
+            f.write('{"version": 1000, "entries": {}}')
+        assert self.cache.get('id') is None
+
+
+class AriCacheRenewalTest(unittest.TestCase):
+    """Tests for the use of certbot._internal.renewal.AriCache in should_autorenew."""
+
+    def test_should_autorenew_uses_cache(self):
+        from certbot._internal import renewal
+        now = datetime.datetime.now(datetime.timezone.utc)
+
+        mock_acme = mock.MagicMock()
+        renewal_info = mock.MagicMock()
+        renewal_info.suggested_window.start = now + datetime.timedelta(days=10)
+        renewal_info.suggested_window.end = now + datetime.timedelta(days=11)
+        mock_acme.renewal_info.return_value = (renewal_info,
+                                               datetime.datetime.now() + datetime.timedelta(hours=6))
+        ari_client_pool = mock.MagicMock()
+        ari_client_pool.get.return_value = mock_acme
+
+        mock_rc = mock.MagicMock()
+        mock_rc.server = 'http://ari'
+        mock_rc.autorenewal_is_enabled.return_value = True
+        mock_rc.ocsp_revoked.return_value = False
+        mock_rc.configuration = {}
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            cert_path = os.path.join(tempdir, 'cert.pem')
+            with open(cert_path, 'wb') as f:
+                f.write(make_cert_with_lifetime(now - datetime.timedelta(days=10), 90))
+            mock_rc.version.return_value = cert_path
+            cache_path = os.path.join(tempdir, 'ari-cache.json')
+            ari_cache = renewal.AriCache(cache_path)
+
+            assert not renewal.should_autorenew(mock_rc, ari_client_pool, ari_cache)
+            assert not renewal.should_autorenew(mock_rc, ari_client_pool, ari_cache)
+            assert mock_acme.renewal_info.call_count == 1
+
+            ari_cache.save()
+            ari_cache = renewal.AriCache(cache_path)
+            assert not renewal.should_autorenew(mock_rc, ari_client_pool, ari_cache)
+            assert mock_acme.renewal_info.call_count == 1
+
+            # Once the Retry-After time has passed, ARI is fetched again
+            future = now + datetime.timedelta(hours=7)
+            with mock.patch('certbot._internal.renewal.datetime') as mock_datetime:
+                mock_datetime.datetime.now.return_value = future
+                mock_datetime.timedelta = datetime.timedelta
+                mock_datetime.timezone = datetime.timezone
+                assert not renewal.should_autorenew(mock_rc, ari_client_pool, ari_cache)
+            assert mock_acme.renewal_info.call_count == 2
+
+
+class CachedNotDueTest(unittest.TestCase):
+    """Tests for certbot._internal.renewal._cached_not_due."""
+
+    def setUp(self):
+        from certbot._internal import lineage_index
+        from certbot._internal import renewal
+        self.now = datetime.datetime.now(datetime.timezone.utc)
+        self.metadata = lineage_index.LineageMetadata(
+            names=['example.com'], not_before=self.now - datetime.timedelta(days=10),
+            not_after=self.now + datetime.timedelta(days=80), serial=1, key_type='ECDSA',
+            server='https://acme', version=1, fullchain='/live/fullchain.pem', deployed=True,
+            ari_cert_id='id', autorenew=True, renew_before_expiry=None, installer=None,
+            export_ocsp_staple=False)
+        self.index = mock.MagicMock()
+        self.index.lookup.return_value = self.metadata
+        self.ari_entry = renewal.AriCacheEntry(
+            self.now + datetime.timedelta(days=40), self.now + datetime.timedelta(days=42),
+            self.now + datetime.timedelta(days=41), self.now + datetime.timedelta(hours=6))
+        self.ari_cache = mock.MagicMock()
+        self.ari_cache.get.return_value = self.ari_entry
+        self.config = mock.MagicMock(renew_by_default=False, dry_run=False, installer=None)
+
+    def _call(self):
+        from certbot._internal import renewal
+        return renewal._cached_not_due(self.config, 'renewal.conf', self.ari_cache, self.index)
+
+    def test_not_due(self):
+        assert self._call() == self.metadata
+        self.ari_cache.get.assert_called_once_with('id')
+
+    def test_forced(self):
+        self.config.renew_by_default = True
+        assert self._call() is None
+        self.config.renew_by_default = False
+        self.config.dry_run = True
+        assert self._call() is None
+
+    def test_unknown_or_changed_lineage(self):
+        self.index.lookup.return_value = None
+        assert self._call() is None
+
+    def test_installer(self):
+        self.index.lookup.return_value = self.metadata._replace(installer='nginx')
+        assert self._call() is None
+        self.index.lookup.return_value = self.metadata
+        self.config.installer = 'apache'
+        assert self._call() is None
+
+    def test_pending_deployment(self):
+        self.index.lookup.return_value = self.metadata._replace(deployed=False)
+        assert self._call() is None
+
+    def test_autorenew_disabled(self):
+        self.index.lookup.return_value = self.metadata._replace(autorenew=False,
+                                                                ari_cert_id=None)
+        assert self._call() is not None
+
+    def test_no_cached_ari(self):
+        self.ari_cache.get.return_value = None
+        assert self._call() is None
+        self.index.lookup.return_value = self.metadata._replace(ari_cert_id=None)
+        assert self._call() is None
+
+    def test_ari_window_started(self):
+        self.ari_cache.get.return_value = self.ari_entry._replace(
+            window_start=self.now - datetime.timedelta(hours=1))
+        assert self._call() is None
+
+    def test_near_expiry(self):
+        self.index.lookup.return_value = self.metadata._replace(renew_before_expiry='90 days')
+        assert self._call() is None
+        self.index.lookup.return_value = self.metadata._replace(
+            not_before=self.now - datetime.timedelta(days=70),
+            not_after=self.now + datetime.timedelta(days=20))
+        assert self._call() is None
+
+    @test_util.patch_display_util()
+    @mock.patch('certbot._internal.renewal.reconstitute')
+    def test_skips_reconstitute(self, mock_reconstitute, unused_mock_display):
+        from certbot._internal import renewal
+        outcome = renewal._LineageOutcome('renewal.conf')
+        renewal._load_lineage(self.config, outcome, self.ari_cache, self.index)
+        assert mock_reconstitute.called is False
+        assert outcome.lineage is None and not outcome.due
+        assert outcome.metadata == self.metadata
+        assert outcome.skipped_message == '/live/fullchain.pem expires on {0}'.format(
+            self.metadata.not_after.strftime('%Y-%m-%d'))
+
+
+class CheckRevocationTest(unittest.TestCase):
+    """Tests for certbot._internal.renewal._check_revocation."""
+
+    def setUp(self):
+        from certbot._internal import renewal
+        self.config = mock.MagicMock(renew_by_default=False, dry_run=False)
+        self.outcomes = []
+        for name in ('a', 'b', 'c'):
+            outcome = renewal._LineageOutcome(f'/etc/letsencrypt/renewal/{name}.conf')
+            outcome.lineage = mock.MagicMock()
+            outcome.lineage.latest_common_version.return_value = 2
+            outcome.lineage.version.side_effect = (
+                lambda kind, version, name=name: f'/archive/{name}/{kind}{version}.pem')
+            self.outcomes.append(outcome)
+        # Lineages found not due from cached data or which failed aren't checked
+        self.outcomes.append(renewal._LineageOutcome('/etc/letsencrypt/renewal/d.conf'))
+        self.outcomes[1].failed = True
+        patcher = mock.patch('certbot._internal.renewal.storage.revocation_checker')
+        self.mock_checker = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch('certbot._internal.renewal._due_regardless_of_revocation')
+        self.mock_due = patcher.start()
+        self.mock_due.return_value = False
+        self.addCleanup(patcher.stop)
+
+    def _call(self):
+        from certbot._internal import renewal
+        renewal._check_revocation(self.config, self.outcomes, mock.sentinel.ari_clients,
+                                  mock.sentinel.ari_cache)
+
+    def test_batched(self):
+        self.mock_checker.ocsp_revoked_many.side_effect = lambda paths: [
+            cert_path.startswith('/archive/c/') for cert_path, _ in paths]
+
+        self._call()
+
+        self.mock_checker.ocsp_revoked_many.assert_called_once_with(mock.ANY)
+        assert [outcome.revoked for outcome in self.outcomes] == [False, None, True, None]
+
+    def test_due_lineages_not_checked(self):
+        # ARI or expiry say to renew a, and checking b fails
+        def _due(lineage, *unused_args):
+            if lineage is self.outcomes[1].lineage:
+                raise errors.Error('unreadable certificate')
+            return lineage is self.outcomes[0].lineage
+        self.mock_due.side_effect = _due
+        self.outcomes[1].failed = False
+        self.mock_checker.ocsp_revoked_many.side_effect = lambda paths: [
+            cert_path.startswith('/archive/c/') for cert_path, _ in paths]
+
+        self._call()
+
+        assert [outcome.revoked for outcome in self.outcomes] == [None, None, True, None]
+        self.mock_due.assert_any_call(self.outcomes[0].lineage, mock.sentinel.ari_clients,
+                                      mock.sentinel.ari_cache)
+
+    def test_forced(self):
+        self.config.renew_by_default = True
+        self._call()
+        assert self.mock_checker.ocsp_revoked_many.called is False
+        assert all(outcome.revoked is None for outcome in self.outcomes)
+
+    def test_autorenewal_disabled(self):
+        for outcome in self.outcomes[:3]:
+            outcome.lineage.autorenewal_is_enabled.return_value = False
+        self._call()
+        assert self.mock_checker.ocsp_revoked_many.called is False
+
+    def test_should_autorenew_uses_result(self):
+        import shutil
+        from certbot._internal import renewal
+        tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempdir)
+        cert_path = os.path.join(tempdir, 'cert.pem')
+        with open(cert_path, 'wb') as f:
+            f.write(make_cert_with_lifetime(
+                datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=10), 90))
+        lineage = mock.MagicMock(server=None, configuration={})
+        lineage.version.return_value = cert_path
+
+        with mock.patch('certbot._internal.renewal.logger'):
+            assert renewal.should_autorenew(lineage, mock.MagicMock(), revoked=True)
+            assert not renewal.should_autorenew(lineage, mock.MagicMock(), revoked=False)
+        assert lineage.ocsp_revoked.called is False
+
+
+class MergeRenewalReportsTest(test_util.ConfigTestCase):
+    """Tests for certbot._internal.renewal.merge_renewal_reports."""
+
+    def _save_report(self, shard, shard_count=2, failures=()):
+        from certbot._internal.renewal_shards import RenewalReport
+        path = os.path.join(self.tempdir, f'report{shard}.json')
+        RenewalReport([f'success{shard}'], list(failures), [], [], [shard],
+                      shard_count).save(path)
+        return path
+
+    def _call(self, *paths):
+        from certbot._internal import renewal
+        self.config.merge_renewal_reports = list(paths)
+        with test_util.patch_display_util():
+            renewal.merge_renewal_reports(self.config)
+
+    def test_merge(self):
+        from certbot._internal.renewal_shards import RenewalReport
+        self.config.renewal_report = os.path.join(self.tempdir, 'report.json')
+        self._call(self._save_report(0), self._save_report(1))
+        report = RenewalReport.load(self.config.renewal_report)
+        assert report.renew_successes == ['success0', 'success1']
+        assert report.shards == [0, 1]
+
+    @mock.patch('certbot._internal.renewal.logger')
+    def test_unsaved_report(self, mock_logger):
+        self.config.renewal_report = os.path.join(self.tempdir, 'missing', 'report.json')
+        self._call(self._save_report(0), self._save_report(1))
+        assert mock_logger.warning.called
+
+    def test_missing_shard(self):
+        from certbot._internal.renewal_shards import RenewalReport
+        self.config.renewal_report = os.path.join(self.tempdir, 'report.json')
+        with pytest.raises(errors.Error, match='shard.s. 1, 3 out of 4'):
+            self._call(self._save_report(0, 4), self._save_report(2, 4))
+        # The partial report is still written
+        assert RenewalReport.load(self.config.renewal_report).shards == [0, 2]
+
+    def test_failures(self):
+        with pytest.raises(errors.Error, match='1 renew failure'):
+            self._call(self._save_report(0), self._save_report(1, failures=['failure1']))
+
+    def test_invalid_reports(self):
+        with pytest.raises(errors.Error, match='Unable to merge'):
+            self._call(os.path.join(self.tempdir, 'missing.json'))
+        with pytest.raises(errors.Error, match='Unable to merge'):
+            self._call(self._save_report(0), self._save_report(1, shard_count=3))
+
+
+class RenewalDaemonTest(test_util.ConfigTestCase):
+    """Tests for certbot._internal.renewal.run_renewal_daemon."""
+
+    def setUp(self):
+        super().setUp()
+        self.rc_path = test_util.make_lineage(self.config.config_dir, 'sample-renewal.conf')
+        for target in ('lock_dir_until_exit', 'release_locks'):
+            patcher = mock.patch('certbot._internal.renewal.util.' + target)
+            setattr(self, 'mock_' + target, patcher.start())
+            self.addCleanup(patcher.stop)
+
+    def test_dry_run_or_force_renewal(self):
+        from certbot._internal import renewal
+        self.config.dry_run = True
+        with pytest.raises(errors.Error):
+            renewal.run_renewal_daemon(self.config, mock.MagicMock())
+        self.config.dry_run = False
+        self.config.renew_by_default = True
+        with pytest.raises(errors.Error):
+            renewal.run_renewal_daemon(self.config, mock.MagicMock())
+
+    @mock.patch('certbot._internal.renewal.hooks.reset_saved_hooks')
+    @mock.patch('certbot._internal.renewal._next_check_time')
+    @mock.patch('certbot._internal.renewal._renew_lineages')
+    def test_renews_when_due(self, mock_renew_lineages, mock_next_check_time, mock_reset_hooks):
+        from certbot._internal import renewal
+        mock_renew_lineages.side_effect = (
+            lambda config, conf_files, *unused_args: [renewal._LineageOutcome(conf_file)
+                                                      for conf_file in conf_files])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        mock_next_check_time.side_effect = [now - datetime.timedelta(seconds=1),
+                                            now + datetime.timedelta(days=1)]
+
+        with mock.patch('time.sleep') as mock_sleep:
+            mock_sleep.side_effect = [None, KeyboardInterrupt]
+            with pytest.raises(KeyboardInterrupt):
+                renewal.run_renewal_daemon(self.config, mock.MagicMock())
+
+        # Checked at startup, then again once its next check time passed
+        assert mock_renew_lineages.call_count == 2
+        assert mock_renew_lineages.call_args[0][1] == [self.rc_path]
+        assert mock_reset_hooks.call_count == 2
+        # Sleeps until the renewal configuration files are scanned again
+        assert 0 < mock_sleep.call_args[0][0] <= renewal.DAEMON_WATCH_INTERVAL
+        # Directories are locked for each batch and released before sleeping
+        assert self.mock_lock_dir_until_exit.call_args_list == 2 * [
+            mock.call(self.config.config_dir), mock.call(self.config.work_dir),
+            mock.call(self.config.logs_dir)]
+        assert self.mock_release_locks.call_count == 2
+
+    @mock.patch('certbot._internal.renewal.hooks.reset_saved_hooks')
+    @mock.patch('certbot._internal.renewal._next_check_time')
+    @mock.patch('certbot._internal.renewal._renew_lineages')
+    def test_waits_for_locks(self, mock_renew_lineages, mock_next_check_time,
+                             unused_mock_reset_hooks):
+        from certbot._internal import renewal
+        mock_renew_lineages.side_effect = (
+            lambda config, conf_files, *unused_args: [renewal._LineageOutcome(conf_file)
+                                                      for conf_file in conf_files])
+        mock_next_check_time.return_value = (datetime.datetime.now(datetime.timezone.utc)
+                                             + datetime.timedelta(days=1))
+        self.mock_lock_dir_until_exit.side_effect = [errors.LockError('locked'), None, None,
+                                                     None]
+
+        with mock.patch.object(renewal, 'DAEMON_WATCH_INTERVAL', 0):
+            with mock.patch('time.sleep') as mock_sleep:
+                mock_sleep.side_effect = [None, KeyboardInterrupt]
+                with pytest.raises(KeyboardInterrupt):
+                    renewal.run_renewal_daemon(self.config, mock.MagicMock())
+
+        # The lineage is examined once the locks could be taken
+        assert mock_renew_lineages.call_count == 1
+        assert self.mock_lock_dir_until_exit.call_count == 4
+
+    @mock.patch('certbot._internal.renewal.hooks.reset_saved_hooks')
+    @mock.patch('certbot._internal.renewal._next_check_time')
+    @mock.patch('certbot._internal.renewal._renew_lineages')
+    def test_watches_renewal_configs(self, mock_renew_lineages, mock_next_check_time,
+                                     unused_mock_reset_hooks):
+        from certbot._internal import renewal
+        mock_renew_lineages.side_effect = Exception('unexpected')
+        mock_next_check_time.return_value = (datetime.datetime.now(datetime.timezone.utc)
+                                             + datetime.timedelta(days=1))
+        other_path = os.path.join(os.path.dirname(self.rc_path), 'other.conf')
+
+        def sleep(unused_seconds):
+            if not os.path.exists(other_path):
+                with open(self.rc_path) as src:
+                    with open(other_path, 'w') as dst:
+                        dst.write(src.read())
+            else:
+                os.remove(self.rc_path)
+                raise KeyboardInterrupt
+
+        with mock.patch.object(renewal, 'DAEMON_WATCH_INTERVAL', 0):
+            with mock.patch('time.sleep', side_effect=sleep):
+                with pytest.raises(KeyboardInterrupt):
+                    renewal.run_renewal_daemon(self.config, mock.MagicMock())
+
+        # Errors don't stop the daemon and only the new file is checked again
+        assert [call[0][1] for call in mock_renew_lineages.call_args_list] == [
+            [self.rc_path], [other_path]]
+
+    @mock.patch('certbot._internal.renewal.hooks.reset_saved_hooks')
+    @mock.patch('certbot._internal.renewal._renew_lineages')
+    def test_schedules_cached_not_due(self, mock_renew_lineages, unused_mock_reset_hooks):
+        from certbot._internal import lineage_index
+        from certbot._internal import renewal
+        now = datetime.datetime.now(datetime.timezone.utc)
+        metadata = lineage_index.LineageMetadata(
+            names=['example.com'], not_before=now - datetime.timedelta(days=10),
+            not_after=now + datetime.timedelta(days=80), serial=1, key_type='ECDSA',
+            server='https://acme', version=1, fullchain='/live/fullchain.pem', deployed=True,
+            ari_cert_id='id', autorenew=True, renew_before_expiry=None, installer=None,
+            export_ocsp_staple=False)
+
+        def renew_lineages(unused_config, conf_files, *unused_args):
+            outcomes = [renewal._LineageOutcome(conf_file) for conf_file in conf_files]
+            for outcome in outcomes:
+                # As left by _load_lineage when the lineage was found not due
+                # from cached data alone
+                outcome.metadata = metadata
+            return outcomes
+        mock_renew_lineages.side_effect = renew_lineages
+        check_times = []
+        next_check_time = renewal._next_check_time
+
+        def record_next_check_time(*args):
+            check_times.append(next_check_time(*args))
+            return check_times[-1]
+
+        with mock.patch('certbot._internal.renewal._next_check_time',
+                        side_effect=record_next_check_time):
+            with mock.patch('time.sleep', side_effect=KeyboardInterrupt):
+                with pytest.raises(KeyboardInterrupt):
+                    renewal.run_renewal_daemon(self.config, mock.MagicMock())
+
+        # Not retried like a failure, but checked again after the longest interval
+        assert len(check_times) == 1
+        assert check_times[0] >= now + renewal.DAEMON_MAX_INTERVAL
+
+
+class NextCheckTimeTest(unittest.TestCase):
+    """Tests for certbot._internal.renewal._next_check_time."""
+
+    def setUp(self):
+        # Certificates don't store microseconds
+        self.now = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+        self.tempdir = tempfile.mkdtemp()
+        cert_path = os.path.join(self.tempdir, 'cert.pem')
+        with open(cert_path, 'wb') as f:
+            f.write(make_cert_with_lifetime(self.now - datetime.timedelta(days=10), 90))
+        self.lineage = mock.MagicMock()
+        self.lineage.autorenewal_is_enabled.return_value = True
+        self.lineage.version.return_value = cert_path
+        self.lineage.configuration = {}
+        self.ari_cache = mock.MagicMock()
+        self.ari_cache.get.return_value = None
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.tempdir)
+
+    def _call(self, failed=False, staple_refresh=None):
+        from certbot._internal import renewal
+        outcome = mock.MagicMock(lineage=self.lineage, failed=failed,
+                                 staple_refresh=staple_refresh)
+        return renewal._next_check_time(outcome, self.ari_cache, self.now)
+
+    def test_failed(self):
+        from certbot._internal import renewal
+        assert self._call(failed=True) == self.now + renewal.DAEMON_RETRY_INTERVAL
+
+    def test_autorenewal_disabled(self):
+        from certbot._internal import renewal
+        self.lineage.autorenewal_is_enabled.return_value = False
+        assert self._call() == self.now + renewal.DAEMON_MAX_INTERVAL
+
+    def test_ari(self):
+        from certbot._internal import renewal
+        renewal_time = self.now + datetime.timedelta(hours=3)
+        self.ari_cache.get.return_value = renewal.AriCacheEntry(
+            None, None, renewal_time, self.now + datetime.timedelta(hours=6))
+        assert self._call() == renewal_time
+
+        self.ari_cache.get.return_value = renewal.AriCacheEntry(
+            None, None, None, self.now + datetime.timedelta(hours=2))
+        assert self._call() == self.now + datetime.timedelta(hours=2)
+
+    def test_default_renewal_time(self):
+        from certbot._internal import renewal
+        assert self._call() == self.now + renewal.DAEMON_MAX_INTERVAL
+        # The default renewal time of the 90 day certificate is 60 days into its lifetime
+        self.now += datetime.timedelta(days=49, hours=18)
+        assert self._call() == self.now + datetime.timedelta(hours=6)
+
+    def test_renew_before_expiry(self):
+        self.now += datetime.timedelta(days=70)
+        self.lineage.configuration = {'renew_before_expiry': '8 days'}
+        # notAfter is 10 days away, so the certificate is due in 2 days, which
+        # is later than the default check in 12 hours
+        from certbot._internal import renewal
+        assert self._call() == self.now + renewal.DAEMON_MAX_INTERVAL
+        self.now += datetime.timedelta(days=1, hours=20)
+        assert self._call() == self.now + datetime.timedelta(hours=4)
+
+    def test_overdue(self):
+        from certbot._internal import renewal
+        self.now += datetime.timedelta(days=85)
+        assert self._call() == self.now + renewal.DAEMON_RETRY_INTERVAL
+
+    def test_staple_refresh(self):
+        staple_refresh = self.now + datetime.timedelta(hours=1)
+        assert self._call(staple_refresh=staple_refresh) == staple_refresh
+
+    def test_cached_metadata(self):
+        from certbot._internal import lineage_index
+        from certbot._internal import renewal
+        metadata = lineage_index.LineageMetadata(
+            names=['example.com'], not_before=self.now - datetime.timedelta(days=10),
+            not_after=self.now + datetime.timedelta(days=80), serial=1, key_type='ECDSA',
+            server='https://acme', version=1, fullchain='/live/fullchain.pem', deployed=True,
+            ari_cert_id='id', autorenew=True, renew_before_expiry=None, installer=None,
+            export_ocsp_staple=False)
+        outcome = renewal._LineageOutcome('renewal.conf')
+        outcome.metadata = metadata
+        renewal_time = self.now + datetime.timedelta(hours=3)
+        self.ari_cache.get.return_value = renewal.AriCacheEntry(
+            None, None, renewal_time, self.now + datetime.timedelta(hours=6))
+
+        assert renewal._next_check_time(outcome, self.ari_cache, self.now) == renewal_time
+        self.ari_cache.get.assert_called_once_with('id')
+
+        outcome.metadata = metadata._replace(
+            ari_cert_id=None, not_after=self.now + datetime.timedelta(days=8, hours=4),
+            renew_before_expiry='8 days')
+        assert (renewal._next_check_time(outcome, self.ari_cache, self.now)
+                == self.now + datetime.timedelta(hours=4))
+
+        outcome.metadata = metadata._replace(autorenew=False)
+        assert (renewal._next_check_time(outcome, self.ari_cache, self.now)
+                == self.now + renewal.DAEMON_MAX_INTERVAL)
+
+    def test_not_examined(self):
+        from certbot._internal import renewal
+        outcome = renewal._LineageOutcome('renewal.conf')
+        assert (renewal._next_check_time(outcome, self.ari_cache, self.now)
+                == self.now + renewal.DAEMON_RETRY_INTERVAL)
+
+
+class ExportOcspStapleTest(unittest.TestCase):
+    """Tests for certbot._internal.renewal._export_ocsp_staple."""
+
+    def setUp(self):
+        from certbot._internal import renewal
+        self.config = mock.MagicMock(export_ocsp_staple=False)
+        self.outcome = renewal._LineageOutcome('/etc/letsencrypt/renewal/example.com.conf')
+        self.now = datetime.datetime.now(datetime.timezone.utc)
+
+    def _call(self):
+        from certbot._internal import renewal
+        renewal._export_ocsp_staple(self.config, self.outcome)
+
+    @mock.patch('certbot._internal.renewal.ocsp_staple.exported_refresh_time')
+    @mock.patch('certbot._internal.renewal.ocsp_staple.export_staple')
+    def test_reconstituted(self, mock_export, mock_refresh_time):
+        mock_refresh_time.return_value = None
+        self.outcome.lineage = mock.MagicMock(
+            live_dir='/etc/letsencrypt/live/example.com',
+            fullchain_path='/etc/letsencrypt/live/example.com/fullchain.pem')
+        self.outcome.config = mock.MagicMock(export_ocsp_staple=False)
+        self._call()
+        assert mock_export.called is False
+
+        # Enabled in the renewal configuration file of the lineage
+        self.outcome.config.export_ocsp_staple = True
+        self._call()
+        mock_refresh_time.assert_called_once_with(
+            '/etc/letsencrypt/live/example.com', '/etc/letsencrypt/live/example.com/fullchain.pem')
+        mock_export.assert_called_once_with(self.config, self.outcome.lineage, force=True)
+        assert self.outcome.staple_refresh is mock_export.return_value
+        assert self.outcome.staple_refreshed
+
+    @mock.patch('certbot._internal.renewal.ocsp_staple.exported_refresh_time')
+    @mock.patch('certbot._internal.renewal.ocsp_staple.export_staple')
+    def test_renewed(self, mock_export, mock_refresh_time):
+        # The exported response is about the certificate which was replaced
+        mock_refresh_time.return_value = self.now + datetime.timedelta(days=1)
+        self.outcome.lineage = mock.MagicMock()
+        self.outcome.config = mock.MagicMock(export_ocsp_staple=True)
+        self.outcome.renewed = True
+        self._call()
+        assert mock_refresh_time.called is False
+        mock_export.assert_called_once_with(self.config, self.outcome.lineage, force=True)
+        assert self.outcome.staple_refreshed
+
+    @mock.patch('certbot._internal.renewal.ocsp_staple.exported_refresh_time')
+    @mock.patch('certbot._internal.renewal.ocsp_staple.export_staple')
+    def test_export_failed(self, mock_export, mock_refresh_time):
+        mock_refresh_time.return_value = None
+        mock_export.return_value = None
+        self.outcome.lineage = mock.MagicMock()
+        self.outcome.config = mock.MagicMock(export_ocsp_staple=True)
+        self._call()
+        assert mock_export.called
+        assert not self.outcome.staple_refreshed
+
+    @mock.patch('certbot._internal.renewal.ocsp_staple.export_staple')
+    def test_parse_failed(self, mock_export):
+        self.config.export_ocsp_staple = True
+        self.outcome.parse_failed = True
+        self._call()
+        assert mock_export.called is False
+
+    @mock.patch('certbot._internal.renewal.storage.RenewableCert')
+    @mock.patch('certbot._internal.renewal.ocsp_staple.exported_refresh_time')
+    @mock.patch('certbot._internal.renewal.ocsp_staple.export_staple')
+    def test_not_reconstituted(self, mock_export, mock_refresh_time, mock_cert):
+        self.outcome.metadata = mock.MagicMock(
+            fullchain='/etc/letsencrypt/live/example.com/fullchain.pem', export_ocsp_staple=False)
+        refresh = self.now + datetime.timedelta(days=1)
+        mock_refresh_time.return_value = refresh
+        self._call()
+        assert mock_refresh_time.called is False
+
+        self.outcome.metadata.export_ocsp_staple = True
+        self._call()
+        mock_refresh_time.assert_called_once_with(
+            '/etc/letsencrypt/live/example.com', '/etc/letsencrypt/live/example.com/fullchain.pem')
+        assert self.outcome.staple_refresh == refresh
+        assert mock_cert.called is False
+        assert mock_export.called is False
+        assert not self.outcome.staple_refreshed
+
+        # The exported response is due for a refresh
+        mock_refresh_time.return_value = self.now - datetime.timedelta(hours=1)
+        self._call()
+        mock_cert.assert_called_once_with(self.outcome.renewal_file, self.config)
+        mock_export.assert_called_once_with(self.config, mock_cert.return_value, force=True)
+        assert self.outcome.staple_refreshed
+
+    @mock.patch('certbot._internal.renewal.logger')
+    @mock.patch('certbot._internal.renewal.storage.RenewableCert')
+    @mock.patch('certbot._internal.renewal.ocsp_staple.exported_refresh_time')
+    @mock.patch('certbot._internal.renewal.ocsp_staple.export_staple')
+    def test_unreadable_lineage(self, mock_export, mock_refresh_time, mock_cert, mock_logger):
+        self.config.export_ocsp_staple = True
+        self.outcome.metadata = mock.MagicMock(
+            fullchain='/etc/letsencrypt/live/example.com/fullchain.pem')
+        mock_refresh_time.return_value = None
+        mock_cert.side_effect = errors.CertStorageError('foo')
+        self._call()
+        assert mock_export.called is False
+        assert mock_logger.warning.called
+
+
+class ReloadInstallersTest(unittest.TestCase):
+    """Tests for certbot._internal.renewal._reload_installers."""
+
+    def _lineage_outcome(self, installer, refreshed=True, renewed=False):
+        from certbot._internal import renewal
+        outcome = renewal._LineageOutcome('/etc/letsencrypt/renewal/example.com.conf')
+        outcome.config = mock.MagicMock(installer=installer)
+        outcome.staple_refreshed = refreshed
+        outcome.renewed = renewed
+        return outcome
+
+    @test_util.patch_display_util()
+    @mock.patch('certbot._internal.renewal.plug_sel.get_unprepared_installer')
+    def test_reload(self, mock_get_installer, unused_mock_display):
+        from certbot._internal import renewal
+        outcomes = [self._lineage_outcome('nginx', refreshed=False),
+                    self._lineage_outcome(None),
+                    self._lineage_outcome('nginx'),
+                    self._lineage_outcome('nginx')]
+
+        renewal._reload_installers(outcomes, mock.MagicMock())
+
+        mock_get_installer.assert_called_once_with(outcomes[2].config, mock.ANY)
+        installer = mock_get_installer.return_value
+        installer.prepare.assert_called_once_with()
+        installer.restart.assert_called_once_with()
+
+    @test_util.patch_display_util()
+    @mock.patch('certbot._internal.renewal.plug_sel.get_unprepared_installer')
+    def test_reload_renewed(self, mock_get_installer, unused_mock_display):
+        # The server was reloaded by the deployment of the new certificate,
+        # before its response was exported
+        from certbot._internal import renewal
+        outcome = self._lineage_outcome('nginx', renewed=True)
+
+        renewal._reload_installers([outcome], mock.MagicMock())
+
+        mock_get_installer.assert_called_once_with(outcome.config, mock.ANY)
+        mock_get_installer.return_value.restart.assert_called_once_with()
+
+    @mock.patch('certbot._internal.renewal.logger')
+    @mock.patch('certbot._internal.renewal.plug_sel.get_unprepared_installer')
+    def test_reload_error(self, mock_get_installer, mock_logger):
+        from certbot._internal import renewal
+        mock_get_installer.return_value.prepare.side_effect = errors.MisconfigurationError('foo')
+
+        renewal._reload_installers([self._lineage_outcome('nginx')], mock.MagicMock())
+
+        assert mock_get_installer.return_value.restart.called is False
+        assert mock_logger.warning.called
+
+
 class MockAriClientPool:
     def __init__(self, renewal_time, retry_after):
         self.mock_acme = mock.MagicMock()
@@ -497,6 +1493,12 @@ class RestoreRequiredConfigElementsTest(test_util.ConfigTestCase):
         with pytest.raises(errors.Error):
             self._call(self.config, renewalparams)
 
+    @mock.patch.object(configuration.NamespaceConfig, 'set_by_user')
+    def test_export_ocsp_staple(self, mock_set_by_user):
+        mock_set_by_user.return_value = False
+        self._call(self.config, {'export_ocsp_staple': 'True'})
+        assert self.config.export_ocsp_staple is True
+
     @mock.patch.object(configuration.NamespaceConfig, 'set_by_user')
     def test_pref_challs_list(self, mock_set_by_user):
         mock_set_by_user.return_value = False
@@ -0,0 +1,59 @@
+"""Tests for certbot._internal.state_file."""
+import json
+import sys
+
+import pytest
+
+from certbot._internal import state_file
+from certbot.compat import filesystem
+from certbot.compat import os
+
+
+def test_write(tmp_path):
+    path = str(tmp_path / 'state')
+    state_file.write(path, 'old')
+    # A leftover temporary file from an interrupted write is replaced
+    state_file.write(path + '.new', 'leftover')
+    state_file.write(path, b'new')
+
+    with open(path, 'rb') as f:
+        assert f.read() == b'new'
+    assert not os.path.exists(path + '.new')
+    assert filesystem.check_mode(path, 0o644)
+
+
+def test_save_json(tmp_path):
+    path = str(tmp_path / 'state.json')
+    state_file.save_json(path, 2, {'entries': {'a': 1}}, indent=2)
+
+    with open(path) as f:
+        content = f.read()
+    assert json.loads(content) == {'version': 2, 'entries': {'a': 1}}
+    assert '\n  "entries"' in content
+
+
+def test_load_json(tmp_path):
+    path = str(tmp_path / 'state.json')
+    state_file.save_json(path, 2, {'entries': {'a': 1}})
+
+    assert state_file.load_json(path, 2, lambda data: data['entries'], 'state') == {'a': 1}
+
+
+@pytest.mark.parametrize('content', [
+    None,
+    json.dumps({'version': 1, 'entries': {'a': 1}}),
+    json.dumps({'version': 2}),
+    json.dumps(['version', 2]),
+    'not json',
+])
+def test_load_json_ignored(tmp_path, content):
+    path = str(tmp_path / 'state.json')
+    if content is not None:
+        with open(path, 'w') as f:
+            f.write(content)
+
+    assert state_file.load_json(path, 2, lambda data: data['entries'], 'state') is None
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main(sys.argv[1:] + [__file__]))  # pragma: no cover
@@ -57,6 +57,7 @@ class RelevantValuesTest(unittest.TestCase):
         self.mock_config.set_by_user.return_value = True
 
         self.values["allow_subset_of_names"] = True
+        self.values["export_ocsp_staple"] = True
         self.values["authenticator"] = "apache"
         self.values["rsa_key_size"] = 1337
         expected_relevant_values = self.values.copy()
@@ -676,6 +677,22 @@ class RenewableCertTests(BaseRenewableCertTest):
         log_msg = logger.call_args[0][0]
         assert "An error occurred determining the OCSP status" in log_msg
 
+    def test_ocsp_response_cache(self):
+        from certbot._internal import storage
+        cache = storage.ocsp_response_cache(self.config)
+        assert storage.ocsp_response_cache(self.config) is cache
+        for kind in ALL_FOUR:
+            self._write_out_kind(kind, 1)
+        with mock.patch("certbot.ocsp.RevocationChecker") as mock_checker:
+            self.test_rc.ocsp_revoked(1)
+        assert mock_checker.call_args[1]["cache"] is cache
+
+    def test_revocation_checker(self):
+        from certbot._internal import storage
+        checker = storage.revocation_checker(self.config)
+        assert storage.revocation_checker(self.config) is checker
+        assert checker.cache is storage.ocsp_response_cache(self.config)
+
     def test_add_time_interval(self):
         from certbot._internal import storage
 
@@ -828,6 +845,14 @@ class DeleteFilesTest(BaseRenewableCertTest):
         assert not os.path.exists(os.path.join(
             self.config.config_dir, "archive", "example.org"))
 
+    def test_delete_exported_ocsp_staple(self):
+        with open(os.path.join(self.config.live_dir, "example.org", "ocsp.der"), 'a'):
+            pass
+        self._call()
+
+        assert not os.path.exists(os.path.join(
+            self.config.live_dir, "example.org"))
+
     def test_bad_renewal_config(self):
         with open(self.config_file.filename, 'a') as config_file:
             config_file.write("asdfasfasdfasdf")
@@ -134,6 +134,19 @@ class LockDirUntilExit(test_util.TempDirTestCase):
         # should never been called.
         assert mock_logger.debug.call_count == 0
 
+    @mock.patch('certbot.util.atexit_register')
+    def test_release_locks(self, mock_register):
+        from certbot import util
+        self._call(self.tempdir)
+        util.release_locks()
+        assert not util._LOCKS  # pylint: disable=protected-access
+
+        # The directory can be locked again, by this process or another one
+        self._call(self.tempdir)
+        assert list(util._LOCKS) == [self.tempdir]  # pylint: disable=protected-access
+        assert mock_register.call_count == 1
+        util.release_locks()
+
 
 class SetUpCoreDirTest(test_util.TempDirTestCase):
     """Tests for certbot.util.make_or_verify_core_dir."""
@@ -8,6 +8,7 @@ import stat
 from typing import Any
 from typing import Dict
 from typing import Generator
+from typing import NamedTuple
 from typing import Optional
 
 try:
@@ -357,6 +358,30 @@ def replace(src: str, dst: str) -> None:
         os.rename(src, dst)
 
 
+class FileState(NamedTuple):
+    """Identity, size and modification time of a file, as returned by `file_state`."""
+    inode: int
+    size: int
+    mtime_ns: int
+
+
+# os.stat is forbidden by certbot.compat.os because the permission bits and ownership it
+# reports are meaningless on Windows. The inode, size and modification time are reliable on
+# every platform though, and are all that is needed to notice that a file changed.
+def file_state(file_path: str) -> FileState:
+    """
+    Return the inode, size and modification time of a file. Like os.stat, this follows
+    symlinks and describes the file they point to.
+
+    :param str file_path: The path of the file
+    :returns: The state of the file
+    :rtype: FileState
+    :raises OSError: if the file cannot be accessed
+    """
+    stats = os.stat(file_path)
+    return FileState(stats.st_ino, stats.st_size, stats.st_mtime_ns)
+
+
 def realpath(file_path: str) -> str:
     """
     Find the real path for the given path. This method resolves symlinks, including
@@ -7,6 +7,7 @@ from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Tuple
 from urllib import parse
 
 from certbot import errors
@@ -137,8 +138,33 @@ class NamespaceConfig:
         """
         Returns a dictionary mapping all argument names to their values
         """
+        if isinstance(self.namespace, _OverlayNamespace):
+            return self.namespace.to_dict()
         return vars(self.namespace)
 
+    def overlay(self) -> 'NamespaceConfig':
+        """Returns a copy of this configuration that can be modified independently.
+
+        Unlike :func:`copy.deepcopy`, this doesn't clone every argument value.
+        The copy reads the values of this configuration until it sets its own,
+        and mutable values (such as lists) are only copied the first time they
+        are accessed through the copy. This configuration must not be modified
+        while the copy is in use.
+
+        :returns: the copy
+        :rtype: NamespaceConfig
+        """
+        argument_sources = self.argument_sources
+        new_config = type(self)(_OverlayNamespace(self.namespace))
+        # Avoid recursion loop because of the delegation defined in __setattr__
+        if argument_sources is not None:
+            object.__setattr__(new_config, '_argument_sources', dict(argument_sources))
+        # The values in _previously_accessed_mutables are snapshots which are only
+        # compared with, never modified, so they can be shared
+        object.__setattr__(new_config, '_previously_accessed_mutables',
+                           dict(self._previously_accessed_mutables))
+        return new_config
+
     def _mark_runtime_override(self, name: str) -> None:
         """
         If an argument_sources dict was set, overwrites an argument's source to
@@ -471,6 +497,45 @@ class NamespaceConfig:
         return new_config
 
 
+class _OverlayNamespace(argparse.Namespace):
+    """Namespace layered on top of a base namespace which isn't modified.
+
+    Attributes which were not set on this namespace are looked up on the base
+    namespace. Mutable values are copied into this namespace the first time
+    they are accessed, so modifying them in place doesn't affect the base.
+    """
+    __slots__ = ('_base',)
+
+    def __init__(self, base: argparse.Namespace) -> None:
+        super().__init__()
+        self._base = base
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes which were not found on this namespace
+        if name == '_base' or name.startswith('__'):
+            raise AttributeError(name)
+        value = getattr(self._base, name)
+        if not _is_immutable(value):
+            value = copy.deepcopy(value)
+            setattr(self, name, value)
+        return value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__dict__ or key in self._base
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a new dictionary mapping all argument names to their values."""
+        if isinstance(self._base, _OverlayNamespace):
+            values = self._base.to_dict()
+        else:
+            values = dict(vars(self._base))
+        values.update(vars(self))
+        return values
+
+    def _get_kwargs(self) -> List[Tuple[str, Any]]:
+        return sorted(self.to_dict().items())
+
+
 def _check_config_sanity(config: NamespaceConfig) -> None:
     """Validate command line options and display error message if
     requirements are not met.
@@ -4,10 +4,14 @@
     is capable of handling the signatures.
 
 """
+from contextlib import contextmanager
 import datetime
 import hashlib
 import logging
 import re
+import threading
+from typing import Dict
+from typing import Generator
 from typing import List
 from typing import Optional
 from typing import Set
@@ -37,6 +41,7 @@ from acme import crypto_util as acme_crypto_util
 from certbot import errors
 from certbot import interfaces
 from certbot import util
+from certbot.compat import filesystem
 from certbot.compat import os
 
 # Cryptography ed448 and ed25519 modules do not exist on oldest tests
@@ -297,10 +302,8 @@ def verify_renewable_cert_sig(renewable_cert: interfaces.RenewableCert) -> None:
     :raises errors.Error: If signature verification fails.
     """
     try:
-        with open(renewable_cert.chain_path, 'rb') as chain_file:
-            chain = x509.load_pem_x509_certificate(chain_file.read(), default_backend())
-        with open(renewable_cert.cert_path, 'rb') as cert_file:
-            cert = x509.load_pem_x509_certificate(cert_file.read(), default_backend())
+        chain = load_cert(renewable_cert.chain_path)
+        cert = load_cert(renewable_cert.cert_path)
         pk = chain.public_key()
         assert cert.signature_hash_algorithm # always present for RSA and ECDSA
         verify_signed_payload(pk, cert.signature, cert.tbs_certificate_bytes,
@@ -462,6 +465,62 @@ def get_names_from_req(
     )
 
 
+class _CertCache:
+    """Certificates parsed by `load_cert` while `cached_certs` is used."""
+    lock = threading.Lock()
+    users = 0
+    certs: Dict[Tuple[str, int, int, int], x509.Certificate] = {}
+
+
+@contextmanager
+def cached_certs() -> Generator[None, None, None]:
+    """Keep the certificates parsed by `load_cert` in memory within this context.
+
+    `certbot renew` uses this while it decides which certificates to renew, so
+    that the many checks made on each certificate parse it only once, however
+    many certificates there are. The certificates are forgotten when the
+    outermost of these contexts, which may be used by several threads, exits.
+
+    """
+    with _CertCache.lock:
+        _CertCache.users += 1
+    try:
+        yield
+    finally:
+        with _CertCache.lock:
+            _CertCache.users -= 1
+            if not _CertCache.users:
+                _CertCache.certs.clear()
+
+
+def load_cert(cert_path: str) -> x509.Certificate:
+    """Load the certificate at cert_path.
+
+    Within `cached_certs`, the same object is returned as long as the file
+    (or the target of the symlink at cert_path) keeps the same inode,
+    modification time and size.
+
+    :param str cert_path: path to a cert in PEM format; for a chain, the
+        first certificate is loaded
+
+    :returns: the certificate
+    :rtype: :class:`cryptography.x509.Certificate`
+
+    """
+    path = filesystem.realpath(cert_path)
+    state = filesystem.file_state(path)
+    key = (path, state.inode, state.mtime_ns, state.size)
+    with _CertCache.lock:
+        cert = _CertCache.certs.get(key)
+    if cert is None:
+        with open(path, "rb") as f:
+            cert = x509.load_pem_x509_certificate(f.read())
+        with _CertCache.lock:
+            if _CertCache.users:
+                cert = _CertCache.certs.setdefault(key, cert)
+    return cert
+
+
 def notBefore(cert_path: str) -> datetime.datetime:
     """When does the cert at cert_path start being valid?
 
@@ -471,9 +530,7 @@ def notBefore(cert_path: str) -> datetime.datetime:
     :rtype: :class:`datetime.datetime`
 
     """
-    with open(cert_path, "rb") as f:
-        cert = x509.load_pem_x509_certificate(f.read())
-    return cert.not_valid_before_utc
+    return load_cert(cert_path).not_valid_before_utc
 
 
 def notAfter(cert_path: str) -> datetime.datetime:
@@ -485,9 +542,7 @@ def notAfter(cert_path: str) -> datetime.datetime:
     :rtype: :class:`datetime.datetime`
 
     """
-    with open(cert_path, "rb") as f:
-        cert = x509.load_pem_x509_certificate(f.read())
-    return cert.not_valid_after_utc
+    return load_cert(cert_path).not_valid_after_utc
 
 
 def sha256sum(filename: str) -> str:
@@ -556,9 +611,7 @@ def get_serial_from_cert(cert_path: str) -> int:
     :returns: serial number of the certificate
     :rtype: int
     """
-    with open(cert_path, "rb") as f:
-        cert = x509.load_pem_x509_certificate(f.read())
-    return cert.serial_number
+    return load_cert(cert_path).serial_number
 
 
 def find_chain_with_issuer(fullchains: List[str], issuer_cn: str,
@@ -1,11 +1,20 @@
 """Tools for checking certificate revocation."""
+import base64
+import collections
+from concurrent import futures
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
 import logging
 import re
+import shutil
 import subprocess
 from subprocess import PIPE
+import threading
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
 from typing import Optional
 from typing import Tuple
 import warnings
@@ -13,7 +22,6 @@ import warnings
 from cryptography import x509
 from cryptography.exceptions import InvalidSignature
 from cryptography.exceptions import UnsupportedAlgorithm
-from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives import serialization
 from cryptography.x509 import ocsp
@@ -22,17 +30,140 @@ import requests
 from certbot import crypto_util
 from certbot import errors
 from certbot import util
+from certbot._internal import state_file
+from certbot.compat import filesystem
+from certbot.compat import os
 from certbot.compat.os import getenv
 from certbot.interfaces import RenewableCert
 
 logger = logging.getLogger(__name__)
 
+STAPLE_FILE = "ocsp.der"
+"""Name of the OCSP response exported for stapling in a lineage's live directory."""
+
+
+class OCSPResponseCache:
+    """A persistent, size-bounded cache of verified OCSP responses.
+
+    Responses are stored as DER, keyed by the issuer key hash and serial
+    number of the certificate they are about, and are used until their
+    nextUpdate time. Responses without nextUpdate aren't cached. When more
+    than `max_entries` responses are cached, the least recently used ones
+    are evicted.
+
+    The cache is read from `path` when first used and only written to it by
+    `save`. This class is thread safe.
+
+    :param str path: path of the JSON file storing the cache
+    :param int max_entries: maximum number of cached responses
+
+    """
+    VERSION = 1
+
+    def __init__(self, path: str, max_entries: int = 10000) -> None:
+        self._path = path
+        self._max_entries = max_entries
+        self._entries: Optional['collections.OrderedDict[str, Tuple[bytes, datetime]]'] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def get(self, issuer_key_hash: bytes, serial_number: int) -> Optional[ocsp.OCSPResponse]:
+        """Return the cached response for a certificate, if it is still current.
+
+        :param bytes issuer_key_hash: hash of the public key of the certificate's
+            issuer, as in the OCSP request
+        :param int serial_number: serial number of the certificate
+
+        :returns: the cached response or `None`
+        :rtype: cryptography.x509.ocsp.OCSPResponse or None
+
+        """
+        key = _cache_key(issuer_key_hash, serial_number)
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= datetime.now(timezone.utc):
+                del entries[key]
+                self._dirty = True
+                return None
+            entries.move_to_end(key)
+            self._dirty = True
+        return ocsp.load_der_ocsp_response(entry[0])
+
+    def set(self, response: ocsp.OCSPResponse) -> None:
+        """Cache a verified, successful response until its nextUpdate time.
+
+        :param cryptography.x509.ocsp.OCSPResponse response: the response
+
+        """
+        if response.next_update_utc is None:
+            return
+        key = _cache_key(response.issuer_key_hash, response.serial_number)
+        with self._lock:
+            entries = self._load()
+            entries[key] = (response.public_bytes(serialization.Encoding.DER),
+                            response.next_update_utc)
+            entries.move_to_end(key)
+            while len(entries) > self._max_entries:
+                entries.popitem(last=False)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the current responses to disk, if the cache changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            now = datetime.now(timezone.utc)
+            entries = {key: {"response": base64.b64encode(der).decode("ascii"),
+                             "next_update": next_update.isoformat()}
+                       for key, (der, next_update) in self._load().items() if next_update > now}
+            state_file.save_json(self._path, self.VERSION, {"entries": entries})
+            self._dirty = False
+
+    def _load(self) -> 'collections.OrderedDict[str, Tuple[bytes, datetime]]':
+        if self._entries is not None:
+            return self._entries
+        self._entries = state_file.load_json(
+            self._path, self.VERSION, _parse_response_cache,
+            "OCSP cache") or collections.OrderedDict()
+        return self._entries
+
+
+def _parse_response_cache(
+        data: Dict[str, Any]) -> 'collections.OrderedDict[str, Tuple[bytes, datetime]]':
+    return collections.OrderedDict(
+        (key, (base64.b64decode(fields["response"]),
+               datetime.fromisoformat(fields["next_update"])))
+        for key, fields in data["entries"].items())
+
+
+def _cache_key(issuer_key_hash: bytes, serial_number: int) -> str:
+    return f"{issuer_key_hash.hex()}:{serial_number:x}"
+
 
 class RevocationChecker:
-    """This class figures out OCSP checking on this system, and performs it."""
+    """This class figures out OCSP checking on this system, and performs it.
+
+    OCSP requests to the same responder reuse a pooled HTTP session, so one
+    checker should be kept to check many certificates. It is thread safe,
+    and its sessions are released by `close`.
 
-    def __init__(self, enforce_openssl_binary_usage: bool = False) -> None:
+    :param bool enforce_openssl_binary_usage: deprecated, use the openssl
+        binary instead of cryptography to check OCSP
+    :param cache: cache of OCSP responses to use and update, if any. It is
+        not used with the openssl binary.
+    :type cache: OCSPResponseCache or None
+
+    """
+
+    def __init__(self, enforce_openssl_binary_usage: bool = False,
+                 cache: Optional[OCSPResponseCache] = None) -> None:
+        self.cache = cache
         self.broken = False
+        self._sessions: Dict[str, requests.Session] = {}
+        self._sessions_lock = threading.Lock()
         if enforce_openssl_binary_usage:
             warnings.warn("enforce_openssl_binary_usage parameter is deprecated "
                 "and will be removed in an upcoming certbot major version update",
@@ -45,11 +176,7 @@ class RevocationChecker:
                 self.broken = True
                 return
 
-            # New versions of openssl want -header var=val, old ones want -header var val
-            test_host_format = subprocess.run(["openssl", "ocsp", "-header", "var", "val"],
-                                     stdout=PIPE, stderr=PIPE, universal_newlines=True,
-                                     check=False, env=util.env_no_snap_for_external_calls())
-            if "Missing =" in test_host_format.stderr:
+            if _openssl_wants_header_equals():
                 self.host_args = lambda host: ["Host=" + host]
             else:
                 self.host_args = lambda host: ["Host", host]
@@ -66,6 +193,81 @@ class RevocationChecker:
         """
         return self.ocsp_revoked_by_paths(cert.cert_path, cert.chain_path)
 
+    def ocsp_response(self, cert_path: str, chain_path: str, timeout: int = 10,
+                      use_cached: bool = True) -> Optional[ocsp.OCSPResponse]:
+        """Retrieve and verify the OCSP response about a certificate.
+
+        This isn't supported with the openssl binary.
+
+        :param str cert_path: Certificate filepath
+        :param str chain_path: Certificate chain
+        :param int timeout: Timeout (in seconds) for the OCSP query
+        :param bool use_cached: whether a response from the cache of this
+            checker may be returned instead of querying the OCSP responder
+
+        :returns: the verified, successful response, or `None` if it couldn't
+            be retrieved or verified
+        :rtype: cryptography.x509.ocsp.OCSPResponse or None
+
+        """
+        if self.use_openssl_binary:
+            raise errors.Error("Retrieving OCSP responses isn't supported with the openssl binary")
+        url, host = _determine_ocsp_server(cert_path)
+        if not host or not url:
+            return None
+        return _fetch_ocsp_cryptography(cert_path, chain_path, url, timeout, self.cache,
+                                        self._session(host), use_cached)
+
+    def ocsp_revoked_many(self, paths: Iterable[Tuple[str, str]], timeout: int = 10,
+                          max_workers: int = 8) -> List[bool]:
+        """Performs the OCSP revocation check of many certificates concurrently.
+
+        Each distinct pair of paths is only checked once, with at most
+        `max_workers` queries in flight at the same time.
+
+        :param paths: pairs of certificate and chain filepaths
+        :type paths: `list` of `tuple` of `str`
+        :param int timeout: Timeout (in seconds) for each OCSP query
+        :param int max_workers: maximum number of concurrent OCSP queries
+
+        :returns: for each pair of `paths`, in the same order, True if the
+            certificate is revoked; False if valid or the check failed or
+            cert is expired.
+        :rtype: `list` of `bool`
+
+        """
+        paths = list(paths)
+        unique_paths = list(dict.fromkeys(paths))
+        if not unique_paths:
+            return []
+        with futures.ThreadPoolExecutor(max_workers=min(max_workers, len(unique_paths))) as pool:
+            results = dict(zip(unique_paths, pool.map(
+                lambda pair: self._ocsp_revoked_safely(pair[0], pair[1], timeout),
+                unique_paths)))
+        return [results[pair] for pair in paths]
+
+    def close(self) -> None:
+        """Close the HTTP sessions used for OCSP queries."""
+        with self._sessions_lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            session.close()
+
+    def _ocsp_revoked_safely(self, cert_path: str, chain_path: str, timeout: int) -> bool:
+        # A failure to check one certificate shouldn't prevent checking the others.
+        try:
+            return self.ocsp_revoked_by_paths(cert_path, chain_path, timeout)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.warning("An error occurred determining the OCSP status of %s.", cert_path)
+            logger.debug(str(e))
+            return False
+
+    def _session(self, host: str) -> requests.Session:
+        with self._sessions_lock:
+            if host not in self._sessions:
+                self._sessions[host] = requests.Session()
+            return self._sessions[host]
+
     def ocsp_revoked_by_paths(self, cert_path: str, chain_path: str, timeout: int = 10) -> bool:
         """Performs the OCSP revocation check
 
@@ -93,7 +295,8 @@ class RevocationChecker:
 
         if self.use_openssl_binary:
             return self._check_ocsp_openssl_bin(cert_path, chain_path, host, url, timeout)
-        return _check_ocsp_cryptography(cert_path, chain_path, url, timeout)
+        return _check_ocsp_cryptography(cert_path, chain_path, url, timeout, self.cache,
+                                        self._session(host))
 
     def _check_ocsp_openssl_bin(self, cert_path: str, chain_path: str,
                                 host: str, url: str, timeout: int) -> bool:
@@ -133,6 +336,62 @@ class RevocationChecker:
         return _translate_ocsp_query(cert_path, output, err)
 
 
+def staple_path(live_dir: str) -> str:
+    """Path of the OCSP response exported for stapling in a lineage's live directory.
+
+    Web servers which can load OCSP responses to staple from a file can be
+    pointed at this DER encoded response, which Certbot keeps current when
+    run with ``--export-ocsp-staple``.
+
+    :param str live_dir: live directory of the lineage
+
+    :returns: path of the exported OCSP response
+    :rtype: str
+
+    """
+    return os.path.join(live_dir, STAPLE_FILE)
+
+
+_openssl_header_probes: Dict[str, bool] = {}
+_openssl_header_probes_lock = threading.Lock()
+
+
+def _openssl_wants_header_equals() -> bool:
+    """Does the openssl binary want -header var=val rather than -header var val?
+
+    The binary is only probed once per process for each openssl build.
+
+    :returns: True if openssl wants -header var=val
+    :rtype: bool
+
+    """
+    build = _openssl_build()
+    with _openssl_header_probes_lock:
+        if build in _openssl_header_probes:
+            return _openssl_header_probes[build]
+        # New versions of openssl want -header var=val, old ones want -header var val
+        test_host_format = subprocess.run(["openssl", "ocsp", "-header", "var", "val"],
+                                 stdout=PIPE, stderr=PIPE, universal_newlines=True,
+                                 check=False, env=util.env_no_snap_for_external_calls())
+        _openssl_header_probes[build] = "Missing =" in test_host_format.stderr
+        return _openssl_header_probes[build]
+
+
+def _openssl_build() -> str:
+    """Identify the openssl binary on the PATH without running it.
+
+    The resolved path, size and modification time of the binary change
+    whenever another version of openssl is installed.
+    """
+    path = shutil.which("openssl") or "openssl"
+    try:
+        path = filesystem.realpath(path)
+        state = filesystem.file_state(path)
+    except OSError:
+        return path
+    return f"{path}:{state.size}:{state.mtime_ns}"
+
+
 def _determine_ocsp_server(cert_path: str) -> Tuple[Optional[str], Optional[str]]:
     """Extract the OCSP server host from a certificate.
 
@@ -141,8 +400,7 @@ def _determine_ocsp_server(cert_path: str) -> Tuple[Optional[str], Optional[str]
     :returns: (OCSP server URL or None, OCSP server host or None)
 
     """
-    with open(cert_path, 'rb') as file_handler:
-        cert = x509.load_pem_x509_certificate(file_handler.read(), default_backend())
+    cert = crypto_util.load_cert(cert_path)
     try:
         extension = cert.extensions.get_extension_for_class(x509.AuthorityInformationAccess)
         ocsp_oid = x509.AuthorityInformationAccessOID.OCSP
@@ -163,26 +421,48 @@ def _determine_ocsp_server(cert_path: str) -> Tuple[Optional[str], Optional[str]
     return None, None
 
 
-def _check_ocsp_cryptography(cert_path: str, chain_path: str, url: str, timeout: int) -> bool:
-    # Retrieve OCSP response
-    with open(chain_path, 'rb') as file_handler:
-        issuer = x509.load_pem_x509_certificate(file_handler.read(), default_backend())
-    with open(cert_path, 'rb') as file_handler:
-        cert = x509.load_pem_x509_certificate(file_handler.read(), default_backend())
+def _check_ocsp_cryptography(cert_path: str, chain_path: str, url: str, timeout: int,
+                             cache: Optional[OCSPResponseCache] = None,
+                             session: Optional[requests.Session] = None) -> bool:
+    response_ocsp = _fetch_ocsp_cryptography(cert_path, chain_path, url, timeout, cache, session)
+    return (response_ocsp is not None
+            and response_ocsp.certificate_status == ocsp.OCSPCertStatus.REVOKED)
+
+
+def _fetch_ocsp_cryptography(cert_path: str, chain_path: str, url: str, timeout: int,
+                             cache: Optional[OCSPResponseCache] = None,
+                             session: Optional[requests.Session] = None,
+                             use_cached: bool = True) -> Optional[ocsp.OCSPResponse]:
+    """Retrieve and verify the OCSP response about a certificate.
+
+    :returns: the verified, successful response, or `None` if it couldn't be
+        retrieved or verified
+    :rtype: cryptography.x509.ocsp.OCSPResponse or None
+
+    """
+    issuer = crypto_util.load_cert(chain_path)
+    cert = crypto_util.load_cert(cert_path)
     builder = ocsp.OCSPRequestBuilder()
     builder = builder.add_certificate(cert, issuer, hashes.SHA1())
     request = builder.build()
+    if cache is not None and use_cached:
+        cached_response = cache.get(request.issuer_key_hash, request.serial_number)
+        if cached_response is not None:
+            logger.debug("Cached OCSP certificate status for %s is: %s",
+                         cert_path, cached_response.certificate_status)
+            return cached_response
     request_binary = request.public_bytes(serialization.Encoding.DER)
+    post = session.post if session is not None else requests.post
     try:
-        response = requests.post(url, data=request_binary,
-                                 headers={'Content-Type': 'application/ocsp-request'},
-                                 timeout=timeout)
+        response = post(url, data=request_binary,
+                        headers={'Content-Type': 'application/ocsp-request'},
+                        timeout=timeout)
     except requests.exceptions.RequestException:
         logger.info("OCSP check failed for %s (are we offline?)", cert_path, exc_info=True)
-        return False
+        return None
     if response.status_code != 200:
         logger.info("OCSP check failed for %s (HTTP status: %d)", cert_path, response.status_code)
-        return False
+        return None
 
     response_ocsp = ocsp.load_der_ocsp_response(response.content)
 
@@ -190,7 +470,7 @@ def _check_ocsp_cryptography(cert_path: str, chain_path: str, url: str, timeout:
     if response_ocsp.response_status != ocsp.OCSPResponseStatus.SUCCESSFUL:
         logger.warning("Invalid OCSP response status for %s: %s",
                      cert_path, response_ocsp.response_status)
-        return False
+        return None
 
     # Check OCSP signature
     try:
@@ -207,9 +487,11 @@ def _check_ocsp_cryptography(cert_path: str, chain_path: str, url: str, timeout:
         # Check OCSP certificate status
         logger.debug("OCSP certificate status for %s is: %s",
                      cert_path, response_ocsp.certificate_status)
-        return response_ocsp.certificate_status == ocsp.OCSPCertStatus.REVOKED
+        if cache is not None:
+            cache.set(response_ocsp)
+        return response_ocsp
 
-    return False
+    return None
 
 
 def _check_ocsp_response(response_ocsp: 'ocsp.OCSPResponse', request_ocsp: 'ocsp.OCSPRequest',
@@ -1,12 +1,17 @@
 """Common code for DNS Authenticator Plugins."""
 import abc
+import concurrent.futures
 import logging
+from time import monotonic
 from time import sleep
 from typing import Callable
+from typing import Dict
 from typing import Iterable
 from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Set
+from typing import Tuple
 from typing import Type
 
 import configobj
@@ -22,15 +27,44 @@ from certbot.display import ops
 from certbot.display import util as display_util
 from certbot.plugins import common
 
+# dnspython is not declared as a dependency in Certbot itself, but the
+# certbot-dns-rfc2136 plugin depends on it. It is only needed to check DNS
+# propagation actively, so this module stays importable without it.
+try:
+    import dns.exception
+    import dns.flags
+    import dns.message
+    import dns.query
+    import dns.rdatatype
+    import dns.resolver
+except ImportError:  # pragma: no cover
+    dns = None  # type: ignore
+
 logger = logging.getLogger(__name__)
 
+#: Seconds between two checks of whether DNS changes have propagated
+PROPAGATION_CHECK_INTERVAL = 2
+
+#: Seconds to wait for each answer from a nameserver when checking propagation
+PROPAGATION_QUERY_TIMEOUT = 5
+
 
 # As of writing this, the only one of our plugins that does not inherit from this class (either
 # directly or indirectly through certbot.plugins.dns_common_lexicon.LexiconDNSAuthenticator) is
 # certbot-dns-route53. If you are attempting to make changes to all of our DNS plugins, please keep
 # this difference in mind.
 class DNSAuthenticator(common.Plugin, interfaces.Authenticator, metaclass=abc.ABCMeta):
-    """Base class for DNS Authenticators"""
+    """Base class for DNS Authenticators
+
+    Subclasses whose provider can change several records in one request should
+    override `_perform_batch` and `_cleanup_batch`. Otherwise, subclasses whose
+    `_perform` and `_cleanup` can safely run in several threads at once should set
+    `_thread_safe` to `True`: the records are then created and deleted concurrently,
+    by up to `_max_workers` threads.
+    """
+
+    _thread_safe = False
+    _max_workers = 10
 
     def __init__(self, config: configuration.NamespaceConfig, name: str) -> None:
         super().__init__(config, name)
@@ -45,6 +79,13 @@ class DNSAuthenticator(common.Plugin, interfaces.Authenticator, metaclass=abc.AB
             type=int,
             help='The number of seconds to wait for DNS to propagate before asking the ACME server '
                  'to verify the DNS record.')
+        add('propagation-check',
+            action='store_true',
+            default=False,
+            help='Instead of always waiting for the propagation seconds, query the authoritative '
+                 'nameservers of each zone and stop waiting as soon as they all serve the DNS '
+                 'records. The propagation seconds are still the longest time to wait. '
+                 'Requires dnspython.')
 
     def auth_hint(self, failed_achalls: List[achallenges.AnnotatedChallenge]) -> str:
         """See certbot.plugins.common.Plugin.auth_hint."""
@@ -71,32 +112,85 @@ class DNSAuthenticator(common.Plugin, interfaces.Authenticator, metaclass=abc.AB
 
         self._attempt_cleanup = True
 
-        responses = []
-        for achall in achalls:
-            domain = achall.domain
-            validation_domain_name = achall.validation_domain_name(domain)
-            validation = achall.validation(achall.account_key)
+        records = self._records(achalls)
+        self._perform_batch(records)
+
+        self._wait_for_propagation([(name, validation) for _, name, validation in records])
+
+        return [achall.response(achall.account_key) for achall in achalls]
+
+    def _wait_for_propagation(self, records: List[Tuple[str, str]]) -> None:
+        """Wait for the DNS TXT records to propagate.
 
-            self._perform(domain, validation_domain_name, validation)
-            responses.append(achall.response(achall.account_key))
+        :param list records: The (validation domain name, validation) pairs which were created.
+        """
+        propagation_seconds = self.conf('propagation-seconds')
+        if propagation_seconds > 0 and self.conf('propagation-check'):
+            if dns is not None:
+                display_util.notify("Waiting up to %d seconds for DNS changes to propagate" %
+                                    propagation_seconds)
+                if not wait_for_propagation(records, propagation_seconds):
+                    logger.info('DNS changes did not propagate to all authoritative nameservers '
+                                'within %d seconds, continuing anyway.', propagation_seconds)
+                return
+            logger.warning('dnspython is not installed, so DNS propagation cannot be checked.')
 
         # DNS updates take time to propagate and checking to see if the update has occurred is not
         # reliable (the machine this code is running on might be able to see an update before
         # the ACME server). So: we sleep for a short amount of time we believe to be long enough.
         display_util.notify("Waiting %d seconds for DNS changes to propagate" %
-                    self.conf('propagation-seconds'))
-        sleep(self.conf('propagation-seconds'))
-
-        return responses
+                    propagation_seconds)
+        sleep(propagation_seconds)
 
     def cleanup(self, achalls: List[achallenges.AnnotatedChallenge]) -> None:  # pylint: disable=missing-function-docstring
         if self._attempt_cleanup:
-            for achall in achalls:
-                domain = achall.domain
-                validation_domain_name = achall.validation_domain_name(domain)
-                validation = achall.validation(achall.account_key)
+            self._cleanup_batch(self._records(achalls))
 
-                self._cleanup(domain, validation_domain_name, validation)
+    @staticmethod
+    def _records(achalls: List[achallenges.AnnotatedChallenge]) -> List[Tuple[str, str, str]]:
+        """The (domain, validation domain name, validation) of each challenge."""
+        return [(achall.domain, achall.validation_domain_name(achall.domain),
+                 achall.validation(achall.account_key)) for achall in achalls]
+
+    def _for_each_record(self, func: Callable[[str, str, str], None],
+                         records: List[Tuple[str, str, str]]) -> None:
+        """Call func with each record, concurrently if the plugin is thread-safe.
+
+        :param callable func: `_perform` or `_cleanup`.
+        :param list records: The (domain, validation domain name, validation) of each record.
+        """
+        workers = min(self._max_workers, len(records)) if self._thread_safe else 1
+        if workers <= 1:
+            for record in records:
+                func(*record)
+            return
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers,
+                                                   thread_name_prefix='certbot-dns') as executor:
+            # Raises the first error in order, once all records have been handled
+            list(executor.map(lambda record: func(*record), records))
+
+    def _perform_batch(self, records: List[Tuple[str, str, str]]) -> None:
+        """
+        Performs dns-01 challenges by creating DNS TXT records.
+
+        Plugins able to create several records in one request should override this. By
+        default, `_perform` is called for each record.
+
+        :param list records: The (domain, validation domain name, validation) of each record.
+        :raises errors.PluginError: If the challenges cannot be performed
+        """
+        self._for_each_record(self._perform, records)
+
+    def _cleanup_batch(self, records: List[Tuple[str, str, str]]) -> None:
+        """
+        Deletes the DNS TXT records which would have been created by `_perform_batch`.
+
+        Plugins able to delete several records in one request should override this. By
+        default, `_cleanup` is called for each record.
+
+        :param list records: The (domain, validation domain name, validation) of each record.
+        """
+        self._for_each_record(self._cleanup, records)
 
     @abc.abstractmethod
     def _setup_credentials(self) -> None:  # pragma: no cover
@@ -352,6 +446,99 @@ def validate_file_permissions(filename: str) -> None:
         logger.warning('Unsafe permissions on credentials configuration file: %s', filename)
 
 
+def wait_for_propagation(records: Iterable[Tuple[str, str]], timeout: float) -> bool:
+    """Wait until the authoritative nameservers serve the given TXT records.
+
+    The nameservers of the zone of each record are queried directly, so what they
+    answer is what the ACME server will see, whatever resolvers cache.
+
+    :param records: The (record name, record content) pairs to wait for.
+    :param float timeout: The maximum number of seconds to wait.
+    :returns: `True` if all nameservers served all records in time, `False` otherwise.
+    :rtype: bool
+    """
+    deadline = monotonic() + timeout
+    expected: Dict[str, Set[str]] = {}
+    for name, content in records:
+        expected.setdefault(name.rstrip('.') + '.', set()).add(content)
+    nameservers: Dict[str, Dict[str, List[str]]] = {}
+
+    while True:
+        for name in list(expected):
+            if _propagated(name, expected[name], nameservers, deadline):
+                del expected[name]
+        if not expected:
+            return True
+        remaining = deadline - monotonic()
+        if remaining <= 0:
+            logger.debug('DNS changes not propagated yet for %s', ', '.join(sorted(expected)))
+            return False
+        sleep(min(PROPAGATION_CHECK_INTERVAL, remaining))
+
+
+def _propagated(name: str, contents: Set[str], nameservers: Dict[str, Dict[str, List[str]]],
+                deadline: float) -> bool:
+    """Do all the authoritative nameservers of name serve all the contents?
+
+    :param str name: The absolute name of the TXT record.
+    :param set contents: The contents the TXT record should have.
+    :param dict nameservers: Cache of the nameserver addresses by nameserver and record name.
+    :param float deadline: The `monotonic` time after which no query is sent.
+    """
+    try:
+        nameservers[name] = nameservers.get(name) or _authoritative_nameservers(name)
+    except dns.exception.DNSException as e:
+        logger.debug('Error finding the nameservers of %s: %s', name, e)
+        return False
+    return bool(nameservers[name]) and all(
+        _served(name, contents, addresses, deadline) for addresses in nameservers[name].values())
+
+
+def _served(name: str, contents: Set[str], addresses: List[str], deadline: float) -> bool:
+    """Does a nameserver serve all the contents of the TXT record name?
+
+    The first address of the nameserver that answers is trusted, so that an unreachable
+    address family (e.g. IPv6 on an IPv4-only host) does not hold the check back.
+    """
+    for address in addresses:
+        timeout = min(PROPAGATION_QUERY_TIMEOUT, deadline - monotonic())
+        if timeout <= 0:
+            return False
+        try:
+            return contents <= _txt_contents(name, address, timeout)
+        except (dns.exception.DNSException, OSError) as e:
+            logger.debug('Error querying %s for %s: %s', address, name, e)
+    return False
+
+
+def _authoritative_nameservers(name: str) -> Dict[str, List[str]]:
+    """Find the addresses of each authoritative nameserver of the zone containing name."""
+    zone = dns.resolver.zone_for_name(name)
+    nameservers: Dict[str, List[str]] = {}
+    for ns in dns.resolver.resolve(zone, 'NS'):
+        addresses: List[str] = []
+        for rdtype in ('A', 'AAAA'):
+            try:
+                addresses.extend(a.to_text() for a in dns.resolver.resolve(ns.target, rdtype))
+            except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
+                pass
+        if addresses:
+            nameservers[str(ns.target)] = addresses
+    logger.debug('Authoritative nameservers of %s for %s: %s', zone, name, nameservers)
+    return nameservers
+
+
+def _txt_contents(name: str, nameserver: str, timeout: float) -> Set[str]:
+    """Query nameserver directly for the contents of the TXT record name."""
+    query = dns.message.make_query(name, dns.rdatatype.TXT)
+    response = dns.query.udp(query, nameserver, timeout=timeout)
+    if response.flags & dns.flags.TC:
+        response = dns.query.tcp(query, nameserver, timeout=timeout)
+    return {b''.join(rdata.strings).decode()
+            for rrset in response.answer if rrset.rdtype == dns.rdatatype.TXT
+            for rdata in rrset}
+
+
 def base_domain_name_guesses(domain: str) -> List[str]:
     """Return a list of progressively less-specific domain names.
 
@@ -144,6 +144,8 @@ _INITIAL_PID = os.getpid()
 # program exits before the lock is cleaned up, it is automatically
 # released, but the file isn't deleted.
 _LOCKS: Dict[str, lock.LockFile] = {}
+# Whether _release_locks was registered to run at exit
+_LOCKS_RELEASE_REGISTERED = False
 _VERSION_COMPONENT_RE = re.compile(r'(\d+ | [a-z]+ | \.)', re.VERBOSE)
 
 def env_no_snap_for_external_calls() -> Dict[str, str]:
@@ -234,13 +236,26 @@ def lock_dir_until_exit(dir_path: str) -> None:
     :raises errors.LockError: if the lock is held by another process
 
     """
-    if not _LOCKS:  # this is the first lock to be released at exit
+    global _LOCKS_RELEASE_REGISTERED  # pylint: disable=global-statement
+    if not _LOCKS_RELEASE_REGISTERED:  # this is the first lock to be released at exit
         atexit_register(_release_locks)
+        _LOCKS_RELEASE_REGISTERED = True
 
     if dir_path not in _LOCKS:
         _LOCKS[dir_path] = lock.lock_dir(dir_path)
 
 
+def release_locks() -> None:
+    """Release the locks taken with lock_dir_until_exit before program exit.
+
+    Long running processes, such as ``certbot renew --daemon``, use this to let
+    other instances of Certbot run while they are idle. The directories can
+    then be locked again with lock_dir_until_exit.
+
+    """
+    _release_locks()
+
+
 def _release_locks() -> None:
     for dir_lock in _LOCKS.values():
         try: